@@ -4,6 +4,7 @@ Base settings.
 
 import logging
 import os
+import tempfile
 from pathlib import Path
 
 import environ
@@ -494,10 +495,48 @@ METRICS_TOKEN = env("METRICS_TOKEN", default="")
 METRICS_ALLOW_QUERY_TOKEN = env.bool("METRICS_ALLOW_QUERY_TOKEN", default=False)
 HEALTHCHECK_SKIP_MIGRATION_CHECK = env.bool("HEALTHCHECK_SKIP_MIGRATION_CHECK", default=False)
 
+PDF_RENDER_MODE = env("PDF_RENDER_MODE", default="process")
+PDF_RENDER_WORKERS = env.int("PDF_RENDER_WORKERS", default=2)
+PDF_RENDER_QUEUE_SIZE = env.int("PDF_RENDER_QUEUE_SIZE", default=8)
+PDF_RENDER_TIMEOUT_SECONDS = env.int("PDF_RENDER_TIMEOUT_SECONDS", default=120)
+PDF_RENDER_MAX_TASKS_PER_CHILD = env.int("PDF_RENDER_MAX_TASKS_PER_CHILD", default=50)
+PDF_RENDER_MEMORY_LIMIT_MB = env.int("PDF_RENDER_MEMORY_LIMIT_MB", default=1024)
+DOCX_RENDER_MODE = env("DOCX_RENDER_MODE", default="process")
+DOCX_PARALLEL_MIN_BLOCKS = env.int("DOCX_PARALLEL_MIN_BLOCKS", default=5000)
+
+RENDER_CACHE_ENABLED = env.bool("RENDER_CACHE_ENABLED", default=True)
+RENDER_CACHE_MAX_BYTES = env.int("RENDER_CACHE_MAX_BYTES", default=512 * 1024 * 1024)
+RENDER_CACHE_MAX_ENTRIES = env.int("RENDER_CACHE_MAX_ENTRIES", default=2000)
+RENDER_CACHE_VERSION = env("RENDER_CACHE_VERSION", default="1")
+RENDER_CACHE_EVICT_EVERY = env.int("RENDER_CACHE_EVICT_EVERY", default=20)
+
+REPORT_REVISION_CHECKPOINT_INTERVAL = env.int("REPORT_REVISION_CHECKPOINT_INTERVAL", default=20)
+REPORT_WORKSPACE_CACHE_SECONDS = env.int("REPORT_WORKSPACE_CACHE_SECONDS", default=300)
+ALIGNMENT_COVERAGE_CACHE_SECONDS = env.int("ALIGNMENT_COVERAGE_CACHE_SECONDS", default=300)
+
+PROGRAMME_RUN_MODE = env("PROGRAMME_RUN_MODE", default="threaded")
+PROGRAMME_RUN_WORKERS = env.int("PROGRAMME_RUN_WORKERS", default=2)
+PROGRAMME_STEP_WORKERS = env.int("PROGRAMME_STEP_WORKERS", default=2)
+PROGRAMME_RUN_LEASE_SECONDS = env.int("PROGRAMME_RUN_LEASE_SECONDS", default=300)
+PROGRAMME_RUN_HEARTBEAT_SECONDS = env.int("PROGRAMME_RUN_HEARTBEAT_SECONDS", default=30)
+PROGRAMME_SCHEDULER_POLL_SECONDS = env.int("PROGRAMME_SCHEDULER_POLL_SECONDS", default=30)
+SPATIAL_LAYER_QA_CACHE_SECONDS = env.int("SPATIAL_LAYER_QA_CACHE_SECONDS", default=86400)
+SPATIAL_OVERLAY_SUBDIVIDE_VERTICES = env.int("SPATIAL_OVERLAY_SUBDIVIDE_VERTICES", default=256)
+INDICATOR_METHOD_RESULTS_PER_PROFILE = env.int("INDICATOR_METHOD_RESULTS_PER_PROFILE", default=20)
+INDICATOR_METHOD_AUTO_REFRESH = env.bool("INDICATOR_METHOD_AUTO_REFRESH", default=True)
+INDICATOR_METHOD_BATCH_MODE = env("INDICATOR_METHOD_BATCH_MODE", default="process")
+INDICATOR_METHOD_BATCH_WORKERS = env.int("INDICATOR_METHOD_BATCH_WORKERS", default=4)
+INDICATOR_METHOD_POSTGIS_WORKERS = env.int("INDICATOR_METHOD_POSTGIS_WORKERS", default=1)
+
 BIRDIE_BASE_URL = env("BIRDIE_BASE_URL", default="")
 BIRDIE_API_TOKEN = env("BIRDIE_API_TOKEN", default="")
 BIRDIE_TIMEOUT_SECONDS = env.int("BIRDIE_TIMEOUT_SECONDS", default=20)
 BIRDIE_USE_FIXTURE = env.bool("BIRDIE_USE_FIXTURE", default=True)
+BIRDIE_MAX_RETRIES = env.int("BIRDIE_MAX_RETRIES", default=3)
+BIRDIE_BACKOFF_SECONDS = env.float("BIRDIE_BACKOFF_SECONDS", default=0.5)
+BIRDIE_MAX_WORKERS = env.int("BIRDIE_MAX_WORKERS", default=4)
+BIRDIE_PAGE_SIZE = env.int("BIRDIE_PAGE_SIZE", default=500)
+BIRDIE_CACHE_DIR = env("BIRDIE_CACHE_DIR", default=str(Path(tempfile.gettempdir()) / "nbms" / "birdie"))
 
 LOGIN_URL = "two_factor:login"
 LOGIN_REDIRECT_URL = "/"
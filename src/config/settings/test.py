@@ -21,6 +21,14 @@ CACHES = {
     }
 }
 
+# Render PDFs in-process; the worker pool has dedicated tests.
+PDF_RENDER_MODE = "inline"
+DOCX_RENDER_MODE = "inline"
+
+# Test transactions are not visible to other threads; run programme steps in-thread.
+PROGRAMME_RUN_MODE = "inline"
+INDICATOR_METHOD_BATCH_MODE = "inline"
+
 # Keep sessions in the DB for test runs to avoid Redis dependency.
 SESSION_ENGINE = "django.contrib.sessions.backends.db"
 
@@ -1016,6 +1016,7 @@ class ReportingSnapshotAdmin(admin.ModelAdmin):
     list_filter = ("snapshot_type", "report_label", "readiness_overall_ready", "created_at")
     readonly_fields = (
         "payload_json",
+        "payload_manifest_json",
         "payload_hash",
         "context_filters_json",
         "resolved_values_manifest_json",
@@ -2,6 +2,7 @@ from collections import defaultdict
 import base64
 from datetime import date, timedelta
 import difflib
+import functools
 import json
 from uuid import uuid4
 
@@ -10,8 +11,9 @@ from django.core.cache import cache
 from django.core.exceptions import PermissionDenied, ValidationError
 from django.core.files.storage import default_storage
 from django.db import connections
-from django.db.models import BooleanField, Case, CharField, Count, DateField, Exists, ExpressionWrapper, F, IntegerField, Max, OuterRef, Q, Value, When
-from django.http import FileResponse, HttpResponse
+from django.db.models import BooleanField, Case, Count, F, IntegerField, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
 from django.middleware.csrf import get_token
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
@@ -39,7 +41,6 @@ from nbms_app.models import (
     EcosystemType,
     EcosystemTypologyCrosswalk,
     Indicator,
-    IndicatorDataPoint,
     IndicatorDataSeries,
     IndicatorDatasetLink,
     IndicatorEvidenceLink,
@@ -125,6 +126,7 @@ from nbms_app.services.entity_narratives import (
     serialize_narrative_versions,
     submit_narrative,
 )
+from nbms_app.services.export_context import ExportBuildContext
 from nbms_app.services.indicator_analytics import (
     build_indicator_audit_payload,
     build_indicator_cube_payload,
@@ -136,6 +138,7 @@ from nbms_app.services.indicator_analytics import (
     resolve_indicator_analytics_context,
 )
 from nbms_app.services.indicator_data import indicator_data_points_for_user, indicator_data_series_for_user
+from nbms_app.services.indicator_explorer import DUE_SOON_DAYS, indicator_explorer_summary
 from nbms_app.services.indicator_release_workflow import (
     approve_indicator_release,
     get_release_workflow_state,
@@ -149,16 +152,18 @@ from nbms_app.services.nr7_builder import (
 )
 from nbms_app.services.reporting_collab import (
     append_revision,
+    changed_keys,
     create_suggested_change,
     decide_suggested_change,
     ensure_initial_revision,
-    payload_hash,
+    revision_contents,
 )
 from nbms_app.services.reporting_dossier import generate_reporting_dossier, read_dossier_manifest
 from nbms_app.services.reporting_exports import (
     build_cbd_report_payload,
-    render_cbd_docx_bytes,
-    render_cbd_pdf_bytes,
+    cbd_report_fingerprint,
+    start_cbd_docx_render,
+    start_cbd_pdf_render,
     store_report_export_artifact,
 )
 from nbms_app.services.reporting_narratives import (
@@ -169,17 +174,26 @@ from nbms_app.services.reporting_narratives import (
     normalize_context_filters,
     persist_report_context,
     render_section_narrative,
+    render_section_narratives,
     resolve_narrative_tokens,
     update_narrative_block_from_callback,
     upsert_narrative_block_content,
 )
 from nbms_app.services.reporting_workflow import (
+    bootstrap_report_workspace,
     ensure_workflow_instance,
+    get_active_workflow,
     report_content_snapshot,
     resolve_cbd_pack,
     transition_report_workflow,
 )
-from nbms_app.services.programme_ops import execute_programme_run, queue_programme_run, user_can_manage_programme
+from nbms_app.services.reporting_workspace import cached_pack_validation, cached_report_payload
+from nbms_app.services.programme_ops import (
+    ProgrammeRunConflict,
+    execute_programme_run,
+    queue_programme_run,
+    user_can_manage_programme,
+)
 from nbms_app.services.readiness import get_instance_readiness
 from nbms_app.services.metrics import render_prometheus, update_db_pool_metrics
 from nbms_app.services.registry_marts import latest_snapshot_date
@@ -189,6 +203,7 @@ from nbms_app.services.registry_workflows import (
     list_registry_evidence_links,
     transition_registry_object,
 )
+from nbms_app.services.search_index import search_page, search_queryset
 from nbms_app.services.section_progress import scoped_framework_targets, scoped_national_targets
 from nbms_app.services.spatial_access import (
     filter_spatial_layers_for_user,
@@ -214,7 +229,9 @@ from nbms_app.services.download_records import (
     create_download_record_from_payload,
     create_download_record_with_asset,
     serialize_download_record,
+    stream_download_record_from_payload,
 )
+from nbms_app.services.render_cache import render_cache_stats
 from nbms_app.services.workflows import approve, publish, reject, submit_for_review
 
 
@@ -507,112 +524,25 @@ def _can_manage_registry_workflows(user):
 
 
 def _annotate_indicator_explorer_queryset(queryset):
-    ready_profiles = IndicatorMethodProfile.objects.filter(
-        indicator=OuterRef("pk"),
-        is_active=True,
-        readiness_state="ready",
-    )
-    partial_profiles = IndicatorMethodProfile.objects.filter(
-        indicator=OuterRef("pk"),
-        is_active=True,
-        readiness_state="partial",
-    )
-    spatial_points = IndicatorDataPoint.objects.filter(
-        series__indicator=OuterRef("pk"),
-    ).filter(Q(spatial_layer__isnull=False) | Q(spatial_unit__isnull=False))
-    required_layers = IndicatorInputRequirement.objects.filter(
-        indicator=OuterRef("pk"),
-        required_map_layers__isnull=False,
-    )
-    queryset = queryset.annotate(
-        method_ready_exists=Exists(ready_profiles),
-        method_partial_exists=Exists(partial_profiles),
-        has_spatial_data=Exists(spatial_points),
-        has_required_layers=Exists(required_layers),
-    )
-    base_score = Case(
-        When(method_ready_exists=True, then=Value(85)),
-        When(method_partial_exists=True, then=Value(55)),
-        default=Value(25),
-        output_field=IntegerField(),
-    )
-    freshness_bonus = Case(
-        When(last_updated_on__isnull=False, then=Value(10)),
-        default=Value(0),
-        output_field=IntegerField(),
-    )
-    queryset = queryset.annotate(
-        readiness_score_ann=base_score + freshness_bonus,
-        has_spatial_ann=Case(
-            When(
-                Q(has_spatial_data=True)
-                | Q(has_required_layers=True)
-                | (Q(spatial_coverage__isnull=False) & ~Q(spatial_coverage=""))
-                | (Q(coverage_geography__isnull=False) & ~Q(coverage_geography="")),
-                then=Value(True),
-            ),
-            default=Value(False),
-            output_field=BooleanField(),
-        ),
-    )
+    # Indicators without an index row yet read as unscored: blocked, red, no spatial output.
     today = timezone.now().date()
-    queryset = queryset.annotate(
-        readiness_band_ann=Case(
-            When(readiness_score_ann__gte=75, then=Value("green")),
-            When(readiness_score_ann__gte=45, then=Value("amber")),
-            default=Value("red"),
-            output_field=CharField(),
+    return queryset.annotate(
+        readiness_score_ann=Coalesce(
+            F("explorer_index__readiness_score"),
+            Case(When(last_updated_on__isnull=False, then=Value(35)), default=Value(25), output_field=IntegerField()),
         ),
-        next_expected_update_ann=Case(
-            When(
-                Q(last_updated_on__isnull=False)
-                & (Q(update_frequency="monthly") | Q(reporting_cadence="monthly")),
-                then=ExpressionWrapper(F("last_updated_on") + timedelta(days=30), output_field=DateField()),
-            ),
-            When(
-                Q(last_updated_on__isnull=False)
-                & (Q(update_frequency="quarterly") | Q(reporting_cadence="quarterly")),
-                then=ExpressionWrapper(F("last_updated_on") + timedelta(days=91), output_field=DateField()),
-            ),
-            When(
-                Q(last_updated_on__isnull=False)
-                & (Q(update_frequency="annual") | Q(reporting_cadence="annual")),
-                then=ExpressionWrapper(F("last_updated_on") + timedelta(days=365), output_field=DateField()),
-            ),
-            When(
-                Q(last_updated_on__isnull=False)
-                & (
-                    Q(update_frequency="biennial")
-                    | Q(update_frequency="every_2_years")
-                    | Q(reporting_cadence="biennial")
-                    | Q(reporting_cadence="every_2_years")
-                ),
-                then=ExpressionWrapper(F("last_updated_on") + timedelta(days=730), output_field=DateField()),
-            ),
-            When(
-                Q(last_updated_on__isnull=False)
-                & (
-                    Q(update_frequency="every_3_years")
-                    | Q(reporting_cadence="every_3_years")
-                ),
-                then=ExpressionWrapper(F("last_updated_on") + timedelta(days=1095), output_field=DateField()),
-            ),
-            default=Value(None),
-            output_field=DateField(),
-        ),
-    )
-    queryset = queryset.annotate(
+        readiness_band_ann=Coalesce(F("explorer_index__readiness_band"), Value("red")),
+        has_spatial_ann=Coalesce(F("explorer_index__has_spatial"), Value(False), output_field=BooleanField()),
+        next_expected_update_ann=F("explorer_index__next_expected_update"),
         due_soon_ann=Case(
             When(
-                next_expected_update_ann__isnull=False,
-                next_expected_update_ann__lte=today + timedelta(days=60),
+                explorer_index__next_expected_update__lte=today + timedelta(days=DUE_SOON_DAYS),
                 then=Value(1),
             ),
             default=Value(0),
             output_field=IntegerField(),
-        )
+        ),
     )
-    return queryset
 
 
 def _registry_gold_model(kind):
@@ -748,7 +678,11 @@ def _can_edit_report_instance(user, instance):
 
 def _serialize_section_response(row):
     ensure_initial_revision(section_response=row, author=row.updated_by)
-    latest_revision = row.revisions.order_by("-version", "-id").first()
+    latest_revision = row.revisions.only("id", "uuid").order_by("-version", "-id").first()
+    return _section_response_fields(row, latest_revision.uuid if latest_revision else None)
+
+
+def _section_response_fields(row, latest_revision_uuid):
     return {
         "uuid": str(row.uuid),
         "section_code": row.section.code,
@@ -760,7 +694,25 @@ def _serialize_section_response(row):
         "locked_for_editing": row.locked_for_editing,
         "updated_by": row.updated_by.username if row.updated_by_id else None,
         "updated_at": row.updated_at.isoformat() if row.updated_at else None,
-        "latest_revision_uuid": str(latest_revision.uuid) if latest_revision else None,
+        "latest_revision_uuid": str(latest_revision_uuid) if latest_revision_uuid else None,
+    }
+
+
+def _placeholder_section_fields(section):
+    # Instances created before workspace bootstrapping may lack a response
+    # row; it is created on the first section read or edit.
+    return {
+        "uuid": None,
+        "section_code": section.code,
+        "section_title": section.title,
+        "ordering": section.ordering,
+        "response_json": build_default_response_payload(section),
+        "current_version": 0,
+        "current_content_hash": "",
+        "locked_for_editing": False,
+        "updated_by": None,
+        "updated_at": None,
+        "latest_revision_uuid": None,
     }
 
 
@@ -829,17 +781,15 @@ def _resolve_export_context(instance, user, raw_context):
 
 def _attach_context_rendering(payload, instance, context_filters):
     payload = _deep_clone(payload)
-    sections = payload.get("sections") or []
+    sections = [section for section in payload.get("sections") or [] if section.get("code")]
+    narratives = render_section_narratives(
+        instance=instance,
+        section_codes=[section["code"] for section in sections],
+        context_filters=context_filters,
+    )
     manifest = []
     for section in sections:
-        section_code = section.get("code")
-        if not section_code:
-            continue
-        rendered = render_section_narrative(
-            instance=instance,
-            section_code=section_code,
-            context_filters=context_filters,
-        )
+        rendered = narratives[section["code"]]
         section["rendered_narrative_html"] = rendered.get("rendered_html", "")
         section_manifest = rendered.get("resolved_values_manifest", [])
         section["resolved_values_manifest"] = section_manifest
@@ -849,6 +799,25 @@ def _attach_context_rendering(payload, instance, context_filters):
     return payload, manifest
 
 
+def _start_workspace_export_render(start_render, instance, context_filters):
+    """
+    Start a workspace export render looked up by fingerprint, building the payload only on a cache miss.
+
+    The resolved values count is stored with the render so a cache hit can still report it.
+    """
+
+    @functools.cache
+    def build():
+        payload = build_cbd_report_payload(instance=instance)
+        return _attach_context_rendering(payload, instance, context_filters)
+
+    return start_render(
+        payload=lambda: build()[0],
+        fingerprint=cbd_report_fingerprint(instance, context_filters=context_filters),
+        metadata=lambda: {"resolved_values_count": len(build()[1])},
+    )
+
+
 def _programme_queryset_for_user(user):
     return filter_monitoring_programmes_for_user(
         MonitoringProgramme.objects.select_related("lead_org", "sensitivity_class", "agreement").prefetch_related(
@@ -873,6 +842,7 @@ def _programme_run_payload(run):
         "requested_by": run.requested_by.username if run.requested_by_id else None,
         "started_at": run.started_at.isoformat() if run.started_at else None,
         "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+        "heartbeat_at": run.heartbeat_at.isoformat() if run.heartbeat_at else None,
         "input_summary_json": run.input_summary_json,
         "output_summary_json": run.output_summary_json,
         "lineage_json": run.lineage_json,
@@ -909,9 +879,11 @@ def _programme_run_payload(run):
                 "ordering": step.ordering,
                 "step_key": step.step_key,
                 "step_type": step.step_type,
+                "depends_on": step.depends_on_json,
                 "status": step.status,
                 "started_at": step.started_at.isoformat() if step.started_at else None,
                 "finished_at": step.finished_at.isoformat() if step.finished_at else None,
+                "duration_ms": step.duration_ms,
                 "details_json": step.details_json,
             }
             for step in run.steps.all().order_by("ordering", "id")
@@ -1402,6 +1374,7 @@ def api_system_health(request):
             "services": checks,
             "observability": observability,
             "download_record_backlog": download_backlog,
+            "render_cache": render_cache_stats(),
             "export_failures_last_24h": failed_downloads_last_24h + failed_programme_runs_last_24h,
             "recent_failures": [
                 {
@@ -1702,7 +1675,10 @@ def api_programme_run_detail(request, run_uuid):
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
         if run.status == ProgrammeRunStatus.RUNNING:
             return Response({"detail": "Run is already executing."}, status=status.HTTP_409_CONFLICT)
-        run = execute_programme_run(run=run, actor=request.user)
+        try:
+            run = execute_programme_run(run=run, actor=request.user)
+        except ProgrammeRunConflict:
+            return Response({"detail": "Run is already executing."}, status=status.HTTP_409_CONFLICT)
         run.refresh_from_db()
     return Response(_programme_run_payload(run))
 
@@ -1914,19 +1890,17 @@ def api_reporting_instances(request):
             status=ReportingStatus.DRAFT,
         )
 
-        pack = resolve_cbd_pack()
-        for section in pack.sections.filter(is_active=True).order_by("ordering", "code"):
-            response_json = build_default_response_payload(section)
-            if section.code == "section-i":
-                response_json["report_label"] = report_label
-                response_json["country_or_reporting_party_name"] = country_name
-                response_json["public_availability"] = "public" if is_public else "internal"
-            ReportTemplatePackResponse.objects.create(
-                reporting_instance=instance,
-                section=section,
-                response_json=response_json,
-                updated_by=request.user if request.user.is_authenticated else None,
-            )
+        pack, _workflow = bootstrap_report_workspace(
+            instance,
+            user=request.user,
+            initial_responses={
+                "section-i": {
+                    "report_label": report_label,
+                    "country_or_reporting_party_name": country_name,
+                    "public_availability": "public" if is_public else "internal",
+                }
+            },
+        )
         record_audit_event(
             request.user,
             "reporting_instance_create",
@@ -2007,8 +1981,9 @@ def api_reporting_nr7_summary(request, instance_uuid):
     if not _require_instance_scope(request.user, instance):
         return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
-    validation = build_nr7_validation_summary(instance=instance, user=request.user)
-    preview = build_nr7_preview_payload(instance=instance, user=request.user)
+    export_context = ExportBuildContext(instance, request.user)
+    validation = build_nr7_validation_summary(instance=instance, user=request.user, context=export_context)
+    preview = build_nr7_preview_payload(instance=instance, user=request.user, context=export_context)
     map_layers = filter_spatial_layers_for_user(
         SpatialLayer.objects.filter(is_active=True).select_related("indicator"),
         request.user,
@@ -2081,12 +2056,13 @@ def api_reporting_workspace_summary(request, instance_uuid):
     if not _can_view_report_instance(request.user, instance):
         return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
     pack = resolve_cbd_pack()
-    workflow = ensure_workflow_instance(instance)
+    workflow = get_active_workflow(instance)
     _sections = list(pack.sections.filter(is_active=True).order_by("ordering", "code"))
+    latest_revisions = ReportSectionRevision.objects.filter(section_response=OuterRef("pk")).order_by("-version", "-id")
     responses = (
         ReportTemplatePackResponse.objects.filter(reporting_instance=instance, section__pack=pack)
         .select_related("section", "updated_by")
-        .prefetch_related("revisions")
+        .annotate(latest_revision_uuid=Subquery(latest_revisions.values("uuid")[:1]))
         .order_by("section__ordering", "section__code")
     )
     response_map = {row.section.code: row for row in responses}
@@ -2094,22 +2070,23 @@ def api_reporting_workspace_summary(request, instance_uuid):
     for section in _sections:
         row = response_map.get(section.code)
         if row is None:
-            row = ReportTemplatePackResponse.objects.create(
-                reporting_instance=instance,
-                section=section,
-                response_json=build_default_response_payload(section),
-                updated_by=request.user if request.user.is_authenticated else None,
-            )
-            ensure_initial_revision(section_response=row, author=request.user)
-        section_rows.append(_serialize_section_response(row))
+            section_rows.append(_placeholder_section_fields(section))
+        else:
+            section_rows.append(_section_response_fields(row, row.latest_revision_uuid))
 
-    validation = build_pack_validation(pack=pack, instance=instance, user=request.user)
-    payload = build_cbd_report_payload(instance=instance)
+    validation = cached_pack_validation(pack=pack, instance=instance, user=request.user)
+    payload = cached_report_payload(pack=pack, instance=instance)
     latest_dossier = instance.dossier_artifacts.order_by("-created_at", "-id").first()
-    approvals = {
-        row.section.code: row
-        for row in workflow.section_approvals.select_related("section", "approved_by").order_by("section__ordering", "section__code")
-    }
+    approvals = {}
+    workflow_actions = []
+    if workflow:
+        approvals = {
+            row.section.code: row
+            for row in workflow.section_approvals.select_related("section", "approved_by").order_by(
+                "section__ordering", "section__code"
+            )
+        }
+        workflow_actions = workflow.actions.select_related("actor").order_by("-created_at", "-id")[:25]
     latest_context = (
         ReportContext.objects.filter(
             reporting_instance=instance,
@@ -2164,11 +2141,11 @@ def api_reporting_workspace_summary(request, instance_uuid):
                 for section in _sections
             ],
             "workflow": {
-                "uuid": str(workflow.uuid),
-                "status": workflow.status,
-                "current_step": workflow.current_step,
-                "locked": workflow.locked,
-                "latest_content_hash": workflow.latest_content_hash,
+                "uuid": str(workflow.uuid) if workflow else None,
+                "status": workflow.status if workflow else ReportWorkflowStatus.ACTIVE,
+                "current_step": workflow.current_step if workflow else ReportingStatus.DRAFT,
+                "locked": workflow.locked if workflow else False,
+                "latest_content_hash": workflow.latest_content_hash if workflow else "",
                 "actions": [
                     {
                         "uuid": str(row.uuid),
@@ -2177,7 +2154,7 @@ def api_reporting_workspace_summary(request, instance_uuid):
                         "comment": row.comment,
                         "created_at": row.created_at.isoformat(),
                     }
-                    for row in workflow.actions.select_related("actor").order_by("-created_at", "-id")[:25]
+                    for row in workflow_actions
                 ],
             },
             "signoff_records": [
@@ -2394,6 +2371,7 @@ def api_reporting_workspace_section_charts(request, instance_uuid, section_code)
         instance=instance,
         section_code=section_code,
         context_filters=context_row.filters_json,
+        user=request.user,
     )
     return Response(payload)
 
@@ -2706,7 +2684,9 @@ def api_reporting_workspace_section_history(request, instance_uuid, section_code
         return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
     _pack, _section, response_row = _get_cbd_pack_response(instance, section_code)
     revisions = list(
-        response_row.revisions.select_related("author").order_by("-version", "-id")
+        response_row.revisions.select_related("author")
+        .defer("content_snapshot", "delta_json")
+        .order_by("-version", "-id")
     )
     diff_from = request.GET.get("from")
     diff_to = request.GET.get("to")
@@ -2714,19 +2694,17 @@ def api_reporting_workspace_section_history(request, instance_uuid, section_code
     if diff_from and diff_to:
         from_row = next((row for row in revisions if str(row.version) == str(diff_from)), None)
         to_row = next((row for row in revisions if str(row.version) == str(diff_to)), None)
-        if from_row and to_row:
-            from_content = from_row.content_snapshot or {}
-            to_content = to_row.content_snapshot or {}
-            changed_keys = sorted(
-                key
-                for key in set(from_content.keys()) | set(to_content.keys())
-                if from_content.get(key) != to_content.get(key)
-            )
-            diff_payload = {
-                "from_version": from_row.version,
-                "to_version": to_row.version,
-                "changed_keys": changed_keys,
-            }
+        if not from_row or not to_row:
+            return Response({"detail": "Revision not found."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            contents = revision_contents(response_row, [from_row.version, to_row.version])
+        except ValidationError as exc:
+            return Response(_validation_error_payload(exc), status=_validation_error_status(exc))
+        diff_payload = {
+            "from_version": from_row.version,
+            "to_version": to_row.version,
+            "changed_keys": changed_keys(contents[from_row.version], contents[to_row.version]),
+        }
     return Response(
         {
             "section_code": section_code,
@@ -3043,12 +3021,13 @@ def api_reporting_workspace_workflow_action(request, instance_uuid):
     resolved_manifest = []
     if any(str(value or "").strip() for value in context_filters.values()):
         pack = resolve_cbd_pack()
-        for section in pack.sections.filter(is_active=True).order_by("ordering", "code"):
-            rendered = render_section_narrative(
-                instance=instance,
-                section_code=section.code,
-                context_filters=context_filters,
-            )
+        section_codes = pack.sections.filter(is_active=True).order_by("ordering", "code").values_list("code", flat=True)
+        narratives = render_section_narratives(
+            instance=instance,
+            section_codes=section_codes,
+            context_filters=context_filters,
+        )
+        for rendered in narratives.values():
             resolved_manifest.extend(rendered.get("resolved_values_manifest", []))
     try:
         workflow, workflow_action = transition_report_workflow(
@@ -3088,9 +3067,9 @@ def api_reporting_workspace_export_pdf(request, instance_uuid):
     if not _report_export_allowed(request.user, instance):
         return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
     context_filters = _resolve_export_context(instance, request.user, request.GET.get("context"))
-    payload = build_cbd_report_payload(instance=instance)
-    payload, manifest = _attach_context_rendering(payload, instance, context_filters)
-    pdf_bytes = render_cbd_pdf_bytes(payload=payload)
+    render = _start_workspace_export_render(start_cbd_pdf_render, instance, context_filters)
+    pdf_bytes = render()
+    resolved_values_count = render.metadata.get("resolved_values_count", 0)
     artifact = store_report_export_artifact(
         instance=instance,
         generated_by=request.user,
@@ -3098,9 +3077,10 @@ def api_reporting_workspace_export_pdf(request, instance_uuid):
         content_bytes=pdf_bytes,
         metadata={
             "api": "workspace_export_pdf",
+            "generated_at": render.generated_at.isoformat(),
             "report_label": instance.report_label,
             "context_filters": context_filters,
-            "resolved_values_count": len(manifest),
+            "resolved_values_count": resolved_values_count,
         },
     )
     record_audit_event(
@@ -3111,7 +3091,7 @@ def api_reporting_workspace_export_pdf(request, instance_uuid):
             "artifact_uuid": str(artifact.uuid),
             "report_label": instance.report_label,
             "context_filters": context_filters,
-            "resolved_values_count": len(manifest),
+            "resolved_values_count": resolved_values_count,
         },
     )
     download_file_name = f"{instance.report_label.lower()}-report-{instance.uuid}.pdf"
@@ -3160,9 +3140,9 @@ def api_reporting_workspace_export_docx(request, instance_uuid):
     if not _report_export_allowed(request.user, instance):
         return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
     context_filters = _resolve_export_context(instance, request.user, request.GET.get("context"))
-    payload = build_cbd_report_payload(instance=instance)
-    payload, manifest = _attach_context_rendering(payload, instance, context_filters)
-    docx_bytes = render_cbd_docx_bytes(payload=payload)
+    render = _start_workspace_export_render(start_cbd_docx_render, instance, context_filters)
+    docx_bytes = render()
+    resolved_values_count = render.metadata.get("resolved_values_count", 0)
     artifact = store_report_export_artifact(
         instance=instance,
         generated_by=request.user,
@@ -3170,9 +3150,10 @@ def api_reporting_workspace_export_docx(request, instance_uuid):
         content_bytes=docx_bytes,
         metadata={
             "api": "workspace_export_docx",
+            "generated_at": render.generated_at.isoformat(),
             "report_label": instance.report_label,
             "context_filters": context_filters,
-            "resolved_values_count": len(manifest),
+            "resolved_values_count": resolved_values_count,
         },
     )
     record_audit_event(
@@ -3183,7 +3164,7 @@ def api_reporting_workspace_export_docx(request, instance_uuid):
             "artifact_uuid": str(artifact.uuid),
             "report_label": instance.report_label,
             "context_filters": context_filters,
-            "resolved_values_count": len(manifest),
+            "resolved_values_count": resolved_values_count,
         },
     )
     download_file_name = f"{instance.report_label.lower()}-report-{instance.uuid}.docx"
@@ -3409,23 +3390,16 @@ def api_reporting_workspace_create_nr8_from_nr7(request, instance_uuid):
         row.section.code: row
         for row in ReportTemplatePackResponse.objects.filter(reporting_instance=source).select_related("section")
     }
-    pack = resolve_cbd_pack()
-    for section in pack.sections.filter(is_active=True).order_by("ordering", "code"):
+    initial_responses = {}
+    for section in resolve_cbd_pack().sections.filter(is_active=True).order_by("ordering", "code"):
         source_row = source_rows.get(section.code)
         response_json = _deep_clone(source_row.response_json if source_row else build_default_response_payload(section))
         response_json["_carry_forward_from_instance"] = str(source.uuid)
         response_json["_carry_forward_needs_review"] = True
         if section.code == "section-i":
             response_json["report_label"] = "NR8"
-        new_row = ReportTemplatePackResponse.objects.create(
-            reporting_instance=instance,
-            section=section,
-            response_json=response_json,
-            updated_by=request.user if request.user.is_authenticated else None,
-            current_version=1,
-            current_content_hash=payload_hash(response_json),
-        )
-        ensure_initial_revision(section_response=new_row, author=request.user)
+        initial_responses[section.code] = response_json
+    bootstrap_report_workspace(instance, user=request.user, initial_responses=initial_responses)
 
     for row in ReportNarrativeBlock.objects.filter(reporting_instance=source):
         new_block = ensure_narrative_block(
@@ -3672,45 +3646,39 @@ def api_discovery_search(request):
             }
         )
 
-    indicator_qs = _indicator_base_queryset(request.user).filter(
-        Q(code__icontains=search)
-        | Q(title__icontains=search)
-        | Q(computation_notes__icontains=search)
-        | Q(national_target__code__icontains=search)
-        | Q(national_target__title__icontains=search)
+    indicator_qs = search_queryset(_indicator_base_queryset(request.user), search)
+    target_qs = search_queryset(
+        filter_queryset_for_user(
+            NationalTarget.objects.select_related("organisation"),
+            request.user,
+            perm="nbms_app.view_nationaltarget",
+        ),
+        search,
     )
-    target_qs = filter_queryset_for_user(
-        NationalTarget.objects.select_related("organisation"),
-        request.user,
-        perm="nbms_app.view_nationaltarget",
-    ).filter(
-        Q(code__icontains=search)
-        | Q(title__icontains=search)
-        | Q(description__icontains=search)
-    )
-    dataset_qs = filter_queryset_for_user(
-        Dataset.objects.select_related("organisation", "created_by").annotate(
-            latest_release_date=Max("releases__release_date")
+    dataset_qs = search_queryset(
+        filter_queryset_for_user(
+            Dataset.objects.select_related("organisation", "created_by").annotate(
+                latest_release_date=Max("releases__release_date")
+            ),
+            request.user,
+            perm="nbms_app.view_dataset",
         ),
-        request.user,
-        perm="nbms_app.view_dataset",
-    ).filter(
-        Q(dataset_code__icontains=search)
-        | Q(title__icontains=search)
-        | Q(description__icontains=search)
+        search,
     )
 
-    indicator_rows = list(indicator_qs.order_by("title", "code", "uuid")[:limit])
-    target_rows = list(target_qs.order_by("code", "title", "uuid")[:limit])
-    dataset_rows = list(dataset_qs.order_by("title", "dataset_code", "uuid")[:limit])
+    indicator_rows, indicator_total = search_page(indicator_qs.order_by("-search_rank", "title", "code", "uuid"), limit)
+    target_rows, target_total = search_page(target_qs.order_by("-search_rank", "code", "title", "uuid"), limit)
+    dataset_rows, dataset_total = search_page(
+        dataset_qs.order_by("-search_rank", "title", "dataset_code", "uuid"), limit
+    )
 
     return Response(
         {
             "search": search,
             "counts": {
-                "indicators": indicator_qs.count(),
-                "targets": target_qs.count(),
-                "datasets": dataset_qs.count(),
+                "indicators": indicator_total,
+                "targets": target_total,
+                "datasets": dataset_total,
             },
             "indicators": [_indicator_payload(row) for row in indicator_rows],
             "targets": [
@@ -3754,13 +3722,7 @@ def api_indicator_list(request):
 
     q = (request.GET.get("q") or request.GET.get("search") or "").strip()
     if q:
-        queryset = queryset.filter(
-            Q(code__icontains=q)
-            | Q(title__icontains=q)
-            | Q(computation_notes__icontains=q)
-            | Q(national_target__code__icontains=q)
-            | Q(national_target__title__icontains=q)
-        )
+        queryset = search_queryset(queryset, q)
 
     frameworks = _split_csv_param(request.GET.get("framework"))
     if frameworks:
@@ -3918,12 +3880,13 @@ def api_indicator_list(request):
     elif sort == "due_soon":
         queryset = queryset.order_by("-due_soon_ann", "next_expected_update_ann", "-last_updated_on", "title", "uuid")
     elif sort == "relevance" and q:
-        queryset = queryset.order_by("title", "code", "uuid")
+        queryset = queryset.order_by("-search_rank", "title", "code", "uuid")
     else:
         queryset = queryset.order_by("title", "code", "uuid")
 
     queryset = queryset.distinct()
-    total = queryset.count()
+    summary = indicator_explorer_summary(queryset)
+    total = summary["total"]
     page = _parse_positive_int(request.GET.get("page"), 1, minimum=1, maximum=100000)
     page_size = _parse_positive_int(
         request.GET.get("page_size") or request.GET.get("size"),
@@ -3935,37 +3898,6 @@ def api_indicator_list(request):
     end = start + page_size
     rows = list(queryset[start:end])
 
-    facets = {
-        "frameworks": list(
-            IndicatorFrameworkIndicatorLink.objects.filter(indicator__in=queryset, is_active=True)
-            .values("framework_indicator__framework__code")
-            .annotate(total=Count("id"))
-            .order_by("framework_indicator__framework__code")
-        ),
-        "statuses": list(
-            queryset.values("status").annotate(total=Count("id")).order_by("status")
-        ),
-        "sensitivities": list(
-            queryset.values("sensitivity").annotate(total=Count("id")).order_by("sensitivity")
-        ),
-        "method_readiness": list(
-            IndicatorMethodProfile.objects.filter(indicator__in=queryset, is_active=True)
-            .values("readiness_state")
-            .annotate(total=Count("id"))
-            .order_by("readiness_state")
-        ),
-    }
-    readiness_counts = {"red": 0, "amber": 0, "green": 0}
-    for row in queryset.values("readiness_band_ann").annotate(total=Count("id")).order_by("readiness_band_ann"):
-        key = str(row.get("readiness_band_ann") or "").lower()
-        if key in readiness_counts:
-            readiness_counts[key] = row.get("total", 0)
-
-    one_year_ago = timezone.now().date() - timedelta(days=365)
-    missing_approved_method = queryset.filter(method_ready_exists=False).count()
-    no_recent_release = queryset.filter(Q(last_updated_on__isnull=True) | Q(last_updated_on__lt=one_year_ago)).count()
-    no_spatial_output = queryset.filter(has_spatial_ann=False).count()
-    due_soon_count = queryset.filter(due_soon_ann=1).count()
     top_targets = list(
         IndicatorFrameworkIndicatorLink.objects.filter(
             indicator__in=queryset,
@@ -3987,25 +3919,25 @@ def api_indicator_list(request):
             "page": page,
             "page_size": page_size,
             "results": [_indicator_payload(item) for item in rows],
-            "facets": facets,
+            "facets": summary["facets"],
             "summary": {
-                "readiness_bands": readiness_counts,
-                "due_soon_count": due_soon_count,
+                "readiness_bands": summary["readiness_bands"],
+                "due_soon_count": summary["due_soon"],
                 "blockers": [
                     {
                         "code": "missing_approved_method",
                         "label": "Missing approved method",
-                        "count": missing_approved_method,
+                        "count": summary["missing_approved_method"],
                     },
                     {
                         "code": "no_recent_release",
                         "label": "No recent release",
-                        "count": no_recent_release,
+                        "count": summary["no_recent_release"],
                     },
                     {
                         "code": "missing_spatial_output",
                         "label": "No spatial output",
-                        "count": no_spatial_output,
+                        "count": summary["missing_spatial_output"],
                     },
                 ],
                 "top_gbf_targets": [
@@ -4339,6 +4271,34 @@ def api_indicator_series_summary(request, indicator_uuid):
     return Response(build_indicator_series_payload(context))
 
 
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def api_indicator_series_csv(request, indicator_uuid):
+    query_snapshot = {
+        key: request.GET.get(key)
+        for key in ("year_from", "year_to")
+        if (request.GET.get(key) or "").strip()
+    }
+    try:
+        stream = stream_download_record_from_payload(
+            user=request.user,
+            payload={
+                "record_type": "indicator_series",
+                "object_uuid": str(indicator_uuid),
+                "query_snapshot": query_snapshot,
+            },
+        )
+    except PermissionDenied:
+        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    except ValidationError as exc:
+        return Response(_validation_error_payload(exc), status=_validation_error_status(exc))
+    response = StreamingHttpResponse(stream["chunks"], content_type=stream["content_type"])
+    response["Content-Disposition"] = f'attachment; filename="{stream["file_name"]}"'
+    if stream["record"] is not None:
+        response["X-Download-Record"] = str(stream["record"].uuid)
+    return response
+
+
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def api_indicator_map(request, indicator_uuid):
@@ -4479,6 +4439,7 @@ def api_indicator_methods(request, indicator_uuid):
                     "disaggregation_requirements_json": profile.disaggregation_requirements_json,
                     "readiness_state": profile.readiness_state,
                     "readiness_notes": profile.readiness_notes,
+                    "resource_class": profile.resource_class,
                     "last_run_at": profile.last_run_at.isoformat() if profile.last_run_at else None,
                     "last_success_at": profile.last_success_at.isoformat() if profile.last_success_at else None,
                     "recent_runs": [
@@ -4961,6 +4922,9 @@ def api_registry_ecosystems(request):
     threat_category = (request.GET.get("threat_category") or "").strip()
     if threat_category:
         queryset = queryset.filter(risk_assessments__category__iexact=threat_category).distinct()
+    search = (request.GET.get("search") or "").strip()
+    if search:
+        queryset = search_queryset(queryset, search).order_by("-search_rank", "ecosystem_code", "name", "uuid")
 
     page_size = _parse_positive_int(request.GET.get("page_size"), default=25, minimum=1, maximum=100)
     page = _parse_positive_int(request.GET.get("page"), default=1, minimum=1, maximum=10000)
@@ -5090,13 +5054,7 @@ def api_registry_taxa(request):
         queryset = queryset.filter(is_endemic=(endemic == "true"))
     search = (request.GET.get("search") or "").strip()
     if search:
-        queryset = queryset.filter(
-            Q(scientific_name__icontains=search)
-            | Q(canonical_name__icontains=search)
-            | Q(taxon_code__icontains=search)
-            | Q(family__icontains=search)
-            | Q(genus__icontains=search)
-        )
+        queryset = search_queryset(queryset, search).order_by("-search_rank", "scientific_name", "taxon_code")
 
     page_size = _parse_positive_int(request.GET.get("page_size"), default=25, minimum=1, maximum=100)
     page = _parse_positive_int(request.GET.get("page"), default=1, minimum=1, maximum=10000)
@@ -5258,10 +5216,8 @@ def api_registry_ias(request):
         queryset = queryset.filter(seicat_assessments__category=seicat).distinct()
     search = (request.GET.get("search") or "").strip()
     if search:
-        queryset = queryset.filter(
-            Q(taxon__scientific_name__icontains=search)
-            | Q(taxon__canonical_name__icontains=search)
-            | Q(taxon__taxon_code__icontains=search)
+        queryset = search_queryset(queryset, search).order_by(
+            "-search_rank", "taxon__scientific_name", "country_code", "id"
         )
 
     page_size = _parse_positive_int(request.GET.get("page_size"), default=25, minimum=1, maximum=100)
@@ -260,6 +260,11 @@ urlpatterns = [
         api_spa.api_indicator_series_summary,
         name="api_indicator_series_summary",
     ),
+    path(
+        "indicators/<uuid:indicator_uuid>/series.csv",
+        api_spa.api_indicator_series_csv,
+        name="api_indicator_series_csv",
+    ),
     path(
         "indicators/<uuid:indicator_uuid>/map",
         api_spa.api_indicator_map,
@@ -26,16 +26,14 @@ from nbms_app.models import (
     StakeholderInvolvement,
 )
 from nbms_app.services.authorization import filter_queryset_for_user
-from nbms_app.services.consent import consent_is_granted, requires_consent
+from nbms_app.services.export_context import ExportBuildContext
 from nbms_app.services.exports import assert_instance_exportable
 from nbms_app.services.indicator_data import (
     binary_indicator_responses_for_user,
     indicator_data_points_for_user,
     indicator_data_series_for_user,
 )
-from nbms_app.services.instance_approvals import approved_queryset
 from nbms_app.services.export_contracts import validate_ort_nr7_v2_payload_shape
-from nbms_app.services.section_progress import scoped_framework_targets, scoped_national_targets
 
 
 EXPORTER_VERSION = "0.2.0"
@@ -63,7 +61,7 @@ def _section_response_by_code(*, templates, response_map):
 
 
 def _serialize_section_i_content(*, instance, fallback):
-    section = SectionIReportContext.objects.filter(reporting_instance=instance).first()
+    section = SectionIReportContext.objects.filter(reporting_instance=instance).select_related("updated_by").first()
     additional_languages = []
     if section:
         additional_languages = sorted([str(value) for value in section.additional_languages or []])
@@ -96,7 +94,7 @@ def _serialize_section_i_content(*, instance, fallback):
 
 
 def _serialize_section_ii_content(*, instance, fallback):
-    section = SectionIINBSAPStatus.objects.filter(reporting_instance=instance).first()
+    section = SectionIINBSAPStatus.objects.filter(reporting_instance=instance).select_related("updated_by").first()
     stakeholder_groups = []
     if section:
         stakeholder_groups = sorted([str(value) for value in section.stakeholder_groups or []])
@@ -134,7 +132,12 @@ def _serialize_section_ii_content(*, instance, fallback):
 
 
 def _serialize_section_v_content(*, instance, fallback):
-    section = SectionVConclusions.objects.filter(reporting_instance=instance).prefetch_related("evidence_items").first()
+    section = (
+        SectionVConclusions.objects.filter(reporting_instance=instance)
+        .select_related("updated_by")
+        .prefetch_related("evidence_items")
+        .first()
+    )
     evidence_uuids = _sorted_uuid_list(section.evidence_items.all()) if section else []
     return {
         "overall_assessment": section.overall_assessment if section else str(fallback.get("overall_assessment") or ""),
@@ -157,14 +160,14 @@ def _serialize_section_v_content(*, instance, fallback):
     }
 
 
-def _serialize_section_iv_goals(*, instance, user, scoped_framework_targets):
+def _serialize_section_iv_goals(*, instance, user, context):
     goals_qs = filter_queryset_for_user(
         FrameworkGoal.objects.select_related("framework"),
         user,
         perm="nbms_app.view_frameworkgoal",
     ).filter(status=LifecycleStatus.PUBLISHED)
-    if scoped_framework_targets.exists():
-        goal_ids = scoped_framework_targets.values_list("goal_id", flat=True)
+    if context.framework_target_ids():
+        goal_ids = context.scoped_framework_targets().values_list("goal_id", flat=True)
         goals_qs = goals_qs.filter(id__in=goal_ids)
     goal_entries = (
         SectionIVFrameworkGoalProgress.objects.filter(
@@ -235,19 +238,20 @@ def _serialize_binary_group_responses(*, instance, user):
     return payload
 
 
-def _require_referential_integrity(*, instance, user, section_iii_entries, section_iv_entries):
+def _require_referential_integrity(*, instance, user, context, section_iii_entries, section_iv_entries):
     referenced_series = set()
     referenced_binary = set()
     referenced_evidence = set()
     referenced_releases = set()
 
+    # Read the prefetched relations; ``values_list`` would query per entry.
     for entry in list(section_iii_entries) + list(section_iv_entries):
-        referenced_series.update(entry.indicator_data_series.values_list("uuid", flat=True))
-        referenced_binary.update(entry.binary_indicator_responses.values_list("uuid", flat=True))
-        referenced_evidence.update(entry.evidence_items.values_list("uuid", flat=True))
-        referenced_releases.update(entry.dataset_releases.values_list("uuid", flat=True))
+        referenced_series.update(item.uuid for item in entry.indicator_data_series.all())
+        referenced_binary.update(item.uuid for item in entry.binary_indicator_responses.all())
+        referenced_evidence.update(item.uuid for item in entry.evidence_items.all())
+        referenced_releases.update(item.uuid for item in entry.dataset_releases.all())
 
-    approved_indicator_ids = approved_queryset(instance, Indicator).values_list("id", flat=True)
+    approved_indicator_ids = context.approved_queryset(Indicator).values_list("id", flat=True)
     allowed_series = indicator_data_series_for_user(user, instance).filter(
         Q(indicator_id__in=approved_indicator_ids) | Q(indicator__isnull=True)
     )
@@ -257,19 +261,15 @@ def _require_referential_integrity(*, instance, user, section_iii_entries, secti
         binary_indicator_responses_for_user(user, instance).values_list("uuid", flat=True)
     )
 
-    allowed_evidence = filter_queryset_for_user(approved_queryset(instance, Evidence), user)
+    allowed_evidence = filter_queryset_for_user(context.approved_queryset(Evidence), user)
     allowed_evidence_ids = set(allowed_evidence.values_list("uuid", flat=True))
 
-    approved_datasets = filter_queryset_for_user(approved_queryset(instance, Dataset), user)
+    approved_datasets = filter_queryset_for_user(context.approved_queryset(Dataset), user)
     allowed_releases = filter_queryset_for_user(
         DatasetRelease.objects.filter(dataset__in=approved_datasets),
         user,
     )
-    allowed_release_ids = {
-        release.uuid
-        for release in allowed_releases
-        if not requires_consent(release) or consent_is_granted(instance, release)
-    }
+    allowed_release_ids = {release.uuid for release in allowed_releases if context.consent_cleared(release)}
 
     blocked = {}
     blocked_series = sorted(str(uid) for uid in referenced_series if uid not in allowed_series_ids)
@@ -317,8 +317,10 @@ def _serialize_points(points):
     return sorted(payloads, key=lambda item: (item["year"], _stable_json(item["disaggregation"])))
 
 
-def build_ort_nr7_v2_payload(*, instance, user):
-    readiness = assert_instance_exportable(instance, user)
+def build_ort_nr7_v2_payload(*, instance, user, context=None):
+    if context is None:
+        context = ExportBuildContext(instance, user)
+    readiness = assert_instance_exportable(instance, user, context=context)
     templates = _required_templates()
 
     responses = ReportSectionResponse.objects.filter(
@@ -348,8 +350,8 @@ def build_ort_nr7_v2_payload(*, instance, user):
             }
         )
 
-    scoped_targets = scoped_national_targets(instance, user)
-    scoped_framework = scoped_framework_targets(instance, user)
+    scoped_targets = context.scoped_national_targets()
+    scoped_framework = context.scoped_framework_targets()
 
     section_iii_entries = (
         SectionIIINationalTargetProgress.objects.filter(
@@ -383,12 +385,13 @@ def build_ort_nr7_v2_payload(*, instance, user):
     section_iv_goal_payload = _serialize_section_iv_goals(
         instance=instance,
         user=user,
-        scoped_framework_targets=scoped_framework,
+        context=context,
     )
 
     eligibility = _require_referential_integrity(
         instance=instance,
         user=user,
+        context=context,
         section_iii_entries=section_iii_entries,
         section_iv_entries=section_iv_entries,
     )
@@ -513,6 +516,7 @@ def build_ort_nr7_v2_payload(*, instance, user):
         )
 
     binary_qs = BinaryIndicatorResponse.objects.filter(uuid__in=referenced_binary).select_related(
+        "reporting_instance",
         "question",
         "question__framework_indicator",
     )
@@ -21,6 +21,11 @@ class MethodResult:
 
 class BaseIndicatorMethod:
     key = "base"
+    # Batch scheduling hints: the worker slot class the method needs, and whether it
+    # reads or writes the indicator's own data points.
+    resource_class = "light"
+    reads_indicator_data = False
+    writes_indicator_data = False
 
     def run(self, context: MethodContext) -> MethodResult:  # pragma: no cover - interface
         raise NotImplementedError
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from decimal import Decimal
 
-from django.db import connection
+from django.db import transaction
 from django.db.models import Avg
 from django.utils import timezone
 
@@ -22,13 +22,14 @@ from nbms_app.models import (
     MonitoringProgrammeRun,
     SeicatCategory,
     SensitivityLevel,
-    SpatialFeature,
-    SpatialLayer,
     SpatialUnit,
     SpatialUnitType,
     TaxonGoldSummary,
+    disaggregation_hash,
 )
-from nbms_app.spatial_fields import GIS_ENABLED
+from nbms_app.services.spatial_overlay import PROTECTED_LAYER_CODES, PROVINCE_LAYER_CODES, active_layer, get_overlay_cache
+from nbms_app.signals import refresh_derived_rows
+from nbms_app.signals_audit import audit_bulk_save
 
 
 def _resolve_run_year(context):
@@ -39,6 +40,51 @@ def _resolve_run_year(context):
         return timezone.now().year
 
 
+def _bulk_upsert_series_points(series, points, *, update_fields):
+    """
+    Insert or update method output ``points`` of ``series`` in one pass.
+
+    Points are matched to stored rows on ``(year, disaggregation hash,
+    spatial unit)``; matches have ``update_fields`` overwritten, the rest
+    are bulk-inserted. Later points with the same key replace earlier ones.
+    """
+
+    keyed = {}
+    for point in points:
+        point.series = series
+        point.disaggregation_hash = disaggregation_hash(point.disaggregation)
+        keyed[(point.year, point.disaggregation_hash, point.spatial_unit_id)] = point
+    existing = {}
+    for row in IndicatorDataPoint.objects.filter(
+        series=series,
+        year__in={key[0] for key in keyed},
+        disaggregation_hash__in={key[1] for key in keyed},
+    ).order_by("id"):
+        existing.setdefault((row.year, row.disaggregation_hash, row.spatial_unit_id), row)
+
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for key, point in keyed.items():
+        current = existing.get(key)
+        if current is None:
+            to_create.append(point)
+            continue
+        for field in update_fields:
+            setattr(current, field, getattr(point, field))
+        current.updated_at = now
+        to_update.append(current)
+    with transaction.atomic():
+        if to_create:
+            IndicatorDataPoint.objects.bulk_create(to_create)
+            audit_bulk_save(IndicatorDataPoint, to_create, created=True)
+        if to_update:
+            IndicatorDataPoint.objects.bulk_update(to_update, [*update_fields, "updated_at"])
+            audit_bulk_save(IndicatorDataPoint, to_update, created=False)
+    refresh_derived_rows(IndicatorDataPoint, [*to_create, *to_update])
+    return to_create, to_update
+
+
 def _upsert_registry_series_point(*, context, series_code, series_title, unit, value_numeric, disaggregation, footnote):
     series, _ = IndicatorDataSeries.objects.update_or_create(
         series_code=series_code,
@@ -56,16 +102,19 @@ def _upsert_registry_series_point(*, context, series_code, series_title, unit, v
             "export_approved": True,
         },
     )
-    IndicatorDataPoint.objects.update_or_create(
-        series=series,
-        year=_resolve_run_year(context),
-        disaggregation=disaggregation,
-        defaults={
-            "value_numeric": value_numeric,
-            "value_text": "",
-            "source_url": "",
-            "footnote": footnote,
-        },
+    _bulk_upsert_series_points(
+        series,
+        [
+            IndicatorDataPoint(
+                year=_resolve_run_year(context),
+                disaggregation=disaggregation,
+                value_numeric=value_numeric,
+                value_text="",
+                source_url="",
+                footnote=footnote,
+            )
+        ],
+        update_fields=["value_numeric", "value_text", "source_url", "footnote"],
     )
     return series
 
@@ -116,6 +165,7 @@ class BinaryQuestionnaireMethod(BaseIndicatorMethod):
 
 class CsvAggregationMethod(BaseIndicatorMethod):
     key = "csv_import_aggregation"
+    reads_indicator_data = True
 
     def run(self, context):
         points_qs = IndicatorDataPoint.objects.filter(series__indicator=context.indicator).order_by("year", "id")
@@ -146,15 +196,12 @@ class CsvAggregationMethod(BaseIndicatorMethod):
 
 class SpatialOverlayMethod(BaseIndicatorMethod):
     key = "spatial_overlay_area_by_province"
+    resource_class = "postgis"
+    writes_indicator_data = True
 
     def run(self, context):
-        admin_layer_codes = context.params.get("admin_layer_codes") or ["ZA_PROVINCES_NE", "ZA_PROVINCES"]
-        overlay_layer_codes = context.params.get("overlay_layer_codes") or [
-            "ZA_PROTECTED_AREAS_NE",
-            "ZA_PROTECTED_AREAS",
-        ]
-        admin_layer = SpatialLayer.objects.filter(layer_code__in=admin_layer_codes, is_active=True).order_by("id").first()
-        overlay_layer = SpatialLayer.objects.filter(layer_code__in=overlay_layer_codes, is_active=True).order_by("id").first()
+        admin_layer = active_layer(context.params.get("admin_layer_codes") or PROVINCE_LAYER_CODES)
+        overlay_layer = active_layer(context.params.get("overlay_layer_codes") or PROTECTED_LAYER_CODES)
         if not admin_layer or not overlay_layer:
             return MethodResult(
                 status="blocked",
@@ -166,63 +213,12 @@ class SpatialOverlayMethod(BaseIndicatorMethod):
                 error_message="Required spatial layers are missing for overlay computation.",
             )
 
-        province_rows = []
-        if GIS_ENABLED:
-            with connection.cursor() as cursor:  # pragma: no cover
-                cursor.execute(
-                    """
-                    WITH admin AS (
-                        SELECT
-                            sf.feature_key,
-                            COALESCE(NULLIF(sf.province_code, ''), sf.feature_key, sf.feature_id, 'UNKNOWN') AS province_code,
-                            COALESCE(NULLIF(sf.name, ''), sf.feature_key, sf.feature_id, 'Unknown') AS province_name,
-                            COALESCE(sf.geom, ST_SetSRID(ST_GeomFromGeoJSON(sf.geometry_json::text), 4326)) AS geom
-                        FROM nbms_app_spatialfeature sf
-                        WHERE sf.layer_id = %s
-                    ),
-                    overlay_union AS (
-                        SELECT ST_UnaryUnion(ST_Collect(COALESCE(sf.geom, ST_SetSRID(ST_GeomFromGeoJSON(sf.geometry_json::text), 4326)))) AS geom
-                        FROM nbms_app_spatialfeature sf
-                        WHERE sf.layer_id = %s
-                    )
-                    SELECT
-                        a.province_code,
-                        a.province_name,
-                        ROUND((ST_Area(a.geom::geography) / 1000000.0)::numeric, 6) AS province_area_km2,
-                        ROUND(
-                            (
-                                CASE
-                                    WHEN o.geom IS NULL THEN 0
-                                    ELSE ST_Area(ST_Intersection(a.geom, o.geom)::geography) / 1000000.0
-                                END
-                            )::numeric,
-                            6
-                        ) AS protected_area_km2
-                    FROM admin a
-                    CROSS JOIN overlay_union o
-                    WHERE a.geom IS NOT NULL
-                    ORDER BY a.province_code
-                    """,
-                    [admin_layer.id, overlay_layer.id],
-                )
-                province_rows = cursor.fetchall()
-        else:
-            admin_features = SpatialFeature.objects.filter(layer=admin_layer).order_by("province_code", "feature_key")
-            overlay_features = SpatialFeature.objects.filter(layer=overlay_layer).order_by("province_code", "feature_key")
-            overlay_by_province = {}
-            for item in overlay_features:
-                props = item.properties or item.properties_json or {}
-                area = props.get("area_km2") or props.get("area_ha")
-                if area is None:
-                    continue
-                area_km2 = float(area) if "km2" in props else float(area) / 100.0
-                key = item.province_code or "UNKNOWN"
-                overlay_by_province[key] = overlay_by_province.get(key, 0.0) + area_km2
-            for item in admin_features:
-                props = item.properties or item.properties_json or {}
-                province_area = float(props.get("area_km2") or 0.0)
-                key = item.province_code or "UNKNOWN"
-                province_rows.append((key, item.name or key, province_area, overlay_by_province.get(key, 0.0)))
+        overlay_cache = get_overlay_cache(admin_layer, overlay_layer)
+        province_rows = list(
+            overlay_cache.units.order_by("unit_code", "id").values_list(
+                "unit_code", "unit_name", "unit_area_km2", "overlay_area_km2"
+            )
+        )
 
         if not province_rows:
             return MethodResult(
@@ -271,26 +267,25 @@ class SpatialOverlayMethod(BaseIndicatorMethod):
         )
 
         output_rows = []
+        points = []
         for province_code, province_name, area_km2, protected_km2 in province_rows:
             area_value = float(area_km2 or 0.0)
             protected_value = float(protected_km2 or 0.0)
             coverage_pct = round((protected_value / area_value) * 100.0, 6) if area_value > 0 else 0.0
-            unit = unit_map.get(province_code)
-            IndicatorDataPoint.objects.update_or_create(
-                series=series,
-                year=now_year,
-                disaggregation={"province_code": province_code, "province_name": province_name},
-                spatial_unit=unit,
-                spatial_layer=overlay_layer,
-                defaults={
-                    "value_numeric": coverage_pct,
-                    "value_text": "",
-                    "spatial_resolution": "province",
-                    "dataset_release": dataset_release,
-                    "programme_run": programme_run,
-                    "source_url": "",
-                    "footnote": "Computed via NBMS spatial overlay method.",
-                },
+            points.append(
+                IndicatorDataPoint(
+                    year=now_year,
+                    disaggregation={"province_code": province_code, "province_name": province_name},
+                    spatial_unit=unit_map.get(province_code),
+                    spatial_layer=overlay_layer,
+                    value_numeric=coverage_pct,
+                    value_text="",
+                    spatial_resolution="province",
+                    dataset_release=dataset_release,
+                    programme_run=programme_run,
+                    source_url="",
+                    footnote="Computed via NBMS spatial overlay method.",
+                )
             )
             output_rows.append(
                 {
@@ -301,6 +296,20 @@ class SpatialOverlayMethod(BaseIndicatorMethod):
                     "coverage_percent": coverage_pct,
                 }
             )
+        _bulk_upsert_series_points(
+            series,
+            points,
+            update_fields=[
+                "spatial_layer",
+                "value_numeric",
+                "value_text",
+                "spatial_resolution",
+                "dataset_release",
+                "programme_run",
+                "source_url",
+                "footnote",
+            ],
+        )
 
         return MethodResult(
             status="succeeded",
@@ -309,6 +318,7 @@ class SpatialOverlayMethod(BaseIndicatorMethod):
                 "indicator_code": context.indicator.code,
                 "admin_layer_code": admin_layer.layer_code,
                 "overlay_layer_code": overlay_layer.layer_code,
+                "overlay_inputs_hash": overlay_cache.inputs_hash,
                 "series_uuid": str(series.uuid),
                 "year": now_year,
                 "programme_run_uuid": str(programme_run.uuid) if programme_run else None,
@@ -320,6 +330,7 @@ class SpatialOverlayMethod(BaseIndicatorMethod):
 
 class BirdieApiConnectorMethod(BaseIndicatorMethod):
     key = "birdie_api_connector"
+    reads_indicator_data = True
 
     def run(self, context):
         points_qs = IndicatorDataPoint.objects.filter(
@@ -355,6 +366,7 @@ class BirdieApiConnectorMethod(BaseIndicatorMethod):
 
 class EcosystemRegistrySummaryMethod(BaseIndicatorMethod):
     key = "ecosystem_registry_summary"
+    writes_indicator_data = True
 
     def run(self, context):
         snapshot = (
@@ -421,6 +433,7 @@ class EcosystemRegistrySummaryMethod(BaseIndicatorMethod):
 
 class IasRegistryPressureMethod(BaseIndicatorMethod):
     key = "ias_registry_pressure_index"
+    writes_indicator_data = True
 
     def run(self, context):
         snapshot = IASGoldSummary.objects.order_by("-snapshot_date").values_list("snapshot_date", flat=True).first()
@@ -479,6 +492,7 @@ class IasRegistryPressureMethod(BaseIndicatorMethod):
 
 class TaxonRegistryPopulationMethod(BaseIndicatorMethod):
     key = "taxon_registry_native_voucher_ratio"
+    writes_indicator_data = True
 
     def run(self, context):
         snapshot = TaxonGoldSummary.objects.order_by("-snapshot_date").values_list("snapshot_date", flat=True).first()
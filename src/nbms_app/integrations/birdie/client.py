@@ -2,11 +2,18 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
+import queue
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Iterator
+from urllib.parse import urlencode, urljoin, urlsplit
 
 from django.conf import settings
-from django.core.cache import cache
 
 try:
     import requests
@@ -15,6 +22,75 @@ except Exception:  # pragma: no cover
 
 
 FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures_seed.json"
+SNAPSHOT_ENDPOINTS = ["species", "sites", "abundance_trends", "occupancy_predictions", "wcv_scores"]
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Pages buffered per endpoint while ``stream_many`` waits for the caller to reach it.
+STREAM_BUFFER_PAGES = 4
+
+
+class BirdieRequestError(RuntimeError):
+    pass
+
+
+class BirdieResponseCache:
+    """
+    On-disk cache of BIRDIE response bodies and their validators.
+
+    Each request URL maps to a ``<key>.json`` body and a ``<key>.meta.json``
+    holding the ``ETag``/``Last-Modified`` values sent back as conditional
+    request headers, so unchanged pages come back as ``304`` and are served
+    from disk across processes and runs.
+    """
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / f"{key}.json", self.root / f"{key}.meta.json"
+
+    def validators(self, url: str) -> dict[str, str]:
+        body_path, meta_path = self._paths(url)
+        if not body_path.exists() or not meta_path.exists():
+            return {}
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url: str):
+        body_path, _meta_path = self._paths(url)
+        return json.loads(body_path.read_text(encoding="utf-8"))
+
+    def discard(self, url: str) -> None:
+        for path in self._paths(url):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def store(self, url: str, payload, *, etag: str = "", last_modified: str = "") -> None:
+        body_path, meta_path = self._paths(url)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._write_atomic(body_path, json.dumps(payload))
+        self._write_atomic(meta_path, json.dumps({"url": url, "etag": etag, "last_modified": last_modified}))
+
+    def _write_atomic(self, path: Path, text: str) -> None:
+        handle, temp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as stream:
+                stream.write(text)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
 
 
 class BirdieClient:
@@ -23,45 +99,166 @@ class BirdieClient:
         self.token = getattr(settings, "BIRDIE_API_TOKEN", "") or ""
         self.timeout = int(getattr(settings, "BIRDIE_TIMEOUT_SECONDS", 20) or 20)
         self.use_fixture = bool(getattr(settings, "BIRDIE_USE_FIXTURE", True))
+        self.max_retries = max(int(getattr(settings, "BIRDIE_MAX_RETRIES", 3) or 1), 1)
+        self.backoff_seconds = float(getattr(settings, "BIRDIE_BACKOFF_SECONDS", 0.5) or 0)
+        self.max_workers = max(int(getattr(settings, "BIRDIE_MAX_WORKERS", 4) or 1), 1)
+        self.page_size = int(getattr(settings, "BIRDIE_PAGE_SIZE", 500) or 0)
+        cache_dir = getattr(settings, "BIRDIE_CACHE_DIR", "") or ""
+        self.response_cache = BirdieResponseCache(cache_dir) if cache_dir else None
 
-    def _cache_key(self, endpoint: str, params: dict[str, Any] | None):
-        blob = json.dumps({"endpoint": endpoint, "params": params or {}}, sort_keys=True)
-        return f"birdie:{hashlib.sha256(blob.encode('utf-8')).hexdigest()}"
+    def _headers(self):
+        headers = {"Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
 
-    def _request_json(self, endpoint: str, params: dict[str, Any] | None = None):
-        cache_key = self._cache_key(endpoint, params)
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return cached
+    def _get(self, session, url: str, *, revalidate: bool = True):
+        headers = self._headers()
+        if self.response_cache and revalidate:
+            headers.update(self.response_cache.validators(url))
+        errors = []
+        for attempt in range(self.max_retries):
+            if attempt and self.backoff_seconds:
+                time.sleep(self.backoff_seconds * (2 ** (attempt - 1)))
+            try:
+                response = session.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as exc:
+                errors.append(str(exc))
+                continue
+            if response.status_code == 304 and self.response_cache:
+                try:
+                    return self.response_cache.load(url)
+                except (OSError, ValueError):
+                    # A missing or corrupt cached body: drop it and fetch the page afresh.
+                    self.response_cache.discard(url)
+                    return self._get(session, url, revalidate=False)
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                errors.append(f"{response.status_code} for {url}")
+                continue
+            try:
+                response.raise_for_status()
+                payload = response.json()
+            except (requests.RequestException, ValueError) as exc:
+                raise BirdieRequestError(str(exc)) from exc
+            if self.response_cache:
+                self.response_cache.store(
+                    url,
+                    payload,
+                    etag=response.headers.get("ETag", ""),
+                    last_modified=response.headers.get("Last-Modified", ""),
+                )
+            return payload
+        raise BirdieRequestError("; ".join(errors))
 
+    def _first_page_url(self, endpoint: str) -> str:
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if self.page_size:
+            url = f"{url}?{urlencode({'page': 1, 'page_size': self.page_size})}"
+        return url
+
+    def _next_page_url(self, next_url: str) -> str:
+        # The bearer token goes with every request, so only follow links back to the configured host.
+        url = urljoin(f"{self.base_url}/", next_url)
+        base = urlsplit(self.base_url)
+        target = urlsplit(url)
+        if (target.scheme, target.netloc) != (base.scheme, base.netloc):
+            raise BirdieRequestError(f"Refusing to follow a next link off {base.netloc}: {url}")
+        return url
+
+    def _iter_remote_pages(self, endpoint: str) -> Iterator[list]:
+        # Pages are either a bare list (unpaged endpoint) or an object with
+        # ``results`` and a ``next`` link. The next page is requested in the
+        # background while the caller processes the current one.
+        with requests.Session() as session, ThreadPoolExecutor(max_workers=1) as prefetch:
+            pending = prefetch.submit(self._get, session, self._first_page_url(endpoint))
+            while pending is not None:
+                payload = pending.result()
+                pending = None
+                if isinstance(payload, dict):
+                    next_url = payload.get("next")
+                    if next_url:
+                        pending = prefetch.submit(self._get, session, self._next_page_url(next_url))
+                    yield list(payload.get("results") or [])
+                else:
+                    yield list(payload or [])
+
+    def iter_pages(self, endpoint: str) -> Iterator[list]:
         if self.base_url and requests:
-            headers = {"Accept": "application/json"}
-            if self.token:
-                headers["Authorization"] = f"Bearer {self.token}"
-            errors = []
-            for _ in range(3):
+            pages = self._iter_remote_pages(endpoint)
+            try:
+                first = next(pages, [])
+            except BirdieRequestError:
+                if not self.use_fixture:
+                    raise
+            else:
+                yield first
+                yield from pages
+                return
+        yield self.fixture_payload().get(endpoint, [])
+
+    def iter_rows(self, endpoint: str) -> Iterator[dict]:
+        for page in self.iter_pages(endpoint):
+            yield from page
+
+    def _request_json(self, endpoint: str):
+        return list(self.iter_rows(endpoint))
+
+    @contextmanager
+    def stream_many(self, endpoints: list[str]):
+        """
+        Page through ``endpoints`` concurrently, yielding ``{endpoint: page iterator}``.
+
+        Each endpoint downloads on its own worker into a buffer of
+        ``STREAM_BUFFER_PAGES`` pages, so later endpoints are fetched while the
+        caller works through earlier ones. Workers start in ``endpoints`` order
+        and at most ``BIRDIE_MAX_WORKERS`` run at once, so the iterators must be
+        consumed in that order. Leaving the block stops every worker.
+        """
+
+        stop = threading.Event()
+        buffers = {endpoint: queue.Queue(maxsize=STREAM_BUFFER_PAGES) for endpoint in endpoints}
+
+        def _put(buffer, item):
+            while not stop.is_set():
                 try:
-                    response = requests.get(
-                        f"{self.base_url}/{endpoint.lstrip('/')}",
-                        params=params or {},
-                        headers=headers,
-                        timeout=self.timeout,
-                    )
-                    response.raise_for_status()
-                    payload = response.json()
-                    cache.set(cache_key, payload, timeout=900)
-                    return payload
-                except Exception as exc:  # noqa: BLE001
-                    errors.append(str(exc))
-            if not self.use_fixture:
-                raise RuntimeError("; ".join(errors))
-
-        fixture = self.fixture_payload()
-        if endpoint in fixture:
-            payload = fixture[endpoint]
-            cache.set(cache_key, payload, timeout=900)
-            return payload
-        return []
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _produce(endpoint):
+            buffer = buffers[endpoint]
+            pages = self.iter_pages(endpoint)
+            try:
+                for page in pages:
+                    if not _put(buffer, (page, None)):
+                        return
+            except Exception as exc:  # noqa: BLE001
+                # Re-raised in the consuming thread.
+                _put(buffer, (None, exc))
+                return
+            finally:
+                pages.close()
+            _put(buffer, (None, None))
+
+        def _consume(endpoint):
+            while True:
+                page, error = buffers[endpoint].get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                yield page
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(endpoints) or 1))
+        try:
+            for endpoint in endpoints:
+                executor.submit(_produce, endpoint)
+            yield {endpoint: _consume(endpoint) for endpoint in endpoints}
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
 
     def fixture_payload(self):
         return json.loads(FIXTURE_PATH.read_text(encoding="utf-8"))
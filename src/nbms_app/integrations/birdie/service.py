@@ -6,9 +6,11 @@ from collections import defaultdict
 from datetime import date
 from decimal import Decimal
 
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models import Avg
+from django.utils import timezone
 
-from nbms_app.integrations.birdie.client import BirdieClient
+from nbms_app.integrations.birdie.client import SNAPSHOT_ENDPOINTS, BirdieClient
 from nbms_app.models import (
     BirdieModelOutput,
     BirdieSite,
@@ -41,6 +43,8 @@ from nbms_app.models import (
     SpatialLayerSourceType,
     UpdateFrequency,
 )
+from nbms_app.signals import refresh_derived_rows
+from nbms_app.signals_audit import audit_bulk_save
 
 
 BIRDIE_INDICATOR_SPECS = [
@@ -79,20 +83,117 @@ def _payload_hash(payload):
     return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
 
 
-def _upsert_integration_asset(*, layer, dataset_key, record_key, payload, endpoint):
-    IntegrationDataAsset.objects.update_or_create(
-        source_system="BIRDIE",
-        layer=layer,
-        dataset_key=dataset_key,
-        record_key=record_key,
-        defaults={
-            "payload_json": payload,
-            "payload_hash": _payload_hash(payload),
-            "source_endpoint": endpoint,
-            "source_version": str(payload.get("model_version", "")) if isinstance(payload, dict) else "",
-            "is_restricted": False,
-        },
-    )
+BULK_BATCH_SIZE = 500
+
+
+def _fingerprint_value(value):
+    if isinstance(value, models.Model):
+        return value.pk
+    if isinstance(value, Decimal):
+        return str(value.normalize())
+    return value
+
+
+def _fingerprint(values):
+    blob = {key: _fingerprint_value(value) for key, value in values.items()}
+    return hashlib.sha256(json.dumps(blob, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class _BulkUpsert:
+    """
+    Stage keyed rows for one model and write only the ones whose content changed.
+
+    Existing rows are loaded once; each staged row is compared with the stored
+    row by a hash of its ``defaults`` and is skipped when unchanged, otherwise it
+    is queued for ``bulk_create``/``bulk_update``. ``prepare`` mirrors any
+    normalisation the model performs in ``save()``.
+    """
+
+    def __init__(self, model, queryset, key_fields, *, prepare=None):
+        self.model = model
+        self.key_fields = key_fields
+        self.prepare = prepare
+        self.existing = {}
+        for obj in queryset:
+            self.existing.setdefault(self._key_of(obj), obj)
+        self.instances = {}
+        self.to_create = []
+        self.to_update = []
+        self.update_fields = set()
+        self.skipped = 0
+        self._pending = set()
+
+    def _key_of(self, obj):
+        return tuple(getattr(obj, self.model._meta.get_field(name).attname) for name in self.key_fields)
+
+    def stage(self, lookup, defaults):
+        key = tuple(_fingerprint_value(lookup[name]) for name in self.key_fields)
+        obj = self.instances.get(key) or self.existing.get(key)
+        if obj is None:
+            obj = self.model(**lookup, **defaults)
+            if self.prepare:
+                self.prepare(obj)
+            self.to_create.append(obj)
+            self._pending.add(id(obj))
+        else:
+            current = {name: getattr(obj, self.model._meta.get_field(name).attname) for name in defaults}
+            if _fingerprint(current) != _fingerprint(defaults):
+                for name, value in defaults.items():
+                    setattr(obj, name, value)
+                if self.prepare:
+                    self.prepare(obj)
+                self.update_fields.update(defaults)
+                if id(obj) not in self._pending:
+                    self.to_update.append(obj)
+                    self._pending.add(id(obj))
+            elif id(obj) not in self._pending and key not in self.instances:
+                self.skipped += 1
+        self.instances[key] = obj
+        return obj
+
+    def flush(self):
+        if self.to_create:
+            self.model.objects.bulk_create(self.to_create, batch_size=BULK_BATCH_SIZE)
+            audit_bulk_save(self.model, self.to_create, created=True)
+        if self.to_update:
+            now = timezone.now()
+            for obj in self.to_update:
+                obj.updated_at = now
+            fields = sorted(self.update_fields | {"updated_at"})
+            if self.prepare:
+                fields = [field.name for field in self.model._meta.concrete_fields if not field.primary_key]
+            self.model.objects.bulk_update(self.to_update, fields, batch_size=BULK_BATCH_SIZE)
+            audit_bulk_save(self.model, self.to_update, created=False)
+        if self.to_create or self.to_update:
+            refresh_derived_rows(self.model, [*self.to_create, *self.to_update])
+        return self
+
+    def get(self, *key):
+        return self.instances.get(key)
+
+    def summary(self):
+        return {"inserted": len(self.to_create), "updated": len(self.to_update), "skipped": self.skipped}
+
+
+class _IntegrationAssets:
+    def __init__(self):
+        self.upsert = _BulkUpsert(
+            IntegrationDataAsset,
+            IntegrationDataAsset.objects.filter(source_system="BIRDIE"),
+            ["source_system", "layer", "dataset_key", "record_key"],
+        )
+
+    def stage(self, *, layer, dataset_key, record_key, payload, endpoint):
+        self.upsert.stage(
+            {"source_system": "BIRDIE", "layer": layer, "dataset_key": dataset_key, "record_key": record_key},
+            {
+                "payload_json": payload,
+                "payload_hash": _payload_hash(payload),
+                "source_endpoint": endpoint,
+                "source_version": str(payload.get("model_version", "")) if isinstance(payload, dict) else "",
+                "is_restricted": False,
+            },
+        )
 
 
 def _get_or_create_org():
@@ -133,58 +234,31 @@ def _get_or_create_national_target(*, org, code):
 
 @transaction.atomic
 def ingest_birdie_snapshot(*, actor=None):
-    client = BirdieClient()
+    # Every endpoint downloads concurrently while the earlier ones are staged.
+    with BirdieClient().stream_many(SNAPSHOT_ENDPOINTS) as streams:
+        return _ingest_snapshot_streams(streams, actor=actor)
+
+
+def _ingest_snapshot_streams(streams, *, actor):
     source_meta = {
         "source": "BIRDIE",
         "fetched_at": date.today().isoformat(),
     }
-    species_rows = client.fetch_species_list()
-    site_rows = client.fetch_site_list()
-    abundance_rows = client.fetch_abundance_trends()
-    occupancy_rows = client.fetch_occupancy_predictions()
-    wcv_rows = client.fetch_wcv_scores()
-
-    _upsert_integration_asset(
-        layer=IntegrationDataLayer.BRONZE,
-        dataset_key="species",
-        record_key="snapshot",
-        payload={"rows": species_rows, **source_meta},
-        endpoint="species",
-    )
-    _upsert_integration_asset(
-        layer=IntegrationDataLayer.BRONZE,
-        dataset_key="sites",
-        record_key="snapshot",
-        payload={"rows": site_rows, **source_meta},
-        endpoint="sites",
-    )
-    _upsert_integration_asset(
-        layer=IntegrationDataLayer.BRONZE,
-        dataset_key="abundance_trends",
-        record_key="snapshot",
-        payload={"rows": abundance_rows, **source_meta},
-        endpoint="abundance_trends",
-    )
-    _upsert_integration_asset(
-        layer=IntegrationDataLayer.BRONZE,
-        dataset_key="occupancy_predictions",
-        record_key="snapshot",
-        payload={"rows": occupancy_rows, **source_meta},
-        endpoint="occupancy_predictions",
-    )
-    _upsert_integration_asset(
-        layer=IntegrationDataLayer.BRONZE,
-        dataset_key="wcv_scores",
-        record_key="snapshot",
-        payload={"rows": wcv_rows, **source_meta},
-        endpoint="wcv_scores",
-    )
-
-    species_lookup = {}
-    for row in species_rows:
-        species, _ = BirdieSpecies.objects.update_or_create(
-            species_code=row["species_code"],
-            defaults={
+    snapshot_rows = {endpoint: [] for endpoint in SNAPSHOT_ENDPOINTS}
+    assets = _IntegrationAssets()
+
+    def _pages(endpoint):
+        # Pages are staged as they arrive; the rows are also kept for the
+        # bronze snapshot asset.
+        for page in streams[endpoint]:
+            snapshot_rows[endpoint].extend(page)
+            yield page
+
+    species_upsert = _BulkUpsert(BirdieSpecies, BirdieSpecies.objects.all(), ["species_code"])
+    for row in (row for page in _pages("species") for row in page):
+        species_upsert.stage(
+            {"species_code": row["species_code"]},
+            {
                 "common_name": row.get("common_name", row["species_code"]),
                 "scientific_name": row.get("scientific_name", ""),
                 "guild": row.get("guild", ""),
@@ -193,20 +267,20 @@ def ingest_birdie_snapshot(*, actor=None):
                 "is_restricted": False,
             },
         )
-        species_lookup[species.species_code] = species
-        _upsert_integration_asset(
+        assets.stage(
             layer=IntegrationDataLayer.SILVER,
             dataset_key="species",
-            record_key=species.species_code,
+            record_key=row["species_code"],
             payload=row,
             endpoint="species",
         )
+    species_upsert.flush()
 
-    site_lookup = {}
-    for row in site_rows:
-        site, _ = BirdieSite.objects.update_or_create(
-            site_code=row["site_code"],
-            defaults={
+    site_upsert = _BulkUpsert(BirdieSite, BirdieSite.objects.all(), ["site_code"])
+    for row in (row for page in _pages("sites") for row in page):
+        site_upsert.stage(
+            {"site_code": row["site_code"]},
+            {
                 "site_name": row.get("site_name", row["site_code"]),
                 "province_code": row.get("province_code", ""),
                 "convention_type": row.get("convention_type", ""),
@@ -216,14 +290,16 @@ def ingest_birdie_snapshot(*, actor=None):
                 "is_restricted": False,
             },
         )
-        site_lookup[site.site_code] = site
-        _upsert_integration_asset(
+        assets.stage(
             layer=IntegrationDataLayer.SILVER,
             dataset_key="sites",
-            record_key=site.site_code,
+            record_key=row["site_code"],
             payload=row,
             endpoint="sites",
         )
+    site_upsert.flush()
+    species_lookup = {key[0]: obj for key, obj in species_upsert.instances.items()}
+    site_lookup = {key[0]: obj for key, obj in site_upsert.instances.items()}
 
     org = _get_or_create_org()
     framework, _ = Framework.objects.get_or_create(
@@ -297,17 +373,23 @@ def ingest_birdie_snapshot(*, actor=None):
         )
         indicator_lookup[spec["metric_code"]] = indicator
 
+    metric_codes = [spec["metric_code"] for spec in BIRDIE_INDICATOR_SPECS]
+    output_upsert = _BulkUpsert(
+        BirdieModelOutput,
+        BirdieModelOutput.objects.filter(metric_code__in=metric_codes),
+        ["metric_code", "site", "species", "year"],
+    )
+
     def _upsert_output(metric_code, row, value_numeric=None, value_text="", value_json=None):
-        site = site_lookup.get(row.get("site_code"))
-        species = species_lookup.get(row.get("species_code"))
-        indicator = indicator_lookup.get(metric_code)
-        output, _ = BirdieModelOutput.objects.update_or_create(
-            metric_code=metric_code,
-            site=site,
-            species=species,
-            year=int(row["year"]),
-            defaults={
-                "indicator": indicator,
+        output_upsert.stage(
+            {
+                "metric_code": metric_code,
+                "site": site_lookup.get(row.get("site_code")),
+                "species": species_lookup.get(row.get("species_code")),
+                "year": int(row["year"]),
+            },
+            {
+                "indicator": indicator_lookup.get(metric_code),
                 "value_numeric": value_numeric,
                 "value_text": value_text,
                 "value_json": value_json or {},
@@ -316,7 +398,7 @@ def ingest_birdie_snapshot(*, actor=None):
                 "is_restricted": False,
             },
         )
-        _upsert_integration_asset(
+        assets.stage(
             layer=IntegrationDataLayer.GOLD,
             dataset_key=metric_code,
             record_key=f"{row.get('site_code', 'NA')}:{row.get('species_code', 'NA')}:{row['year']}",
@@ -331,18 +413,19 @@ def ingest_birdie_snapshot(*, actor=None):
             },
             endpoint=metric_code,
         )
-        return output
 
-    for row in abundance_rows:
+    richness_by_site_year = defaultdict(set)
+    for row in (row for page in _pages("abundance_trends") for row in page):
         _upsert_output(
             "waterbird_abundance_trend",
             row,
             value_numeric=Decimal(str(row.get("value") or 0)),
             value_json={"site_code": row.get("site_code"), "species_code": row.get("species_code")},
         )
+        richness_by_site_year[(row.get("site_code"), int(row["year"]))].add(row.get("species_code"))
 
     occupancy_by_species = defaultdict(lambda: defaultdict(list))
-    for row in occupancy_rows:
+    for row in (row for page in _pages("occupancy_predictions") for row in page):
         psi_value = Decimal(str(row.get("psi") or 0))
         _upsert_output(
             "occupancy_change_signal",
@@ -352,9 +435,6 @@ def ingest_birdie_snapshot(*, actor=None):
         )
         occupancy_by_species[row.get("species_code")][int(row["year"])].append(float(psi_value))
 
-    richness_by_site_year = defaultdict(set)
-    for row in abundance_rows:
-        richness_by_site_year[(row.get("site_code"), int(row["year"]))].add(row.get("species_code"))
     for (site_code, year), species_codes in richness_by_site_year.items():
         _upsert_output(
             "species_richness_trend",
@@ -363,7 +443,7 @@ def ingest_birdie_snapshot(*, actor=None):
             value_json={"species_codes": sorted(species_codes)},
         )
 
-    for row in wcv_rows:
+    for row in (row for page in _pages("wcv_scores") for row in page):
         _upsert_output(
             "waterbird_conservation_value",
             row,
@@ -371,6 +451,16 @@ def ingest_birdie_snapshot(*, actor=None):
             value_text=row.get("category", ""),
             value_json={"category": row.get("category", "")},
         )
+    output_upsert.flush()
+
+    for endpoint in SNAPSHOT_ENDPOINTS:
+        assets.stage(
+            layer=IntegrationDataLayer.BRONZE,
+            dataset_key=endpoint,
+            record_key="snapshot",
+            payload={"rows": snapshot_rows[endpoint], **source_meta},
+            endpoint=endpoint,
+        )
 
     programme, _ = MonitoringProgramme.objects.update_or_create(
         programme_code="NBMS-BIRDIE-INTEGRATION",
@@ -422,20 +512,26 @@ def ingest_birdie_snapshot(*, actor=None):
         )
         series_map[spec["metric_code"]] = series
 
-    aggregates = defaultdict(lambda: defaultdict(list))
-    for item in BirdieModelOutput.objects.filter(metric_code__in=[spec["metric_code"] for spec in BIRDIE_INDICATOR_SPECS]):
-        if item.value_numeric is not None:
-            aggregates[item.metric_code][item.year].append(float(item.value_numeric))
-
-    for metric_code, year_map in aggregates.items():
-        series = series_map[metric_code]
-        for year, values in sorted(year_map.items()):
-            numeric_mean = Decimal(str(round(sum(values) / len(values), 6)))
-            IndicatorDataPoint.objects.update_or_create(
-                series=series,
-                year=year,
-                defaults={"value_numeric": numeric_mean, "disaggregation": {"geography": "national", "source": "BIRDIE"}},
-            )
+    aggregates = (
+        BirdieModelOutput.objects.filter(metric_code__in=metric_codes, value_numeric__isnull=False)
+        .values("metric_code", "year")
+        .annotate(mean=Avg("value_numeric"))
+        .order_by("metric_code", "year")
+    )
+    point_upsert = _BulkUpsert(
+        IndicatorDataPoint,
+        IndicatorDataPoint.objects.filter(series__in=series_map.values()).order_by("id"),
+        ["series", "year"],
+    )
+    for row in aggregates:
+        point_upsert.stage(
+            {"series": series_map[row["metric_code"]], "year": row["year"]},
+            {
+                "value_numeric": Decimal(str(round(float(row["mean"]), 6))),
+                "disaggregation": {"geography": "national", "source": "BIRDIE"},
+            },
+        )
+    point_upsert.flush()
 
     occupancy_layer, _ = SpatialLayer.objects.update_or_create(
         layer_code="BIRDIE_OCCUPANCY_SITES",
@@ -453,7 +549,13 @@ def ingest_birdie_snapshot(*, actor=None):
             "default_style_json": {"circleColor": "#2f8f67", "circleRadius": 6, "circleOpacity": 0.8},
         },
     )
-    for row in occupancy_rows:
+    feature_upsert = _BulkUpsert(
+        SpatialFeature,
+        SpatialFeature.objects.filter(layer=occupancy_layer),
+        ["layer", "feature_key"],
+        prepare=SpatialFeature.normalise_fields,
+    )
+    for row in snapshot_rows["occupancy_predictions"]:
         site = site_lookup.get(row.get("site_code"))
         if not site or site.longitude is None or site.latitude is None:
             continue
@@ -472,10 +574,9 @@ def ingest_birdie_snapshot(*, actor=None):
                 ]
             ],
         }
-        SpatialFeature.objects.update_or_create(
-            layer=occupancy_layer,
-            feature_key=f"{site.site_code}:{row.get('species_code')}:{row.get('year')}",
-            defaults={
+        feature_upsert.stage(
+            {"layer": occupancy_layer, "feature_key": f"{site.site_code}:{row.get('species_code')}:{row.get('year')}"},
+            {
                 "feature_id": f"{site.site_code}:{row.get('species_code')}:{row.get('year')}",
                 "name": f"{site.site_name} {row.get('species_code')} {row.get('year')}",
                 "province_code": site.province_code,
@@ -494,13 +595,27 @@ def ingest_birdie_snapshot(*, actor=None):
                 "geometry_json": geometry,
             },
         )
-
+    feature_upsert.flush()
+    assets.upsert.flush()
+
+    changes = {
+        "species": species_upsert.summary(),
+        "sites": site_upsert.summary(),
+        "model_outputs": output_upsert.summary(),
+        "data_points": point_upsert.summary(),
+        "spatial_features": feature_upsert.summary(),
+        "integration_assets": assets.upsert.summary(),
+    }
     return {
-        "species_count": len(species_rows),
-        "site_count": len(site_rows),
-        "abundance_row_count": len(abundance_rows),
-        "occupancy_row_count": len(occupancy_rows),
-        "wcv_row_count": len(wcv_rows),
+        "species_count": len(snapshot_rows["species"]),
+        "site_count": len(snapshot_rows["sites"]),
+        "abundance_row_count": len(snapshot_rows["abundance_trends"]),
+        "occupancy_row_count": len(snapshot_rows["occupancy_predictions"]),
+        "wcv_row_count": len(snapshot_rows["wcv_scores"]),
         "programme_code": programme.programme_code,
         "indicator_codes": sorted(spec["code"] for spec in BIRDIE_INDICATOR_SPECS),
+        "changes": changes,
+        "totals": {
+            state: sum(counts[state] for counts in changes.values()) for state in ("inserted", "updated", "skipped")
+        },
     }
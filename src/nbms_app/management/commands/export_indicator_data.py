@@ -1,10 +1,9 @@
-import csv
-import json
 from pathlib import Path
 
 from django.core.management.base import BaseCommand
 
-from nbms_app.models import IndicatorDataPoint
+from nbms_app.models import IndicatorDataPoint, IndicatorDataSeries
+from nbms_app.services.csv_streaming import DEFAULT_QUERY_CHUNK_SIZE, iter_csv_chunks, json_cell, write_chunks
 
 
 FIELDNAMES = [
@@ -32,6 +31,61 @@ FIELDNAMES = [
 ]
 
 
+def _series_columns(series_ids):
+    rows = IndicatorDataSeries.objects.filter(id__in=series_ids).values_list(
+        "id",
+        "uuid",
+        "framework_indicator__framework__code",
+        "framework_indicator__code",
+        "indicator__uuid",
+        "indicator__code",
+        "title",
+        "unit",
+        "value_type",
+        "methodology",
+        "disaggregation_schema",
+        "source_notes",
+        "status",
+        "sensitivity",
+        "export_approved",
+    )
+    columns = {}
+    for (
+        series_id,
+        uuid,
+        framework_code,
+        framework_indicator_code,
+        indicator_uuid,
+        indicator_code,
+        title,
+        unit,
+        value_type,
+        methodology,
+        disaggregation_schema,
+        source_notes,
+        status,
+        sensitivity,
+        export_approved,
+    ) in rows:
+        columns[series_id] = (
+            str(uuid),
+            framework_code or "",
+            framework_indicator_code or "",
+            str(indicator_uuid) if indicator_uuid else "",
+            indicator_code or "",
+            title,
+            unit,
+            value_type,
+            methodology,
+            json_cell(disaggregation_schema),
+            source_notes,
+            status,
+            sensitivity,
+            str(export_approved),
+        )
+    return columns
+
+
 class Command(BaseCommand):
     help = "Export indicator data series and points to a CSV file."
 
@@ -42,48 +96,52 @@ class Command(BaseCommand):
         out_path = Path(options["out"])
         out_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Series metadata repeats on every point row, so it is resolved once per
+        # series and points are streamed as narrow tuples in bounded memory.
         points = (
-            IndicatorDataPoint.objects.select_related(
-                "series",
-                "series__framework_indicator",
-                "series__framework_indicator__framework",
-                "series__indicator",
-                "dataset_release",
+            IndicatorDataPoint.objects.order_by("series__id", "year", "id")
+            .values_list(
+                "series_id",
+                "year",
+                "value_numeric",
+                "value_text",
+                "disaggregation",
+                "dataset_release__uuid",
+                "source_url",
+                "footnote",
             )
-            .order_by("series__id", "year", "id")
+            .iterator(chunk_size=DEFAULT_QUERY_CHUNK_SIZE)
         )
+        series_columns = _series_columns(IndicatorDataPoint.objects.values("series_id"))
+        exported = 0
+        skipped = 0
 
-        with out_path.open("w", newline="", encoding="utf-8") as handle:
-            writer = csv.DictWriter(handle, fieldnames=FIELDNAMES)
-            writer.writeheader()
-
-            for point in points:
-                series = point.series
-                framework = series.framework_indicator.framework if series.framework_indicator else None
-                writer.writerow(
-                    {
-                        "series_uuid": str(series.uuid),
-                        "framework_code": framework.code if framework else "",
-                        "framework_indicator_code": series.framework_indicator.code if series.framework_indicator else "",
-                        "indicator_uuid": str(series.indicator.uuid) if series.indicator else "",
-                        "indicator_code": series.indicator.code if series.indicator else "",
-                        "series_title": series.title,
-                        "unit": series.unit,
-                        "value_type": series.value_type,
-                        "methodology": series.methodology,
-                        "disaggregation_schema_json": json.dumps(series.disaggregation_schema or {}, sort_keys=True),
-                        "source_notes": series.source_notes,
-                        "status": series.status,
-                        "sensitivity": series.sensitivity,
-                        "export_approved": str(series.export_approved),
-                        "year": point.year,
-                        "value_numeric": str(point.value_numeric) if point.value_numeric is not None else "",
-                        "value_text": point.value_text or "",
-                        "disaggregation_json": json.dumps(point.disaggregation or {}, sort_keys=True),
-                        "dataset_release_uuid": str(point.dataset_release.uuid) if point.dataset_release else "",
-                        "source_url": point.source_url,
-                        "footnote": point.footnote,
-                    }
+        def rows():
+            nonlocal exported, skipped
+            for series_id, year, value_numeric, value_text, disaggregation, release_uuid, source_url, footnote in points:
+                # Points of a series deleted (or created) after the metadata
+                # lookup was built are skipped rather than aborting the export.
+                columns = series_columns.get(series_id)
+                if columns is None:
+                    skipped += 1
+                    continue
+                exported += 1
+                yield (
+                    *columns,
+                    year,
+                    str(value_numeric) if value_numeric is not None else "",
+                    value_text or "",
+                    json_cell(disaggregation),
+                    str(release_uuid) if release_uuid else "",
+                    source_url,
+                    footnote,
                 )
 
-        self.stdout.write(self.style.SUCCESS(f"Exported {points.count()} indicator data point(s)."))
+        with out_path.open("wb") as handle:
+            write_chunks(handle, iter_csv_chunks(FIELDNAMES, rows()))
+
+        if skipped:
+            self.stdout.write(
+                self.style.WARNING(f"Skipped {skipped} point(s) whose series changed during the export.")
+            )
+        self.stdout.write(self.style.SUCCESS(f"Exported {exported} indicator data point(s)."))
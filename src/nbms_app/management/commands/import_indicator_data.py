@@ -4,6 +4,8 @@ from decimal import Decimal, InvalidOperation
 from pathlib import Path
 
 from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
 
 from nbms_app.models import (
     DatasetRelease,
@@ -14,6 +16,13 @@ from nbms_app.models import (
     IndicatorDataSeries,
     IndicatorValueType,
 )
+from nbms_app.signals import refresh_derived_rows
+from nbms_app.signals_audit import audit_bulk_save
+
+
+DEFAULT_CHUNK_SIZE = 2000
+
+POINT_UPDATE_FIELDS = ["value_numeric", "value_text", "disaggregation", "source_url", "footnote", "updated_at"]
 
 
 def _parse_json(value, field, row_number):
@@ -45,178 +54,294 @@ def _parse_bool(value):
     return None
 
 
+def _disaggregation_key(value):
+    return json.dumps(value or {}, sort_keys=True, separators=(",", ":"))
+
+
+class _ImportLookups:
+    """Identity lookups resolved once per import instead of once per row."""
+
+    def __init__(self):
+        self.frameworks = dict(Framework.objects.values_list("code", "id"))
+        self.framework_indicators = {}
+        for framework_id, code, pk in FrameworkIndicator.objects.order_by("id").values_list("framework_id", "code", "id"):
+            self.framework_indicators.setdefault((framework_id, code), pk)
+        self.indicators_by_uuid = {}
+        self.indicators_by_code = {}
+        for pk, indicator_uuid, code in Indicator.objects.order_by("id").values_list("id", "uuid", "code"):
+            self.indicators_by_uuid[str(indicator_uuid)] = pk
+            self.indicators_by_code.setdefault(code, pk)
+        self.dataset_releases = {
+            str(release_uuid): pk for pk, release_uuid in DatasetRelease.objects.values_list("id", "uuid")
+        }
+        self.series = {}
+        for series in IndicatorDataSeries.objects.all():
+            if series.framework_indicator_id:
+                self.series[("framework_indicator", series.framework_indicator_id)] = series
+            elif series.indicator_id:
+                self.series[("indicator", series.indicator_id)] = series
+
+    def resolve_series_key(self, row, row_number):
+        framework_code = (row.get("framework_code") or "").strip()
+        framework_indicator_code = (row.get("framework_indicator_code") or "").strip()
+        indicator_uuid = (row.get("indicator_uuid") or "").strip()
+        indicator_code = (row.get("indicator_code") or "").strip()
+
+        if framework_indicator_code:
+            if not framework_code:
+                raise CommandError(
+                    f"Row {row_number}: framework_code is required when framework_indicator_code is set."
+                )
+            framework_id = self.frameworks.get(framework_code)
+            if not framework_id:
+                raise CommandError(f"Row {row_number}: framework not found: {framework_code}")
+            framework_indicator_id = self.framework_indicators.get((framework_id, framework_indicator_code))
+            if not framework_indicator_id:
+                raise CommandError(
+                    f"Row {row_number}: framework indicator not found: {framework_code}:{framework_indicator_code}"
+                )
+            return ("framework_indicator", framework_indicator_id)
+        if indicator_uuid:
+            indicator_id = self.indicators_by_uuid.get(indicator_uuid)
+            if not indicator_id:
+                raise CommandError(f"Row {row_number}: indicator UUID not found: {indicator_uuid}")
+            return ("indicator", indicator_id)
+        if indicator_code:
+            indicator_id = self.indicators_by_code.get(indicator_code)
+            if not indicator_id:
+                raise CommandError(f"Row {row_number}: indicator code not found: {indicator_code}")
+            return ("indicator", indicator_id)
+        raise CommandError(f"Row {row_number}: indicator_uuid/indicator_code or framework_indicator_code required.")
+
+    def resolve_dataset_release(self, row, row_number):
+        dataset_release_uuid = (row.get("dataset_release_uuid") or "").strip()
+        if not dataset_release_uuid:
+            return None
+        dataset_release_id = self.dataset_releases.get(dataset_release_uuid)
+        if not dataset_release_id:
+            raise CommandError(f"Row {row_number}: dataset_release UUID not found: {dataset_release_uuid}")
+        return dataset_release_id
+
+
+class _ChunkedIndicatorDataImport:
+    """
+    Stage CSV rows in chunks and upsert series/points with bulk writes.
+
+    Rows are parsed and validated in memory; each chunk is flushed in its own
+    transaction with one lookup query for existing points and one bulk insert
+    and bulk update per model. Row errors are collected and do not abort the
+    remaining rows.
+    """
+
+    def __init__(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.chunk_size = max(1, int(chunk_size))
+        self.lookups = _ImportLookups()
+        self.created_series = 0
+        self.updated_series = 0
+        self.created_points = 0
+        self.updated_points = 0
+        self.errors = []
+        self._new_series = []
+        self._dirty_series = {}
+        self._staged_points = []
+
+    def run(self, rows):
+        for row_number, row in rows:
+            try:
+                self._stage_row(row, row_number)
+            except CommandError as exc:
+                self.errors.append(str(exc))
+            if len(self._staged_points) >= self.chunk_size:
+                self.flush()
+        self.flush()
+        return self
+
+    def _stage_row(self, row, row_number):
+        series_key = self.lookups.resolve_series_key(row, row_number)
+
+        value_type_raw = (row.get("value_type") or "").strip()
+        value_type = value_type_raw or IndicatorValueType.NUMERIC
+        disaggregation_schema = _parse_json(
+            row.get("disaggregation_schema_json") or "",
+            "disaggregation_schema_json",
+            row_number,
+        )
+        series_defaults = {
+            "title": (row.get("series_title") or "").strip(),
+            "unit": (row.get("unit") or "").strip(),
+            "value_type": value_type,
+            "methodology": (row.get("methodology") or "").strip(),
+            "disaggregation_schema": disaggregation_schema or {},
+            "source_notes": (row.get("source_notes") or "").strip(),
+        }
+
+        year = (row.get("year") or "").strip()
+        if not year:
+            raise CommandError(f"Row {row_number}: year is required for data points.")
+        try:
+            year = int(year)
+        except ValueError as exc:
+            raise CommandError(f"Row {row_number}: invalid integer in year: {year}") from exc
+
+        value_numeric = _parse_decimal(row.get("value_numeric"), "value_numeric", row_number)
+        value_text = (row.get("value_text") or "").strip() or None
+        if value_numeric is None and value_text is None:
+            raise CommandError(f"Row {row_number}: value_numeric or value_text is required.")
+
+        disaggregation = _parse_json(
+            row.get("disaggregation_json") or "",
+            "disaggregation_json",
+            row_number,
+        )
+        dataset_release_id = self.lookups.resolve_dataset_release(row, row_number)
+
+        series = self.lookups.series.get(series_key)
+        if series is None:
+            series = IndicatorDataSeries(**{f"{series_key[0]}_id": series_key[1]}, **series_defaults)
+            self.lookups.series[series_key] = series
+            self._new_series.append(series)
+            self.created_series += 1
+        else:
+            updated_fields = self._apply_series_updates(series, series_defaults, value_type_raw, row)
+            if updated_fields:
+                if series.pk:
+                    self._dirty_series.setdefault(id(series), (series, set()))[1].update(updated_fields)
+                self.updated_series += 1
+
+        self._staged_points.append(
+            (
+                series,
+                {
+                    "year": year,
+                    "dataset_release_id": dataset_release_id,
+                    "value_numeric": value_numeric,
+                    "value_text": value_text,
+                    "disaggregation": disaggregation or {},
+                    "source_url": (row.get("source_url") or "").strip(),
+                    "footnote": (row.get("footnote") or "").strip(),
+                },
+            )
+        )
+
+    def _apply_series_updates(self, series, series_defaults, value_type_raw, row):
+        updated_fields = []
+        for field, value in series_defaults.items():
+            if field == "value_type":
+                continue
+            if value:
+                setattr(series, field, value)
+                updated_fields.append(field)
+        if value_type_raw:
+            series.value_type = series_defaults["value_type"]
+            updated_fields.append("value_type")
+        status = (row.get("status") or "").strip()
+        if status:
+            series.status = status
+            updated_fields.append("status")
+        sensitivity = (row.get("sensitivity") or "").strip()
+        if sensitivity:
+            series.sensitivity = sensitivity
+            updated_fields.append("sensitivity")
+        export_approved = _parse_bool(row.get("export_approved"))
+        if export_approved is not None:
+            series.export_approved = export_approved
+            updated_fields.append("export_approved")
+        return updated_fields
+
+    def flush(self):
+        if not self._staged_points and not self._new_series and not self._dirty_series:
+            return
+        with transaction.atomic():
+            self._flush_series()
+            self._flush_points()
+
+    def _flush_series(self):
+        now = timezone.now()
+        if self._new_series:
+            IndicatorDataSeries.objects.bulk_create(self._new_series, batch_size=self.chunk_size)
+            audit_bulk_save(IndicatorDataSeries, self._new_series, created=True)
+            self._new_series = []
+        fields_by_group = {}
+        for series, fields in self._dirty_series.values():
+            series.updated_at = now
+            fields_by_group.setdefault(tuple(sorted(fields | {"updated_at"})), []).append(series)
+        for fields, series_rows in fields_by_group.items():
+            IndicatorDataSeries.objects.bulk_update(series_rows, list(fields), batch_size=self.chunk_size)
+            audit_bulk_save(IndicatorDataSeries, series_rows, created=False)
+        self._dirty_series = {}
+
+    def _flush_points(self):
+        if not self._staged_points:
+            return
+        series_ids = {series.pk for series, _values in self._staged_points}
+        years = {values["year"] for _series, values in self._staged_points}
+        existing = {}
+        for point in IndicatorDataPoint.objects.filter(series_id__in=series_ids, year__in=years).order_by("id"):
+            key = (point.series_id, point.year, point.dataset_release_id, _disaggregation_key(point.disaggregation))
+            existing.setdefault(key, point)
+
+        now = timezone.now()
+        to_create = {}
+        to_update = {}
+        for series, values in self._staged_points:
+            key = (series.pk, values["year"], values["dataset_release_id"], _disaggregation_key(values["disaggregation"]))
+            point = to_create.get(key) or existing.get(key)
+            if point is None:
+                to_create[key] = IndicatorDataPoint(series_id=series.pk, **values)
+                self.created_points += 1
+                continue
+            for field in ("value_numeric", "value_text", "disaggregation", "source_url", "footnote"):
+                setattr(point, field, values[field])
+            if point.pk:
+                point.updated_at = now
+                to_update[key] = point
+            self.updated_points += 1
+
+        if to_create:
+            created = IndicatorDataPoint.objects.bulk_create(list(to_create.values()), batch_size=self.chunk_size)
+            audit_bulk_save(IndicatorDataPoint, created, created=True)
+        if to_update:
+            updated = list(to_update.values())
+            IndicatorDataPoint.objects.bulk_update(updated, POINT_UPDATE_FIELDS, batch_size=self.chunk_size)
+            audit_bulk_save(IndicatorDataPoint, updated, created=False)
+        if to_create or to_update:
+            refresh_derived_rows(IndicatorDataPoint, [*to_create.values(), *to_update.values()])
+        self._staged_points = []
+
+
 class Command(BaseCommand):
     help = "Import indicator data series and points from a CSV file."
 
     def add_arguments(self, parser):
         parser.add_argument("--in", dest="in_path", required=True, help="Input CSV path.")
         parser.add_argument("--mode", default="upsert", choices=["upsert"], help="Import mode (default: upsert).")
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f"Rows staged per bulk write (default: {DEFAULT_CHUNK_SIZE}).",
+        )
 
     def handle(self, *args, **options):
         in_path = Path(options["in_path"])
         if not in_path.exists():
             raise CommandError(f"Input CSV not found: {in_path}")
-
-        created_series = 0
-        updated_series = 0
-        created_points = 0
-        updated_points = 0
-        errors = []
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be a positive integer.")
 
         with in_path.open("r", newline="", encoding="utf-8") as handle:
             reader = csv.DictReader(handle)
-            for row_number, row in enumerate(reader, start=2):
-                try:
-                    framework_code = (row.get("framework_code") or "").strip()
-                    framework_indicator_code = (row.get("framework_indicator_code") or "").strip()
-                    indicator_uuid = (row.get("indicator_uuid") or "").strip()
-                    indicator_code = (row.get("indicator_code") or "").strip()
-
-                    framework_indicator = None
-                    indicator = None
-
-                    if framework_indicator_code:
-                        if not framework_code:
-                            raise CommandError(
-                                f"Row {row_number}: framework_code is required when framework_indicator_code is set."
-                            )
-                        framework = Framework.objects.filter(code=framework_code).first()
-                        if not framework:
-                            raise CommandError(f"Row {row_number}: framework not found: {framework_code}")
-                        framework_indicator = FrameworkIndicator.objects.filter(
-                            framework=framework,
-                            code=framework_indicator_code,
-                        ).first()
-                        if not framework_indicator:
-                            raise CommandError(
-                                f"Row {row_number}: framework indicator not found: {framework_code}:{framework_indicator_code}"
-                            )
-                    elif indicator_uuid:
-                        indicator = Indicator.objects.filter(uuid=indicator_uuid).first()
-                        if not indicator:
-                            raise CommandError(f"Row {row_number}: indicator UUID not found: {indicator_uuid}")
-                    elif indicator_code:
-                        indicator = Indicator.objects.filter(code=indicator_code).first()
-                        if not indicator:
-                            raise CommandError(f"Row {row_number}: indicator code not found: {indicator_code}")
-                    else:
-                        raise CommandError(
-                            f"Row {row_number}: indicator_uuid/indicator_code or framework_indicator_code required."
-                        )
-
-                    series_lookup = {}
-                    if framework_indicator:
-                        series_lookup["framework_indicator"] = framework_indicator
-                    if indicator:
-                        series_lookup["indicator"] = indicator
-
-                    if not series_lookup:
-                        raise CommandError(f"Row {row_number}: unable to resolve series identity.")
-
-                    value_type_raw = (row.get("value_type") or "").strip()
-                    value_type = value_type_raw or IndicatorValueType.NUMERIC
-                    disaggregation_schema = _parse_json(
-                        row.get("disaggregation_schema_json") or "",
-                        "disaggregation_schema_json",
-                        row_number,
-                    )
-
-                    series_defaults = {
-                        "title": (row.get("series_title") or "").strip(),
-                        "unit": (row.get("unit") or "").strip(),
-                        "value_type": value_type,
-                        "methodology": (row.get("methodology") or "").strip(),
-                        "disaggregation_schema": disaggregation_schema or {},
-                        "source_notes": (row.get("source_notes") or "").strip(),
-                    }
-
-                    series, created = IndicatorDataSeries.objects.get_or_create(
-                        **series_lookup,
-                        defaults=series_defaults,
-                    )
-                    if created:
-                        created_series += 1
-                    else:
-                        updated_fields = []
-                        for field, value in series_defaults.items():
-                            if field == "value_type":
-                                continue
-                            if value:
-                                setattr(series, field, value)
-                                updated_fields.append(field)
-                        if value_type_raw:
-                            series.value_type = value_type
-                            updated_fields.append("value_type")
-                        status = (row.get("status") or "").strip()
-                        if status:
-                            series.status = status
-                            updated_fields.append("status")
-                        sensitivity = (row.get("sensitivity") or "").strip()
-                        if sensitivity:
-                            series.sensitivity = sensitivity
-                            updated_fields.append("sensitivity")
-                        export_approved = _parse_bool(row.get("export_approved"))
-                        if export_approved is not None:
-                            series.export_approved = export_approved
-                            updated_fields.append("export_approved")
-                        if updated_fields:
-                            series.save(update_fields=updated_fields)
-                            updated_series += 1
-
-                    year = row.get("year")
-                    if not year:
-                        raise CommandError(f"Row {row_number}: year is required for data points.")
-                    year = int(year)
-
-                    value_numeric = _parse_decimal(row.get("value_numeric"), "value_numeric", row_number)
-                    value_text = (row.get("value_text") or "").strip() or None
-                    if value_numeric is None and value_text is None:
-                        raise CommandError(f"Row {row_number}: value_numeric or value_text is required.")
-
-                    disaggregation = _parse_json(
-                        row.get("disaggregation_json") or "",
-                        "disaggregation_json",
-                        row_number,
-                    )
-                    dataset_release_uuid = (row.get("dataset_release_uuid") or "").strip()
-                    dataset_release = None
-                    if dataset_release_uuid:
-                        dataset_release = DatasetRelease.objects.filter(uuid=dataset_release_uuid).first()
-                        if not dataset_release:
-                            raise CommandError(
-                                f"Row {row_number}: dataset_release UUID not found: {dataset_release_uuid}"
-                            )
-
-                    point_defaults = {
-                        "value_numeric": value_numeric,
-                        "value_text": value_text,
-                        "disaggregation": disaggregation or {},
-                        "source_url": (row.get("source_url") or "").strip(),
-                        "footnote": (row.get("footnote") or "").strip(),
-                    }
-
-                    point, point_created = IndicatorDataPoint.objects.update_or_create(
-                        series=series,
-                        year=year,
-                        dataset_release=dataset_release,
-                        disaggregation=disaggregation or {},
-                        defaults=point_defaults,
-                    )
-                    if point_created:
-                        created_points += 1
-                    else:
-                        updated_points += 1
-
-                except CommandError as exc:
-                    errors.append(str(exc))
-
-        if errors:
-            raise CommandError("Import failed:\n" + "\n".join(errors))
+            result = _ChunkedIndicatorDataImport(chunk_size=options["chunk_size"]).run(
+                enumerate(reader, start=2)
+            )
+
+        if result.errors:
+            raise CommandError("Import failed:\n" + "\n".join(result.errors))
 
         self.stdout.write(
             self.style.SUCCESS(
                 "Imported indicator data: "
-                f"{created_series} series created, {updated_series} series updated, "
-                f"{created_points} points created, {updated_points} points updated."
+                f"{result.created_series} series created, {result.updated_series} series updated, "
+                f"{result.created_points} points created, {result.updated_points} points updated."
             )
         )
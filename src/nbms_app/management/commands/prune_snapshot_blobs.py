@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from nbms_app.services.snapshots import SNAPSHOT_BLOB_GRACE_PERIOD, prune_snapshot_blobs
+
+
+class Command(BaseCommand):
+    help = "Delete stored reporting snapshot chunks that no snapshot references."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-minutes",
+            type=int,
+            default=int(SNAPSHOT_BLOB_GRACE_PERIOD.total_seconds() // 60),
+            help="Keep unreferenced chunks written or reused within this many minutes.",
+        )
+
+    def handle(self, *args, **options):
+        older_than = timezone.now() - timedelta(minutes=max(options["grace_minutes"], 0))
+        deleted = prune_snapshot_blobs(older_than=older_than)
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} unreferenced snapshot chunk(s)."))
@@ -1,12 +1,17 @@
+import copy
 import csv
 import json
 import re
+import time
 from datetime import date
 from pathlib import Path
 from uuid import UUID
 
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
-from django.db import IntegrityError, transaction
+from django.db import IntegrityError, models, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
 
 from nbms_app.models import (
     AccessLevel,
@@ -44,6 +49,12 @@ from nbms_app.models import (
     UpdateFrequency,
     User,
 )
+from nbms_app.services.audit import suppress_audit_events
+from nbms_app.signals import refresh_derived_rows
+from nbms_app.signals_audit import audit_bulk_save
+
+
+BULK_BATCH_SIZE = 500
 
 
 ENTITY_HEADERS = {
@@ -361,30 +372,26 @@ class Command(BaseCommand):
         if not import_fn:
             raise CommandError(f"Unsupported entity: {entity}")
 
-        created = 0
-        updated = 0
-        errors = []
+        session = _CatalogImportSession(strict=strict)
+        row_count = 0
 
         def run_import():
-            nonlocal created, updated
+            nonlocal row_count
             with csv_path.open("r", newline="", encoding="utf-8") as handle:
                 reader = csv.DictReader(handle)
                 _ensure_headers(reader, entity)
                 for row_number, row in enumerate(reader, start=2):
+                    row_count += 1
+                    session.begin_row()
                     try:
-                        if not strict and not dry_run:
-                            with transaction.atomic():
-                                c, u = import_fn(row, mode, row_number)
-                        else:
-                            c, u = import_fn(row, mode, row_number)
+                        c, u = import_fn(session, row, mode, row_number)
                     except CommandError as exc:
-                        if strict:
-                            raise
-                        errors.append(f"Row {row_number}: {exc}")
+                        session.record_error(row_number, exc)
                         continue
-                    created += c
-                    updated += u
+                    session.commit_row(row_number, c, u)
+            session.flush()
 
+        started = time.perf_counter()
         if dry_run or strict:
             with transaction.atomic():
                 run_import()
@@ -392,6 +399,9 @@ class Command(BaseCommand):
                     transaction.set_rollback(True)
         else:
             run_import()
+        elapsed = time.perf_counter() - started
+        created, updated = session.totals()
+        errors = session.errors
 
         if errors:
             for error in errors:
@@ -405,6 +415,8 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.SUCCESS(f"Import complete. Created: {created}, Updated: {updated}.")
             )
+        rate = row_count / elapsed if elapsed > 0 else float(row_count)
+        self.stdout.write(f"Processed {row_count} row(s) in {elapsed:.2f}s ({rate:.0f} rows/s).")
 
         if dry_run:
             self.stdout.write(self.style.WARNING("Dry-run: no changes were committed."))
@@ -495,59 +507,352 @@ def _normalize_choice(value, allowed, field, row_number, default=""):
     return normalized
 
 
-def _check_uuid_conflict(model, uuid_value, code_field, code_value, row_number, label):
+def _key_part(value):
+    if isinstance(value, models.Model):
+        return ("pk", value.pk) if value.pk is not None else ("new", id(value))
+    return value
+
+
+def _field_key(obj, field_name):
+    field = obj._meta.get_field(field_name)
+    if field.many_to_one:
+        if field.is_cached(obj):
+            return _key_part(field.get_cached_value(obj))
+        raw = getattr(obj, field.attname)
+        return ("pk", raw) if raw is not None else None
+    return getattr(obj, field_name)
+
+
+def _object_key(obj, fields):
+    return tuple(_field_key(obj, field) for field in fields)
+
+
+def _has_unsaved_parent(obj):
+    for field in obj._meta.concrete_fields:
+        if field.many_to_one and field.is_cached(obj):
+            related = field.get_cached_value(obj)
+            if related is not None and related.pk is None:
+                return True
+    return False
+
+
+class _CatalogIndex:
+    """In-memory lookup maps for one import run; each model is loaded at most once."""
+
+    def __init__(self):
+        self._objects = {}
+        self._maps = {}
+
+    def objects(self, model):
+        if model not in self._objects:
+            queryset = model.objects.all()
+            if not queryset.ordered:
+                queryset = queryset.order_by("pk")
+            self._objects[model] = list(queryset)
+        return self._objects[model]
+
+    def _map(self, model, fields):
+        key = (model, fields)
+        if key not in self._maps:
+            mapping = {}
+            for obj in self.objects(model):
+                mapping.setdefault(_object_key(obj, fields), []).append(obj)
+            self._maps[key] = mapping
+        return self._maps[key]
+
+    def filter(self, model, **lookup):
+        fields = tuple(sorted(lookup))
+        key = tuple(_key_part(lookup[field]) for field in fields)
+        return list(self._map(model, fields).get(key, []))
+
+    def first(self, model, **lookup):
+        matches = self.filter(model, **lookup)
+        return matches[0] if matches else None
+
+    def add(self, model, obj):
+        self.objects(model).append(obj)
+        for (mapped_model, fields), mapping in self._maps.items():
+            if mapped_model is model:
+                mapping.setdefault(_object_key(obj, fields), []).append(obj)
+
+    def update(self, model, obj, values):
+        previous = {
+            fields: _object_key(obj, fields) for (mapped_model, fields) in self._maps if mapped_model is model
+        }
+        for field, value in values.items():
+            setattr(obj, field, value)
+        for fields, old_key in previous.items():
+            new_key = _object_key(obj, fields)
+            if new_key == old_key:
+                continue
+            mapping = self._maps[(model, fields)]
+            mapping[old_key] = [item for item in mapping[old_key] if item is not obj]
+            mapping.setdefault(new_key, []).append(obj)
+
+
+class _StagedWrite:
+    __slots__ = ("obj", "row_number", "label", "fields")
+
+    def __init__(self, obj, row_number, label, fields=None):
+        self.obj = obj
+        self.row_number = row_number
+        self.label = label
+        self.fields = fields
+
+
+class _CatalogImportSession:
+    """
+    Stage one entity file in memory and write it with bulk upserts.
+
+    Lookups resolve against a preloaded ``_CatalogIndex``; each row's writes are
+    buffered and only applied to the index once the whole row validated, so a
+    failing row leaves no partial state. ``flush`` then writes new objects per
+    model in parent-before-child order, followed by updates and M2M links.
+    """
+
+    def __init__(self, strict=False):
+        self.strict = strict
+        self.index = _CatalogIndex()
+        self.errors = []
+        self.failed_rows = set()
+        self._row_ops = []
+        self._row_results = {}
+        self._models = []
+        self._created = {}
+        self._updated = {}
+        self._m2m = {}
+
+    def _track_model(self, model):
+        if model not in self._models:
+            self._models.append(model)
+
+    def begin_row(self):
+        self._row_ops = []
+
+    def stage_create(self, model, obj, row_number, label):
+        self._row_ops.append(("create", model, obj, row_number, label, None))
+
+    def stage_update(self, model, obj, values, row_number, label):
+        self._row_ops.append(("update", model, obj, row_number, label, values))
+
+    def set_m2m(self, obj, field_name, values, row_number):
+        self._row_ops.append(("m2m", type(obj), obj, row_number, field_name, values))
+
+    def commit_row(self, row_number, created, updated):
+        for op, model, obj, op_row, label, values in self._row_ops:
+            self._track_model(model)
+            if op == "create":
+                self.index.add(model, obj)
+                self._created.setdefault(model, []).append(_StagedWrite(obj, op_row, label))
+            elif op == "update":
+                self.index.update(model, obj, values)
+                if obj.pk is None:
+                    continue
+                staged = self._updated.setdefault(model, {}).get(id(obj))
+                if staged:
+                    staged.fields.update(values)
+                    staged.row_number = op_row
+                else:
+                    self._updated[model][id(obj)] = _StagedWrite(obj, op_row, label, set(values))
+            else:
+                self._m2m.setdefault((model, label), {})[id(obj)] = (obj, values, op_row)
+        self._row_ops = []
+        self._row_results[row_number] = (created, updated)
+
+    def record_error(self, row_number, exc):
+        if self.strict:
+            raise exc
+        self.errors.append(f"Row {row_number}: {exc}")
+        self.failed_rows.add(row_number)
+
+    def totals(self):
+        created = sum(c for row, (c, _u) in self._row_results.items() if row not in self.failed_rows)
+        updated = sum(u for row, (_c, u) in self._row_results.items() if row not in self.failed_rows)
+        return created, updated
+
+    def flush(self):
+        with transaction.atomic():
+            for model in self._models:
+                self._flush_created(model, self._created.get(model, []))
+            for model in self._models:
+                self._flush_updated(model, list(self._updated.get(model, {}).values()))
+            for (model, field_name), entries in self._m2m.items():
+                self._flush_m2m(model, field_name, list(entries.values()))
+
+    def _flush_created(self, model, entries):
+        written = []
+        pending = entries
+        while pending:
+            ready = [entry for entry in pending if not _has_unsaved_parent(entry.obj)]
+            if not ready:
+                for entry in pending:
+                    self._constraint_error(entry)
+                break
+            written.extend(self._bulk_write(model, ready, create=True))
+            ready_ids = {id(entry) for entry in ready}
+            pending = [entry for entry in pending if id(entry) not in ready_ids]
+        if not written:
+            return
+        objs = [entry.obj for entry in written]
+        audit_bulk_save(model, objs, created=True)
+        with suppress_audit_events():
+            for obj in objs:
+                post_save.send(sender=model, instance=obj, created=True, update_fields=None, raw=False, using="default")
+
+    def _flush_updated(self, model, entries):
+        if not entries:
+            return
+        now = timezone.now()
+        for entry in entries:
+            if hasattr(entry.obj, "updated_at"):
+                entry.obj.updated_at = now
+                entry.fields.add("updated_at")
+        written = []
+        by_fields = {}
+        for entry in entries:
+            by_fields.setdefault(tuple(sorted(entry.fields)), []).append(entry)
+        for fields, group in by_fields.items():
+            written.extend(self._bulk_write(model, group, fields=list(fields)))
+        audit_bulk_save(model, [entry.obj for entry in written], created=False)
+        refresh_derived_rows(model, [entry.obj for entry in written])
+
+    def _bulk_write(self, model, entries, create=False, fields=None):
+        objs = [entry.obj for entry in entries]
+        try:
+            with transaction.atomic():
+                if create:
+                    model.objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+                else:
+                    model.objects.bulk_update(objs, fields, batch_size=BULK_BATCH_SIZE)
+            return entries
+        except IntegrityError:
+            pass
+        # Fall back to one savepoint per object so the offending rows can be reported.
+        written = []
+        for entry in entries:
+            if create:
+                entry.obj.pk = None
+                entry.obj._state.adding = True
+            try:
+                with transaction.atomic():
+                    if create:
+                        model.objects.bulk_create([entry.obj])
+                    else:
+                        model.objects.bulk_update([entry.obj], fields)
+            except IntegrityError:
+                if create:
+                    entry.obj.pk = None
+                self._constraint_error(entry)
+                continue
+            written.append(entry)
+        return written
+
+    def _constraint_error(self, entry):
+        self.record_error(
+            entry.row_number,
+            CommandError(f"Row {entry.row_number}: {entry.label} violates a constraint."),
+        )
+
+    def _flush_m2m(self, model, field_name, entries):
+        entries = [(obj, values) for obj, values, row_number in entries if obj.pk and row_number not in self.failed_rows]
+        if not entries:
+            return
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        target = field.m2m_reverse_field_name()
+        through.objects.filter(**{f"{source}_id__in": [obj.pk for obj, _values in entries]}).delete()
+        links = []
+        for obj, values in entries:
+            for value_pk in dict.fromkeys(value.pk for value in values):
+                links.append(through(**{f"{source}_id": obj.pk, f"{target}_id": value_pk}))
+        through.objects.bulk_create(links, batch_size=BULK_BATCH_SIZE)
+
+
+def _sync_goal_active(obj):
+    # Mirrors FrameworkGoal.save(), which derives is_active from status.
+    obj.is_active = obj.status != LifecycleStatus.ARCHIVED
+    return {"is_active"}
+
+
+def _validate_before_save(obj):
+    # Mirrors save(validate=True) on framework targets/indicators; relations come
+    # from the preloaded index and uniqueness is enforced by the upsert lookup.
+    exclude = [field.name for field in obj._meta.concrete_fields if field.is_relation]
+    try:
+        obj.clean_fields(exclude=exclude)
+        obj.clean()
+    except ValidationError as exc:
+        raise CommandError(f"{obj.__class__.__name__} is invalid: {'; '.join(exc.messages)}") from exc
+    return set()
+
+
+_PRE_SAVE_HOOKS = {
+    FrameworkGoal: _sync_goal_active,
+    FrameworkTarget: _validate_before_save,
+    FrameworkIndicator: _validate_before_save,
+}
+
+
+def _check_uuid_conflict(ctx, model, uuid_value, code_field, code_value, row_number, label):
     if not uuid_value or not code_value:
         return
-    existing = model.objects.filter(**{code_field: code_value}).first()
+    existing = ctx.index.first(model, **{code_field: code_value})
     if existing and existing.uuid != uuid_value:
         raise CommandError(
             f"Row {row_number}: {label} code '{code_value}' already exists with a different UUID."
         )
 
 
-def _resolve_by_code(model, code_field, code_value, row_number, label):
+def _resolve_by_code(ctx, model, code_field, code_value, row_number, label):
     code_value = _clean(code_value)
     if not code_value:
         return None
-    obj = model.objects.filter(**{code_field: code_value}).first()
+    obj = ctx.index.first(model, **{code_field: code_value})
     if not obj:
         raise CommandError(f"Row {row_number}: {label} not found for code '{code_value}'.")
     return obj
 
 
-def _resolve_by_uuid_or_code(model, uuid_value, code_value, code_field, row_number, label):
+def _resolve_by_uuid_or_code(ctx, model, uuid_value, code_value, code_field, row_number, label):
     if uuid_value:
-        obj = model.objects.filter(uuid=uuid_value).first()
+        obj = ctx.index.first(model, uuid=uuid_value)
         if not obj:
             raise CommandError(f"Row {row_number}: {label} UUID not found: {uuid_value}")
         return obj
     code_value = _clean(code_value)
     if code_value:
-        obj = model.objects.filter(**{code_field: code_value}).first()
+        obj = ctx.index.first(model, **{code_field: code_value})
         if not obj:
             raise CommandError(f"Row {row_number}: {label} not found for code '{code_value}'.")
         return obj
     raise CommandError(f"Row {row_number}: {label} requires {code_field} or UUID.")
 
 
-def _upsert_model(model, lookup, defaults, mode, row_number, label):
-    if mode == "insert_only":
-        if model.objects.filter(**lookup).exists():
-            raise CommandError(f"Row {row_number}: {label} already exists.")
-        try:
-            obj = model.objects.create(**lookup, **defaults)
-        except IntegrityError as exc:
-            raise CommandError(f"Row {row_number}: {label} violates a constraint.") from exc
+def _upsert_model(ctx, model, lookup, defaults, mode, row_number, label):
+    existing = ctx.index.first(model, **lookup)
+    hook = _PRE_SAVE_HOOKS.get(model)
+    if existing is None:
+        obj = model(**{**lookup, **defaults})
+        if hook:
+            hook(obj)
+        ctx.stage_create(model, obj, row_number, label)
         return obj, 1, 0
-    try:
-        obj, created = model.objects.update_or_create(defaults=defaults, **lookup)
-    except IntegrityError as exc:
-        raise CommandError(f"Row {row_number}: {label} violates a constraint.") from exc
-    return obj, (1 if created else 0), (0 if created else 1)
+    if mode == "insert_only":
+        raise CommandError(f"Row {row_number}: {label} already exists.")
+    values = dict(defaults)
+    if hook:
+        candidate = copy.copy(existing)
+        for field, value in values.items():
+            setattr(candidate, field, value)
+        for field in hook(candidate):
+            values[field] = getattr(candidate, field)
+    ctx.stage_update(model, existing, values, row_number, label)
+    return existing, 0, 1
 
 
 
-def _import_organisation(row, mode, row_number):
+def _import_organisation(ctx, row, mode, row_number):
     uuid_value = _parse_uuid(row.get("org_uuid"), "org_uuid", row_number)
     org_code = _clean(row.get("org_code"))
     name = _clean(row.get("org_name"))
@@ -555,9 +860,9 @@ def _import_organisation(row, mode, row_number):
         raise CommandError("org_name is required.")
     if not uuid_value and not org_code:
         raise CommandError("org_uuid or org_code is required.")
-    _check_uuid_conflict(Organisation, uuid_value, "org_code", org_code, row_number, "Organisation")
+    _check_uuid_conflict(ctx, Organisation, uuid_value, "org_code", org_code, row_number, "Organisation")
 
-    parent_org = _resolve_by_code(Organisation, "org_code", row.get("parent_org_code"), row_number, "Parent org")
+    parent_org = _resolve_by_code(ctx, Organisation, "org_code", row.get("parent_org_code"), row_number, "Parent org")
     defaults = {
         "name": name,
         "org_code": org_code or None,
@@ -574,11 +879,11 @@ def _import_organisation(row, mode, row_number):
         "source_ref": _clean(row.get("source_ref")),
     }
     lookup = {"uuid": uuid_value} if uuid_value else {"org_code": org_code}
-    _, created, updated = _upsert_model(Organisation, lookup, defaults, mode, row_number, "Organisation")
+    _, created, updated = _upsert_model(ctx, Organisation, lookup, defaults, mode, row_number, "Organisation")
     return created, updated
 
 
-def _import_sensitivity_class(row, mode, row_number):
+def _import_sensitivity_class(ctx, row, mode, row_number):
     code = _clean(row.get("sensitivity_code"))
     name = _clean(row.get("sensitivity_name"))
     if not code or not name:
@@ -608,6 +913,7 @@ def _import_sensitivity_class(row, mode, row_number):
         "source_ref": _clean(row.get("source_ref")),
     }
     _, created, updated = _upsert_model(
+        ctx,
         SensitivityClass,
         {"sensitivity_code": code},
         defaults,
@@ -618,7 +924,7 @@ def _import_sensitivity_class(row, mode, row_number):
     return created, updated
 
 
-def _import_data_agreement(row, mode, row_number):
+def _import_data_agreement(ctx, row, mode, row_number):
     uuid_value = _parse_uuid(row.get("agreement_uuid"), "agreement_uuid", row_number)
     code = _clean(row.get("agreement_code"))
     title = _clean(row.get("title"))
@@ -626,7 +932,7 @@ def _import_data_agreement(row, mode, row_number):
         raise CommandError("title is required.")
     if not code:
         raise CommandError("agreement_code is required.")
-    _check_uuid_conflict(DataAgreement, uuid_value, "agreement_code", code, row_number, "DataAgreement")
+    _check_uuid_conflict(ctx, DataAgreement, uuid_value, "agreement_code", code, row_number, "DataAgreement")
 
     agreement_type = _normalize_choice(
         row.get("agreement_type"),
@@ -659,6 +965,7 @@ def _import_data_agreement(row, mode, row_number):
     }
     lookup = {"uuid": uuid_value} if uuid_value else {"agreement_code": code}
     agreement, created, updated = _upsert_model(
+        ctx,
         DataAgreement,
         lookup,
         defaults,
@@ -670,21 +977,22 @@ def _import_data_agreement(row, mode, row_number):
     party_codes = _split_codes(row.get("parties_org_codes"))
     parties = []
     for code_value in party_codes:
-        org = _resolve_by_code(Organisation, "org_code", code_value, row_number, "Organisation")
+        org = _resolve_by_code(ctx, Organisation, "org_code", code_value, row_number, "Organisation")
         parties.append(org)
-    agreement.parties.set(parties)
+    ctx.set_m2m(agreement, "parties", parties, row_number)
     return created, updated
 
 
-def _import_framework(row, mode, row_number):
+def _import_framework(ctx, row, mode, row_number):
     uuid_value = _parse_uuid(row.get("framework_uuid"), "framework_uuid", row_number)
     code = _clean(row.get("framework_code"))
     title = _clean(row.get("title"))
     if not code or not title:
         raise CommandError("framework_code and title are required.")
-    _check_uuid_conflict(Framework, uuid_value, "code", code, row_number, "Framework")
+    _check_uuid_conflict(ctx, Framework, uuid_value, "code", code, row_number, "Framework")
 
     organisation = _resolve_by_code(
+        ctx,
         Organisation,
         "org_code",
         row.get("organisation_code"),
@@ -717,6 +1025,7 @@ def _import_framework(row, mode, row_number):
     }
     lookup = {"uuid": uuid_value} if uuid_value else {"code": code}
     _, created, updated = _upsert_model(
+        ctx,
         Framework,
         lookup,
         defaults,
@@ -727,7 +1036,7 @@ def _import_framework(row, mode, row_number):
     return created, updated
 
 
-def _import_monitoring_programme(row, mode, row_number):
+def _import_monitoring_programme(ctx, row, mode, row_number):
     uuid_value = _parse_uuid(row.get("programme_uuid"), "programme_uuid", row_number)
     code = _clean(row.get("programme_code"))
     title = _clean(row.get("title"))
@@ -736,6 +1045,7 @@ def _import_monitoring_programme(row, mode, row_number):
     if not code:
         raise CommandError("programme_code is required.")
     _check_uuid_conflict(
+        ctx,
         MonitoringProgramme,
         uuid_value,
         "programme_code",
@@ -759,6 +1069,7 @@ def _import_monitoring_programme(row, mode, row_number):
         default="",
     )
     sensitivity = _resolve_by_code(
+        ctx,
         SensitivityClass,
         "sensitivity_code",
         row.get("sensitivity_code"),
@@ -766,13 +1077,14 @@ def _import_monitoring_programme(row, mode, row_number):
         "SensitivityClass",
     )
     agreement = _resolve_by_code(
+        ctx,
         DataAgreement,
         "agreement_code",
         row.get("agreement_code"),
         row_number,
         "DataAgreement",
     )
-    lead_org = _resolve_by_code(Organisation, "org_code", row.get("lead_org_code"), row_number, "Organisation")
+    lead_org = _resolve_by_code(ctx, Organisation, "org_code", row.get("lead_org_code"), row_number, "Organisation")
 
     defaults = {
         "programme_code": code or None,
@@ -805,6 +1117,7 @@ def _import_monitoring_programme(row, mode, row_number):
     }
     lookup = {"uuid": uuid_value} if uuid_value else {"programme_code": code}
     programme, created, updated = _upsert_model(
+        ctx,
         MonitoringProgramme,
         lookup,
         defaults,
@@ -816,13 +1129,13 @@ def _import_monitoring_programme(row, mode, row_number):
     partner_codes = _split_codes(row.get("partner_org_codes"))
     partners = []
     for code_value in partner_codes:
-        org = _resolve_by_code(Organisation, "org_code", code_value, row_number, "Organisation")
+        org = _resolve_by_code(ctx, Organisation, "org_code", code_value, row_number, "Organisation")
         partners.append(org)
-    programme.partners.set(partners)
+    ctx.set_m2m(programme, "partners", partners, row_number)
     return created, updated
 
 
-def _import_dataset_catalog(row, mode, row_number):
+def _import_dataset_catalog(ctx, row, mode, row_number):
     uuid_value = _parse_uuid(row.get("dataset_uuid"), "dataset_uuid", row_number)
     code = _clean(row.get("dataset_code"))
     title = _clean(row.get("title"))
@@ -830,7 +1143,7 @@ def _import_dataset_catalog(row, mode, row_number):
         raise CommandError("title is required.")
     if not code:
         raise CommandError("dataset_code is required.")
-    _check_uuid_conflict(DatasetCatalog, uuid_value, "dataset_code", code, row_number, "DatasetCatalog")
+    _check_uuid_conflict(ctx, DatasetCatalog, uuid_value, "dataset_code", code, row_number, "DatasetCatalog")
 
     access_level = _normalize_choice(
         row.get("access_level"),
@@ -858,6 +1171,7 @@ def _import_dataset_catalog(row, mode, row_number):
         licence = _normalize_choice(licence, CONTROLLED_VOCABS["licence_type"], "licence", row_number, default=licence)
 
     custodian_org = _resolve_by_code(
+        ctx,
         Organisation,
         "org_code",
         row.get("custodian_org_code"),
@@ -865,6 +1179,7 @@ def _import_dataset_catalog(row, mode, row_number):
         "Organisation",
     )
     producer_org = _resolve_by_code(
+        ctx,
         Organisation,
         "org_code",
         row.get("producer_org_code"),
@@ -872,6 +1187,7 @@ def _import_dataset_catalog(row, mode, row_number):
         "Organisation",
     )
     sensitivity = _resolve_by_code(
+        ctx,
         SensitivityClass,
         "sensitivity_code",
         row.get("sensitivity_code"),
@@ -879,6 +1195,7 @@ def _import_dataset_catalog(row, mode, row_number):
         "SensitivityClass",
     )
     agreement = _resolve_by_code(
+        ctx,
         DataAgreement,
         "agreement_code",
         row.get("agreement_code"),
@@ -919,6 +1236,7 @@ def _import_dataset_catalog(row, mode, row_number):
     }
     lookup = {"uuid": uuid_value} if uuid_value else {"dataset_code": code}
     _, created, updated = _upsert_model(
+        ctx,
         DatasetCatalog,
         lookup,
         defaults,
@@ -930,7 +1248,7 @@ def _import_dataset_catalog(row, mode, row_number):
 
 
 
-def _import_methodology(row, mode, row_number):
+def _import_methodology(ctx, row, mode, row_number):
     uuid_value = _parse_uuid(row.get("methodology_uuid"), "methodology_uuid", row_number)
     code = _clean(row.get("methodology_code"))
     title = _clean(row.get("title"))
@@ -938,9 +1256,9 @@ def _import_methodology(row, mode, row_number):
         raise CommandError("title is required.")
     if not code:
         raise CommandError("methodology_code is required.")
-    _check_uuid_conflict(Methodology, uuid_value, "methodology_code", code, row_number, "Methodology")
+    _check_uuid_conflict(ctx, Methodology, uuid_value, "methodology_code", code, row_number, "Methodology")
 
-    owner_org = _resolve_by_code(Organisation, "org_code", row.get("owner_org_code"), row_number, "Organisation")
+    owner_org = _resolve_by_code(ctx, Organisation, "org_code", row.get("owner_org_code"), row_number, "Organisation")
     defaults = {
         "methodology_code": code or None,
         "title": title,
@@ -954,6 +1272,7 @@ def _import_methodology(row, mode, row_number):
     }
     lookup = {"uuid": uuid_value} if uuid_value else {"methodology_code": code}
     _, created, updated = _upsert_model(
+        ctx,
         Methodology,
         lookup,
         defaults,
@@ -964,18 +1283,18 @@ def _import_methodology(row, mode, row_number):
     return created, updated
 
 
-def _import_methodology_version(row, mode, row_number):
+def _import_methodology_version(ctx, row, mode, row_number):
     uuid_value = _parse_uuid(row.get("methodology_version_uuid"), "methodology_version_uuid", row_number)
     methodology_code = _clean(row.get("methodology_code"))
     version = _clean(row.get("version"))
     if not methodology_code or not version:
         raise CommandError("methodology_code and version are required.")
-    methodology = _resolve_by_code(Methodology, "methodology_code", methodology_code, row_number, "Methodology")
+    methodology = _resolve_by_code(ctx, Methodology, "methodology_code", methodology_code, row_number, "Methodology")
     if uuid_value:
-        existing = MethodologyVersion.objects.filter(uuid=uuid_value).first()
+        existing = ctx.index.first(MethodologyVersion, uuid=uuid_value)
         if existing and (existing.methodology_id != methodology.id or existing.version != version):
             raise CommandError("methodology_version_uuid does not match methodology_code/version.")
-        conflict = MethodologyVersion.objects.filter(methodology=methodology, version=version).first()
+        conflict = ctx.index.first(MethodologyVersion, methodology=methodology, version=version)
         if conflict and conflict.uuid != uuid_value:
             raise CommandError("methodology_code/version already exists with a different UUID.")
 
@@ -1008,6 +1327,7 @@ def _import_methodology_version(row, mode, row_number):
 
     lookup = {"uuid": uuid_value} if uuid_value else {"methodology": methodology, "version": version}
     _, created, updated = _upsert_model(
+        ctx,
         MethodologyVersion,
         lookup,
         defaults,
@@ -1019,8 +1339,9 @@ def _import_methodology_version(row, mode, row_number):
 
 
 
-def _import_programme_dataset_link(row, mode, row_number):
+def _import_programme_dataset_link(ctx, row, mode, row_number):
     programme = _resolve_by_uuid_or_code(
+        ctx,
         MonitoringProgramme,
         _parse_uuid(row.get("programme_uuid"), "programme_uuid", row_number),
         row.get("programme_code"),
@@ -1029,6 +1350,7 @@ def _import_programme_dataset_link(row, mode, row_number):
         "MonitoringProgramme",
     )
     dataset = _resolve_by_uuid_or_code(
+        ctx,
         DatasetCatalog,
         _parse_uuid(row.get("dataset_uuid"), "dataset_uuid", row_number),
         row.get("dataset_code"),
@@ -1052,6 +1374,7 @@ def _import_programme_dataset_link(row, mode, row_number):
         "source_ref": _clean(row.get("source_ref")),
     }
     _, created, updated = _upsert_model(
+        ctx,
         ProgrammeDatasetLink,
         {"programme": programme, "dataset": dataset},
         defaults,
@@ -1062,8 +1385,9 @@ def _import_programme_dataset_link(row, mode, row_number):
     return created, updated
 
 
-def _import_programme_indicator_link(row, mode, row_number):
+def _import_programme_indicator_link(ctx, row, mode, row_number):
     programme = _resolve_by_uuid_or_code(
+        ctx,
         MonitoringProgramme,
         _parse_uuid(row.get("programme_uuid"), "programme_uuid", row_number),
         row.get("programme_code"),
@@ -1072,6 +1396,7 @@ def _import_programme_indicator_link(row, mode, row_number):
         "MonitoringProgramme",
     )
     indicator = _resolve_by_uuid_or_code(
+        ctx,
         Indicator,
         _parse_uuid(row.get("indicator_uuid"), "indicator_uuid", row_number),
         row.get("indicator_code"),
@@ -1095,6 +1420,7 @@ def _import_programme_indicator_link(row, mode, row_number):
         "source_ref": _clean(row.get("source_ref")),
     }
     _, created, updated = _upsert_model(
+        ctx,
         ProgrammeIndicatorLink,
         {"programme": programme, "indicator": indicator},
         defaults,
@@ -1105,8 +1431,9 @@ def _import_programme_indicator_link(row, mode, row_number):
     return created, updated
 
 
-def _import_methodology_dataset_link(row, mode, row_number):
+def _import_methodology_dataset_link(ctx, row, mode, row_number):
     methodology = _resolve_by_uuid_or_code(
+        ctx,
         Methodology,
         _parse_uuid(row.get("methodology_uuid"), "methodology_uuid", row_number),
         row.get("methodology_code"),
@@ -1115,6 +1442,7 @@ def _import_methodology_dataset_link(row, mode, row_number):
         "Methodology",
     )
     dataset = _resolve_by_uuid_or_code(
+        ctx,
         DatasetCatalog,
         _parse_uuid(row.get("dataset_uuid"), "dataset_uuid", row_number),
         row.get("dataset_code"),
@@ -1138,6 +1466,7 @@ def _import_methodology_dataset_link(row, mode, row_number):
         "source_ref": _clean(row.get("source_ref")),
     }
     _, created, updated = _upsert_model(
+        ctx,
         MethodologyDatasetLink,
         {"methodology": methodology, "dataset": dataset},
         defaults,
@@ -1148,8 +1477,9 @@ def _import_methodology_dataset_link(row, mode, row_number):
     return created, updated
 
 
-def _import_methodology_indicator_link(row, mode, row_number):
+def _import_methodology_indicator_link(ctx, row, mode, row_number):
     methodology = _resolve_by_uuid_or_code(
+        ctx,
         Methodology,
         _parse_uuid(row.get("methodology_uuid"), "methodology_uuid", row_number),
         row.get("methodology_code"),
@@ -1158,6 +1488,7 @@ def _import_methodology_indicator_link(row, mode, row_number):
         "Methodology",
     )
     indicator = _resolve_by_uuid_or_code(
+        ctx,
         Indicator,
         _parse_uuid(row.get("indicator_uuid"), "indicator_uuid", row_number),
         row.get("indicator_code"),
@@ -1184,6 +1515,7 @@ def _import_methodology_indicator_link(row, mode, row_number):
     updated_total = 0
 
     _, created, updated = _upsert_model(
+        ctx,
         MethodologyIndicatorLink,
         {"methodology": methodology, "indicator": indicator},
         defaults,
@@ -1198,7 +1530,7 @@ def _import_methodology_indicator_link(row, mode, row_number):
     version_label = _clean(row.get("methodology_version"))
     version = None
     if version_uuid:
-        version = MethodologyVersion.objects.filter(uuid=version_uuid).first()
+        version = ctx.index.first(MethodologyVersion, uuid=version_uuid)
         if not version:
             raise CommandError(f"Row {row_number}: MethodologyVersion not found for uuid '{version_uuid}'.")
         if version.methodology_id != methodology.id:
@@ -1206,22 +1538,22 @@ def _import_methodology_indicator_link(row, mode, row_number):
                 f"Row {row_number}: MethodologyVersion does not belong to methodology '{methodology.methodology_code}'."
             )
     elif version_label:
-        version = MethodologyVersion.objects.filter(methodology=methodology, version=version_label).first()
+        version = ctx.index.first(MethodologyVersion, methodology=methodology, version=version_label)
         if not version:
             raise CommandError(
                 f"Row {row_number}: MethodologyVersion '{version_label}' not found for methodology '{methodology.methodology_code}'."
             )
     else:
-        active_versions = MethodologyVersion.objects.filter(methodology=methodology, is_active=True)
-        if not active_versions.exists():
+        active_versions = ctx.index.filter(MethodologyVersion, methodology=methodology, is_active=True)
+        if not active_versions:
             raise CommandError(
                 f"Row {row_number}: No active MethodologyVersion for methodology '{methodology.methodology_code}'."
             )
-        if active_versions.count() > 1:
+        if len(active_versions) > 1:
             raise CommandError(
                 f"Row {row_number}: Multiple active MethodologyVersions for methodology '{methodology.methodology_code}'."
             )
-        version = active_versions.first()
+        version = active_versions[0]
 
     source_ref = _clean(row.get("source_ref"))
     source_url = source_ref if source_ref.startswith("http") else ""
@@ -1232,6 +1564,7 @@ def _import_methodology_indicator_link(row, mode, row_number):
         "is_active": _parse_bool(row.get("is_active"), "is_active", row_number, default=True),
     }
     _, created, updated = _upsert_model(
+        ctx,
         IndicatorMethodologyVersionLink,
         {"indicator": indicator, "methodology_version": version},
         version_defaults,
@@ -1244,7 +1577,7 @@ def _import_methodology_indicator_link(row, mode, row_number):
     return created_total, updated_total
 
 
-def _import_indicator(row, mode, row_number):
+def _import_indicator(ctx, row, mode, row_number):
     uuid_value = _parse_uuid(row.get("indicator_uuid"), "indicator_uuid", row_number)
     code = _clean(row.get("indicator_code"))
     title = _clean(row.get("indicator_title"))
@@ -1252,15 +1585,15 @@ def _import_indicator(row, mode, row_number):
         raise CommandError("indicator_code is required.")
     if not title:
         raise CommandError("indicator_title is required.")
-    _check_uuid_conflict(Indicator, uuid_value, "code", code, row_number, "Indicator")
+    _check_uuid_conflict(ctx, Indicator, uuid_value, "code", code, row_number, "Indicator")
 
     target_uuid = _parse_uuid(row.get("national_target_uuid"), "national_target_uuid", row_number)
     target_code = _clean(row.get("national_target_code"))
     target = None
     if target_uuid:
-        target = NationalTarget.objects.filter(uuid=target_uuid).first()
+        target = ctx.index.first(NationalTarget, uuid=target_uuid)
     elif target_code:
-        target = NationalTarget.objects.filter(code=target_code).first()
+        target = ctx.index.first(NationalTarget, code=target_code)
     if not target:
         raise CommandError("NationalTarget is required (national_target_uuid or national_target_code).")
 
@@ -1308,6 +1641,7 @@ def _import_indicator(row, mode, row_number):
     )
 
     responsible_org = _resolve_by_code(
+        ctx,
         Organisation,
         "org_code",
         row.get("responsible_org_code"),
@@ -1315,6 +1649,7 @@ def _import_indicator(row, mode, row_number):
         "Organisation",
     )
     organisation = _resolve_by_code(
+        ctx,
         Organisation,
         "org_code",
         row.get("organisation_code"),
@@ -1322,6 +1657,7 @@ def _import_indicator(row, mode, row_number):
         "Organisation",
     )
     owner_org = _resolve_by_code(
+        ctx,
         Organisation,
         "org_code",
         row.get("owner_org_code"),
@@ -1329,6 +1665,7 @@ def _import_indicator(row, mode, row_number):
         "Organisation",
     )
     license_obj = _resolve_by_code(
+        ctx,
         License,
         "code",
         row.get("license_code"),
@@ -1339,14 +1676,14 @@ def _import_indicator(row, mode, row_number):
     data_steward = None
     data_steward_username = _clean(row.get("data_steward_username"))
     if data_steward_username:
-        data_steward = User.objects.filter(username=data_steward_username).first()
+        data_steward = ctx.index.first(User, username=data_steward_username)
         if not data_steward:
             raise CommandError(f"User not found for data_steward_username '{data_steward_username}'.")
 
     indicator_lead = None
     indicator_lead_username = _clean(row.get("indicator_lead_username"))
     if indicator_lead_username:
-        indicator_lead = User.objects.filter(username=indicator_lead_username).first()
+        indicator_lead = ctx.index.first(User, username=indicator_lead_username)
         if not indicator_lead:
             raise CommandError(f"User not found for indicator_lead_username '{indicator_lead_username}'.")
 
@@ -1357,7 +1694,7 @@ def _import_indicator(row, mode, row_number):
         row_number,
     )
     if source_document_uuid:
-        source_document = SourceDocument.objects.filter(uuid=source_document_uuid).first()
+        source_document = ctx.index.first(SourceDocument, uuid=source_document_uuid)
         if not source_document:
             raise CommandError(f"SourceDocument not found for UUID '{source_document_uuid}'.")
 
@@ -1400,18 +1737,18 @@ def _import_indicator(row, mode, row_number):
     }
 
     lookup = {"uuid": uuid_value} if uuid_value else {"code": code}
-    _, created, updated = _upsert_model(Indicator, lookup, defaults, mode, row_number, "Indicator")
+    _, created, updated = _upsert_model(ctx, Indicator, lookup, defaults, mode, row_number, "Indicator")
     return created, updated
 
 
 
-def _import_gbf_goal(row, mode, row_number):
+def _import_gbf_goal(ctx, row, mode, row_number):
     framework_code = _clean(row.get("framework_code"))
     goal_code = _clean(row.get("goal_code"))
     title = _clean(row.get("goal_title"))
     if not framework_code or not goal_code or not title:
         raise CommandError("framework_code, goal_code, and goal_title are required.")
-    framework = _resolve_by_code(Framework, "code", framework_code, row_number, "Framework")
+    framework = _resolve_by_code(ctx, Framework, "code", framework_code, row_number, "Framework")
     defaults = {
         "title": title,
         "official_text": _clean(row.get("official_text")),
@@ -1421,6 +1758,7 @@ def _import_gbf_goal(row, mode, row_number):
         "source_ref": _clean(row.get("source_ref")),
     }
     _, created, updated = _upsert_model(
+        ctx,
         FrameworkGoal,
         {"framework": framework, "code": goal_code},
         defaults,
@@ -1431,17 +1769,17 @@ def _import_gbf_goal(row, mode, row_number):
     return created, updated
 
 
-def _import_gbf_target(row, mode, row_number):
+def _import_gbf_target(ctx, row, mode, row_number):
     framework_code = _clean(row.get("framework_code"))
     target_code = _clean(row.get("target_code"))
     title = _clean(row.get("target_title"))
     if not framework_code or not target_code or not title:
         raise CommandError("framework_code, target_code, and target_title are required.")
-    framework = _resolve_by_code(Framework, "code", framework_code, row_number, "Framework")
+    framework = _resolve_by_code(ctx, Framework, "code", framework_code, row_number, "Framework")
     goal_code = _clean(row.get("goal_code"))
     goal = None
     if goal_code:
-        goal = FrameworkGoal.objects.filter(framework=framework, code=goal_code).first()
+        goal = ctx.index.first(FrameworkGoal, framework=framework, code=goal_code)
         if not goal:
             raise CommandError(f"Row {row_number}: FrameworkGoal not found for code '{goal_code}'.")
     is_active = _parse_bool(row.get("is_active"), "is_active", row_number, default=True)
@@ -1455,6 +1793,7 @@ def _import_gbf_target(row, mode, row_number):
         "source_ref": _clean(row.get("source_ref")),
     }
     _, created, updated = _upsert_model(
+        ctx,
         FrameworkTarget,
         {"framework": framework, "code": target_code},
         defaults,
@@ -1465,17 +1804,17 @@ def _import_gbf_target(row, mode, row_number):
     return created, updated
 
 
-def _import_gbf_indicator(row, mode, row_number):
+def _import_gbf_indicator(ctx, row, mode, row_number):
     framework_code = _clean(row.get("framework_code"))
     indicator_code = _clean(row.get("indicator_code"))
     title = _clean(row.get("indicator_title"))
     if not framework_code or not indicator_code or not title:
         raise CommandError("framework_code, indicator_code, and indicator_title are required.")
-    framework = _resolve_by_code(Framework, "code", framework_code, row_number, "Framework")
+    framework = _resolve_by_code(ctx, Framework, "code", framework_code, row_number, "Framework")
     target_code = _clean(row.get("framework_target_code"))
     framework_target = None
     if target_code:
-        framework_target = FrameworkTarget.objects.filter(framework=framework, code=target_code).first()
+        framework_target = ctx.index.first(FrameworkTarget, framework=framework, code=target_code)
         if not framework_target:
             raise CommandError(f"Row {row_number}: FrameworkTarget not found for code '{target_code}'.")
     indicator_type = _normalize_choice(
@@ -1496,6 +1835,7 @@ def _import_gbf_indicator(row, mode, row_number):
         "source_ref": _clean(row.get("source_ref")),
     }
     _, created, updated = _upsert_model(
+        ctx,
         FrameworkIndicator,
         {"framework": framework, "code": indicator_code},
         defaults,
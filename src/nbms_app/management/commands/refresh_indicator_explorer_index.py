@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from nbms_app.models import Indicator
+from nbms_app.services.indicator_explorer import refresh_indicator_explorer_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the indicator explorer index (readiness, spatial and framework facets) for all or selected indicators."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--indicator", action="append", default=[], help="Indicator code; repeat to select several.")
+
+    def handle(self, *args, **options):
+        indicator_ids = None
+        if options["indicator"]:
+            indicator_ids = list(Indicator.objects.filter(code__in=options["indicator"]).values_list("id", flat=True))
+        started = time.monotonic()
+        rows = refresh_indicator_explorer_index(indicator_ids)
+        duration_ms = int((time.monotonic() - started) * 1000)
+        self.stdout.write(self.style.SUCCESS(f"Indicator explorer index refreshed: rows={rows} duration_ms={duration_ms}"))
@@ -10,12 +10,20 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         summary = refresh_registry_gold_marts()
+        for name, mart in summary["marts"].items():
+            mode = "full rebuild" if mart["full_rebuild"] else "incremental"
+            self.stdout.write(
+                f"{name}: rows={mart['rows']} written={mart['rows_written']} "
+                f"partitions_refreshed={mart['partitions_refreshed']}/{mart['partitions']} "
+                f"({mode}, {mart['duration_ms']}ms)"
+            )
         self.stdout.write(
             self.style.SUCCESS(
                 "Registry marts refreshed: "
                 f"snapshot_date={summary['snapshot_date']} "
                 f"taxon_rows={summary['taxon_rows']} "
                 f"ecosystem_rows={summary['ecosystem_rows']} "
-                f"ias_rows={summary['ias_rows']}"
+                f"ias_rows={summary['ias_rows']} "
+                f"duration_ms={summary['duration_ms']}"
             )
         )
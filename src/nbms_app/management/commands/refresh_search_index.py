@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from nbms_app.models import SearchEntityType
+from nbms_app.services.search_index import refresh_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search documents of indicators, targets, datasets and registry records."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--entity-type",
+            action="append",
+            choices=SearchEntityType.values,
+            default=[],
+            help="Entity type to rebuild; repeat to select several (defaults to all).",
+        )
+
+    def handle(self, *args, **options):
+        entity_types = [SearchEntityType(value) for value in options["entity_type"]] or list(SearchEntityType)
+        for entity_type in entity_types:
+            started = time.monotonic()
+            rows = refresh_search_documents(entity_type)
+            duration_ms = int((time.monotonic() - started) * 1000)
+            self.stdout.write(f"{entity_type.value}: rows={rows} duration_ms={duration_ms}")
+        self.stdout.write(self.style.SUCCESS(f"Search index refreshed for {len(entity_types)} entity type(s)."))
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from nbms_app.models import IndicatorMethodProfile, IndicatorMethodRunStatus, IndicatorMethodType, User
+from nbms_app.services.indicator_method_batch import run_indicator_methods
+
+
+class Command(BaseCommand):
+    help = "Run indicator method profiles across the catalogue in dependency order and report timings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--indicator", action="append", default=[], help="Indicator code; repeat to select several.")
+        parser.add_argument("--method-type", choices=IndicatorMethodType.values, help="Only run profiles of this type.")
+        parser.add_argument("--workers", type=int, default=0, help="Worker processes (defaults to INDICATOR_METHOD_BATCH_WORKERS).")
+        parser.add_argument(
+            "--postgis-workers",
+            type=int,
+            default=0,
+            help="Workers that may run PostGIS-heavy profiles at once (defaults to INDICATOR_METHOD_POSTGIS_WORKERS).",
+        )
+        parser.add_argument("--force", action="store_true", help="Re-run profiles even when a stored result is current.")
+        parser.add_argument("--output", help="Write the JSON run report to this path.")
+        parser.add_argument("--actor", type=str, default="", help="Optional username to attribute runs to.")
+
+    def handle(self, *args, **options):
+        actor = None
+        actor_username = (options.get("actor") or "").strip()
+        if actor_username:
+            actor = User.objects.filter(username=actor_username).first()
+            if not actor:
+                self.stdout.write(self.style.WARNING(f"Actor '{actor_username}' not found. Running without actor."))
+
+        profiles = IndicatorMethodProfile.objects.filter(is_active=True)
+        if options["indicator"]:
+            profiles = profiles.filter(indicator__code__in=options["indicator"])
+        if options.get("method_type"):
+            profiles = profiles.filter(method_type=options["method_type"])
+        if not profiles.exists():
+            raise CommandError("No active indicator method profiles match the selection.")
+
+        report = run_indicator_methods(
+            profiles=profiles,
+            user=actor,
+            use_cache=not options["force"],
+            workers=options.get("workers") or None,
+            postgis_workers=options.get("postgis_workers") or None,
+        )
+
+        for entry in report["profiles"]:
+            duration = f"{entry['duration_ms']}ms" if entry["duration_ms"] is not None else "-"
+            line = f"{entry['indicator_code']} {entry['implementation_key'] or entry['method_type']}: {entry['status']} ({duration})"
+            if entry["error"]:
+                line = f"{line} {entry['error']}"
+            self.stdout.write(line)
+        counts = ", ".join(f"{status}={count}" for status, count in report["counts"].items())
+        self.stdout.write(
+            self.style.SUCCESS(f"Ran {len(report['profiles'])} profile(s) in {report['duration_ms']}ms: {counts}.")
+        )
+        if options.get("output"):
+            Path(options["output"]).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        if report["counts"].get(IndicatorMethodRunStatus.FAILED):
+            raise CommandError(f"{report['counts'][IndicatorMethodRunStatus.FAILED]} indicator method profile(s) failed.")
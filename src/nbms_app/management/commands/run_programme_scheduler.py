@@ -0,0 +1,54 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from nbms_app.models import User
+from nbms_app.services.programme_scheduler import ProgrammeRunScheduler
+
+
+class Command(BaseCommand):
+    help = "Run the monitoring programme scheduler: lease due runs and execute them on a bounded worker pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=0, help="Concurrent runs (defaults to PROGRAMME_RUN_WORKERS).")
+        parser.add_argument(
+            "--poll-seconds",
+            type=int,
+            default=0,
+            help="Seconds between scheduler ticks (defaults to PROGRAMME_SCHEDULER_POLL_SECONDS).",
+        )
+        parser.add_argument("--limit", type=int, default=20, help="Maximum number of due programmes to queue per tick.")
+        parser.add_argument("--once", action="store_true", help="Run a single tick and wait for its runs to finish.")
+        parser.add_argument("--actor", type=str, default="", help="Optional username to attribute audit actions to.")
+
+    def handle(self, *args, **options):
+        actor = None
+        actor_username = (options.get("actor") or "").strip()
+        if actor_username:
+            actor = User.objects.filter(username=actor_username).first()
+            if not actor:
+                self.stdout.write(self.style.WARNING(f"Actor '{actor_username}' not found. Running without actor."))
+
+        scheduler = ProgrammeRunScheduler(
+            actor=actor,
+            workers=options.get("workers") or None,
+            queue_limit=max(1, int(options["limit"])),
+        )
+        if options.get("once"):
+            runs = scheduler.tick()
+            scheduler.shutdown(wait=True)
+            self.stdout.write(self.style.SUCCESS(f"Claimed {len(runs)} programme run(s)."))
+            return
+
+        stop_event = threading.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_args: stop_event.set())
+        self.stdout.write(
+            self.style.SUCCESS(f"Programme scheduler {scheduler.lease_owner} started with {scheduler.workers} worker(s).")
+        )
+        try:
+            scheduler.serve_forever(stop_event=stop_event, poll_seconds=options.get("poll_seconds") or None)
+        finally:
+            scheduler.shutdown(wait=True)
+        self.stdout.write("Programme scheduler stopped.")
@@ -15,6 +15,9 @@ class Command(BaseCommand):
                 f"sites={summary['site_count']}, "
                 f"abundance={summary['abundance_row_count']}, "
                 f"occupancy={summary['occupancy_row_count']}, "
-                f"wcv={summary['wcv_row_count']}"
+                f"wcv={summary['wcv_row_count']}; "
+                f"inserted={summary['totals']['inserted']}, "
+                f"updated={summary['totals']['updated']}, "
+                f"skipped={summary['totals']['skipped']}"
             )
         )
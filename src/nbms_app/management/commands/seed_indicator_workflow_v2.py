@@ -34,6 +34,7 @@ from nbms_app.models import (
     SensitivityLevel,
     UpdateFrequency,
 )
+from nbms_app.services.input_versions import bump_input_versions_for
 from nbms_app.services.nba_pilot_ingest import (
     DEFAULT_MANIFEST_PATH,
     _build_disaggregation_schema,
@@ -417,4 +418,5 @@ def _upsert_demo_indicator(*, definition: dict, organisation: Organisation, lice
             for point in definition["points"]
         ]
     )
+    bump_input_versions_for(IndicatorDataPoint, scope_ids=[series.id])
     return indicator
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.11 on 2026-10-18 23:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0048_dataset_license_dataset_metadata_json_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RenderCacheEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('cache_key', models.CharField(max_length=64, unique=True)),
+                ('kind', models.CharField(max_length=40)),
+                ('payload_hash', models.CharField(max_length=64)),
+                ('template_version', models.CharField(blank=True, max_length=64)),
+                ('renderer_version', models.CharField(blank=True, max_length=80)),
+                ('storage_path', models.CharField(max_length=512)),
+                ('content_type', models.CharField(blank=True, max_length=120)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('size_bytes', models.BigIntegerField(default=0)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('last_accessed_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-last_accessed_at', '-id'],
+                'indexes': [models.Index(fields=['last_accessed_at'], name='nbms_app_re_last_ac_d55b30_idx'), models.Index(fields=['kind', 'payload_hash'], name='nbms_app_re_kind_567367_idx')],
+            },
+        ),
+    ]
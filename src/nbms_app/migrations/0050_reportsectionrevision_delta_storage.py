@@ -0,0 +1,122 @@
+# Generated by Django 5.2.11 on 2026-10-18 23:39
+
+import json
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def _canonical_json(value):
+    return json.dumps(value or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
+
+
+def _delta(before, after):
+    delta = {}
+    changed = {key: value for key, value in after.items() if key not in before or before[key] != value}
+    removed = sorted(key for key in before if key not in after)
+    if changed:
+        delta["set"] = changed
+    if removed:
+        delta["unset"] = removed
+    return delta
+
+
+def _apply_delta(content, delta):
+    content = dict(content)
+    for key in delta.get("unset") or []:
+        content.pop(key, None)
+    for key, value in (delta.get("set") or {}).items():
+        content[key] = value
+    return content
+
+
+def _compact_revisions(apps, schema_editor):
+    ReportSectionRevision = apps.get_model("nbms_app", "ReportSectionRevision")
+    interval = max(int(getattr(settings, "REPORT_REVISION_CHECKPOINT_INTERVAL", 20) or 1), 1)
+    section_ids = (
+        ReportSectionRevision.objects.order_by().values_list("section_response_id", flat=True).distinct()
+    )
+    for section_id in list(section_ids):
+        rows = list(ReportSectionRevision.objects.filter(section_response_id=section_id).order_by("version"))
+        changed = []
+        previous = None
+        last_checkpoint = None
+        for row in rows:
+            content = row.content_snapshot or {}
+            content_text = _canonical_json(content)
+            delta = None
+            if (
+                previous is not None
+                and last_checkpoint is not None
+                and row.version == previous[0] + 1
+                and row.version - last_checkpoint < interval
+            ):
+                delta = _delta(previous[1], content)
+                # Keep a checkpoint when the delta is no smaller than the content or
+                # would not reproduce it exactly (``==`` treats 1 and True as equal).
+                if (
+                    len(_canonical_json(delta)) >= len(content_text)
+                    or _canonical_json(_apply_delta(previous[1], delta)) != content_text
+                ):
+                    delta = None
+            if delta is None:
+                last_checkpoint = row.version
+            else:
+                row.storage_kind = "delta"
+                row.delta_json = delta
+                row.content_snapshot = {}
+                changed.append(row)
+            previous = (row.version, content)
+        ReportSectionRevision.objects.bulk_update(
+            changed,
+            ["storage_kind", "delta_json", "content_snapshot"],
+            batch_size=500,
+        )
+
+
+def _expand_revisions(apps, schema_editor):
+    ReportSectionRevision = apps.get_model("nbms_app", "ReportSectionRevision")
+    section_ids = (
+        ReportSectionRevision.objects.filter(storage_kind="delta")
+        .order_by()
+        .values_list("section_response_id", flat=True)
+        .distinct()
+    )
+    for section_id in list(section_ids):
+        changed = []
+        content = {}
+        for row in ReportSectionRevision.objects.filter(section_response_id=section_id).order_by("version"):
+            if row.storage_kind == "delta":
+                content = _apply_delta(content, row.delta_json or {})
+                row.storage_kind = "checkpoint"
+                row.content_snapshot = content
+                row.delta_json = {}
+                changed.append(row)
+            else:
+                content = row.content_snapshot or {}
+        ReportSectionRevision.objects.bulk_update(
+            changed,
+            ["storage_kind", "delta_json", "content_snapshot"],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0049_rendercacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportsectionrevision',
+            name='delta_json',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='reportsectionrevision',
+            name='storage_kind',
+            field=models.CharField(choices=[('checkpoint', 'Checkpoint'), ('delta', 'Delta')], default='checkpoint', max_length=20),
+        ),
+        migrations.RunPython(_compact_revisions, _expand_revisions),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.11 on 2026-10-18 23:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0050_reportsectionrevision_delta_storage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportingSnapshotBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('kind', models.CharField(blank=True, max_length=64)),
+                ('content_json', models.JSONField()),
+                ('size_bytes', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='reportingsnapshot',
+            name='payload_manifest_json',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AlterField(
+            model_name='reportingsnapshot',
+            name='payload_json',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
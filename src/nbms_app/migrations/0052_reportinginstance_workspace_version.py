@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 00:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0051_reportingsnapshotblob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reportinginstance',
+            name='workspace_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
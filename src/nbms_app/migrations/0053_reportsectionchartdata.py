@@ -0,0 +1,32 @@
+# Generated by Django 5.2.11 on 2026-10-19 00:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0052_reportinginstance_workspace_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportSectionChartData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('section_code', models.CharField(max_length=100)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('data_hash', models.CharField(blank=True, max_length=64)),
+                ('charts_json', models.JSONField(blank=True, default=list)),
+                ('indicator_charts_json', models.JSONField(blank=True, default=list)),
+                ('reporting_instance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='section_chart_data', to='nbms_app.reportinginstance')),
+            ],
+            options={
+                'ordering': ['reporting_instance_id', 'section_code'],
+                'constraints': [models.UniqueConstraint(fields=('reporting_instance', 'section_code'), name='uq_report_section_chart_data')],
+            },
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.11 on 2026-10-19 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0053_reportsectionchartdata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monitoringprogrammerun',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='monitoringprogrammerun',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='monitoringprogrammerun',
+            name='lease_owner',
+            field=models.CharField(blank=True, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='monitoringprogrammerunstep',
+            name='depends_on_json',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='monitoringprogrammerunstep',
+            name='duration_ms',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='monitoringprogrammerun',
+            index=models.Index(fields=['status', 'lease_expires_at'], name='nbms_app_mo_status_d6c942_idx'),
+        ),
+    ]
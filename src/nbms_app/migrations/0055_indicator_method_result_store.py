@@ -0,0 +1,49 @@
+# Generated by Django 5.2.11 on 2026-10-19 00:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0054_programme_run_leases'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='indicatormethodprofile',
+            name='input_versions_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+        migrations.CreateModel(
+            name='InputTableVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('table_name', models.CharField(max_length=60)),
+                ('scope_id', models.BigIntegerField(default=0)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('table_name', 'scope_id'), name='uq_input_table_version_scope')],
+            },
+        ),
+        migrations.CreateModel(
+            name='IndicatorMethodResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('input_hash', models.CharField(max_length=128, unique=True)),
+                ('input_versions_hash', models.CharField(blank=True, max_length=64)),
+                ('output_json', models.JSONField(blank=True, default=dict)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stored_results', to='nbms_app.indicatormethodprofile')),
+                ('run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stored_results', to='nbms_app.indicatormethodrun')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['profile', 'created_at'], name='nbms_app_in_profile_8392d0_idx')],
+            },
+        ),
+    ]
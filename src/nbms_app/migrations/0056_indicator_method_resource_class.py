@@ -0,0 +1,18 @@
+# Generated by Django 5.2.11 on 2026-10-19 00:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0055_indicator_method_result_store'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='indicatormethodprofile',
+            name='resource_class',
+            field=models.CharField(blank=True, choices=[('light', 'Light'), ('postgis', 'PostGIS-heavy')], help_text="Worker slot class for batch runs; blank uses the implementation's default.", max_length=20),
+        ),
+    ]
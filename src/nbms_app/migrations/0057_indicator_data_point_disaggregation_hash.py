@@ -0,0 +1,45 @@
+# Generated by Django 5.2.11 on 2026-10-19 00:46
+
+import hashlib
+import json
+
+import nbms_app.models
+from django.db import migrations, models
+
+
+def _disaggregation_hash(value):
+    payload = json.dumps(value or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _backfill_disaggregation_hash(apps, schema_editor):
+    IndicatorDataPoint = apps.get_model("nbms_app", "IndicatorDataPoint")
+    batch = []
+    for point in IndicatorDataPoint.objects.only("id", "disaggregation").order_by("id").iterator(chunk_size=2000):
+        point.disaggregation_hash = _disaggregation_hash(point.disaggregation)
+        batch.append(point)
+        if len(batch) >= 2000:
+            IndicatorDataPoint.objects.bulk_update(batch, ["disaggregation_hash"])
+            batch = []
+    if batch:
+        IndicatorDataPoint.objects.bulk_update(batch, ["disaggregation_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0056_indicator_method_resource_class'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='indicatordatapoint',
+            name='disaggregation_hash',
+            field=nbms_app.models.DisaggregationHashField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(_backfill_disaggregation_hash, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='indicatordatapoint',
+            index=models.Index(fields=['series', 'year', 'disaggregation_hash'], name='nbms_app_in_series__1b23dc_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.11 on 2026-10-19 00:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0057_indicator_data_point_disaggregation_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RegistryMartRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('mart', models.CharField(choices=[('taxon', 'Taxon'), ('ecosystem', 'Ecosystem'), ('ias', 'IAS')], max_length=20)),
+                ('snapshot_date', models.DateField()),
+                ('partition_fingerprints_json', models.JSONField(blank=True, default=dict)),
+                ('partitions_refreshed', models.PositiveIntegerField(default=0)),
+                ('rows_written', models.PositiveIntegerField(default=0)),
+                ('full_rebuild', models.BooleanField(default=False)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['mart', 'snapshot_date'], name='nbms_app_re_mart_34c6cd_idx')],
+            },
+        ),
+    ]
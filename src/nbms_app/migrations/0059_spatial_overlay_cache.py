@@ -0,0 +1,57 @@
+# Generated by Django 5.2.11 on 2026-10-19 01:01
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from nbms_app import spatial_fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0058_registry_mart_refresh'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpatialOverlayCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('inputs_hash', models.CharField(blank=True, max_length=64)),
+                ('overlay_geom', spatial_fields.GeometryField(blank=True, null=True, srid=4326)),
+                ('overlay_area_km2', models.DecimalField(decimal_places=6, default=Decimal('0'), max_digits=18)),
+                ('computed_at', models.DateTimeField(blank=True, null=True)),
+                ('duration_ms', models.PositiveIntegerField(default=0)),
+                ('admin_ingestion_run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='nbms_app.spatialingestionrun')),
+                ('admin_layer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='admin_overlay_caches', to='nbms_app.spatiallayer')),
+                ('overlay_ingestion_run', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='nbms_app.spatialingestionrun')),
+                ('overlay_layer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='overlay_caches', to='nbms_app.spatiallayer')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SpatialOverlayCacheUnit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('unit_code', models.CharField(max_length=160)),
+                ('unit_name', models.CharField(blank=True, max_length=255)),
+                ('unit_area_km2', models.DecimalField(decimal_places=6, default=Decimal('0'), max_digits=18)),
+                ('overlay_area_km2', models.DecimalField(decimal_places=6, default=Decimal('0'), max_digits=18)),
+                ('cache', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='units', to='nbms_app.spatialoverlaycache')),
+            ],
+            options={
+                'ordering': ['cache', 'unit_code', 'id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='spatialoverlaycache',
+            constraint=models.UniqueConstraint(fields=('admin_layer', 'overlay_layer'), name='uq_spatial_overlay_cache_layers'),
+        ),
+        migrations.AddIndex(
+            model_name='spatialoverlaycacheunit',
+            index=models.Index(fields=['cache', 'unit_code'], name='nbms_app_sp_cache_i_807bbd_idx'),
+        ),
+    ]
@@ -0,0 +1,115 @@
+# Generated by Django 5.2.11 on 2026-10-19 01:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# A frozen copy of services.indicator_explorer.refresh_indicator_explorer_index
+# at this migration, so existing indicators are scored without importing
+# live code.
+BACKFILL_EXPLORER_INDEX_SQL = """
+INSERT INTO nbms_app_indicatorexplorerindex (
+    indicator_id, method_readiness_state, method_readiness_states, readiness_score, readiness_band,
+    has_spatial, next_expected_update, framework_codes, created_at, updated_at
+)
+SELECT
+    id,
+    readiness_state,
+    readiness_states,
+    readiness_score,
+    CASE WHEN readiness_score >= 75 THEN 'green' WHEN readiness_score >= 45 THEN 'amber' ELSE 'red' END,
+    has_spatial,
+    next_expected_update,
+    framework_codes,
+    NOW(),
+    NOW()
+FROM (
+    SELECT
+        i.id,
+        profiles.readiness_state,
+        profiles.readiness_states,
+        CASE profiles.readiness_state WHEN 'ready' THEN 85 WHEN 'partial' THEN 55 ELSE 25 END
+            + CASE WHEN i.last_updated_on IS NOT NULL THEN 10 ELSE 0 END AS readiness_score,
+        (
+            COALESCE(i.spatial_coverage, '') <> ''
+            OR COALESCE(i.coverage_geography, '') <> ''
+            OR EXISTS (
+                SELECT 1
+                FROM nbms_app_indicatorinputrequirement r
+                JOIN nbms_app_indicatorinputrequirement_required_map_layers rl
+                    ON rl.indicatorinputrequirement_id = r.id
+                WHERE r.indicator_id = i.id
+            )
+            OR EXISTS (
+                SELECT 1
+                FROM nbms_app_indicatordatapoint dp
+                JOIN nbms_app_indicatordataseries s ON s.id = dp.series_id
+                WHERE s.indicator_id = i.id
+                  AND (dp.spatial_layer_id IS NOT NULL OR dp.spatial_unit_id IS NOT NULL)
+            )
+        ) AS has_spatial,
+        CASE
+            WHEN i.last_updated_on IS NULL THEN NULL
+            WHEN i.update_frequency IN ('monthly') OR i.reporting_cadence IN ('monthly') THEN i.last_updated_on + 30
+            WHEN i.update_frequency IN ('quarterly') OR i.reporting_cadence IN ('quarterly') THEN i.last_updated_on + 91
+            WHEN i.update_frequency IN ('annual') OR i.reporting_cadence IN ('annual') THEN i.last_updated_on + 365
+            WHEN i.update_frequency IN ('biennial', 'every_2_years')
+                OR i.reporting_cadence IN ('biennial', 'every_2_years') THEN i.last_updated_on + 730
+            WHEN i.update_frequency IN ('every_3_years')
+                OR i.reporting_cadence IN ('every_3_years') THEN i.last_updated_on + 1095
+        END AS next_expected_update,
+        COALESCE(
+            (
+                SELECT jsonb_agg(DISTINCT f.code ORDER BY f.code)
+                FROM nbms_app_indicatorframeworkindicatorlink l
+                JOIN nbms_app_frameworkindicator fi ON fi.id = l.framework_indicator_id
+                JOIN nbms_app_framework f ON f.id = fi.framework_id
+                WHERE l.indicator_id = i.id AND l.is_active
+            ),
+            '[]'::jsonb
+        ) AS framework_codes
+    FROM nbms_app_indicator i
+    CROSS JOIN LATERAL (
+        SELECT
+            CASE
+                WHEN bool_or(mp.readiness_state = 'ready') THEN 'ready'
+                WHEN bool_or(mp.readiness_state = 'partial') THEN 'partial'
+                ELSE 'blocked'
+            END AS readiness_state,
+            COALESCE(jsonb_agg(DISTINCT mp.readiness_state ORDER BY mp.readiness_state), '[]'::jsonb) AS readiness_states
+        FROM nbms_app_indicatormethodprofile mp
+        WHERE mp.indicator_id = i.id AND mp.is_active
+    ) profiles
+) scored
+ON CONFLICT (indicator_id) DO NOTHING
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0059_spatial_overlay_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndicatorExplorerIndex',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('method_readiness_state', models.CharField(choices=[('ready', 'Ready'), ('partial', 'Partial'), ('blocked', 'Blocked')], default='blocked', max_length=20)),
+                ('method_readiness_states', models.JSONField(blank=True, default=list)),
+                ('readiness_score', models.PositiveSmallIntegerField(default=0)),
+                ('readiness_band', models.CharField(blank=True, max_length=10)),
+                ('has_spatial', models.BooleanField(default=False)),
+                ('next_expected_update', models.DateField(blank=True, null=True)),
+                ('framework_codes', models.JSONField(blank=True, default=list)),
+                ('indicator', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='explorer_index', to='nbms_app.indicator')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['readiness_band', 'readiness_score'], name='nbms_app_in_readine_5df2d1_idx'), models.Index(fields=['next_expected_update'], name='nbms_app_in_next_ex_a5b387_idx'), models.Index(fields=['has_spatial'], name='nbms_app_in_has_spa_9bec2a_idx')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_EXPLORER_INDEX_SQL, migrations.RunSQL.noop),
+    ]
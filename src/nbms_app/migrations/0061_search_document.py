@@ -0,0 +1,99 @@
+# Generated by Django 5.2.11 on 2026-10-19 01:26
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+def _create_trigram_index(apps, schema_editor):
+    # pg_trgm ships with PostgreSQL contrib and the PostGIS images; where it is
+    # unavailable, substring search still works by scanning the documents.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS nbms_search_doc_text_trgm "
+            "ON nbms_app_searchdocument USING gin (search_text gin_trgm_ops)"
+        )
+
+
+def _drop_trigram_index(apps, schema_editor):
+    schema_editor.execute("DROP INDEX IF EXISTS nbms_search_doc_text_trgm")
+
+
+# A frozen copy of services.search_index.SEARCH_SOURCES at this migration:
+# entity type -> (table, joins, weight -> columns), so existing records get
+# their documents without importing live code.
+BACKFILL_SOURCES = {
+    "indicator": (
+        "nbms_app_indicator",
+        "LEFT JOIN nbms_app_nationaltarget t ON t.id = s.national_target_id",
+        {"A": ["s.code", "s.title"], "B": ["t.code", "t.title"], "C": ["s.computation_notes"]},
+    ),
+    "national_target": ("nbms_app_nationaltarget", "", {"A": ["s.code", "s.title"], "C": ["s.description"]}),
+    "dataset": ("nbms_app_dataset", "", {"A": ["s.dataset_code", "s.title"], "C": ["s.description"]}),
+    "taxon": (
+        "nbms_app_taxonconcept",
+        "",
+        {"A": ["s.taxon_code", "s.scientific_name", "s.canonical_name"], "B": ["s.family", "s.genus"]},
+    ),
+    "ecosystem_type": (
+        "nbms_app_ecosystemtype",
+        "",
+        {"A": ["s.ecosystem_code", "s.name"], "B": ["s.biome", "s.bioregion"], "C": ["s.description"]},
+    ),
+    "alien_taxon_profile": (
+        "nbms_app_alientaxonprofile",
+        "LEFT JOIN nbms_app_taxonconcept t ON t.id = s.taxon_id",
+        {"A": ["t.taxon_code", "t.scientific_name", "t.canonical_name"]},
+    ),
+}
+
+
+def _backfill_search_documents(apps, schema_editor):
+    for entity_type, (table, joins, weights) in BACKFILL_SOURCES.items():
+        columns = [column for weight in sorted(weights) for column in weights[weight]]
+        vector = " || ".join(
+            f"setweight(to_tsvector('simple', concat_ws(' ', {', '.join(weights[weight])})), '{weight}')"
+            for weight in sorted(weights)
+        )
+        schema_editor.execute(
+            f"""
+            INSERT INTO nbms_app_searchdocument (entity_type, object_id, search_text, search_vector, created_at, updated_at)
+            SELECT %s, s.id, lower(concat_ws(E'\\n', {', '.join(columns)})), {vector}, NOW(), NOW()
+            FROM {table} s
+            {joins}
+            ON CONFLICT (entity_type, object_id) DO NOTHING
+            """,
+            [entity_type],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0060_indicator_explorer_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('entity_type', models.CharField(choices=[('indicator', 'Indicator'), ('national_target', 'National target'), ('dataset', 'Dataset'), ('taxon', 'Taxon'), ('ecosystem_type', 'Ecosystem type'), ('alien_taxon_profile', 'IAS profile')], max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('search_text', models.TextField(blank=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='nbms_search_doc_vector_gin')],
+                'constraints': [models.UniqueConstraint(fields=('entity_type', 'object_id'), name='uq_search_document_entity')],
+            },
+        ),
+        migrations.RunPython(_create_trigram_index, _drop_trigram_index),
+        migrations.RunPython(_backfill_search_documents, migrations.RunPython.noop),
+    ]
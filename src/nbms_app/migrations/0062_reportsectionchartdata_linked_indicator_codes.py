@@ -0,0 +1,29 @@
+# Generated by Django 5.2.11 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0061_search_document'),
+    ]
+
+    operations = [
+        # Stored rows predate ``linked_indicator_codes``; the next read builds
+        # them in memory and the next section save stores them again.
+        migrations.RunSQL('DELETE FROM "nbms_app_reportsectionchartdata"', migrations.RunSQL.noop),
+        migrations.RemoveField(
+            model_name='reportsectionchartdata',
+            name='data_hash',
+        ),
+        migrations.RemoveField(
+            model_name='reportsectionchartdata',
+            name='indicator_charts_json',
+        ),
+        migrations.AddField(
+            model_name='reportsectionchartdata',
+            name='linked_indicator_codes',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
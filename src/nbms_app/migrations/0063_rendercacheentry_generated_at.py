@@ -0,0 +1,23 @@
+# Generated by Django 5.2.11 on 2026-10-19 02:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('nbms_app', '0062_reportsectionchartdata_linked_indicator_codes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rendercacheentry',
+            name='generated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='rendercacheentry',
+            name='metadata',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
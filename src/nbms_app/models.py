@@ -1,3 +1,4 @@
+import hashlib
 import uuid
 from decimal import Decimal
 import json
@@ -6,9 +7,11 @@ from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.utils import timezone
 from django.utils.text import slugify
 
 from nbms_app import spatial_fields
@@ -319,6 +322,11 @@ class ReportCommentThreadStatus(models.TextChoices):
     RESOLVED = "resolved", "Resolved"
 
 
+class RevisionStorageKind(models.TextChoices):
+    CHECKPOINT = "checkpoint", "Checkpoint"
+    DELTA = "delta", "Delta"
+
+
 class SuggestedChangeStatus(models.TextChoices):
     PROPOSED = "proposed", "Proposed"
     PENDING = "pending", "Pending"
@@ -422,6 +430,11 @@ class IndicatorMethodReadiness(models.TextChoices):
     BLOCKED = "blocked", "Blocked"
 
 
+class IndicatorMethodResourceClass(models.TextChoices):
+    LIGHT = "light", "Light"
+    POSTGIS = "postgis", "PostGIS-heavy"
+
+
 class IndicatorMethodRunStatus(models.TextChoices):
     SUCCEEDED = "succeeded", "Succeeded"
     FAILED = "failed", "Failed"
@@ -633,6 +646,12 @@ class IASGoldDimension(models.TextChoices):
     PROVINCE = "province", "Province"
 
 
+class RegistryMart(models.TextChoices):
+    TAXON = "taxon", "Taxon"
+    ECOSYSTEM = "ecosystem", "Ecosystem"
+    IAS = "ias", "IAS"
+
+
 class ReportingCycle(TimeStampedModel):
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     code = models.CharField(max_length=50, unique=True)
@@ -709,6 +728,8 @@ class ReportingInstance(TimeStampedModel):
     final_content_hash = models.CharField(max_length=64, blank=True)
     finalized_at = models.DateTimeField(blank=True, null=True)
     notes = models.TextField(blank=True)
+    # Bumped by section, workflow and approval writes; keys cached workspace summaries.
+    workspace_version = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         cycle_code = self.cycle.code if self.cycle_id else ""
@@ -723,7 +744,10 @@ class ReportingSnapshot(TimeStampedModel):
         related_name="snapshots",
     )
     snapshot_type = models.CharField(max_length=50, default="NR7_V2_EXPORT")
-    payload_json = models.JSONField()
+    # Legacy inline payload; new snapshots reference ReportingSnapshotBlob rows
+    # through ``payload_manifest_json`` instead.
+    payload_json = models.JSONField(blank=True, null=True)
+    payload_manifest_json = models.JSONField(default=dict, blank=True)
     payload_hash = models.CharField(max_length=64)
     exporter_schema = models.CharField(max_length=100)
     exporter_version = models.CharField(max_length=50)
@@ -773,6 +797,18 @@ class ReportingSnapshot(TimeStampedModel):
         ]
 
 
+class ReportingSnapshotBlob(TimeStampedModel):
+    """Content-addressed, immutable chunk of a snapshot payload shared across snapshots."""
+
+    content_hash = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=64, blank=True)
+    content_json = models.JSONField()
+    size_bytes = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.kind}:{self.content_hash[:12]}"
+
+
 class ReviewDecision(TimeStampedModel):
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     reporting_instance = models.ForeignKey(
@@ -1086,12 +1122,16 @@ class MonitoringProgrammeRun(TimeStampedModel):
     log_excerpt = models.TextField(blank=True)
     error_message = models.TextField(blank=True)
     request_id = models.CharField(max_length=64, blank=True)
+    lease_owner = models.CharField(max_length=120, blank=True)
+    lease_expires_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         indexes = [
             models.Index(fields=["programme", "created_at"]),
             models.Index(fields=["programme", "status"]),
             models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["status", "lease_expires_at"]),
             models.Index(fields=["run_type"]),
         ]
 
@@ -1109,8 +1149,10 @@ class MonitoringProgrammeRunStep(TimeStampedModel):
     step_key = models.CharField(max_length=50)
     step_type = models.CharField(max_length=20, choices=ProgrammeStepType.choices)
     status = models.CharField(max_length=20, choices=ProgrammeRunStatus.choices, default=ProgrammeRunStatus.QUEUED)
+    depends_on_json = models.JSONField(default=list, blank=True)
     started_at = models.DateTimeField(blank=True, null=True)
     finished_at = models.DateTimeField(blank=True, null=True)
+    duration_ms = models.PositiveIntegerField(blank=True, null=True)
     details_json = models.JSONField(default=dict, blank=True)
     log_excerpt = models.TextField(blank=True)
 
@@ -1989,6 +2031,13 @@ class IndicatorMethodProfile(TimeStampedModel):
     readiness_notes = models.TextField(blank=True)
     last_run_at = models.DateTimeField(blank=True, null=True)
     last_success_at = models.DateTimeField(blank=True, null=True)
+    input_versions_hash = models.CharField(max_length=64, blank=True)
+    resource_class = models.CharField(
+        max_length=20,
+        choices=IndicatorMethodResourceClass.choices,
+        blank=True,
+        help_text="Worker slot class for batch runs; blank uses the implementation's default.",
+    )
     is_active = models.BooleanField(default=True)
     source_system = models.CharField(max_length=100, blank=True)
     source_ref = models.CharField(max_length=255, blank=True)
@@ -2046,6 +2095,46 @@ class IndicatorMethodRun(TimeStampedModel):
         return f"{self.profile_id}:{self.status}"
 
 
+class IndicatorMethodResult(TimeStampedModel):
+    profile = models.ForeignKey(
+        IndicatorMethodProfile,
+        on_delete=models.CASCADE,
+        related_name="stored_results",
+    )
+    input_hash = models.CharField(max_length=128, unique=True)
+    input_versions_hash = models.CharField(max_length=64, blank=True)
+    output_json = models.JSONField(default=dict, blank=True)
+    run = models.ForeignKey(
+        IndicatorMethodRun,
+        on_delete=models.SET_NULL,
+        related_name="stored_results",
+        blank=True,
+        null=True,
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["profile", "created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id}:{self.input_hash[:12]}"
+
+
+class InputTableVersion(TimeStampedModel):
+    table_name = models.CharField(max_length=60)
+    scope_id = models.BigIntegerField(default=0)
+    version = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["table_name", "scope_id"], name="uq_input_table_version_scope"),
+        ]
+
+    def __str__(self):
+        return f"{self.table_name}:{self.scope_id}:{self.version}"
+
+
 class Framework(TimeStampedModel):
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     code = models.CharField(max_length=50, unique=True)
@@ -2605,6 +2694,28 @@ class IndicatorDataSeries(TimeStampedModel):
         ]
 
 
+def disaggregation_hash(disaggregation):
+    """Stable digest of a disaggregation mapping, independent of key order."""
+
+    payload = json.dumps(disaggregation or {}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DisaggregationHashField(models.CharField):
+    """Digest of the row's ``disaggregation``, recomputed on every save and bulk insert."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("max_length", 64)
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        value = disaggregation_hash(model_instance.disaggregation)
+        setattr(model_instance, self.attname, value)
+        return value
+
+
 class IndicatorDataPoint(TimeStampedModel):
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     series = models.ForeignKey(IndicatorDataSeries, on_delete=models.CASCADE, related_name="data_points")
@@ -2613,6 +2724,7 @@ class IndicatorDataPoint(TimeStampedModel):
     value_text = models.TextField(blank=True, null=True)
     uncertainty = models.TextField(blank=True)
     disaggregation = models.JSONField(default=dict, blank=True)
+    disaggregation_hash = DisaggregationHashField()
     spatial_unit = models.ForeignKey(
         "SpatialUnit",
         on_delete=models.SET_NULL,
@@ -2668,6 +2780,7 @@ class IndicatorDataPoint(TimeStampedModel):
         ]
         indexes = [
             models.Index(fields=["series", "year"]),
+            models.Index(fields=["series", "year", "disaggregation_hash"]),
             models.Index(fields=["spatial_unit"]),
             models.Index(fields=["spatial_layer"]),
             models.Index(fields=["programme_run"]),
@@ -3411,6 +3524,37 @@ class IndicatorInputRequirement(TimeStampedModel):
         return f"{self.indicator.code}:input-requirements"
 
 
+class IndicatorExplorerIndex(TimeStampedModel):
+    """Per-indicator readiness, spatial and framework facts the indicator explorer filters and facets on."""
+
+    indicator = models.OneToOneField(
+        Indicator,
+        on_delete=models.CASCADE,
+        related_name="explorer_index",
+    )
+    method_readiness_state = models.CharField(
+        max_length=20,
+        choices=IndicatorMethodReadiness.choices,
+        default=IndicatorMethodReadiness.BLOCKED,
+    )
+    method_readiness_states = models.JSONField(default=list, blank=True)
+    readiness_score = models.PositiveSmallIntegerField(default=0)
+    readiness_band = models.CharField(max_length=10, blank=True)
+    has_spatial = models.BooleanField(default=False)
+    next_expected_update = models.DateField(blank=True, null=True)
+    framework_codes = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["readiness_band", "readiness_score"]),
+            models.Index(fields=["next_expected_update"]),
+            models.Index(fields=["has_spatial"]),
+        ]
+
+    def __str__(self):
+        return f"{self.indicator_id}:{self.readiness_band}:{self.readiness_score}"
+
+
 class IndicatorRegistryCoverageRequirement(TimeStampedModel):
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     indicator = models.OneToOneField(
@@ -3515,7 +3659,8 @@ class SpatialFeature(TimeStampedModel):
             spatial_fields.GistIndex(fields=["geom"], name="nbms_spatial_feature_geom_gix"),
         ]
 
-    def save(self, *args, **kwargs):
+    def normalise_fields(self):
+        """Sync the key, properties, geometry and bbox mirrors; also used before bulk writes."""
         if not self.feature_id:
             self.feature_id = self.feature_key
         if not self.feature_key:
@@ -3539,12 +3684,64 @@ class SpatialFeature(TimeStampedModel):
             self.minx, self.miny, self.maxx, self.maxy = bbox
         elif self.geom and hasattr(self.geom, "extent"):
             self.minx, self.miny, self.maxx, self.maxy = self.geom.extent
+
+    def save(self, *args, **kwargs):
+        self.normalise_fields()
         super().save(*args, **kwargs)
 
     def __str__(self):
         return self.feature_id or self.feature_key
 
 
+class SpatialOverlayCache(TimeStampedModel):
+    admin_layer = models.ForeignKey(SpatialLayer, on_delete=models.CASCADE, related_name="admin_overlay_caches")
+    overlay_layer = models.ForeignKey(SpatialLayer, on_delete=models.CASCADE, related_name="overlay_caches")
+    admin_ingestion_run = models.ForeignKey(
+        SpatialIngestionRun,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+    )
+    overlay_ingestion_run = models.ForeignKey(
+        SpatialIngestionRun,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        blank=True,
+        null=True,
+    )
+    inputs_hash = models.CharField(max_length=64, blank=True)
+    overlay_geom = spatial_fields.GeometryField(srid=4326, blank=True, null=True)
+    overlay_area_km2 = models.DecimalField(max_digits=18, decimal_places=6, default=Decimal("0"))
+    computed_at = models.DateTimeField(blank=True, null=True)
+    duration_ms = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["admin_layer", "overlay_layer"], name="uq_spatial_overlay_cache_layers"),
+        ]
+
+    def __str__(self):
+        return f"{self.admin_layer_id}x{self.overlay_layer_id}:{self.inputs_hash[:12]}"
+
+
+class SpatialOverlayCacheUnit(TimeStampedModel):
+    cache = models.ForeignKey(SpatialOverlayCache, on_delete=models.CASCADE, related_name="units")
+    unit_code = models.CharField(max_length=160)
+    unit_name = models.CharField(max_length=255, blank=True)
+    unit_area_km2 = models.DecimalField(max_digits=18, decimal_places=6, default=Decimal("0"))
+    overlay_area_km2 = models.DecimalField(max_digits=18, decimal_places=6, default=Decimal("0"))
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["cache", "unit_code"]),
+        ]
+        ordering = ["cache", "unit_code", "id"]
+
+    def __str__(self):
+        return f"{self.cache_id}:{self.unit_code}"
+
+
 class IucnGetNode(TimeStampedModel):
     code = models.CharField(max_length=80, unique=True)
     level = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(6)])
@@ -4345,6 +4542,54 @@ class IASGoldSummary(TimeStampedModel):
         )
 
 
+class RegistryMartRefresh(TimeStampedModel):
+    mart = models.CharField(max_length=20, choices=RegistryMart.choices)
+    snapshot_date = models.DateField()
+    partition_fingerprints_json = models.JSONField(default=dict, blank=True)
+    partitions_refreshed = models.PositiveIntegerField(default=0)
+    rows_written = models.PositiveIntegerField(default=0)
+    full_rebuild = models.BooleanField(default=False)
+    duration_ms = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["mart", "snapshot_date"]),
+        ]
+        ordering = ["-created_at", "-id"]
+
+    def __str__(self):
+        return f"{self.mart}:{self.snapshot_date}:{self.partitions_refreshed}"
+
+
+class SearchEntityType(models.TextChoices):
+    INDICATOR = "indicator", "Indicator"
+    NATIONAL_TARGET = "national_target", "National target"
+    DATASET = "dataset", "Dataset"
+    TAXON = "taxon", "Taxon"
+    ECOSYSTEM_TYPE = "ecosystem_type", "Ecosystem type"
+    ALIEN_TAXON_PROFILE = "alien_taxon_profile", "IAS profile"
+
+
+class SearchDocument(TimeStampedModel):
+    """Weighted full-text vector and lower-cased substring text of one searchable record."""
+
+    entity_type = models.CharField(max_length=30, choices=SearchEntityType.choices)
+    object_id = models.BigIntegerField()
+    search_text = models.TextField(blank=True)
+    search_vector = SearchVectorField(blank=True, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["entity_type", "object_id"], name="uq_search_document_entity"),
+        ]
+        indexes = [
+            GinIndex(fields=["search_vector"], name="nbms_search_doc_vector_gin"),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.object_id}"
+
+
 class ProgrammeTemplate(TimeStampedModel):
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     template_code = models.CharField(max_length=100, unique=True)
@@ -4497,7 +4742,15 @@ class ReportSectionRevision(TimeStampedModel):
         blank=True,
         null=True,
     )
+    storage_kind = models.CharField(
+        max_length=20,
+        choices=RevisionStorageKind.choices,
+        default=RevisionStorageKind.CHECKPOINT,
+    )
+    # Checkpoints hold the full content; deltas hold ``{"set": {...}, "unset": [...]}``
+    # against the previous version.
     content_snapshot = models.JSONField(default=dict, blank=True)
+    delta_json = models.JSONField(default=dict, blank=True)
     content_hash = models.CharField(max_length=64)
     parent_hash = models.CharField(max_length=64, blank=True)
     note = models.TextField(blank=True)
@@ -4758,6 +5011,30 @@ class ReportNarrativeBlockVersion(TimeStampedModel):
         return f"{self.block_id}:v{self.version}"
 
 
+class ReportSectionChartData(TimeStampedModel):
+    reporting_instance = models.ForeignKey(
+        ReportingInstance,
+        on_delete=models.CASCADE,
+        related_name="section_chart_data",
+    )
+    section_code = models.CharField(max_length=100)
+    content_hash = models.CharField(max_length=64)
+    charts_json = models.JSONField(default=list, blank=True)
+    linked_indicator_codes = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["reporting_instance", "section_code"],
+                name="uq_report_section_chart_data",
+            ),
+        ]
+        ordering = ["reporting_instance_id", "section_code"]
+
+    def __str__(self):
+        return f"{self.reporting_instance_id}:{self.section_code}:{self.content_hash[:8]}"
+
+
 class GovernedNarrativeEntityType(models.TextChoices):
     DASHBOARD = "dashboard", "Dashboard"
     FRAMEWORK = "framework", "Framework"
@@ -5063,6 +5340,32 @@ class ReportExportArtifact(TimeStampedModel):
         return f"{self.reporting_instance_id}:{self.format}:{self.content_hash[:8]}"
 
 
+class RenderCacheEntry(TimeStampedModel):
+    cache_key = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=40)
+    payload_hash = models.CharField(max_length=64)
+    template_version = models.CharField(max_length=64, blank=True)
+    renderer_version = models.CharField(max_length=80, blank=True)
+    storage_path = models.CharField(max_length=512)
+    content_type = models.CharField(max_length=120, blank=True)
+    content_hash = models.CharField(max_length=64)
+    size_bytes = models.BigIntegerField(default=0)
+    hit_count = models.PositiveIntegerField(default=0)
+    last_accessed_at = models.DateTimeField(default=timezone.now)
+    generated_at = models.DateTimeField(blank=True, null=True)
+    metadata = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["last_accessed_at"]),
+            models.Index(fields=["kind", "payload_hash"]),
+        ]
+        ordering = ["-last_accessed_at", "-id"]
+
+    def __str__(self):
+        return f"{self.kind}:{self.cache_key[:8]}"
+
+
 class ReportDossierArtifact(TimeStampedModel):
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     reporting_instance = models.ForeignKey(
@@ -18,7 +18,7 @@ from nbms_app.services.alignment import (
     filter_indicator_framework_links_for_user,
     filter_target_framework_links_for_user,
 )
-from nbms_app.services.alignment_coverage import compute_alignment_coverage, get_selected_targets_and_indicators
+from nbms_app.services.alignment_coverage import cached_alignment_coverage, get_selected_targets_and_indicators
 from nbms_app.services.alignment_ordering import (
     order_indicator_links_queryset,
     order_queryset_by_code_title_uuid,
@@ -27,6 +27,8 @@ from nbms_app.services.alignment_ordering import (
 )
 from nbms_app.services.authorization import filter_queryset_for_user
 from nbms_app.services.consent import requires_consent
+from nbms_app.services.indicator_explorer import refresh_indicator_explorer_index
+from nbms_app.services.input_versions import bump_input_versions_for
 
 
 def _consent_granted_uuids(instance, model):
@@ -99,7 +101,7 @@ def selected_targets_and_indicators(instance, user):
 
 
 def orphan_targets_for_instance(instance, user, query=None):
-    coverage = compute_alignment_coverage(user=user, instance=instance, scope="selected", include_details=False)
+    coverage = cached_alignment_coverage(user=user, instance=instance, scope="selected", include_details=False)
     orphans = coverage["orphans"]["national_targets_unmapped"]
     if not query:
         return orphans
@@ -112,7 +114,7 @@ def orphan_targets_for_instance(instance, user, query=None):
 
 
 def orphan_indicators_for_instance(instance, user, query=None):
-    coverage = compute_alignment_coverage(user=user, instance=instance, scope="selected", include_details=False)
+    coverage = cached_alignment_coverage(user=user, instance=instance, scope="selected", include_details=False)
     orphans = coverage["orphans"]["indicators_unmapped"]
     if not query:
         return orphans
@@ -344,6 +346,7 @@ def bulk_archive_target_links(*, user, links):
         updated = NationalTargetFrameworkTargetLink.objects.filter(id__in=[link.id for link in links]).update(
             is_active=False
         )
+        bump_input_versions_for(NationalTargetFrameworkTargetLink)
     return updated
 
 
@@ -354,4 +357,6 @@ def bulk_archive_indicator_links(*, user, links):
         updated = IndicatorFrameworkIndicatorLink.objects.filter(id__in=[link.id for link in links]).update(
             is_active=False
         )
+        bump_input_versions_for(IndicatorFrameworkIndicatorLink)
+        refresh_indicator_explorer_index([link.indicator_id for link in links])
     return updated
@@ -1,13 +1,12 @@
 from collections import defaultdict
 from datetime import timezone as dt_timezone
 
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, F, OuterRef, Q
 from django.utils import timezone
 
 from nbms_app.models import (
-    ConsentRecord,
-    ConsentStatus,
     FrameworkIndicator,
     FrameworkTarget,
     Indicator,
@@ -27,10 +26,10 @@ from nbms_app.services.alignment_ordering import (
     order_queryset_by_code_title_uuid,
     sort_dicts,
     sort_framework_link_dicts,
-    sort_model_items,
 )
 from nbms_app.services.authorization import filter_queryset_for_user, is_system_admin
-from nbms_app.services.consent import requires_consent
+from nbms_app.services.consent import consent_visible_q
+from nbms_app.services.input_versions import TABLE_WIDE_SCOPE, get_input_versions
 from nbms_app.services.instance_approvals import approved_queryset
 
 
@@ -54,26 +53,63 @@ def _strict_user(user):
     return user
 
 
-def _consent_granted_uuids(instance, model):
-    if not instance:
-        return set()
-    content_type = ContentType.objects.get_for_model(model)
-    return set(
-        ConsentRecord.objects.filter(
-            content_type=content_type,
-            status=ConsentStatus.GRANTED,
+def _item_dicts(queryset):
+    rows = [
+        {"uuid": str(row["uuid"]), "code": row["code"], "title": row["title"]}
+        for row in queryset.values("uuid", "code", "title")
+    ]
+    return sort_dicts(rows, "code", "title", "uuid")
+
+
+def _framework_entry(row):
+    return {
+        "framework_code": row["framework_code"],
+        "framework_title": row["framework_title"],
+        "targets": {"mapped_links": 0, "distinct_framework_targets_used": 0},
+        "indicators": {"mapped_links": 0, "distinct_framework_indicators_used": 0},
+    }
+
+
+def _framework_counts(links, relation):
+    return (
+        links.values(
+            framework_code=F(f"{relation}__framework__code"),
+            framework_title=F(f"{relation}__framework__title"),
         )
-        .filter(Q(reporting_instance=instance) | Q(reporting_instance__isnull=True))
-        .values_list("object_uuid", flat=True)
+        .annotate(mapped_links=Count("pk"), distinct_used=Count(f"{relation}_id", distinct=True))
+        .order_by()
     )
 
 
-def _apply_consent_filter(instance, items, consent_granted):
-    filtered = []
-    for obj in items:
-        if not requires_consent(obj) or obj.uuid in consent_granted:
-            filtered.append(obj)
-    return filtered
+def _coverage_details(items, links, owner_field, relation, links_key):
+    linked = defaultdict(list)
+    rows = links.values(
+        owner_field,
+        f"{relation}__uuid",
+        f"{relation}__code",
+        f"{relation}__title",
+        f"{relation}__framework__code",
+    )
+    for row in rows:
+        linked[row[owner_field]].append(
+            {
+                "uuid": str(row[f"{relation}__uuid"]),
+                "code": row[f"{relation}__code"],
+                "title": row[f"{relation}__title"],
+                "framework_code": row[f"{relation}__framework__code"],
+            }
+        )
+    details = [
+        {
+            "uuid": str(row["uuid"]),
+            "code": row["code"],
+            "title": row["title"],
+            "mapped": bool(linked.get(row["id"])),
+            links_key: sort_framework_link_dicts(linked.get(row["id"], [])),
+        }
+        for row in items.values("id", "uuid", "code", "title")
+    ]
+    return sort_dicts(details, "code", "title", "uuid")
 
 
 def _percent(part, total):
@@ -194,178 +230,78 @@ def compute_alignment_coverage(
             perm="nbms_app.view_indicator",
         )
 
-    targets = sort_model_items(list(targets_qs))
-    indicators = sort_model_items(list(indicators_qs))
-
-    target_consent = _consent_granted_uuids(instance, NationalTarget)
-    indicator_consent = _consent_granted_uuids(instance, Indicator)
-    framework_target_consent = _consent_granted_uuids(instance, FrameworkTarget)
-    framework_indicator_consent = _consent_granted_uuids(instance, FrameworkIndicator)
-
-    targets = _apply_consent_filter(instance, targets, target_consent)
-    indicators = _apply_consent_filter(instance, indicators, indicator_consent)
+    targets = NationalTarget.objects.filter(pk__in=targets_qs.order_by().values("pk")).filter(
+        consent_visible_q(NationalTarget, instance)
+    )
+    indicators = Indicator.objects.filter(pk__in=indicators_qs.order_by().values("pk")).filter(
+        consent_visible_q(Indicator, instance)
+    )
 
     target_links = NationalTargetFrameworkTargetLink.objects.filter(
-        national_target__in=targets,
+        national_target__in=targets.values("pk"),
         is_active=True,
-    ).select_related("framework_target", "framework_target__framework", "national_target")
+    )
     target_links = filter_target_framework_links_for_user(target_links, strict_user)
     if framework_filter:
         target_links = target_links.filter(framework_target__framework__code__in=framework_filter)
-    target_links = target_links.order_by(
-        "framework_target__framework__code",
-        "framework_target__code",
-        "framework_target__title",
-        "framework_target__uuid",
-    )
-    target_links = [
-        link
-        for link in target_links
-        if not requires_consent(link.framework_target)
-        or link.framework_target.uuid in framework_target_consent
-    ]
+    target_links = target_links.filter(
+        consent_visible_q(FrameworkTarget, instance, prefix="framework_target__")
+    ).order_by()
 
     indicator_links = IndicatorFrameworkIndicatorLink.objects.filter(
-        indicator__in=indicators,
+        indicator__in=indicators.values("pk"),
         is_active=True,
-    ).select_related("framework_indicator", "framework_indicator__framework", "indicator")
+    )
     indicator_links = filter_indicator_framework_links_for_user(indicator_links, strict_user)
     if framework_filter:
         indicator_links = indicator_links.filter(framework_indicator__framework__code__in=framework_filter)
-    indicator_links = indicator_links.order_by(
-        "framework_indicator__framework__code",
-        "framework_indicator__code",
-        "framework_indicator__title",
-        "framework_indicator__uuid",
-    )
-    indicator_links = [
-        link
-        for link in indicator_links
-        if not requires_consent(link.framework_indicator)
-        or link.framework_indicator.uuid in framework_indicator_consent
-    ]
+    indicator_links = indicator_links.filter(
+        consent_visible_q(FrameworkIndicator, instance, prefix="framework_indicator__")
+    ).order_by()
 
-    target_links_map = defaultdict(list)
-    for link in target_links:
-        target_links_map[link.national_target_id].append(link)
+    target_mapped_q = Exists(target_links.filter(national_target=OuterRef("pk")))
+    indicator_mapped_q = Exists(indicator_links.filter(indicator=OuterRef("pk")))
+    target_counts = targets.aggregate(total=Count("pk"), mapped=Count("pk", filter=Q(target_mapped_q)))
+    indicator_counts = indicators.aggregate(total=Count("pk"), mapped=Count("pk", filter=Q(indicator_mapped_q)))
 
-    indicator_links_map = defaultdict(list)
-    for link in indicator_links:
-        indicator_links_map[link.indicator_id].append(link)
+    orphans_targets = _item_dicts(targets.filter(~target_mapped_q))
+    orphans_indicators = _item_dicts(indicators.filter(~indicator_mapped_q))
 
-    mapped_target_ids = set(target_links_map.keys())
-    mapped_indicator_ids = set(indicator_links_map.keys())
+    framework_stats = {}
+    for row in _framework_counts(target_links, "framework_target"):
+        data = framework_stats.setdefault(row["framework_code"], _framework_entry(row))
+        data["targets"] = {
+            "mapped_links": row["mapped_links"],
+            "distinct_framework_targets_used": row["distinct_used"],
+        }
+    for row in _framework_counts(indicator_links, "framework_indicator"):
+        data = framework_stats.setdefault(row["framework_code"], _framework_entry(row))
+        data["indicators"] = {
+            "mapped_links": row["mapped_links"],
+            "distinct_framework_indicators_used": row["distinct_used"],
+        }
+    by_framework = sort_dicts(list(framework_stats.values()), "framework_code", "framework_title")
 
-    orphans_targets = []
-    orphans_indicators = []
     target_details = []
     indicator_details = []
-
-    for target in targets:
-        links = target_links_map.get(target.id, [])
-        if not links:
-            orphans_targets.append(
-                {"uuid": str(target.uuid), "code": target.code, "title": target.title}
-            )
-        if include_details:
-            linked_framework_targets = [
-                {
-                    "uuid": str(link.framework_target.uuid),
-                    "code": link.framework_target.code,
-                    "title": link.framework_target.title,
-                    "framework_code": link.framework_target.framework.code,
-                }
-                for link in links
-            ]
-            linked_framework_targets = sort_framework_link_dicts(linked_framework_targets)
-            target_details.append(
-                {
-                    "uuid": str(target.uuid),
-                    "code": target.code,
-                    "title": target.title,
-                    "mapped": bool(links),
-                    "linked_framework_targets": linked_framework_targets,
-                }
-            )
-
-    for indicator in indicators:
-        links = indicator_links_map.get(indicator.id, [])
-        if not links:
-            orphans_indicators.append(
-                {"uuid": str(indicator.uuid), "code": indicator.code, "title": indicator.title}
-            )
-        if include_details:
-            linked_framework_indicators = [
-                {
-                    "uuid": str(link.framework_indicator.uuid),
-                    "code": link.framework_indicator.code,
-                    "title": link.framework_indicator.title,
-                    "framework_code": link.framework_indicator.framework.code,
-                }
-                for link in links
-            ]
-            linked_framework_indicators = sort_framework_link_dicts(linked_framework_indicators)
-            indicator_details.append(
-                {
-                    "uuid": str(indicator.uuid),
-                    "code": indicator.code,
-                    "title": indicator.title,
-                    "mapped": bool(links),
-                    "linked_framework_indicators": linked_framework_indicators,
-                }
-            )
-
-    framework_stats = {}
-    for link in target_links:
-        framework = link.framework_target.framework
-        data = framework_stats.setdefault(
-            framework.code,
-            {
-                "framework_code": framework.code,
-                "framework_title": framework.title,
-                "targets": {"mapped_links": 0, "distinct_framework_targets_used": set()},
-                "indicators": {"mapped_links": 0, "distinct_framework_indicators_used": set()},
-            },
+    if include_details:
+        target_details = _coverage_details(
+            targets,
+            target_links,
+            "national_target_id",
+            "framework_target",
+            "linked_framework_targets",
         )
-        data["targets"]["mapped_links"] += 1
-        data["targets"]["distinct_framework_targets_used"].add(link.framework_target_id)
-
-    for link in indicator_links:
-        framework = link.framework_indicator.framework
-        data = framework_stats.setdefault(
-            framework.code,
-            {
-                "framework_code": framework.code,
-                "framework_title": framework.title,
-                "targets": {"mapped_links": 0, "distinct_framework_targets_used": set()},
-                "indicators": {"mapped_links": 0, "distinct_framework_indicators_used": set()},
-            },
-        )
-        data["indicators"]["mapped_links"] += 1
-        data["indicators"]["distinct_framework_indicators_used"].add(link.framework_indicator_id)
-
-    by_framework = []
-    for data in framework_stats.values():
-        by_framework.append(
-            {
-                "framework_code": data["framework_code"],
-                "framework_title": data["framework_title"],
-                "targets": {
-                    "mapped_links": data["targets"]["mapped_links"],
-                    "distinct_framework_targets_used": len(data["targets"]["distinct_framework_targets_used"]),
-                },
-                "indicators": {
-                    "mapped_links": data["indicators"]["mapped_links"],
-                    "distinct_framework_indicators_used": len(
-                        data["indicators"]["distinct_framework_indicators_used"]
-                    ),
-                },
-            }
+        indicator_details = _coverage_details(
+            indicators,
+            indicator_links,
+            "indicator_id",
+            "framework_indicator",
+            "linked_framework_indicators",
         )
-    by_framework = sort_dicts(by_framework, "framework_code", "framework_title")
 
-    target_mapped = sum(1 for target in targets if target.id in mapped_target_ids)
-    indicator_mapped = sum(1 for indicator in indicators if indicator.id in mapped_indicator_ids)
+    target_total, target_mapped = target_counts["total"], target_counts["mapped"]
+    indicator_total, indicator_mapped = indicator_counts["total"], indicator_counts["mapped"]
 
     generated_at = timezone.now().astimezone(dt_timezone.utc).isoformat()
 
@@ -379,11 +315,6 @@ def compute_alignment_coverage(
     else:
         selection_note = None
 
-    orphans_targets = sort_dicts(orphans_targets, "code", "title", "uuid")
-    orphans_indicators = sort_dicts(orphans_indicators, "code", "title", "uuid")
-    target_details = sort_dicts(target_details, "code", "title", "uuid")
-    indicator_details = sort_dicts(indicator_details, "code", "title", "uuid")
-
     return {
         "instance_uuid": str(instance.uuid),
         "scope": scope,
@@ -396,16 +327,16 @@ def compute_alignment_coverage(
         ],
         "summary": {
             "national_targets": {
-                "total": len(targets),
+                "total": target_total,
                 "mapped": target_mapped,
-                "unmapped": len(targets) - target_mapped,
-                "pct_mapped": _percent(target_mapped, len(targets)),
+                "unmapped": target_total - target_mapped,
+                "pct_mapped": _percent(target_mapped, target_total),
             },
             "indicators": {
-                "total": len(indicators),
+                "total": indicator_total,
                 "mapped": indicator_mapped,
-                "unmapped": len(indicators) - indicator_mapped,
-                "pct_mapped": _percent(indicator_mapped, len(indicators)),
+                "unmapped": indicator_total - indicator_mapped,
+                "pct_mapped": _percent(indicator_mapped, indicator_total),
             },
         },
         "by_framework": by_framework,
@@ -414,7 +345,62 @@ def compute_alignment_coverage(
             "indicators_unmapped": orphans_indicators,
         },
         "coverage_details": {
-            "national_targets": target_details if include_details else [],
-            "indicators": indicator_details if include_details else [],
+            "national_targets": target_details,
+            "indicators": indicator_details,
         },
     }
+
+
+def cached_alignment_coverage(
+    *,
+    user,
+    instance,
+    scope="selected",
+    framework_codes=None,
+    include_details=True,
+):
+    """
+    ``compute_alignment_coverage`` cached per instance workspace version, user and filters.
+
+    Link and consent writes bump their input versions, and progress and
+    approval writes bump ``workspace_version``; the timeout bounds how long
+    registry status, sensitivity or role changes take to show up.
+    """
+
+    timeout = int(getattr(settings, "ALIGNMENT_COVERAGE_CACHE_SECONDS", 300) or 0)
+    if not timeout or not instance:
+        return compute_alignment_coverage(
+            user=user,
+            instance=instance,
+            scope=scope,
+            framework_codes=framework_codes,
+            include_details=include_details,
+        )
+    versions = get_input_versions([("alignment_link", TABLE_WIDE_SCOPE), ("consent_record", TABLE_WIDE_SCOPE)])
+    updated_at = instance.updated_at.timestamp() if instance.updated_at else 0
+    key = ":".join(
+        str(part)
+        for part in (
+            "alignment_coverage",
+            instance.pk,
+            instance.workspace_version,
+            updated_at,
+            versions[("alignment_link", TABLE_WIDE_SCOPE)],
+            versions[("consent_record", TABLE_WIDE_SCOPE)],
+            getattr(user, "pk", None) or "anon",
+            scope,
+            ",".join(sorted(code for code in (framework_codes or []) if code)),
+            int(bool(include_details)),
+        )
+    )
+    value = cache.get(key)
+    if value is None:
+        value = compute_alignment_coverage(
+            user=user,
+            instance=instance,
+            scope=scope,
+            framework_codes=framework_codes,
+            include_details=include_details,
+        )
+        cache.set(key, value, timeout=timeout)
+    return value
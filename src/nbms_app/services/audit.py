@@ -102,7 +102,7 @@ def _request_metadata(request):
     }
 
 
-def record_event(actor, event_type, obj=None, object_ref=None, metadata=None, request=None):
+def build_event(actor, event_type, obj=None, object_ref=None, metadata=None, request=None):
     request = request or get_current_request()
     if actor is None and request and getattr(request, "user", None) and request.user.is_authenticated:
         actor = request.user
@@ -128,7 +128,7 @@ def record_event(actor, event_type, obj=None, object_ref=None, metadata=None, re
     payload = _sanitize_metadata(payload)
 
     request_meta = _request_metadata(request)
-    AuditEvent.objects.create(
+    return AuditEvent(
         actor=actor,
         action=event_type,
         event_type=event_type,
@@ -146,6 +146,12 @@ def record_event(actor, event_type, obj=None, object_ref=None, metadata=None, re
     )
 
 
+def record_event(actor, event_type, obj=None, object_ref=None, metadata=None, request=None):
+    event = build_event(actor, event_type, obj=obj, object_ref=object_ref, metadata=metadata, request=request)
+    event.save(force_insert=True)
+    return event
+
+
 def record_audit_event(actor, action, obj, metadata=None, request=None):
     record_event(actor, action, obj=obj, metadata=metadata, request=request)
 
@@ -1,4 +1,5 @@
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import Q
 from django.utils import timezone
 
 from nbms_app.models import ConsentRecord, ConsentStatus, SensitivityLevel
@@ -10,6 +11,34 @@ def requires_consent(obj):
     return getattr(obj, "sensitivity", None) == SensitivityLevel.IPLC_SENSITIVE or getattr(obj, "consent_required", False)
 
 
+def consent_visible_q(model, instance, *, prefix=""):
+    """
+    ``Q`` keeping ``model`` rows that need no consent or whose consent is granted.
+
+    The SQL counterpart of ``requires_consent`` plus a granted ``ConsentRecord``
+    for ``instance`` or for all instances; ``prefix`` applies it across a
+    relation (``"framework_target__"``).
+    """
+
+    field_names = {field.name for field in model._meta.get_fields()}
+    requires = Q()
+    if "sensitivity" in field_names:
+        requires |= Q(**{f"{prefix}sensitivity": SensitivityLevel.IPLC_SENSITIVE})
+    if "consent_required" in field_names:
+        requires |= Q(**{f"{prefix}consent_required": True})
+    if not requires:
+        return Q()
+    granted = ConsentRecord.objects.filter(
+        content_type=ContentType.objects.get_for_model(model),
+        status=ConsentStatus.GRANTED,
+    )
+    if instance:
+        granted = granted.filter(Q(reporting_instance=instance) | Q(reporting_instance__isnull=True))
+    else:
+        granted = granted.filter(reporting_instance__isnull=True)
+    return ~requires | Q(**{f"{prefix}uuid__in": granted.values("object_uuid")})
+
+
 def consent_is_granted(instance, obj):
     content_type = ContentType.objects.get_for_model(obj.__class__)
     return ConsentRecord.objects.filter(
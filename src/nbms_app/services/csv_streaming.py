@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import tempfile
+from io import StringIO
+from typing import Iterable, Iterator
+
+from django.core.files import File
+
+
+DEFAULT_ROWS_PER_CHUNK = 500
+DEFAULT_QUERY_CHUNK_SIZE = 2000
+SPOOL_MAX_MEMORY_BYTES = 4 * 1024 * 1024
+
+
+def json_cell(value) -> str:
+    """Serialize a JSON field for a CSV cell, skipping the encoder for empty values."""
+
+    if not value:
+        return "{}"
+    return json.dumps(value, sort_keys=True, ensure_ascii=True)
+
+
+def iter_csv_chunks(header: list[str] | None, rows: Iterable, *, rows_per_chunk: int = DEFAULT_ROWS_PER_CHUNK) -> Iterator[bytes]:
+    """
+    Encode ``rows`` as UTF-8 CSV and yield it in chunks of ``rows_per_chunk`` rows.
+
+    Only one chunk is held in memory at a time, so the caller can feed the
+    output to a streaming response, a file or storage without materialising
+    the whole document.
+    """
+
+    buffer = StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(header)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+class HashingSpool:
+    """
+    Spooled temporary file that tracks size and SHA-256 while chunks are written.
+
+    Content stays in memory up to ``SPOOL_MAX_MEMORY_BYTES`` and rolls over to
+    disk beyond that, which keeps large exports at bounded memory while still
+    producing the hash/size metadata stored on download records.
+    """
+
+    def __init__(self, max_memory_bytes: int = SPOOL_MAX_MEMORY_BYTES):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes, mode="w+b")
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> int:
+        self._file.write(chunk)
+        self._digest.update(chunk)
+        self.size += len(chunk)
+        return len(chunk)
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
+    def as_file(self, name: str) -> File:
+        self._file.seek(0)
+        return File(self._file, name=name)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def tee_chunks(chunks: Iterable[bytes], spool: HashingSpool) -> Iterator[bytes]:
+    """Yield ``chunks`` unchanged while copying each one into ``spool``."""
+
+    for chunk in chunks:
+        spool.write(chunk)
+        yield chunk
+
+
+def write_chunks(handle, chunks: Iterable[bytes]) -> int:
+    size = 0
+    for chunk in chunks:
+        handle.write(chunk)
+        size += len(chunk)
+    return size
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import copy
+import logging
+import threading
+import xml.etree.ElementTree as ElementTree
+from io import BytesIO
+from zipfile import ZipFile
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from nbms_app.services.metrics import observe_background_job
+from nbms_app.services.pdf_rendering import PdfRenderError, get_render_pool
+
+
+logger = logging.getLogger(__name__)
+
+RENDER_MODE_PROCESS = "process"
+RENDER_MODE_INLINE = "inline"
+
+W_NAMESPACE = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_W = f"{{{W_NAMESPACE}}}"
+
+# Run children that contribute text, as python-docx maps them in ``Paragraph.text``.
+_RUN_TEXT = {
+    f"{_W}t": None,
+    f"{_W}tab": "\t",
+    f"{_W}ptab": "\t",
+    f"{_W}cr": "\n",
+    f"{_W}noBreakHyphen": "-",
+}
+
+_BASE = None
+_BASE_LOCK = threading.Lock()
+
+
+def _load_base():
+    """Parse the python-docx default template once and index its paragraph style ids by name."""
+
+    global _BASE
+    with _BASE_LOCK:
+        if _BASE is None:
+            try:
+                from docx import Document  # noqa: WPS433
+                from docx.enum.style import WD_STYLE_TYPE  # noqa: WPS433
+            except Exception as exc:  # noqa: BLE001
+                raise ValidationError(f"DOCX renderer dependency missing: {exc}") from exc
+            document = Document()
+            style_ids = {
+                style.name: style.style_id
+                for style in document.styles
+                if style.type == WD_STYLE_TYPE.PARAGRAPH
+            }
+            _BASE = (document, style_ids)
+        return _BASE
+
+
+class DocxBuilder:
+    """
+    A document cloned from the pre-loaded base template.
+
+    Styles are applied by id from the template's index; python-docx resolves
+    a style name by scanning every style on each ``add_paragraph`` call,
+    which dominates the cost of large reports.
+    """
+
+    def __init__(self):
+        base, self._style_ids = _load_base()
+        self.document = copy.deepcopy(base)
+        self._body = self.document.element.body
+
+    def paragraph(self, text="", style=None):
+        paragraph = self.document.add_paragraph(text)
+        if style:
+            paragraph._p.style = self._style_ids.get(style, style)  # noqa: SLF001
+        return paragraph
+
+    def heading(self, text, level=1):
+        return self.paragraph(text, style="Title" if level == 0 else f"Heading {level}")
+
+    def add_blocks(self, blocks):
+        for kind, text, option in blocks:
+            if kind == "heading":
+                self.heading(text, level=option)
+            else:
+                self.paragraph(text, style=option)
+
+    def body_fragment(self):
+        from lxml import etree  # noqa: WPS433
+
+        return b"".join(
+            etree.tostring(child)
+            for child in self._body.iterchildren()
+            if child.tag != f"{_W}sectPr"
+        )
+
+    def append_fragment(self, fragment):
+        from docx.oxml import parse_xml  # noqa: WPS433
+
+        if not fragment:
+            return
+        wrapper = parse_xml(f'<w:body xmlns:w="{W_NAMESPACE}">'.encode("utf-8") + fragment + b"</w:body>")
+        section_properties = self._body.sectPr
+        for child in list(wrapper):
+            if section_properties is not None:
+                section_properties.addprevious(child)
+            else:
+                self._body.append(child)
+
+    def to_bytes(self):
+        output = BytesIO()
+        self.document.save(output)
+        return output.getvalue()
+
+
+def render_body_fragment(blocks):
+    """Build ``blocks`` into body XML on a fresh template clone; runs on render workers."""
+
+    builder = DocxBuilder()
+    builder.add_blocks(blocks)
+    return builder.body_fragment()
+
+
+def _render_mode():
+    return str(getattr(settings, "DOCX_RENDER_MODE", RENDER_MODE_PROCESS) or RENDER_MODE_PROCESS).lower()
+
+
+def _parallel_min_blocks():
+    return int(getattr(settings, "DOCX_PARALLEL_MIN_BLOCKS", 5000) or 0)
+
+
+def render_section_fragments(sections):
+    """
+    Render each section's blocks to a body fragment, in order.
+
+    Reports with at least ``DOCX_PARALLEL_MIN_BLOCKS`` blocks fan the
+    sections out to the shared render worker pool; a section that cannot be
+    queued or whose worker fails is rendered inline instead.
+    """
+
+    total_blocks = sum(len(blocks) for blocks in sections)
+    threshold = _parallel_min_blocks()
+    if _render_mode() == RENDER_MODE_INLINE or len(sections) < 2 or not threshold or total_blocks < threshold:
+        return [render_body_fragment(blocks) for blocks in sections]
+
+    pool = get_render_pool()
+    timeout = float(getattr(settings, "PDF_RENDER_TIMEOUT_SECONDS", 120) or 0) or None
+    futures = []
+    for blocks in sections:
+        try:
+            futures.append(pool.submit_call(render_body_fragment, blocks, job="docx_render"))
+        except PdfRenderError:
+            futures.append(None)
+    fragments = []
+    for blocks, future in zip(sections, futures):
+        fragment = None
+        if future is not None:
+            try:
+                fragment = pool.wait(future, timeout=timeout)
+                observe_background_job("docx_render", "succeeded")
+            except PdfRenderError as exc:
+                logger.warning("DOCX section render failed on worker (%s); rendering inline.", exc)
+                observe_background_job("docx_render", "failed")
+        fragments.append(fragment if fragment is not None else render_body_fragment(blocks))
+    return fragments
+
+
+def iter_docx_paragraph_text(content_bytes):
+    """
+    Yield the text of each top-level paragraph in a DOCX document.
+
+    Only ``word/document.xml`` is read, streamed through ``iterparse`` and
+    cleared paragraph by paragraph, so uploads are not loaded as a full
+    python-docx package. Text matches ``Document(...).paragraphs[i].text``.
+    """
+
+    with ZipFile(BytesIO(content_bytes)) as archive, archive.open("word/document.xml") as handle:
+        path = []
+        parts = []
+        for event, element in ElementTree.iterparse(handle, events=("start", "end")):
+            if event == "start":
+                path.append(element.tag)
+                continue
+            path.pop()
+            tag = element.tag
+            if tag in _RUN_TEXT and _in_body_paragraph_run(path):
+                parts.append(_RUN_TEXT[tag] if _RUN_TEXT[tag] is not None else element.text or "")
+            elif tag == f"{_W}br" and _in_body_paragraph_run(path):
+                if element.get(f"{_W}type", "textWrapping") == "textWrapping":
+                    parts.append("\n")
+            elif path and path[-1] == f"{_W}body":
+                if tag == f"{_W}p":
+                    yield "".join(parts)
+                parts = []
+                element.clear()
+
+
+def _in_body_paragraph_run(path):
+    # path ends at the run: body/p/r or body/p/hyperlink/r
+    if len(path) < 3 or path[-1] != f"{_W}r":
+        return False
+    if path[-2] == f"{_W}p":
+        return path[-3] == f"{_W}body"
+    return len(path) >= 4 and path[-2] == f"{_W}hyperlink" and path[-3] == f"{_W}p" and path[-4] == f"{_W}body"
+
+
+def extract_docx_text(content_bytes):
+    lines = [text.strip() for text in iter_docx_paragraph_text(content_bytes) if text.strip()]
+    return "\n".join(lines)
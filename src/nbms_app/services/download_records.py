@@ -34,6 +34,13 @@ from nbms_app.models import (
     TaxonConcept,
 )
 from nbms_app.services.catalog_access import filter_monitoring_programmes_for_user
+from nbms_app.services.csv_streaming import (
+    DEFAULT_QUERY_CHUNK_SIZE,
+    HashingSpool,
+    iter_csv_chunks,
+    json_cell,
+    tee_chunks,
+)
 from nbms_app.services.metrics import observe_download_created, observe_export_request
 from nbms_app.services.authorization import (
     ROLE_ADMIN,
@@ -54,6 +61,7 @@ from nbms_app.services.report_products import (
 )
 from nbms_app.services.reporting_exports import (
     build_cbd_report_payload,
+    cbd_report_fingerprint,
     render_cbd_docx_bytes,
     render_cbd_pdf_bytes,
 )
@@ -95,17 +103,12 @@ def _storage_path(record_uuid: UUID, file_name: str) -> str:
     return f"downloads/{record_uuid}/{file_name}"
 
 
-def _store_asset(record: DownloadRecord, *, file_name: str, content_type: str, content_bytes: bytes) -> DownloadRecord:
-    safe_name = _safe_filename(file_name, "download.bin")
-    storage_path = _storage_path(record.uuid, safe_name)
-    if default_storage.exists(storage_path):
-        default_storage.delete(storage_path)
-    default_storage.save(storage_path, ContentFile(content_bytes))
+def _mark_asset_ready(record: DownloadRecord, *, storage_path: str, file_name: str, content_type: str, size: int, file_hash: str) -> DownloadRecord:
     record.file_asset_path = storage_path
-    record.file_asset_name = safe_name
+    record.file_asset_name = file_name
     record.file_content_type = content_type
-    record.file_size_bytes = len(content_bytes)
-    record.file_hash = _sha256_bytes(content_bytes)
+    record.file_size_bytes = size
+    record.file_hash = file_hash
     record.status = DownloadRecordStatus.READY
     record.save(
         update_fields=[
@@ -121,6 +124,81 @@ def _store_asset(record: DownloadRecord, *, file_name: str, content_type: str, c
     return record
 
 
+def _prepare_storage_path(record: DownloadRecord, file_name: str) -> tuple[str, str]:
+    safe_name = _safe_filename(file_name, "download.bin")
+    storage_path = _storage_path(record.uuid, safe_name)
+    if default_storage.exists(storage_path):
+        default_storage.delete(storage_path)
+    return storage_path, safe_name
+
+
+def _store_asset(record: DownloadRecord, *, file_name: str, content_type: str, content_bytes: bytes) -> DownloadRecord:
+    storage_path, safe_name = _prepare_storage_path(record, file_name)
+    default_storage.save(storage_path, ContentFile(content_bytes))
+    return _mark_asset_ready(
+        record,
+        storage_path=storage_path,
+        file_name=safe_name,
+        content_type=content_type,
+        size=len(content_bytes),
+        file_hash=_sha256_bytes(content_bytes),
+    )
+
+
+def _store_spooled_asset(record: DownloadRecord, *, file_name: str, content_type: str, spool: HashingSpool) -> DownloadRecord:
+    storage_path, safe_name = _prepare_storage_path(record, file_name)
+    default_storage.save(storage_path, spool.as_file(safe_name))
+    return _mark_asset_ready(
+        record,
+        storage_path=storage_path,
+        file_name=safe_name,
+        content_type=content_type,
+        size=spool.size,
+        file_hash=spool.sha256,
+    )
+
+
+def _store_build_asset(record: DownloadRecord, build: dict) -> DownloadRecord:
+    if "content_chunks" not in build:
+        return _store_asset(
+            record,
+            file_name=build["file_name"],
+            content_type=build["content_type"],
+            content_bytes=build["content_bytes"],
+        )
+    spool = HashingSpool()
+    try:
+        for chunk in build["content_chunks"]:
+            spool.write(chunk)
+        return _store_spooled_asset(record, file_name=build["file_name"], content_type=build["content_type"], spool=spool)
+    finally:
+        spool.close()
+
+
+def _stream_build_asset(record: DownloadRecord, build: dict):
+    chunks = build.get("content_chunks")
+    if chunks is None:
+        chunks = [build["content_bytes"]]
+    spool = HashingSpool()
+    stored = False
+    try:
+        yield from tee_chunks(chunks, spool)
+        _store_spooled_asset(record, file_name=build["file_name"], content_type=build["content_type"], spool=spool)
+        stored = True
+    finally:
+        spool.close()
+        # A client disconnecting mid-stream closes the generator; do not leave the record pending.
+        if not stored:
+            _mark_failed(record, "Download stream ended before the export completed.")
+
+
+def _mark_failed(record: DownloadRecord, error_message: str) -> DownloadRecord:
+    record.status = DownloadRecordStatus.FAILED
+    record.error_message = error_message
+    record.save(update_fields=["status", "error_message", "updated_at"])
+    return record
+
+
 def _access_level_for_sensitivity(sensitivity: str) -> str:
     if sensitivity == SensitivityLevel.PUBLIC:
         return AccessLevel.PUBLIC
@@ -175,6 +253,66 @@ def _normalise_query_snapshot(value):
     return value if isinstance(value, dict) else {}
 
 
+INDICATOR_SERIES_CSV_HEADER = [
+    "indicator_uuid",
+    "indicator_code",
+    "indicator_title",
+    "series_uuid",
+    "series_title",
+    "year",
+    "value_numeric",
+    "value_text",
+    "spatial_resolution",
+    "spatial_unit_code",
+    "spatial_unit_name",
+    "spatial_layer_code",
+    "disaggregation_json",
+]
+
+
+def _indicator_series_csv_rows(indicator: Indicator, points_qs):
+    indicator_prefix = (str(indicator.uuid), indicator.code, indicator.title)
+    projection = points_qs.values_list(
+        "series__uuid",
+        "series__title",
+        "year",
+        "value_numeric",
+        "value_text",
+        "spatial_resolution",
+        "series__spatial_resolution",
+        "spatial_unit__unit_code",
+        "spatial_unit__name",
+        "spatial_layer__layer_code",
+        "disaggregation",
+    )
+    for (
+        series_uuid,
+        series_title,
+        year,
+        value_numeric,
+        value_text,
+        spatial_resolution,
+        series_spatial_resolution,
+        spatial_unit_code,
+        spatial_unit_name,
+        spatial_layer_code,
+        disaggregation,
+    ) in projection.iterator(chunk_size=DEFAULT_QUERY_CHUNK_SIZE):
+        yield (
+            *indicator_prefix,
+            str(series_uuid),
+            series_title,
+            year,
+            value_numeric if value_numeric is not None else "",
+            value_text or "",
+            spatial_resolution or series_spatial_resolution or "",
+            spatial_unit_code or "",
+            spatial_unit_name or "",
+            spatial_layer_code or "",
+            json_cell(disaggregation),
+        )
+
+
 def _build_indicator_series_export(*, user, indicator_uuid: UUID, query_snapshot: dict):
     indicator = filter_queryset_for_user(
         Indicator.objects.select_related("national_target"),
@@ -187,7 +325,6 @@ def _build_indicator_series_export(*, user, indicator_uuid: UUID, query_snapshot
     points_qs = (
         indicator_data_points_for_user(user)
         .filter(series__in=indicator_data_series_for_user(user).filter(indicator=indicator))
-        .select_related("series", "spatial_unit", "spatial_layer")
         .order_by("year", "series__title", "id")
     )
     year_from = query_snapshot.get("year_from")
@@ -200,43 +337,7 @@ def _build_indicator_series_export(*, user, indicator_uuid: UUID, query_snapshot
     except (TypeError, ValueError):
         pass
 
-    writer_buffer = StringIO()
-    writer = csv.writer(writer_buffer)
-    writer.writerow(
-        [
-            "indicator_uuid",
-            "indicator_code",
-            "indicator_title",
-            "series_uuid",
-            "series_title",
-            "year",
-            "value_numeric",
-            "value_text",
-            "spatial_resolution",
-            "spatial_unit_code",
-            "spatial_unit_name",
-            "spatial_layer_code",
-            "disaggregation_json",
-        ]
-    )
-    for point in points_qs:
-        writer.writerow(
-            [
-                str(indicator.uuid),
-                indicator.code,
-                indicator.title,
-                str(point.series.uuid),
-                point.series.title,
-                point.year,
-                point.value_numeric if point.value_numeric is not None else "",
-                point.value_text or "",
-                point.spatial_resolution or point.series.spatial_resolution or "",
-                point.spatial_unit.unit_code if point.spatial_unit_id else "",
-                point.spatial_unit.name if point.spatial_unit_id else "",
-                point.spatial_layer.layer_code if point.spatial_layer_id else "",
-                json.dumps(point.disaggregation or {}, sort_keys=True, ensure_ascii=True),
-            ]
-        )
+    content_chunks = iter_csv_chunks(INDICATOR_SERIES_CSV_HEADER, _indicator_series_csv_rows(indicator, points_qs))
 
     dataset_links = IndicatorDatasetLink.objects.filter(indicator=indicator).select_related("dataset")
     visible_datasets = filter_queryset_for_user(
@@ -272,7 +373,7 @@ def _build_indicator_series_export(*, user, indicator_uuid: UUID, query_snapshot
         "contributing_sources": contributing_sources,
         "file_name": f"{indicator.code.lower()}-series.csv",
         "content_type": "text/csv; charset=utf-8",
-        "content_bytes": writer_buffer.getvalue().encode("utf-8"),
+        "content_chunks": content_chunks,
     }
 
 
@@ -348,16 +449,22 @@ def _build_report_export(*, user, instance_uuid: UUID, query_snapshot: dict):
     if fmt not in {"pdf", "docx", "json"}:
         raise ValidationError("Unsupported report export format.")
 
-    payload = build_cbd_report_payload(instance=instance)
     if fmt == "pdf":
-        content_bytes = render_cbd_pdf_bytes(payload=payload)
+        content_bytes = render_cbd_pdf_bytes(
+            payload=lambda: build_cbd_report_payload(instance=instance),
+            fingerprint=cbd_report_fingerprint(instance),
+        )
         content_type = "application/pdf"
         extension = "pdf"
     elif fmt == "docx":
-        content_bytes = render_cbd_docx_bytes(payload=payload)
+        content_bytes = render_cbd_docx_bytes(
+            payload=lambda: build_cbd_report_payload(instance=instance),
+            fingerprint=cbd_report_fingerprint(instance),
+        )
         content_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
         extension = "docx"
     else:
+        payload = build_cbd_report_payload(instance=instance)
         content_bytes = json.dumps(payload, sort_keys=True, ensure_ascii=True).encode("utf-8")
         content_type = "application/json"
         extension = "json"
@@ -696,7 +803,7 @@ def _parse_uuid(raw_value):
         raise ValidationError("Invalid object_uuid.")
 
 
-def create_download_record_from_payload(*, user, payload: dict) -> DownloadRecord:
+def _resolve_download_build(*, user, payload: dict):
     if not isinstance(payload, dict):
         raise ValidationError("Payload must be an object.")
 
@@ -733,6 +840,10 @@ def create_download_record_from_payload(*, user, payload: dict) -> DownloadRecor
             query_snapshot=query_snapshot,
         )
 
+    return record_type, query_snapshot, regen_params, build
+
+
+def _create_build_record(*, user, record_type: str, query_snapshot: dict, regen_params: dict, build: dict) -> DownloadRecord:
     actor = user if getattr(user, "is_authenticated", False) else None
     record = DownloadRecord.objects.create(
         created_by=actor,
@@ -750,12 +861,62 @@ def create_download_record_from_payload(*, user, payload: dict) -> DownloadRecor
     record.save(update_fields=["citation_id", "citation_text", "updated_at"])
     observe_download_created(record_type=record.record_type)
     observe_export_request(export_type=record.record_type)
-    return _store_asset(
-        record,
-        file_name=build["file_name"],
-        content_type=build["content_type"],
-        content_bytes=build["content_bytes"],
+    return record
+
+
+def _build_download_from_payload(*, user, payload: dict):
+    record_type, query_snapshot, regen_params, build = _resolve_download_build(user=user, payload=payload)
+    record = _create_build_record(
+        user=user,
+        record_type=record_type,
+        query_snapshot=query_snapshot,
+        regen_params=regen_params,
+        build=build,
+    )
+    return record, build
+
+
+def create_download_record_from_payload(*, user, payload: dict) -> DownloadRecord:
+    record, build = _build_download_from_payload(user=user, payload=payload)
+    return _store_build_asset(record, build)
+
+
+def stream_download_record_from_payload(*, user, payload: dict) -> dict:
+    """
+    Build a download and return its content as a chunk iterator.
+
+    For signed-in users a download record is created and the chunks are
+    copied into storage as they are consumed, so a ``StreamingHttpResponse``
+    can serve the export while the stored asset (and its hash/size) is
+    written in the same pass. The record is marked ready once the iterator is
+    exhausted, or failed if it is closed early. Anonymous downloads are
+    streamed without a record (``record`` is ``None``), so a public GET
+    writes nothing.
+    """
+
+    record_type, query_snapshot, regen_params, build = _resolve_download_build(user=user, payload=payload)
+    if not getattr(user, "is_authenticated", False):
+        observe_export_request(export_type=record_type)
+        chunks = build.get("content_chunks")
+        return {
+            "record": None,
+            "file_name": _safe_filename(build["file_name"], "download.bin"),
+            "content_type": build["content_type"],
+            "chunks": [build["content_bytes"]] if chunks is None else chunks,
+        }
+    record = _create_build_record(
+        user=user,
+        record_type=record_type,
+        query_snapshot=query_snapshot,
+        regen_params=regen_params,
+        build=build,
     )
+    return {
+        "record": record,
+        "file_name": _safe_filename(build["file_name"], "download.bin"),
+        "content_type": build["content_type"],
+        "chunks": _stream_build_asset(record, build),
+    }
 
 
 def create_download_record_with_asset(
@@ -0,0 +1,101 @@
+from django.core.exceptions import ValidationError
+
+from nbms_app.models import FrameworkTarget, NationalTarget
+from nbms_app.services.consent import requires_consent
+from nbms_app.services.readiness import (
+    _approved_ids,
+    _consent_granted_uuids,
+    check_release_readiness,
+    compute_release_readiness_report,
+    get_instance_readiness,
+)
+from nbms_app.services.section_progress import scoped_framework_targets, scoped_national_targets
+
+
+class ExportBuildContext:
+    """
+    Scoping, readiness, approval and consent lookups for one instance and user.
+
+    Each lookup runs once and is reused by everything that takes the context
+    (``assert_instance_exportable``, the ORT NR7 v2 builder, snapshots, the
+    NR7 builder and the review pack), instead of every step repeating the
+    same readiness and scoping queries. A context is meant to live for one
+    build; create a new one after the underlying records change.
+    """
+
+    def __init__(self, instance, user):
+        self.instance = instance
+        self.user = user
+        self._memo = {}
+
+    def _memoize(self, key, compute):
+        if key not in self._memo:
+            try:
+                self._memo[key] = (compute(), None)
+            except ValidationError as exc:
+                self._memo[key] = (None, exc)
+        value, error = self._memo[key]
+        if error is not None:
+            raise error
+        return value
+
+    def national_target_ids(self):
+        return self._memoize(
+            "national_target_ids",
+            lambda: list(scoped_national_targets(self.instance, self.user).values_list("id", flat=True)),
+        )
+
+    def framework_target_ids(self):
+        return self._memoize(
+            "framework_target_ids",
+            lambda: list(scoped_framework_targets(self.instance, self.user).values_list("id", flat=True)),
+        )
+
+    def scoped_national_targets(self):
+        return (
+            NationalTarget.objects.filter(id__in=self.national_target_ids())
+            .select_related("organisation", "created_by")
+            .order_by("code")
+        )
+
+    def scoped_framework_targets(self):
+        return (
+            FrameworkTarget.objects.filter(id__in=self.framework_target_ids())
+            .select_related("framework", "organisation", "created_by")
+            .order_by("framework__code", "code")
+        )
+
+    def instance_readiness(self):
+        return self._memoize(
+            "instance_readiness",
+            lambda: get_instance_readiness(self.instance, self.user, context=self),
+        )
+
+    def release_readiness(self):
+        """``(report, summary)`` from ``compute_release_readiness_report``; it does not depend on the user."""
+
+        return self._memoize("release_readiness", lambda: compute_release_readiness_report(self.instance))
+
+    def validated_release_readiness(self):
+        report, summary = self.release_readiness()
+        check_release_readiness(report, summary)
+        return report, summary
+
+    def approved_uuids(self, model):
+        return self._memoize(("approved_uuids", model), lambda: set(_approved_ids(self.instance, model)))
+
+    def approved_queryset(self, model):
+        """Same rows as ``instance_approvals.approved_queryset(instance, model)``."""
+
+        return model.objects.filter(uuid__in=self.approved_uuids(model))
+
+    def consent_granted_uuids(self, model):
+        return self._memoize(
+            ("consent_granted_uuids", model),
+            lambda: _consent_granted_uuids(self.instance, model),
+        )
+
+    def consent_cleared(self, obj):
+        """Same answer as ``not requires_consent(obj) or consent_is_granted(instance, obj)``."""
+
+        return not requires_consent(obj) or obj.uuid in self.consent_granted_uuids(obj.__class__)
@@ -18,37 +18,36 @@ from nbms_app.models import (
 from nbms_app.services.audit import record_audit_event, suppress_audit_events
 from nbms_app.services.authorization import ROLE_DATA_STEWARD, ROLE_SECRETARIAT, is_system_admin, user_has_role
 from nbms_app.services.consent import consent_is_granted
+from nbms_app.services.export_context import ExportBuildContext
 from nbms_app.services.instance_approvals import approved_queryset
 from nbms_app.services.metrics import inc_counter
 from nbms_app.services.notifications import create_notification
-from nbms_app.services.readiness import (
-    compute_release_readiness_report,
-    get_instance_readiness,
-    validate_release_readiness,
-)
+from nbms_app.services.readiness import compute_release_readiness_report, validate_release_readiness
 
 
 def _is_admin(user):
     return bool(user and is_system_admin(user))
 
 
-def assert_instance_exportable(instance, user):
+def assert_instance_exportable(instance, user, context=None):
     if not instance:
         raise ValidationError("Reporting instance is required for exports.")
     if not user or not getattr(user, "is_authenticated", False):
         raise PermissionDenied("Authentication required.")
 
-    readiness = get_instance_readiness(instance, user)
+    if context is None:
+        context = ExportBuildContext(instance, user)
+    readiness = context.instance_readiness()
     blockers = readiness.get("blockers", [])
     if blockers:
         messages = "; ".join(blocker.get("message", "") for blocker in blockers if blocker)
         raise ValidationError(messages or "Export blocked by readiness checks.")
 
     if getattr(settings, "EXPORT_REQUIRE_READINESS", False):
-        readiness_report, _summary = validate_release_readiness(instance)
+        readiness_report, _summary = context.validated_release_readiness()
     else:
         try:
-            readiness_report, _summary = compute_release_readiness_report(instance)
+            readiness_report, _summary = context.release_readiness()
         except ValidationError:
             readiness_report = {}
     readiness.setdefault("details", {})["readiness_report"] = readiness_report
@@ -1,13 +1,9 @@
 from collections import defaultdict
 from datetime import timezone as dt_timezone
 
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q
 from django.utils import timezone
 
 from nbms_app.models import (
-    ConsentRecord,
-    ConsentStatus,
     DatasetRelease,
     FrameworkIndicator,
     FrameworkTarget,
@@ -25,7 +21,7 @@ from nbms_app.services.alignment import filter_indicator_framework_links_for_use
 from nbms_app.services.alignment_coverage import get_selected_targets_and_indicators
 from nbms_app.services.alignment_ordering import sort_dicts, sort_model_items
 from nbms_app.services.authorization import filter_queryset_for_user, is_system_admin
-from nbms_app.services.consent import requires_consent
+from nbms_app.services.consent import consent_visible_q
 from nbms_app.services.indicator_data import indicator_data_series_for_user
 from nbms_app.services.instance_approvals import approved_queryset
 
@@ -50,24 +46,6 @@ def _strict_user(user):
     return user
 
 
-def _consent_granted_uuids(instance, model):
-    content_type = ContentType.objects.get_for_model(model)
-    qs = ConsentRecord.objects.filter(content_type=content_type, status=ConsentStatus.GRANTED)
-    if instance:
-        qs = qs.filter(Q(reporting_instance=instance) | Q(reporting_instance__isnull=True))
-    else:
-        qs = qs.filter(reporting_instance__isnull=True)
-    return set(qs.values_list("object_uuid", flat=True))
-
-
-def _apply_consent_filter(items, consent_granted):
-    filtered = []
-    for obj in items:
-        if not requires_consent(obj) or obj.uuid in consent_granted:
-            filtered.append(obj)
-    return filtered
-
-
 def _percent(part, total):
     if not total:
         return 0.0
@@ -114,82 +92,43 @@ def compute_hl21_1_gap_analysis(
     indicator_level = _indicator_level_value(indicator_level) or FrameworkIndicatorType.HEADLINE
 
     selection_source = None
-    selected_targets = []
-    selected_indicators = []
-
     if scope == "selected":
         targets_qs, indicators_qs, selection_source = get_selected_targets_and_indicators(
             instance=instance,
             user=user,
         )
-        target_consent = _consent_granted_uuids(instance, NationalTarget)
-        indicator_consent = _consent_granted_uuids(instance, Indicator)
-        selected_targets = _apply_consent_filter(list(targets_qs), target_consent)
-        selected_indicators = _apply_consent_filter(list(indicators_qs), indicator_consent)
-    else:
-        target_consent = _consent_granted_uuids(instance, NationalTarget)
-        indicator_consent = _consent_granted_uuids(instance, Indicator)
-        selected_targets = []
-        selected_indicators = []
-
-    framework_target_consent = _consent_granted_uuids(instance, FrameworkTarget)
-    framework_indicator_consent = _consent_granted_uuids(instance, FrameworkIndicator)
-
-    if scope == "selected":
-        if not selected_targets:
-            framework_indicators = []
-        else:
-            target_links = NationalTargetFrameworkTargetLink.objects.filter(
-                national_target__in=selected_targets,
-                is_active=True,
-            ).select_related("framework_target", "framework_target__framework", "framework_target__goal")
-            target_links = filter_target_framework_links_for_user(target_links, strict_user)
-            target_links = [
-                link
-                for link in target_links
-                if not requires_consent(link.framework_target)
-                or link.framework_target.uuid in framework_target_consent
-            ]
-            framework_target_ids = {link.framework_target_id for link in target_links}
-            framework_indicators_qs = FrameworkIndicator.objects.filter(
-                framework_target_id__in=framework_target_ids,
-                status=LifecycleStatus.PUBLISHED,
-            ).select_related("framework", "framework_target", "framework_target__goal")
-            if framework_code:
-                framework_indicators_qs = framework_indicators_qs.filter(
-                    framework__code=framework_code
-                )
-            if indicator_level:
-                framework_indicators_qs = framework_indicators_qs.filter(
-                    indicator_type=indicator_level
-                )
-            framework_indicators_qs = filter_queryset_for_user(
-                framework_indicators_qs,
-                user,
-            )
-            framework_indicators = _apply_consent_filter(
-                list(framework_indicators_qs),
-                framework_indicator_consent,
-            )
-    else:
+        selected_targets = NationalTarget.objects.filter(pk__in=targets_qs.order_by().values("pk")).filter(
+            consent_visible_q(NationalTarget, instance)
+        )
+        indicators_qs = Indicator.objects.filter(pk__in=indicators_qs.order_by().values("pk"))
+        target_links = NationalTargetFrameworkTargetLink.objects.filter(
+            national_target__in=selected_targets.values("pk"),
+            is_active=True,
+        )
+        target_links = filter_target_framework_links_for_user(target_links, strict_user).filter(
+            consent_visible_q(FrameworkTarget, instance, prefix="framework_target__")
+        )
         framework_indicators_qs = FrameworkIndicator.objects.filter(
+            framework_target_id__in=target_links.order_by().values("framework_target_id"),
             status=LifecycleStatus.PUBLISHED,
-        ).select_related("framework", "framework_target", "framework_target__goal")
-        if framework_code:
-            framework_indicators_qs = framework_indicators_qs.filter(framework__code=framework_code)
-        if indicator_level:
-            framework_indicators_qs = framework_indicators_qs.filter(indicator_type=indicator_level)
-        framework_indicators_qs = filter_queryset_for_user(
-            framework_indicators_qs,
-            user,
-        )
-        framework_indicators = _apply_consent_filter(
-            list(framework_indicators_qs),
-            framework_indicator_consent,
         )
+    else:
+        indicators_qs = Indicator.objects.filter(status=LifecycleStatus.PUBLISHED)
+        framework_indicators_qs = FrameworkIndicator.objects.filter(status=LifecycleStatus.PUBLISHED)
 
+    framework_indicators_qs = framework_indicators_qs.select_related(
+        "framework", "framework_target", "framework_target__goal"
+    )
+    if framework_code:
+        framework_indicators_qs = framework_indicators_qs.filter(framework__code=framework_code)
+    if indicator_level:
+        framework_indicators_qs = framework_indicators_qs.filter(indicator_type=indicator_level)
+    framework_indicators_qs = filter_queryset_for_user(
+        framework_indicators_qs,
+        user,
+    ).filter(consent_visible_q(FrameworkIndicator, instance))
     framework_indicators = sorted(
-        framework_indicators,
+        framework_indicators_qs,
         key=lambda item: (
             item.framework.code if item.framework_id else "",
             item.code or "",
@@ -198,66 +137,49 @@ def compute_hl21_1_gap_analysis(
         ),
     )
 
-    if scope == "selected":
-        indicators_qs = Indicator.objects.filter(id__in=[obj.id for obj in selected_indicators])
-    else:
-        indicators_qs = Indicator.objects.filter(status=LifecycleStatus.PUBLISHED).select_related(
-            "national_target", "organisation", "created_by"
-        )
     indicators_qs = filter_queryset_for_user(
         indicators_qs,
         user,
         perm="nbms_app.view_indicator",
-    )
-    indicators = _apply_consent_filter(list(indicators_qs), indicator_consent)
-    indicators = sort_model_items(indicators)
+    ).filter(consent_visible_q(Indicator, instance))
+    indicators = sort_model_items(indicators_qs.only("id", "uuid", "code", "title", "reporting_capability"))
+    indicators_by_id = {indicator.id: indicator for indicator in indicators}
 
-    indicator_ids = [indicator.id for indicator in indicators]
+    indicator_ids = list(indicators_by_id)
     framework_indicator_ids = [indicator.id for indicator in framework_indicators]
 
     indicator_links = IndicatorFrameworkIndicatorLink.objects.filter(
         indicator_id__in=indicator_ids,
         framework_indicator_id__in=framework_indicator_ids,
         is_active=True,
-    ).select_related(
-        "indicator",
-        "framework_indicator",
-        "framework_indicator__framework",
-        "framework_indicator__framework_target",
-        "framework_indicator__framework_target__goal",
     )
     indicator_links = filter_indicator_framework_links_for_user(indicator_links, strict_user)
     if framework_code:
         indicator_links = indicator_links.filter(framework_indicator__framework__code=framework_code)
     if indicator_level:
         indicator_links = indicator_links.filter(framework_indicator__indicator_type=indicator_level)
-    indicator_links = [
-        link
-        for link in indicator_links
-        if not requires_consent(link.framework_indicator)
-        or link.framework_indicator.uuid in framework_indicator_consent
-    ]
 
-    links_by_framework_indicator = defaultdict(list)
-    for link in indicator_links:
-        links_by_framework_indicator[link.framework_indicator_id].append(link)
+    links_by_framework_indicator = defaultdict(set)
+    for framework_indicator_id, indicator_id in indicator_links.values_list("framework_indicator_id", "indicator_id"):
+        links_by_framework_indicator[framework_indicator_id].add(indicator_id)
 
     # Reportability sources
     series_qs = indicator_data_series_for_user(user, instance)
     if indicator_ids:
         series_qs = series_qs.filter(indicator_id__in=indicator_ids)
-    series_consent = _consent_granted_uuids(instance, IndicatorDataSeries)
-    series = _apply_consent_filter(list(series_qs), series_consent)
-    series_indicator_ids = {item.indicator_id for item in series if item.indicator_id}
+    series_indicator_ids = set(
+        series_qs.filter(consent_visible_q(IndicatorDataSeries, instance))
+        .filter(indicator_id__isnull=False)
+        .values_list("indicator_id", flat=True)
+    )
 
-    releases_qs = DatasetRelease.objects.select_related("dataset")
+    releases_qs = DatasetRelease.objects.all()
     if instance and scope == "selected":
         releases_qs = approved_queryset(instance, DatasetRelease)
-    releases_qs = filter_queryset_for_user(releases_qs, user)
-    release_consent = _consent_granted_uuids(instance, DatasetRelease)
-    releases = _apply_consent_filter(list(releases_qs), release_consent)
-    release_ids = [release.id for release in releases]
-    dataset_ids = {release.dataset_id for release in releases if release.dataset_id}
+    releases_qs = filter_queryset_for_user(releases_qs, user).filter(consent_visible_q(DatasetRelease, instance))
+    releases = list(releases_qs.values_list("id", "dataset_id"))
+    release_ids = [release_id for release_id, _dataset_id in releases]
+    dataset_ids = {dataset_id for _release_id, dataset_id in releases if dataset_id}
 
     indicator_ids_with_dataset_release = set()
     if dataset_ids:
@@ -275,7 +197,6 @@ def compute_hl21_1_gap_analysis(
             ).values_list("series__indicator_id", flat=True)
         )
 
-    indicator_reportability = {}
     indicator_reportability_sources = {}
     for indicator in indicators:
         sources = []
@@ -286,7 +207,6 @@ def compute_hl21_1_gap_analysis(
         capability = _reporting_capability_value(indicator)
         if capability in {"yes", "partial"}:
             sources.append("reporting_capability")
-        indicator_reportability[indicator.id] = bool(sources)
         indicator_reportability_sources[indicator.id] = sources
 
     headline_items = []
@@ -295,18 +215,14 @@ def compute_hl21_1_gap_analysis(
 
     by_target_stats = {}
     for framework_indicator in framework_indicators:
-        mapped_links = links_by_framework_indicator.get(framework_indicator.id, [])
-        mapped_indicator_ids = {link.indicator_id for link in mapped_links}
-        mapped_indicators = [indicator for indicator in indicators if indicator.id in mapped_indicator_ids]
-        mapped_indicators = sort_model_items(mapped_indicators)
+        mapped_indicator_ids = links_by_framework_indicator.get(framework_indicator.id, set())
+        mapped_indicators = sort_model_items(indicators_by_id[indicator_id] for indicator_id in mapped_indicator_ids)
 
-        addressed = bool(mapped_links)
+        addressed = bool(mapped_indicator_ids)
         reportable_sources = set()
-        reportable = False
         for indicator in mapped_indicators:
-            if indicator_reportability.get(indicator.id):
-                reportable = True
-                reportable_sources.update(indicator_reportability_sources.get(indicator.id, []))
+            reportable_sources.update(indicator_reportability_sources[indicator.id])
+        reportable = bool(reportable_sources)
 
         mapped_indicator_dicts = []
         if include_details:
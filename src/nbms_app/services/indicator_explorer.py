@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from nbms_app.models import (
+    Framework,
+    FrameworkIndicator,
+    Indicator,
+    IndicatorDataPoint,
+    IndicatorDataSeries,
+    IndicatorExplorerIndex,
+    IndicatorFrameworkIndicatorLink,
+    IndicatorInputRequirement,
+    IndicatorMethodProfile,
+)
+
+
+READINESS_BANDS = ("red", "amber", "green")
+DUE_SOON_DAYS = 60
+RECENT_RELEASE_DAYS = 365
+
+# Days from ``last_updated_on`` to the next expected update, by update frequency
+# or reporting cadence; the first matching entry wins.
+NEXT_UPDATE_DAYS = [
+    (["monthly"], 30),
+    (["quarterly"], 91),
+    (["annual"], 365),
+    (["biennial", "every_2_years"], 730),
+    (["every_3_years"], 1095),
+]
+
+FACET_KEYS = {
+    "frameworks": "framework_indicator__framework__code",
+    "statuses": "status",
+    "sensitivities": "sensitivity",
+    "method_readiness": "readiness_state",
+}
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _next_update_sql():
+    whens = []
+    params = []
+    for frequencies, days in NEXT_UPDATE_DAYS:
+        whens.append("WHEN i.update_frequency = ANY(%s) OR i.reporting_cadence = ANY(%s) THEN i.last_updated_on + %s::integer")
+        params.extend([frequencies, frequencies, days])
+    return f"CASE WHEN i.last_updated_on IS NULL THEN NULL {' '.join(whens)} END", params
+
+
+def refresh_indicator_explorer_index(indicator_ids=None, *, create=True):
+    """
+    Recompute the explorer index rows of ``indicator_ids`` (every indicator when ``None``) in one upsert.
+
+    Readiness follows the best active method profile (85 ready, 55 partial,
+    25 otherwise, plus 10 once the indicator has been updated); an indicator
+    has spatial output when a data point carries a spatial layer or unit, its
+    input requirement names map layers, or it records a spatial or
+    geographic coverage.
+
+    With ``create=False`` only existing rows are updated, so a refresh
+    triggered while an indicator's related rows are being cascade-deleted
+    does not recreate its row.
+    """
+
+    conditions = []
+    where_params = []
+    if indicator_ids is not None:
+        indicator_ids = sorted({int(pk) for pk in indicator_ids if pk is not None})
+        if not indicator_ids:
+            return 0
+        conditions.append("i.id = ANY(%s)")
+        where_params.append(indicator_ids)
+    if not create:
+        conditions.append(f"EXISTS (SELECT 1 FROM {_table(IndicatorExplorerIndex)} x WHERE x.indicator_id = i.id)")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    layers_field = IndicatorInputRequirement._meta.get_field("required_map_layers")
+    layers_table = connection.ops.quote_name(layers_field.remote_field.through._meta.db_table)
+    layers_column = connection.ops.quote_name(layers_field.m2m_column_name())
+    next_update, next_update_params = _next_update_sql()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {_table(IndicatorExplorerIndex)} (
+                indicator_id, method_readiness_state, method_readiness_states, readiness_score, readiness_band,
+                has_spatial, next_expected_update, framework_codes, created_at, updated_at
+            )
+            SELECT
+                id,
+                readiness_state,
+                readiness_states,
+                readiness_score,
+                CASE WHEN readiness_score >= 75 THEN 'green' WHEN readiness_score >= 45 THEN 'amber' ELSE 'red' END,
+                has_spatial,
+                next_expected_update,
+                framework_codes,
+                NOW(),
+                NOW()
+            FROM (
+                SELECT
+                    i.id,
+                    profiles.readiness_state,
+                    profiles.readiness_states,
+                    CASE profiles.readiness_state WHEN 'ready' THEN 85 WHEN 'partial' THEN 55 ELSE 25 END
+                        + CASE WHEN i.last_updated_on IS NOT NULL THEN 10 ELSE 0 END AS readiness_score,
+                    (
+                        COALESCE(i.spatial_coverage, '') <> ''
+                        OR COALESCE(i.coverage_geography, '') <> ''
+                        OR EXISTS (
+                            SELECT 1
+                            FROM {_table(IndicatorInputRequirement)} r
+                            JOIN {layers_table} rl ON rl.{layers_column} = r.id
+                            WHERE r.indicator_id = i.id
+                        )
+                        OR EXISTS (
+                            SELECT 1
+                            FROM {_table(IndicatorDataPoint)} dp
+                            JOIN {_table(IndicatorDataSeries)} s ON s.id = dp.series_id
+                            WHERE s.indicator_id = i.id
+                              AND (dp.spatial_layer_id IS NOT NULL OR dp.spatial_unit_id IS NOT NULL)
+                        )
+                    ) AS has_spatial,
+                    {next_update} AS next_expected_update,
+                    COALESCE(
+                        (
+                            SELECT jsonb_agg(DISTINCT f.code ORDER BY f.code)
+                            FROM {_table(IndicatorFrameworkIndicatorLink)} l
+                            JOIN {_table(FrameworkIndicator)} fi ON fi.id = l.framework_indicator_id
+                            JOIN {_table(Framework)} f ON f.id = fi.framework_id
+                            WHERE l.indicator_id = i.id AND l.is_active
+                        ),
+                        '[]'::jsonb
+                    ) AS framework_codes
+                FROM {_table(Indicator)} i
+                CROSS JOIN LATERAL (
+                    SELECT
+                        CASE
+                            WHEN bool_or(mp.readiness_state = 'ready') THEN 'ready'
+                            WHEN bool_or(mp.readiness_state = 'partial') THEN 'partial'
+                            ELSE 'blocked'
+                        END AS readiness_state,
+                        COALESCE(
+                            jsonb_agg(DISTINCT mp.readiness_state ORDER BY mp.readiness_state),
+                            '[]'::jsonb
+                        ) AS readiness_states
+                    FROM {_table(IndicatorMethodProfile)} mp
+                    WHERE mp.indicator_id = i.id AND mp.is_active
+                ) profiles
+                {where}
+            ) scored
+            ON CONFLICT (indicator_id) DO UPDATE SET
+                method_readiness_state = EXCLUDED.method_readiness_state,
+                method_readiness_states = EXCLUDED.method_readiness_states,
+                readiness_score = EXCLUDED.readiness_score,
+                readiness_band = EXCLUDED.readiness_band,
+                has_spatial = EXCLUDED.has_spatial,
+                next_expected_update = EXCLUDED.next_expected_update,
+                framework_codes = EXCLUDED.framework_codes,
+                updated_at = EXCLUDED.updated_at
+            """,
+            [*next_update_params, *where_params],
+        )
+        return cursor.rowcount
+
+
+def refresh_explorer_index_for_series(series_ids, *, create=True):
+    """Refresh the explorer index of the indicators owning ``series_ids``."""
+
+    series_ids = {int(pk) for pk in series_ids if pk is not None}
+    if not series_ids:
+        return 0
+    indicator_ids = IndicatorDataSeries.objects.filter(pk__in=series_ids).values_list("indicator_id", flat=True)
+    return refresh_indicator_explorer_index(list(indicator_ids), create=create)
+
+
+def indicator_explorer_summary(queryset):
+    """
+    Count the indicators in ``queryset`` with their facets and blockers in one grouped scan.
+
+    Every facet counts matching indicators: an indicator linked to two
+    frameworks counts once under each. An indicator without an index row yet
+    counts as an unscored one (blocked, red, no spatial output), as it does
+    in the explorer rows. Returns ``total``, ``facets`` (lists
+    of ``{<facet key>: value, "total": n}``), ``readiness_bands`` and the
+    blocker and due-soon counts.
+    """
+
+    ids_sql, ids_params = queryset.order_by().values("pk").query.sql_with_params()
+    today = timezone.now().date()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH scope AS (
+                SELECT
+                    i.id, i.status, i.sensitivity, i.last_updated_on,
+                    COALESCE(x.method_readiness_state, 'blocked') AS method_readiness_state,
+                    COALESCE(x.method_readiness_states, '[]'::jsonb) AS method_readiness_states,
+                    COALESCE(x.readiness_band, 'red') AS readiness_band,
+                    COALESCE(x.has_spatial, FALSE) AS has_spatial,
+                    x.next_expected_update,
+                    COALESCE(x.framework_codes, '[]'::jsonb) AS framework_codes
+                FROM {_table(Indicator)} i
+                LEFT JOIN {_table(IndicatorExplorerIndex)} x ON x.indicator_id = i.id
+                WHERE i.id IN ({ids_sql})
+            )
+            SELECT
+                CASE
+                    WHEN GROUPING(s.status) = 0 THEN 'statuses'
+                    WHEN GROUPING(s.sensitivity) = 0 THEN 'sensitivities'
+                    WHEN GROUPING(s.readiness_band) = 0 THEN 'readiness_bands'
+                    WHEN GROUPING(fw.code) = 0 THEN 'frameworks'
+                    WHEN GROUPING(rs.state) = 0 THEN 'method_readiness'
+                    ELSE 'total'
+                END AS facet,
+                COALESCE(s.status, s.sensitivity, s.readiness_band, fw.code, rs.state) AS value,
+                COUNT(DISTINCT s.id),
+                COUNT(DISTINCT s.id) FILTER (WHERE s.method_readiness_state <> 'ready'),
+                COUNT(DISTINCT s.id) FILTER (WHERE s.last_updated_on IS NULL OR s.last_updated_on < %s),
+                COUNT(DISTINCT s.id) FILTER (WHERE NOT s.has_spatial),
+                COUNT(DISTINCT s.id) FILTER (WHERE s.next_expected_update <= %s)
+            FROM scope s
+            LEFT JOIN LATERAL jsonb_array_elements_text(s.framework_codes) AS fw(code) ON TRUE
+            LEFT JOIN LATERAL jsonb_array_elements_text(s.method_readiness_states) AS rs(state) ON TRUE
+            GROUP BY GROUPING SETS ((), (s.status), (s.sensitivity), (s.readiness_band), (fw.code), (rs.state))
+            """,
+            [
+                *ids_params,
+                today - timedelta(days=RECENT_RELEASE_DAYS),
+                today + timedelta(days=DUE_SOON_DAYS),
+            ],
+        )
+        rows = cursor.fetchall()
+
+    summary = {
+        "total": 0,
+        "facets": {name: [] for name in FACET_KEYS},
+        "readiness_bands": {band: 0 for band in READINESS_BANDS},
+        "missing_approved_method": 0,
+        "no_recent_release": 0,
+        "missing_spatial_output": 0,
+        "due_soon": 0,
+    }
+    for facet, value, total, missing_method, no_recent, no_spatial, due_soon in rows:
+        if facet == "total":
+            summary.update(
+                total=total,
+                missing_approved_method=missing_method,
+                no_recent_release=no_recent,
+                missing_spatial_output=no_spatial,
+                due_soon=due_soon,
+            )
+        elif facet == "readiness_bands":
+            if value in summary["readiness_bands"]:
+                summary["readiness_bands"][value] = total
+        elif value is not None:
+            summary["facets"][facet].append({FACET_KEYS[facet]: value, "total": total})
+    for name, key in FACET_KEYS.items():
+        summary["facets"][name].sort(key=lambda item: item[key])
+    return summary
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from nbms_app.indicator_methods.registry import get_method
+from nbms_app.models import (
+    IndicatorMethodProfile,
+    IndicatorMethodResourceClass,
+    IndicatorMethodRunStatus,
+    User,
+)
+from nbms_app.services.indicator_method_sdk import run_method_profile, stored_method_result
+from nbms_app.services.metrics import observe_background_job
+
+
+logger = logging.getLogger(__name__)
+
+BATCH_MODE_PROCESS = "process"
+BATCH_MODE_INLINE = "inline"
+
+# Report statuses beyond IndicatorMethodRunStatus: a stored result was reused
+# without starting a run, or an upstream profile failed so the run was not attempted.
+STATUS_CACHED = "cached"
+STATUS_SKIPPED = "skipped"
+
+
+def _batch_mode():
+    return str(getattr(settings, "INDICATOR_METHOD_BATCH_MODE", BATCH_MODE_PROCESS) or BATCH_MODE_PROCESS).lower()
+
+
+def _batch_workers():
+    return max(1, int(getattr(settings, "INDICATOR_METHOD_BATCH_WORKERS", 4) or 1))
+
+
+def _postgis_workers():
+    return max(1, int(getattr(settings, "INDICATOR_METHOD_POSTGIS_WORKERS", 1) or 1))
+
+
+def profile_resource_class(profile):
+    """The profile's worker slot class, defaulting to its implementation's."""
+
+    if profile.resource_class:
+        return profile.resource_class
+    method = get_method(profile.implementation_key)
+    return getattr(method, "resource_class", IndicatorMethodResourceClass.LIGHT)
+
+
+def profile_dependencies(profiles):
+    """
+    Map each profile id to the ids of the ``profiles`` that must finish before it.
+
+    Profiles whose method writes its indicator's data points (spatial overlays,
+    registry summaries) run before profiles that read the same indicator's
+    data points, so readers see the refreshed values.
+    """
+
+    writers = defaultdict(set)
+    for profile in profiles:
+        if getattr(get_method(profile.implementation_key), "writes_indicator_data", False):
+            writers[profile.indicator_id].add(profile.id)
+    dependencies = {}
+    for profile in profiles:
+        upstream = set()
+        if getattr(get_method(profile.implementation_key), "reads_indicator_data", False):
+            upstream = writers.get(profile.indicator_id, set()) - {profile.id}
+        dependencies[profile.id] = upstream
+    return dependencies
+
+
+def _run_profile(profile_id, user_id, use_cache):
+    profile = IndicatorMethodProfile.objects.select_related("indicator").get(pk=profile_id)
+    user = User.objects.filter(pk=user_id).first() if user_id else None
+    started = time.monotonic()
+    run = run_method_profile(profile=profile, user=user, params={}, use_cache=use_cache)
+    output = run.output_json if isinstance(run.output_json, dict) else {}
+    return {
+        "status": run.status,
+        "cache_hit": bool(output.get("cache_hit")),
+        "run_uuid": str(run.uuid),
+        "duration_ms": int((time.monotonic() - started) * 1000),
+        "error": run.error_message,
+    }
+
+
+def _run_profile_in_worker(profile_id, user_id, use_cache):
+    try:
+        return _run_profile(profile_id, user_id, use_cache)
+    finally:
+        connections.close_all()
+
+
+def _new_executor(workers):
+    # Spawned workers configure Django before unpickling any task.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    )
+
+
+class _BatchPlan:
+    """Dependency and slot bookkeeping for one batch; entries become the report rows."""
+
+    def __init__(self, profiles, *, workers, postgis_workers):
+        self.order = [profile.id for profile in profiles]
+        self.profiles = {profile.id: profile for profile in profiles}
+        self.workers = workers
+        self.postgis_workers = postgis_workers
+        self.waiting = profile_dependencies(profiles)
+        self.downstream = defaultdict(set)
+        for profile_id, upstream in self.waiting.items():
+            for upstream_id in upstream:
+                self.downstream[upstream_id].add(profile_id)
+        self.classes = {profile.id: profile_resource_class(profile) for profile in profiles}
+        self.entries = {
+            profile.id: {
+                "profile_uuid": str(profile.uuid),
+                "indicator_code": profile.indicator.code,
+                "method_type": profile.method_type,
+                "implementation_key": profile.implementation_key,
+                "resource_class": self.classes[profile.id],
+                "depends_on": sorted(str(self.profiles[upstream_id].uuid) for upstream_id in self.waiting[profile.id]),
+                "status": None,
+                "cache_hit": False,
+                "run_uuid": None,
+                "duration_ms": None,
+                "error": "",
+            }
+            for profile in profiles
+        }
+        self.ready = [profile_id for profile_id in self.order if not self.waiting[profile_id]]
+        self.running = {}
+
+    def pending(self):
+        return any(self.entries[profile_id]["status"] is None for profile_id in self.order)
+
+    def take_ready(self):
+        """Pop the next ready profile that fits a free slot of its resource class."""
+
+        if len(self.running) >= self.workers:
+            return None
+        postgis_running = sum(
+            1 for profile_id in self.running.values() if self.classes[profile_id] == IndicatorMethodResourceClass.POSTGIS
+        )
+        for index, profile_id in enumerate(self.ready):
+            if self.classes[profile_id] == IndicatorMethodResourceClass.POSTGIS and postgis_running >= self.postgis_workers:
+                continue
+            return self.ready.pop(index)
+        return None
+
+    def release_cycle(self):
+        # Readers that also write their indicator's data can depend on each other;
+        # run the earliest one so the batch still makes progress.
+        running = set(self.running.values())
+        for profile_id in self.order:
+            if self.entries[profile_id]["status"] is None and profile_id not in running:
+                self.waiting[profile_id] = set()
+                self.ready.append(profile_id)
+                return
+
+    def finish(self, profile_id, result):
+        entry = self.entries[profile_id]
+        entry.update(result)
+        observe_background_job("indicator_method_batch", entry["status"])
+        if entry["status"] == IndicatorMethodRunStatus.FAILED:
+            self._skip_downstream(profile_id)
+            return
+        for downstream_id in sorted(self.downstream[profile_id], key=self.order.index):
+            upstream = self.waiting[downstream_id]
+            if profile_id in upstream:
+                upstream.discard(profile_id)
+                if not upstream and self.entries[downstream_id]["status"] is None:
+                    self.ready.append(downstream_id)
+
+    def _skip_downstream(self, profile_id):
+        for downstream_id in self.downstream[profile_id]:
+            entry = self.entries[downstream_id]
+            if entry["status"] is not None:
+                continue
+            if downstream_id in self.ready:
+                self.ready.remove(downstream_id)
+            entry["status"] = STATUS_SKIPPED
+            entry["error"] = f"Upstream profile {self.entries[profile_id]['profile_uuid']} failed."
+            observe_background_job("indicator_method_batch", STATUS_SKIPPED)
+            self._skip_downstream(downstream_id)
+
+
+def run_indicator_methods(*, profiles=None, user=None, use_cache=True, workers=None, postgis_workers=None):
+    """
+    Run method profiles in dependency order and return a consolidated report.
+
+    Independent profiles run concurrently on a process pool of ``workers``,
+    of which at most ``postgis_workers`` run PostGIS-heavy profiles. A
+    profile whose current inputs already have a stored result is reported
+    as ``cached`` without starting a run. ``INDICATOR_METHOD_BATCH_MODE``
+    ``inline`` runs every profile in this process, one at a time.
+    """
+
+    if profiles is None:
+        profiles = IndicatorMethodProfile.objects.filter(is_active=True)
+    profiles = list(profiles.select_related("indicator").order_by("indicator__code", "method_type", "id"))
+    inline = _batch_mode() == BATCH_MODE_INLINE
+    workers = 1 if inline else max(1, int(workers or _batch_workers()))
+    postgis_workers = min(workers, max(1, int(postgis_workers or _postgis_workers())))
+    user_id = user.pk if getattr(user, "is_authenticated", False) else None
+
+    started_at = timezone.now()
+    clock = time.monotonic()
+    plan = _BatchPlan(profiles, workers=workers, postgis_workers=postgis_workers)
+    executor = None
+    try:
+        while plan.pending():
+            profile_id = plan.take_ready()
+            if profile_id is not None:
+                profile = plan.profiles[profile_id]
+                stored = stored_method_result(profile) if use_cache else None
+                if stored is not None:
+                    plan.finish(
+                        profile_id,
+                        {
+                            "status": STATUS_CACHED,
+                            "cache_hit": True,
+                            "run_uuid": str(stored.run.uuid) if stored.run else None,
+                            "duration_ms": 0,
+                        },
+                    )
+                elif inline:
+                    plan.finish(profile_id, _run_profile(profile_id, user_id, use_cache))
+                else:
+                    executor = executor or _new_executor(workers)
+                    plan.running[executor.submit(_run_profile_in_worker, profile_id, user_id, use_cache)] = profile_id
+                continue
+            if plan.running:
+                done, _pending = wait(list(plan.running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished_id = plan.running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as exc:  # noqa: BLE001
+                        logger.exception("Indicator method profile %s failed on batch worker.", finished_id)
+                        result = {"status": IndicatorMethodRunStatus.FAILED, "error": str(exc) or exc.__class__.__name__}
+                        if isinstance(exc, BrokenProcessPool) and executor is not None:
+                            executor.shutdown(wait=False, cancel_futures=True)
+                            executor = None
+                    plan.finish(finished_id, result)
+                continue
+            plan.release_cycle()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    entries = [plan.entries[profile_id] for profile_id in plan.order]
+    return {
+        "started_at": started_at.isoformat(),
+        "finished_at": timezone.now().isoformat(),
+        "duration_ms": int((time.monotonic() - clock) * 1000),
+        "mode": BATCH_MODE_INLINE if inline else BATCH_MODE_PROCESS,
+        "workers": workers,
+        "postgis_workers": postgis_workers,
+        "counts": dict(sorted(Counter(entry["status"] for entry in entries).items())),
+        "profiles": entries,
+    }
@@ -3,81 +3,162 @@ from __future__ import annotations
 import hashlib
 import json
 
-from django.core.cache import cache
-from django.db.models import Max
+from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
 
 from nbms_app.indicator_methods.base import MethodContext
 from nbms_app.indicator_methods.registry import get_method
 from nbms_app.models import (
-    BinaryIndicatorResponse,
-    IndicatorDataPoint,
+    BinaryIndicatorQuestion,
+    IndicatorDataSeries,
     IndicatorFrameworkIndicatorLink,
     IndicatorInputRequirement,
+    IndicatorMethodProfile,
     IndicatorMethodReadiness,
+    IndicatorMethodResult,
     IndicatorMethodRun,
     IndicatorMethodRunStatus,
     IndicatorMethodType,
     SpatialFeature,
+    SpatialLayer,
 )
 from nbms_app.services.audit import record_audit_event
+from nbms_app.services.input_versions import GOLD_INPUT_TABLES, TABLE_WIDE_SCOPE, get_input_versions
 
 
-def _latest_input_stamp(profile):
+def _results_per_profile():
+    return max(1, int(getattr(settings, "INDICATOR_METHOD_RESULTS_PER_PROFILE", 20) or 1))
+
+
+def _input_scopes(profile):
+    """
+    The ``(table_name, scope_id)`` version counters a profile's method reads.
+
+    Returns ``None`` for method types without tracked table inputs; those
+    fall back to the indicator's own ``updated_at``.
+    """
+
     indicator = profile.indicator
-    if profile.method_type == IndicatorMethodType.CSV_IMPORT:
-        return (
-            IndicatorDataPoint.objects.filter(series__indicator=indicator).aggregate(value=Max("updated_at")).get("value")
-        )
-    if profile.method_type == IndicatorMethodType.BINARY_QUESTIONNAIRE:
+    scopes = set()
+    if profile.method_type in {IndicatorMethodType.CSV_IMPORT, IndicatorMethodType.API_CONNECTOR}:
+        series_ids = IndicatorDataSeries.objects.filter(indicator=indicator).values_list("id", flat=True)
+        scopes.update(("indicator_data_point", series_id) for series_id in series_ids)
+    elif profile.method_type == IndicatorMethodType.BINARY_QUESTIONNAIRE:
         framework_indicator_ids = IndicatorFrameworkIndicatorLink.objects.filter(
             indicator=indicator,
             is_active=True,
         ).values_list("framework_indicator_id", flat=True)
-        return (
-            BinaryIndicatorResponse.objects.filter(question__framework_indicator_id__in=framework_indicator_ids).aggregate(
-                value=Max("updated_at")
-            ).get("value")
-        )
-    if profile.method_type == IndicatorMethodType.SPATIAL_OVERLAY:
-        requirement = (
-            IndicatorInputRequirement.objects.filter(indicator=indicator)
-            .prefetch_related("required_map_layers", "required_map_sources")
-            .first()
-        )
-        layer_ids = []
+        question_ids = BinaryIndicatorQuestion.objects.filter(
+            framework_indicator_id__in=framework_indicator_ids
+        ).values_list("id", flat=True)
+        scopes.update(("binary_indicator_response", question_id) for question_id in question_ids)
+    elif profile.method_type == IndicatorMethodType.SPATIAL_OVERLAY:
+        requirement = IndicatorInputRequirement.objects.filter(indicator=indicator).first()
+        layer_ids = set()
         if requirement:
-            layer_ids = list(requirement.required_map_layers.values_list("id", flat=True))
+            layer_ids.update(
+                SpatialLayer.objects.filter(
+                    Q(pk__in=requirement.required_map_layers.values("id"))
+                    | Q(spatial_source__in=requirement.required_map_sources.values("id"))
+                ).values_list("id", flat=True)
+            )
         if not layer_ids:
-            layer_ids = list(
+            layer_ids.update(
                 SpatialFeature.objects.filter(indicator=indicator).values_list("layer_id", flat=True).distinct()
             )
-        feature_stamp = None
-        if layer_ids:
-            feature_stamp = (
-                SpatialFeature.objects.filter(layer_id__in=layer_ids).aggregate(value=Max("updated_at")).get("value")
-            )
-        if requirement:
-            source_stamp = requirement.required_map_sources.aggregate(value=Max("last_sync_at")).get("value")
-            if source_stamp and (feature_stamp is None or source_stamp > feature_stamp):
-                return source_stamp
-        return feature_stamp
-    return indicator.updated_at
+        scopes.update(("spatial_feature", layer_id) for layer_id in layer_ids)
+    scopes.update(
+        (table_name, TABLE_WIDE_SCOPE)
+        for table_name in profile.required_inputs_json or []
+        if table_name in GOLD_INPUT_TABLES
+    )
+    if not scopes and profile.method_type not in {
+        IndicatorMethodType.CSV_IMPORT,
+        IndicatorMethodType.API_CONNECTOR,
+        IndicatorMethodType.BINARY_QUESTIONNAIRE,
+        IndicatorMethodType.SPATIAL_OVERLAY,
+    }:
+        return None
+    return scopes
+
+
+def input_versions_hash(profile):
+    """Digest of the current versions of every input the profile reads."""
 
+    scopes = _input_scopes(profile)
+    if scopes is None:
+        blob = {"indicator_updated_at": profile.indicator.updated_at.isoformat()}
+    else:
+        versions = get_input_versions(scopes)
+        blob = {"versions": sorted([table_name, scope_id, version] for (table_name, scope_id), version in versions.items())}
+    payload = json.dumps(blob, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
-def _build_input_hash(profile, params, input_stamp):
+
+def _build_input_hash(profile, params, versions_hash):
     blob = {
         "profile_uuid": str(profile.uuid),
         "indicator_uuid": str(profile.indicator.uuid),
         "method_type": profile.method_type,
         "implementation_key": profile.implementation_key,
         "params": params or {},
-        "input_stamp": input_stamp.isoformat() if input_stamp else None,
+        "input_versions": versions_hash,
     }
     payload = json.dumps(blob, sort_keys=True, separators=(",", ":"))
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
+def stored_method_result(profile, params=None):
+    """The stored result for ``profile`` with ``params`` at its current input versions, if any."""
+
+    input_hash = _build_input_hash(profile, params or {}, input_versions_hash(profile))
+    return IndicatorMethodResult.objects.filter(input_hash=input_hash).select_related("run").first()
+
+
+def _store_result(*, profile, run, input_hash, versions_hash, output):
+    IndicatorMethodResult.objects.bulk_create(
+        [
+            IndicatorMethodResult(
+                profile=profile,
+                run=run,
+                input_hash=input_hash,
+                input_versions_hash=versions_hash,
+                output_json=output,
+            )
+        ],
+        update_conflicts=True,
+        unique_fields=["input_hash"],
+        update_fields=["run", "input_versions_hash", "output_json", "updated_at"],
+    )
+    stale_ids = list(
+        IndicatorMethodResult.objects.filter(profile=profile)
+        .order_by("-updated_at", "-id")
+        .values_list("id", flat=True)[_results_per_profile():]
+    )
+    if stale_ids:
+        IndicatorMethodResult.objects.filter(id__in=stale_ids).delete()
+
+
+def _finish_profile(profile, *, run, versions_hash, notes, readiness):
+    profile.last_run_at = run.finished_at
+    if run.status == IndicatorMethodRunStatus.SUCCEEDED:
+        profile.last_success_at = run.finished_at
+    profile.readiness_state = readiness
+    profile.readiness_notes = notes
+    profile.input_versions_hash = versions_hash
+    profile.save(
+        update_fields=[
+            "last_run_at",
+            "last_success_at",
+            "readiness_state",
+            "readiness_notes",
+            "input_versions_hash",
+            "updated_at",
+        ]
+    )
+
+
 def run_method_profile(*, profile, user=None, params=None, use_cache=True):
     params = params or {}
     now = timezone.now()
@@ -101,30 +182,23 @@ def run_method_profile(*, profile, user=None, params=None, use_cache=True):
         profile.save(update_fields=["last_run_at", "readiness_state", "readiness_notes", "updated_at"])
         return run
 
-    input_stamp = _latest_input_stamp(profile)
-    input_hash = _build_input_hash(profile, params, input_stamp)
+    versions_hash = input_versions_hash(profile)
+    input_hash = _build_input_hash(profile, params, versions_hash)
     run.input_hash = input_hash
 
-    cache_key = f"indicator_method:{input_hash}"
     if use_cache:
-        cached = cache.get(cache_key)
-        if cached:
+        stored = IndicatorMethodResult.objects.filter(input_hash=input_hash).only("output_json").first()
+        if stored:
             run.status = IndicatorMethodRunStatus.SUCCEEDED
-            run.output_json = {**cached, "cache_hit": True}
+            run.output_json = {**stored.output_json, "cache_hit": True}
             run.finished_at = timezone.now()
             run.save(update_fields=["status", "output_json", "finished_at", "input_hash", "updated_at"])
-            profile.last_run_at = run.finished_at
-            profile.last_success_at = run.finished_at
-            profile.readiness_state = IndicatorMethodReadiness.READY
-            profile.readiness_notes = "Method execution succeeded (cache hit)."
-            profile.save(
-                update_fields=[
-                    "last_run_at",
-                    "last_success_at",
-                    "readiness_state",
-                    "readiness_notes",
-                    "updated_at",
-                ]
+            _finish_profile(
+                profile,
+                run=run,
+                versions_hash=versions_hash,
+                notes="Method execution succeeded (cache hit).",
+                readiness=IndicatorMethodReadiness.READY,
             )
             record_audit_event(
                 user,
@@ -154,29 +228,25 @@ def run_method_profile(*, profile, user=None, params=None, use_cache=True):
         update_fields=["status", "output_json", "error_message", "finished_at", "input_hash", "updated_at"]
     )
 
-    profile.last_run_at = finished
     if mapped_status == IndicatorMethodRunStatus.SUCCEEDED:
-        profile.last_success_at = finished
-        profile.readiness_state = IndicatorMethodReadiness.READY
-        profile.readiness_notes = "Method execution succeeded."
+        readiness = IndicatorMethodReadiness.READY
+        notes = "Method execution succeeded."
         if use_cache:
-            cache.set(cache_key, result.output, timeout=3600)
+            _store_result(
+                profile=profile,
+                run=run,
+                input_hash=input_hash,
+                versions_hash=versions_hash,
+                output=result.output,
+            )
     elif mapped_status == IndicatorMethodRunStatus.BLOCKED:
-        profile.readiness_state = IndicatorMethodReadiness.PARTIAL
-        profile.readiness_notes = result.error_message or "Method blocked due to missing inputs."
+        readiness = IndicatorMethodReadiness.PARTIAL
+        notes = result.error_message or "Method blocked due to missing inputs."
     else:
-        profile.readiness_state = IndicatorMethodReadiness.BLOCKED
-        profile.readiness_notes = result.error_message or "Method execution failed."
+        readiness = IndicatorMethodReadiness.BLOCKED
+        notes = result.error_message or "Method execution failed."
+    _finish_profile(profile, run=run, versions_hash=versions_hash, notes=notes, readiness=readiness)
 
-    profile.save(
-        update_fields=[
-            "last_run_at",
-            "last_success_at",
-            "readiness_state",
-            "readiness_notes",
-            "updated_at",
-        ]
-    )
     record_audit_event(
         user,
         "indicator_method_run",
@@ -188,3 +258,28 @@ def run_method_profile(*, profile, user=None, params=None, use_cache=True):
         },
     )
     return run
+
+
+def refresh_stale_method_profiles(*, user=None, limit=None):
+    """
+    Re-run active profiles whose inputs changed since their last run.
+
+    A profile is stale when the digest of its current input versions no
+    longer matches the one recorded on its last run; profiles that never
+    ran are left alone. Returns the runs started.
+    """
+
+    profiles = (
+        IndicatorMethodProfile.objects.filter(is_active=True)
+        .exclude(input_versions_hash="")
+        .select_related("indicator")
+        .order_by("last_run_at", "id")
+    )
+    runs = []
+    for profile in profiles.iterator():
+        if limit is not None and len(runs) >= limit:
+            break
+        if input_versions_hash(profile) == profile.input_versions_hash:
+            continue
+        runs.append(run_method_profile(profile=profile, user=user, params={}))
+    return runs
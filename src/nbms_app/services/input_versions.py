@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from django.db import connection
+
+from nbms_app.models import (
+    BinaryIndicatorResponse,
+    ConsentRecord,
+    EcosystemGoldSummary,
+    IASGoldSummary,
+    IndicatorDataPoint,
+    IndicatorFrameworkIndicatorLink,
+    InputTableVersion,
+    NationalTargetFrameworkTargetLink,
+    SpatialFeature,
+    TaxonGoldSummary,
+)
+
+
+TABLE_WIDE_SCOPE = 0
+
+# Tables indicator methods and cached alignment summaries read from, and the
+# column each version counter is scoped by.
+# A ``None`` scope keeps a single table-wide counter.
+INPUT_TABLES = {
+    IndicatorDataPoint: ("indicator_data_point", "series_id"),
+    BinaryIndicatorResponse: ("binary_indicator_response", "question_id"),
+    SpatialFeature: ("spatial_feature", "layer_id"),
+    EcosystemGoldSummary: ("ecosystem_gold_summary", None),
+    TaxonGoldSummary: ("taxon_gold_summary", None),
+    IASGoldSummary: ("ias_gold_summary", None),
+    NationalTargetFrameworkTargetLink: ("alignment_link", None),
+    IndicatorFrameworkIndicatorLink: ("alignment_link", None),
+    ConsentRecord: ("consent_record", None),
+}
+
+GOLD_INPUT_TABLES = {"ecosystem_gold_summary", "taxon_gold_summary", "ias_gold_summary"}
+
+
+def bump_input_versions(table_name, scope_ids=(TABLE_WIDE_SCOPE,)):
+    """
+    Increment the version counter of each ``(table_name, scope_id)``, creating it at 1.
+
+    Runs as a single upsert; scopes are sorted so concurrent writers lock
+    counter rows in the same order.
+    """
+
+    scope_ids = sorted({int(scope_id) for scope_id in scope_ids if scope_id is not None})
+    if not scope_ids:
+        return
+    table = connection.ops.quote_name(InputTableVersion._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {table} (table_name, scope_id, version, created_at, updated_at)
+            SELECT %s, scope_id, 1, NOW(), NOW() FROM UNNEST(%s::bigint[]) AS scope_id
+            ON CONFLICT (table_name, scope_id)
+            DO UPDATE SET version = {table}.version + 1, updated_at = EXCLUDED.updated_at
+            """,
+            [table_name, scope_ids],
+        )
+
+
+def bump_input_versions_for(model, instances=None, *, scope_ids=None):
+    """Bump the counters covering ``instances`` (or explicit ``scope_ids``) of a tracked input model."""
+
+    entry = INPUT_TABLES.get(model)
+    if entry is None:
+        return
+    table_name, scope_attr = entry
+    if scope_attr is None:
+        bump_input_versions(table_name)
+        return
+    if scope_ids is None:
+        scope_ids = [getattr(instance, scope_attr) for instance in instances or []]
+    bump_input_versions(table_name, scope_ids)
+
+
+def get_input_versions(keys):
+    """Current version of each ``(table_name, scope_id)`` key; unknown keys are at version 0."""
+
+    keys = set(keys)
+    if not keys:
+        return {}
+    versions = {key: 0 for key in keys}
+    rows = InputTableVersion.objects.filter(
+        table_name__in={table_name for table_name, _ in keys},
+        scope_id__in={scope_id for _, scope_id in keys},
+    ).values_list("table_name", "scope_id", "version")
+    for table_name, scope_id, version in rows:
+        if (table_name, scope_id) in versions:
+            versions[(table_name, scope_id)] = version
+    return versions
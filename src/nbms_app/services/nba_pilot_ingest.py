@@ -52,6 +52,7 @@ from nbms_app.models import (
     SensitivityLevel,
     UpdateFrequency,
 )
+from nbms_app.services.input_versions import bump_input_versions_for
 
 
 PILOT_ROOT = Path(__file__).resolve().parents[1] / "pilots"
@@ -832,6 +833,7 @@ def _upsert_series_and_points(
         for point in parsed.points
     ]
     IndicatorDataPoint.objects.bulk_create(point_rows)
+    bump_input_versions_for(IndicatorDataPoint, scope_ids=[series.id])
 
 
 def _upsert_mea_mappings(*, entry: dict[str, Any], indicator: Indicator, organisation: Organisation) -> list[dict[str, Any]]:
@@ -1,6 +1,3 @@
-from io import BytesIO
-
-from django.core.exceptions import ValidationError
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -12,7 +9,9 @@ from nbms_app.models import (
     SectionIVFrameworkTargetProgress,
     SectionVConclusions,
 )
-from nbms_app.services.readiness import get_instance_readiness
+from nbms_app.services.export_context import ExportBuildContext
+from nbms_app.services.pdf_rendering import render_pdf_bytes
+from nbms_app.services.render_cache import cached_render
 
 
 def _missing_text_fields(instance):
@@ -100,8 +99,8 @@ def _cross_section_gaps(instance):
     return gaps
 
 
-def build_nr7_validation_summary(*, instance, user):
-    readiness = get_instance_readiness(instance, user)
+def build_nr7_validation_summary(*, instance, user, context=None):
+    readiness = (context or ExportBuildContext(instance, user)).instance_readiness()
     missing_fields = _missing_text_fields(instance)
     cross_section = _cross_section_gaps(instance)
 
@@ -176,32 +175,40 @@ def build_nr7_validation_summary(*, instance, user):
     }
 
 
-def build_nr7_preview_payload(*, instance, user):
+def build_nr7_preview_payload(*, instance, user, context=None):
     try:
-        payload = build_ort_nr7_v2_payload(instance=instance, user=user)
+        payload = build_ort_nr7_v2_payload(instance=instance, user=user, context=context)
         return {"preview_payload": payload, "preview_error": None}
     except Exception as exc:  # noqa: BLE001
         return {"preview_payload": None, "preview_error": str(exc)}
 
 
-def render_nr7_pdf_bytes(*, instance, user):
-    try:
-        from xhtml2pdf import pisa  # noqa: WPS433
-    except Exception as exc:  # noqa: BLE001
-        raise ValidationError(f"PDF renderer dependency missing: {exc}") from exc
+NR7_PDF_TEMPLATE = "nbms_app/reporting/nr7_report_pdf.html"
 
-    preview = build_nr7_preview_payload(instance=instance, user=user)
-    validation = build_nr7_validation_summary(instance=instance, user=user)
+
+def render_nr7_pdf_bytes(*, instance, user):
+    export_context = ExportBuildContext(instance, user)
+    preview = build_nr7_preview_payload(instance=instance, user=user, context=export_context)
+    validation = build_nr7_validation_summary(instance=instance, user=user, context=export_context)
     context = {
         "instance": instance,
         "preview_payload": preview["preview_payload"],
         "preview_error": preview["preview_error"],
         "validation": validation,
-        "generated_at": timezone.now(),
     }
-    html = render_to_string("nbms_app/reporting/nr7_report_pdf.html", context)
-    output = BytesIO()
-    result = pisa.CreatePDF(src=html, dest=output, encoding="utf-8")
-    if result.err:
-        raise ValidationError("Failed to render NR7 PDF output.")
-    return output.getvalue()
+    return cached_render(
+        kind="nr7_pdf",
+        renderer="pdf",
+        template_name=NR7_PDF_TEMPLATE,
+        payload={
+            "instance": {"uuid": str(instance.uuid), "updated_at": instance.updated_at},
+            "preview_payload": preview["preview_payload"],
+            "preview_error": preview["preview_error"],
+            "validation": validation,
+        },
+        content_type="application/pdf",
+        render=lambda generated_at: render_pdf_bytes(
+            render_to_string(NR7_PDF_TEMPLATE, {**context, "generated_at": generated_at}),
+            error_message="Failed to render NR7 PDF output.",
+        ),
+    )
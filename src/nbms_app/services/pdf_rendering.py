@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+from collections import deque
+from concurrent.futures import Future, InvalidStateError, ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from nbms_app.services.metrics import observe_background_job
+
+
+logger = logging.getLogger(__name__)
+
+RENDER_MODE_PROCESS = "process"
+RENDER_MODE_INLINE = "inline"
+
+
+class PdfRenderError(Exception):
+    pass
+
+
+class PdfRendererUnavailable(PdfRenderError):
+    pass
+
+
+class PdfRenderFailed(PdfRenderError):
+    pass
+
+
+def _limit_worker_memory(memory_limit_mb: int) -> None:
+    if not memory_limit_mb:
+        return
+    try:
+        import resource  # noqa: WPS433
+    except ImportError:  # pragma: no cover - not available on Windows
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _init_render_worker(memory_limit_mb: int, pid_slot) -> None:
+    # Publish this process's pid so a stuck render can be terminated without executor internals.
+    pid_slot.value = os.getpid()
+    _limit_worker_memory(memory_limit_mb)
+
+
+def _render_html_to_pdf(html: str) -> bytes:
+    try:
+        from xhtml2pdf import pisa  # noqa: WPS433
+    except Exception as exc:  # noqa: BLE001
+        raise PdfRendererUnavailable(f"PDF renderer dependency missing: {exc}") from exc
+
+    output = BytesIO()
+    try:
+        result = pisa.CreatePDF(src=html, dest=output, encoding="utf-8")
+    except MemoryError as exc:
+        raise PdfRenderError("PDF render exceeded the worker memory limit.") from exc
+    if result.err:
+        raise PdfRenderFailed("PDF renderer reported errors.")
+    return output.getvalue()
+
+
+class _RenderWorker:
+    """
+    One single-process executor; recycling it stops only its own process.
+
+    The worker process records its pid in a shared slot when it starts (and
+    again whenever ``max_tasks_per_child`` replaces it), so a stuck render
+    can be terminated without reaching into the executor.
+    """
+
+    def __init__(self, pool: "PdfRenderPool"):
+        context = multiprocessing.get_context("spawn")
+        self.pid = context.Value("i", 0, lock=False)
+        self.executor = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=context,
+            initializer=_init_render_worker,
+            initargs=(pool.memory_limit_mb, self.pid),
+            max_tasks_per_child=pool.max_tasks_per_child,
+        )
+        self.retired = False
+
+    def kill(self, *, terminate: bool = True) -> None:
+        self.retired = True
+        # A worker whose pool broke has already exited; its pid may belong to another process by now.
+        if terminate and self.pid.value:
+            try:
+                os.kill(self.pid.value, signal.SIGTERM)
+            except OSError:
+                pass
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class PdfRenderPool:
+    """
+    Process pool for xhtml2pdf renders, which are CPU-bound and hold the GIL.
+
+    Work is admitted through a bounded semaphore (running + queued renders)
+    and handed to an idle worker; each worker runs under an address-space cap
+    and is replaced after ``max_tasks_per_child`` renders. A render that
+    overruns its timeout or crashes its worker recycles only that worker, so
+    renders running on the others are left alone.
+    """
+
+    def __init__(self, *, workers: int, queue_size: int, max_tasks_per_child: int, memory_limit_mb: int):
+        self.workers = max(workers, 1)
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.memory_limit_mb = memory_limit_mb
+        self._slots = threading.BoundedSemaphore(self.workers + max(queue_size, 0))
+        self._lock = threading.RLock()
+        self._idle = None
+        self._pending = deque()
+        self._running = {}
+
+    def _dispatch(self) -> None:
+        with self._lock:
+            if self._idle is None:
+                self._idle = [_RenderWorker(self) for _ in range(self.workers)]
+            while self._pending and self._idle:
+                future, fn, args = self._pending.popleft()
+                if not future.set_running_or_notify_cancel():
+                    continue
+                worker = self._idle.pop()
+                self._running[future] = worker
+                try:
+                    inner = worker.executor.submit(fn, *args)
+                except Exception as exc:  # noqa: BLE001
+                    self._retire(worker, terminate=not isinstance(exc, BrokenProcessPool))
+                    self._running.pop(future, None)
+                    future.set_exception(PdfRenderError(f"Render worker unavailable: {exc}"))
+                    continue
+                inner.add_done_callback(lambda inner, future=future, worker=worker: self._finish(future, worker, inner))
+
+    def _retire(self, worker: _RenderWorker, *, terminate: bool = True) -> None:
+        # Caller holds ``self._lock``.
+        if worker.retired:
+            return
+        worker.kill(terminate=terminate)
+        if self._idle is not None:
+            self._idle.append(_RenderWorker(self))
+
+    def _finish(self, future: Future, worker: _RenderWorker, inner: Future) -> None:
+        with self._lock:
+            if self._running.get(future) is worker:
+                del self._running[future]
+            if worker.retired:
+                return
+            exc = inner.exception()
+            if isinstance(exc, BrokenProcessPool):
+                self._retire(worker, terminate=False)
+            elif self._idle is not None:
+                self._idle.append(worker)
+        _settle(future, inner)
+        self._dispatch()
+
+    def reset(self) -> None:
+        with self._lock:
+            idle, running = self._idle or [], self._running
+            self._idle = None
+            self._running = {}
+            pending, self._pending = self._pending, deque()
+            for worker in [*idle, *running.values()]:
+                worker.kill()
+        for future in running:
+            _settle(future, exception=PdfRenderError("Render workers were reset."))
+        for future, _fn, _args in pending:
+            future.cancel()
+
+    def submit(self, html: str) -> Future:
+        return self.submit_call(_render_html_to_pdf, html)
+
+    def submit_call(self, fn, *args, job: str = "pdf_render") -> Future:
+        """Run ``fn(*args)`` on a worker; ``fn`` must be importable by spawned processes."""
+
+        if not self._slots.acquire(blocking=False):
+            observe_background_job(job, "rejected")
+            raise PdfRenderError("Render workers are busy; try again shortly.")
+        future = Future()
+        future.add_done_callback(lambda _future: self._slots.release())
+        with self._lock:
+            self._pending.append((future, fn, args))
+        try:
+            self._dispatch()
+        except Exception:
+            future.cancel()
+            raise
+        return future
+
+    def wait(self, future: Future, *, timeout: float | None) -> bytes:
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError as exc:
+            if not future.cancel():
+                logger.warning("PDF render exceeded %ss; recycling its render worker.", timeout)
+                with self._lock:
+                    worker = self._running.pop(future, None)
+                    if worker is not None:
+                        self._retire(worker)
+                _settle(future, exception=PdfRenderError("PDF render timed out."))
+                self._dispatch()
+            raise PdfRenderError("PDF render timed out.") from exc
+        except BrokenProcessPool as exc:
+            raise PdfRenderError("PDF render worker exited unexpectedly.") from exc
+
+    def render(self, html: str, *, timeout: float | None) -> bytes:
+        return self.wait(self.submit(html), timeout=timeout)
+
+
+def _settle(future: Future, inner: Future | None = None, *, exception: Exception | None = None) -> None:
+    """Resolve ``future`` from ``inner`` (or with ``exception``) unless it has already been resolved."""
+
+    try:
+        if inner is None:
+            future.set_exception(exception)
+        elif inner.cancelled():
+            future.set_exception(PdfRenderError("PDF render was cancelled."))
+        elif inner.exception() is not None:
+            future.set_exception(inner.exception())
+        else:
+            future.set_result(inner.result())
+    except InvalidStateError:
+        pass
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_render_pool() -> PdfRenderPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = PdfRenderPool(
+                workers=int(getattr(settings, "PDF_RENDER_WORKERS", 2) or 1),
+                queue_size=int(getattr(settings, "PDF_RENDER_QUEUE_SIZE", 8) or 0),
+                max_tasks_per_child=int(getattr(settings, "PDF_RENDER_MAX_TASKS_PER_CHILD", 50) or 0),
+                memory_limit_mb=int(getattr(settings, "PDF_RENDER_MEMORY_LIMIT_MB", 1024) or 0),
+            )
+        return _POOL
+
+
+def _render_mode() -> str:
+    return str(getattr(settings, "PDF_RENDER_MODE", RENDER_MODE_PROCESS) or RENDER_MODE_PROCESS).lower()
+
+
+def _as_validation_error(exc: PdfRenderError, error_message: str) -> ValidationError:
+    observe_background_job("pdf_render", "failed")
+    if isinstance(exc, PdfRendererUnavailable):
+        return ValidationError(str(exc))
+    if isinstance(exc, PdfRenderFailed):
+        return ValidationError(error_message)
+    return ValidationError(f"{error_message} {exc}")
+
+
+def start_pdf_render(html: str, *, error_message: str = "Failed to render PDF output."):
+    """
+    Start rendering ``html`` and return a callable that waits for the PDF bytes.
+
+    Renders run on the shared process pool unless ``PDF_RENDER_MODE`` is
+    ``inline``, so the caller can prepare other outputs while the PDF is
+    produced. Failures surface as ``ValidationError`` like the call sites
+    that rendered with xhtml2pdf directly.
+    """
+
+    if _render_mode() == RENDER_MODE_INLINE:
+        try:
+            content = _render_html_to_pdf(html)
+        except PdfRenderError as exc:
+            raise _as_validation_error(exc, error_message) from exc
+        observe_background_job("pdf_render", "succeeded")
+        return lambda: content
+
+    pool = get_render_pool()
+    timeout = float(getattr(settings, "PDF_RENDER_TIMEOUT_SECONDS", 120) or 0) or None
+    try:
+        future = pool.submit(html)
+    except PdfRenderError as exc:
+        raise _as_validation_error(exc, error_message) from exc
+
+    def collect() -> bytes:
+        try:
+            content = pool.wait(future, timeout=timeout)
+        except PdfRenderError as exc:
+            raise _as_validation_error(exc, error_message) from exc
+        observe_background_job("pdf_render", "succeeded")
+        return content
+
+    return collect
+
+
+def render_pdf_bytes(html: str, *, error_message: str = "Failed to render PDF output.") -> bytes:
+    """Render ``html`` to PDF bytes, waiting for the result."""
+
+    return start_pdf_render(html, error_message=error_message)()
@@ -2,21 +2,27 @@ from __future__ import annotations
 
 import hashlib
 import json
+import logging
 import os
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import timedelta
 from io import StringIO
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.core.management import call_command
-from django.db import transaction
-from django.db import connection
-from django.db.models import Q
+from django.db import connection, connections, transaction
+from django.db.models import Count, Max, Q
 from django.utils import timezone
 
 from nbms_app.models import (
     IndicatorMethodProfile,
-    MonitoringProgramme,
     MonitoringProgrammeAlert,
     MonitoringProgrammeArtefactRef,
     MonitoringProgrammeQAResult,
@@ -42,6 +48,11 @@ from nbms_app.services.spatial_sources import sync_spatial_sources
 from nbms_app.spatial_fields import GIS_ENABLED
 
 
+logger = logging.getLogger(__name__)
+
+RUN_MODE_THREADED = "threaded"
+RUN_MODE_INLINE = "inline"
+
 CADENCE_DELTA_MAP = {
     ProgrammeRefreshCadence.DAILY: timedelta(days=1),
     ProgrammeRefreshCadence.WEEKLY: timedelta(days=7),
@@ -52,13 +63,49 @@ CADENCE_DELTA_MAP = {
 
 
 DEFAULT_PIPELINE_STEPS = [
-    {"key": "ingest", "type": ProgrammeStepType.INGEST},
-    {"key": "validate", "type": ProgrammeStepType.VALIDATE},
-    {"key": "compute", "type": ProgrammeStepType.COMPUTE},
-    {"key": "publish", "type": ProgrammeStepType.PUBLISH},
+    {"key": "ingest", "type": ProgrammeStepType.INGEST, "depends_on": []},
+    {"key": "validate", "type": ProgrammeStepType.VALIDATE, "depends_on": ["ingest"]},
+    {"key": "compute", "type": ProgrammeStepType.COMPUTE, "depends_on": ["validate"]},
+    {"key": "publish", "type": ProgrammeStepType.PUBLISH, "depends_on": ["compute"]},
 ]
 
 
+class ProgrammeRunConflict(Exception):
+    """Another process is executing the run or holds its lease."""
+
+
+def _run_mode():
+    return str(getattr(settings, "PROGRAMME_RUN_MODE", RUN_MODE_THREADED) or RUN_MODE_THREADED).lower()
+
+
+def _step_workers():
+    return max(1, int(getattr(settings, "PROGRAMME_STEP_WORKERS", 2) or 1))
+
+
+def _lease_seconds():
+    return max(1, int(getattr(settings, "PROGRAMME_RUN_LEASE_SECONDS", 300) or 300))
+
+
+def _heartbeat_seconds():
+    return max(1, int(getattr(settings, "PROGRAMME_RUN_HEARTBEAT_SECONDS", 30) or 30))
+
+
+def default_lease_owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def heartbeat_programme_run(run, *, lease_owner):
+    """Extend the lease on ``run``; returns False once another process has taken it over."""
+
+    now = timezone.now()
+    return bool(
+        MonitoringProgrammeRun.objects.filter(pk=run.pk, lease_owner=lease_owner).update(
+            heartbeat_at=now,
+            lease_expires_at=now + timedelta(seconds=_lease_seconds()),
+        )
+    )
+
+
 def user_can_manage_programme(user, programme):
     if not user or not getattr(user, "is_authenticated", False):
         return False
@@ -101,6 +148,15 @@ def create_programme_alert(
 
 
 def _pipeline_steps(programme, run_type):
+    """
+    Resolve the step graph for a run.
+
+    Configured steps may list the keys they wait for in ``depends_on``; a
+    step without it waits for the step before it. Dependencies can only
+    point at earlier steps, so the graph is always acyclic. Step keys must be
+    unique; a definition that repeats one raises ``ValidationError``.
+    """
+
     configured_steps = (programme.pipeline_definition_json or {}).get("steps") or []
     if configured_steps:
         steps = []
@@ -108,16 +164,26 @@ def _pipeline_steps(programme, run_type):
             step_type = (item.get("type") or "").strip().lower()
             if step_type not in ProgrammeStepType.values:
                 continue
+            earlier_keys = [step["key"] for step in steps]
+            if "depends_on" in item:
+                depends_on = [key for key in (item.get("depends_on") or []) if key in earlier_keys]
+            else:
+                depends_on = earlier_keys[-1:]
             steps.append(
                 {
                     "key": (item.get("key") or step_type).strip() or step_type,
                     "type": step_type,
+                    "depends_on": depends_on,
                 }
             )
+        keys = [step["key"] for step in steps]
+        duplicates = sorted({key for key in keys if keys.count(key) > 1})
+        if duplicates:
+            raise ValidationError(f"Duplicate pipeline step keys: {', '.join(duplicates)}.")
         if steps:
             return steps
     if run_type and run_type != ProgrammeRunType.FULL:
-        return [{"key": run_type, "type": run_type}]
+        return [{"key": run_type, "type": run_type, "depends_on": []}]
     return DEFAULT_PIPELINE_STEPS
 
 
@@ -150,29 +216,90 @@ def _artifact_from_text(*, run, step, label, text, storage_path, media_type):
     return checksum
 
 
-def _spatial_invalid_geometry_count(*, layer_id):
-    if not GIS_ENABLED:
-        return 0
-    geom_expr = "COALESCE(geom, ST_SetSRID(ST_GeomFromGeoJSON(geometry_json::text), 4326))"
-    with connection.cursor() as cursor:
-        cursor.execute(
-            f"""
-            SELECT COUNT(*)
-            FROM nbms_app_spatialfeature
-            WHERE layer_id = %s
-              AND ({geom_expr}) IS NOT NULL
-              AND NOT ST_IsValid({geom_expr})
-            """,
-            [layer_id],
-        )
-        row = cursor.fetchone()
-    return int((row or [0])[0] or 0)
+def _spatial_qa_cache_seconds():
+    return int(getattr(settings, "SPATIAL_LAYER_QA_CACHE_SECONDS", 86400) or 0)
+
+
+def _spatial_layer_versions(layer_ids):
+    """Content version per layer from feature count, latest feature write and highest feature id."""
+
+    rows = (
+        SpatialFeature.objects.filter(layer_id__in=layer_ids)
+        .values("layer_id")
+        .annotate(feature_count=Count("id"), latest=Max("updated_at"), last_id=Max("id"))
+    )
+    return {
+        row["layer_id"]: f"{row['feature_count']}:{row['latest'].isoformat() if row['latest'] else ''}:{row['last_id']}"
+        for row in rows
+    }
+
+
+def _spatial_layer_qa_metrics(layer_ids):
+    """
+    Feature, invalid-geometry and missing-bbox counts for ``layer_ids`` in one grouped pass.
+
+    With PostGIS the geometry is resolved once per feature (parsing
+    ``geometry_json`` only where ``geom`` is empty) and validated inside the
+    same aggregate.
+    """
+
+    if not layer_ids:
+        return {}
+    metrics = {
+        layer_id: {"feature_count": 0, "invalid_geometry_count": 0, "missing_bbox_count": 0}
+        for layer_id in layer_ids
+    }
+    if GIS_ENABLED:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT
+                    layer_id,
+                    COUNT(*),
+                    COUNT(*) FILTER (WHERE geometry IS NOT NULL AND NOT ST_IsValid(geometry)),
+                    COUNT(*) FILTER (WHERE minx IS NULL OR miny IS NULL OR maxx IS NULL OR maxy IS NULL)
+                FROM (
+                    SELECT
+                        layer_id,
+                        minx,
+                        miny,
+                        maxx,
+                        maxy,
+                        COALESCE(geom, ST_SetSRID(ST_GeomFromGeoJSON(geometry_json::text), 4326)) AS geometry
+                    FROM nbms_app_spatialfeature
+                    WHERE layer_id = ANY(%s)
+                ) AS features
+                GROUP BY layer_id
+                """,
+                [list(layer_ids)],
+            )
+            rows = cursor.fetchall()
+        for layer_id, feature_count, invalid_count, missing_bbox_count in rows:
+            metrics[layer_id] = {
+                "feature_count": int(feature_count or 0),
+                "invalid_geometry_count": int(invalid_count or 0),
+                "missing_bbox_count": int(missing_bbox_count or 0),
+            }
+        return metrics
+    missing_bbox = Q(minx__isnull=True) | Q(miny__isnull=True) | Q(maxx__isnull=True) | Q(maxy__isnull=True)
+    rows = (
+        SpatialFeature.objects.filter(layer_id__in=layer_ids)
+        .values("layer_id")
+        .annotate(feature_count=Count("id"), missing_bbox_count=Count("id", filter=missing_bbox))
+    )
+    for row in rows:
+        metrics[row["layer_id"]] = {
+            "feature_count": row["feature_count"],
+            "invalid_geometry_count": 0,
+            "missing_bbox_count": row["missing_bbox_count"],
+        }
+    return metrics
 
 
 def _run_spatial_layer_qa(*, run, step):
     rows = []
     blocking = False
-    layers = (
+    layers = list(
         SpatialLayer.objects.filter(is_active=True, spatial_source__enabled_by_default=True)
         .select_related("latest_ingestion_run")
         .order_by("theme", "layer_code", "id")
@@ -187,14 +314,24 @@ def _run_spatial_layer_qa(*, run, step):
             message="No default-enabled spatial layers found for validation.",
             details_json={},
         )
-        return {"layers_checked": 0, "rows": rows, "blocking": False}
+        return {"layers_checked": 0, "layers_revalidated": 0, "rows": rows, "blocking": False}
 
+    # Layers whose features are unchanged since their last check reuse the cached metrics.
+    versions = _spatial_layer_versions([layer.id for layer in layers])
+    cache_keys = {layer.id: f"spatial_layer_qa:{layer.id}:{versions.get(layer.id, 'empty')}" for layer in layers}
+    timeout = _spatial_qa_cache_seconds()
+    cached = cache.get_many(list(cache_keys.values())) if timeout else {}
+    stale_ids = [layer.id for layer in layers if cache_keys[layer.id] not in cached]
+    fresh = _spatial_layer_qa_metrics(stale_ids)
+    if timeout and fresh:
+        cache.set_many({cache_keys[layer_id]: metrics for layer_id, metrics in fresh.items()}, timeout=timeout)
+
+    qa_results = []
     for layer in layers:
-        feature_count = SpatialFeature.objects.filter(layer=layer).count()
-        invalid_count = _spatial_invalid_geometry_count(layer_id=layer.id)
-        missing_bbox_count = SpatialFeature.objects.filter(layer=layer).filter(
-            Q(minx__isnull=True) | Q(miny__isnull=True) | Q(maxx__isnull=True) | Q(maxy__isnull=True)
-        ).count()
+        metrics = fresh.get(layer.id) or cached[cache_keys[layer.id]]
+        feature_count = metrics["feature_count"]
+        invalid_count = metrics["invalid_geometry_count"]
+        missing_bbox_count = metrics["missing_bbox_count"]
         latest_run = layer.latest_ingestion_run
         qa_status = ProgrammeQaStatus.PASS
         message = f"{layer.layer_code}: features={feature_count}, invalid={invalid_count}, bbox_missing={missing_bbox_count}"
@@ -212,17 +349,21 @@ def _run_spatial_layer_qa(*, run, step):
             "missing_bbox_count": missing_bbox_count,
             "latest_ingestion_status": latest_run.status if latest_run else None,
             "latest_ingestion_run_id": latest_run.run_id if latest_run else None,
+            "qa_cached": layer.id not in fresh,
         }
         rows.append(details)
-        MonitoringProgrammeQAResult.objects.create(
-            run=run,
-            step=step,
-            code=f"SPATIAL_LAYER_{layer.layer_code}",
-            status=qa_status,
-            message=message,
-            details_json=details,
+        qa_results.append(
+            MonitoringProgrammeQAResult(
+                run=run,
+                step=step,
+                code=f"SPATIAL_LAYER_{layer.layer_code}",
+                status=qa_status,
+                message=message,
+                details_json=details,
+            )
         )
-    return {"layers_checked": len(rows), "rows": rows, "blocking": blocking}
+    MonitoringProgrammeQAResult.objects.bulk_create(qa_results)
+    return {"layers_checked": len(rows), "layers_revalidated": len(fresh), "rows": rows, "blocking": blocking}
 
 
 def _publish_spatial_layers(*, run, step):
@@ -291,9 +432,11 @@ def _write_run_report_artefact(*, run):
                     "ordering": row.ordering,
                     "step_key": row.step_key,
                     "step_type": row.step_type,
+                    "depends_on": row.depends_on_json,
                     "status": row.status,
                     "started_at": row.started_at.isoformat() if row.started_at else None,
                     "finished_at": row.finished_at.isoformat() if row.finished_at else None,
+                    "duration_ms": row.duration_ms,
                     "details_json": row.details_json,
                 }
                 for row in run.steps.order_by("ordering", "id")
@@ -362,372 +505,595 @@ def queue_programme_run(
     return run
 
 
-def execute_programme_run(*, run, actor=None):
-    if run.status == ProgrammeRunStatus.RUNNING:
-        return run
-
-    actor = actor if getattr(actor, "is_authenticated", False) else run.requested_by
-    programme = run.programme
-    now = timezone.now()
-    run.status = ProgrammeRunStatus.RUNNING
-    run.started_at = now
-    run.error_message = ""
-    run.save(update_fields=["status", "started_at", "error_message", "updated_at"])
-    record_audit_event(
-        actor,
-        "programme_run_started",
-        run,
-        metadata={"programme_uuid": str(programme.uuid), "run_type": run.run_type},
-    )
-    observe_background_job(job_type="programme_run", status=ProgrammeRunStatus.RUNNING)
-
-    rules = programme.data_quality_rules_json or {}
-    min_datasets = _minimum_rule_int(rules, "minimum_dataset_links", 1)
-    min_indicators = _minimum_rule_int(rules, "minimum_indicator_links", 1)
-    dataset_link_count = programme.dataset_links.filter(is_active=True).count()
-    indicator_link_count = programme.indicator_links.filter(is_active=True).count()
-
-    final_status = ProgrammeRunStatus.SUCCEEDED
-    run_errors = []
-    step_summaries = []
-    steps = _pipeline_steps(programme, run.run_type)
-
-    for index, step in enumerate(steps, start=1):
-        step_obj = MonitoringProgrammeRunStep.objects.create(
-            run=run,
-            ordering=index,
-            step_key=step["key"],
-            step_type=step["type"],
-            status=ProgrammeRunStatus.RUNNING,
-            started_at=timezone.now(),
-        )
-        step_state = ProgrammeRunStatus.SUCCEEDED
-        step_details = {
-            "dry_run": run.dry_run,
-            "dataset_link_count": dataset_link_count,
-            "indicator_link_count": indicator_link_count,
-        }
+def _execute_step(*, run, programme, step, step_obj, actor, context):
+    """Run a single pipeline step; returns ``(status, details, errors)``."""
 
-        if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-BIRDIE-INTEGRATION":
-            if run.dry_run:
-                step_details["integration"] = {"source": "BIRDIE", "dry_run": True}
-            else:
-                from nbms_app.integrations.birdie.service import ingest_birdie_snapshot
+    dataset_link_count = context["dataset_link_count"]
+    indicator_link_count = context["indicator_link_count"]
+    min_datasets = context["min_datasets"]
+    min_indicators = context["min_indicators"]
+    step_state = ProgrammeRunStatus.SUCCEEDED
+    errors = []
+    step_details = {
+        "dry_run": run.dry_run,
+        "dataset_link_count": dataset_link_count,
+        "indicator_link_count": indicator_link_count,
+    }
 
-                ingest_summary = ingest_birdie_snapshot(actor=actor)
-                step_details["integration"] = {"source": "BIRDIE", "summary": ingest_summary}
+    if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-BIRDIE-INTEGRATION":
+        if run.dry_run:
+            step_details["integration"] = {"source": "BIRDIE", "dry_run": True}
+        else:
+            from nbms_app.integrations.birdie.service import ingest_birdie_snapshot
 
-        if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-SPATIAL-BASELINES":
-            if run.dry_run:
-                step_details["integration"] = {"source": "spatial_sources", "dry_run": True}
-            else:
-                spatial_summary = sync_spatial_sources(
-                    actor=actor,
-                    include_optional=False,
-                    force=False,
-                    dry_run=False,
-                    seed_defaults=True,
-                )
-                step_details["integration"] = {"source": "spatial_sources", "summary": spatial_summary}
-                for row in spatial_summary.get("results", []):
-                    storage_path = row.get("storage_path") or ""
-                    if storage_path:
-                        MonitoringProgrammeArtefactRef.objects.create(
-                            run=run,
-                            step=step_obj,
-                            label=f"{row.get('source_code', 'source')}-raw",
-                            storage_path=storage_path,
-                            media_type="application/zip",
-                            checksum_sha256=row.get("checksum", ""),
-                            metadata_json={
-                                "source_code": row.get("source_code"),
-                                "layer_code": row.get("layer_code"),
-                                "run_id": row.get("run_id"),
-                            },
-                        )
-                    qa_status = {
-                        "ready": ProgrammeQaStatus.PASS,
-                        "skipped": ProgrammeQaStatus.WARN,
-                        "blocked": ProgrammeQaStatus.FAIL,
-                        "failed": ProgrammeQaStatus.FAIL,
-                    }.get(row.get("status"), ProgrammeQaStatus.WARN)
-                    MonitoringProgrammeQAResult.objects.create(
-                        run=run,
-                        step=step_obj,
-                        code=f"SPATIAL_SOURCE_{row.get('source_code', 'unknown')}",
-                        status=qa_status,
-                        message=row.get("detail") or row.get("status") or "No detail provided.",
-                        details_json=row,
-                    )
-                failed_count = int(spatial_summary.get("status_counts", {}).get("failed", 0))
-                blocked_count = int(spatial_summary.get("status_counts", {}).get("blocked", 0))
-                if failed_count:
-                    step_state = ProgrammeRunStatus.FAILED
-                    final_status = ProgrammeRunStatus.FAILED
-                    run_errors.append(f"Spatial source sync failed for {failed_count} source(s).")
-                elif blocked_count:
-                    step_state = ProgrammeRunStatus.BLOCKED
-                    final_status = ProgrammeRunStatus.BLOCKED
-                    run_errors.append(f"Spatial source sync blocked for {blocked_count} source(s).")
-
-        if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-PROG-ECOSYSTEMS":
-            if run.dry_run:
-                step_details["integration"] = {"source": "vegmap_registry", "dry_run": True}
-            else:
-                ingest_log = StringIO()
-                try:
-                    call_command("sync_spatial_sources", "--source-code", "NE_GEOREGIONS_ZA", stdout=ingest_log, stderr=ingest_log)
-                    call_command("sync_vegmap_baseline", "--use-demo-layer", "--vegmap-version", "demo", stdout=ingest_log, stderr=ingest_log)
-                    detail_text = ingest_log.getvalue().strip()
-                    step_details["integration"] = {"source": "vegmap_registry", "log": detail_text}
-                    MonitoringProgrammeQAResult.objects.create(
-                        run=run,
-                        step=step_obj,
-                        code="VEGMAP_REGISTRY_SYNC",
-                        status=ProgrammeQaStatus.PASS,
-                        message="VegMap baseline sync completed for ecosystem programme.",
-                        details_json={"log": detail_text},
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    step_state = ProgrammeRunStatus.FAILED
-                    final_status = ProgrammeRunStatus.FAILED
-                    detail_text = ingest_log.getvalue().strip()
-                    run_errors.append(f"Ecosystem programme ingest failed: {exc}")
-                    step_details["integration"] = {"source": "vegmap_registry", "error": str(exc), "log": detail_text}
-                    MonitoringProgrammeQAResult.objects.create(
-                        run=run,
-                        step=step_obj,
-                        code="VEGMAP_REGISTRY_SYNC",
-                        status=ProgrammeQaStatus.FAIL,
-                        message=f"VegMap baseline sync failed: {exc}",
-                        details_json={"log": detail_text},
-                    )
+            ingest_summary = ingest_birdie_snapshot(actor=actor)
+            step_details["integration"] = {"source": "BIRDIE", "summary": ingest_summary}
 
-        if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-PROG-TAXA":
-            if run.dry_run:
-                step_details["integration"] = {"source": "taxon_registry", "dry_run": True}
-            else:
-                ingest_log = StringIO()
-                try:
-                    call_command("sync_taxon_backbone", "--seed-demo", "--skip-remote", stdout=ingest_log, stderr=ingest_log)
-                    call_command("sync_specimen_vouchers", "--seed-demo", stdout=ingest_log, stderr=ingest_log)
-                    detail_text = ingest_log.getvalue().strip()
-                    step_details["integration"] = {"source": "taxon_registry", "log": detail_text}
-                    MonitoringProgrammeQAResult.objects.create(
-                        run=run,
-                        step=step_obj,
-                        code="TAXON_REGISTRY_SYNC",
-                        status=ProgrammeQaStatus.PASS,
-                        message="Taxon backbone and voucher sync completed.",
-                        details_json={"log": detail_text},
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    step_state = ProgrammeRunStatus.FAILED
-                    final_status = ProgrammeRunStatus.FAILED
-                    detail_text = ingest_log.getvalue().strip()
-                    run_errors.append(f"Taxon programme ingest failed: {exc}")
-                    step_details["integration"] = {"source": "taxon_registry", "error": str(exc), "log": detail_text}
-                    MonitoringProgrammeQAResult.objects.create(
+    if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-SPATIAL-BASELINES":
+        if run.dry_run:
+            step_details["integration"] = {"source": "spatial_sources", "dry_run": True}
+        else:
+            spatial_summary = sync_spatial_sources(
+                actor=actor,
+                include_optional=False,
+                force=False,
+                dry_run=False,
+                seed_defaults=True,
+            )
+            step_details["integration"] = {"source": "spatial_sources", "summary": spatial_summary}
+            for row in spatial_summary.get("results", []):
+                storage_path = row.get("storage_path") or ""
+                if storage_path:
+                    MonitoringProgrammeArtefactRef.objects.create(
                         run=run,
                         step=step_obj,
-                        code="TAXON_REGISTRY_SYNC",
-                        status=ProgrammeQaStatus.FAIL,
-                        message=f"Taxon registry sync failed: {exc}",
-                        details_json={"log": detail_text},
+                        label=f"{row.get('source_code', 'source')}-raw",
+                        storage_path=storage_path,
+                        media_type="application/zip",
+                        checksum_sha256=row.get("checksum", ""),
+                        metadata_json={
+                            "source_code": row.get("source_code"),
+                            "layer_code": row.get("layer_code"),
+                            "run_id": row.get("run_id"),
+                        },
                     )
+                qa_status = {
+                    "ready": ProgrammeQaStatus.PASS,
+                    "skipped": ProgrammeQaStatus.WARN,
+                    "blocked": ProgrammeQaStatus.FAIL,
+                    "failed": ProgrammeQaStatus.FAIL,
+                }.get(row.get("status"), ProgrammeQaStatus.WARN)
+                MonitoringProgrammeQAResult.objects.create(
+                    run=run,
+                    step=step_obj,
+                    code=f"SPATIAL_SOURCE_{row.get('source_code', 'unknown')}",
+                    status=qa_status,
+                    message=row.get("detail") or row.get("status") or "No detail provided.",
+                    details_json=row,
+                )
+            failed_count = int(spatial_summary.get("status_counts", {}).get("failed", 0))
+            blocked_count = int(spatial_summary.get("status_counts", {}).get("blocked", 0))
+            if failed_count:
+                step_state = ProgrammeRunStatus.FAILED
+                errors.append(f"Spatial source sync failed for {failed_count} source(s).")
+            elif blocked_count:
+                step_state = ProgrammeRunStatus.BLOCKED
+                errors.append(f"Spatial source sync blocked for {blocked_count} source(s).")
 
-        if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-PROG-IAS":
-            if run.dry_run:
-                step_details["integration"] = {"source": "ias_registry", "dry_run": True}
-            else:
-                ingest_log = StringIO()
-                try:
-                    call_command("sync_griis_za", "--seed-demo", stdout=ingest_log, stderr=ingest_log)
-                    detail_text = ingest_log.getvalue().strip()
-                    step_details["integration"] = {"source": "ias_registry", "log": detail_text}
-                    MonitoringProgrammeQAResult.objects.create(
-                        run=run,
-                        step=step_obj,
-                        code="IAS_REGISTRY_SYNC",
-                        status=ProgrammeQaStatus.PASS,
-                        message="IAS baseline sync completed.",
-                        details_json={"log": detail_text},
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    step_state = ProgrammeRunStatus.FAILED
-                    final_status = ProgrammeRunStatus.FAILED
-                    detail_text = ingest_log.getvalue().strip()
-                    run_errors.append(f"IAS programme ingest failed: {exc}")
-                    step_details["integration"] = {"source": "ias_registry", "error": str(exc), "log": detail_text}
-                    MonitoringProgrammeQAResult.objects.create(
-                        run=run,
-                        step=step_obj,
-                        code="IAS_REGISTRY_SYNC",
-                        status=ProgrammeQaStatus.FAIL,
-                        message=f"IAS registry sync failed: {exc}",
-                        details_json={"log": detail_text},
-                    )
+    if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-PROG-ECOSYSTEMS":
+        if run.dry_run:
+            step_details["integration"] = {"source": "vegmap_registry", "dry_run": True}
+        else:
+            ingest_log = StringIO()
+            try:
+                call_command("sync_spatial_sources", "--source-code", "NE_GEOREGIONS_ZA", stdout=ingest_log, stderr=ingest_log)
+                call_command("sync_vegmap_baseline", "--use-demo-layer", "--vegmap-version", "demo", stdout=ingest_log, stderr=ingest_log)
+                detail_text = ingest_log.getvalue().strip()
+                step_details["integration"] = {"source": "vegmap_registry", "log": detail_text}
+                MonitoringProgrammeQAResult.objects.create(
+                    run=run,
+                    step=step_obj,
+                    code="VEGMAP_REGISTRY_SYNC",
+                    status=ProgrammeQaStatus.PASS,
+                    message="VegMap baseline sync completed for ecosystem programme.",
+                    details_json={"log": detail_text},
+                )
+            except Exception as exc:  # noqa: BLE001
+                step_state = ProgrammeRunStatus.FAILED
+                detail_text = ingest_log.getvalue().strip()
+                errors.append(f"Ecosystem programme ingest failed: {exc}")
+                step_details["integration"] = {"source": "vegmap_registry", "error": str(exc), "log": detail_text}
+                MonitoringProgrammeQAResult.objects.create(
+                    run=run,
+                    step=step_obj,
+                    code="VEGMAP_REGISTRY_SYNC",
+                    status=ProgrammeQaStatus.FAIL,
+                    message=f"VegMap baseline sync failed: {exc}",
+                    details_json={"log": detail_text},
+                )
 
-        if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-PROG-PROTECTED-AREAS":
-            if run.dry_run:
-                step_details["integration"] = {"source": "protected_areas_registry", "dry_run": True}
-            else:
-                ingest_log = StringIO()
-                try:
-                    call_command("sync_spatial_sources", "--source-code", "NE_PROTECTED_LANDS_ZA", stdout=ingest_log, stderr=ingest_log)
-                    call_command("sync_spatial_sources", "--source-code", "NE_ADMIN1_ZA", stdout=ingest_log, stderr=ingest_log)
-                    detail_text = ingest_log.getvalue().strip()
-                    step_details["integration"] = {"source": "protected_areas_registry", "log": detail_text}
-                    MonitoringProgrammeQAResult.objects.create(
-                        run=run,
-                        step=step_obj,
-                        code="PROTECTED_AREAS_SYNC",
-                        status=ProgrammeQaStatus.PASS,
-                        message="Protected areas sources synced.",
-                        details_json={"log": detail_text},
-                    )
-                except Exception as exc:  # noqa: BLE001
-                    step_state = ProgrammeRunStatus.FAILED
-                    final_status = ProgrammeRunStatus.FAILED
-                    detail_text = ingest_log.getvalue().strip()
-                    run_errors.append(f"Protected areas ingest failed: {exc}")
-                    step_details["integration"] = {
-                        "source": "protected_areas_registry",
-                        "error": str(exc),
-                        "log": detail_text,
-                    }
-                    MonitoringProgrammeQAResult.objects.create(
-                        run=run,
-                        step=step_obj,
-                        code="PROTECTED_AREAS_SYNC",
-                        status=ProgrammeQaStatus.FAIL,
-                        message=f"Protected areas sync failed: {exc}",
-                        details_json={"log": detail_text},
-                    )
+    if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-PROG-TAXA":
+        if run.dry_run:
+            step_details["integration"] = {"source": "taxon_registry", "dry_run": True}
+        else:
+            ingest_log = StringIO()
+            try:
+                call_command("sync_taxon_backbone", "--seed-demo", "--skip-remote", stdout=ingest_log, stderr=ingest_log)
+                call_command("sync_specimen_vouchers", "--seed-demo", stdout=ingest_log, stderr=ingest_log)
+                detail_text = ingest_log.getvalue().strip()
+                step_details["integration"] = {"source": "taxon_registry", "log": detail_text}
+                MonitoringProgrammeQAResult.objects.create(
+                    run=run,
+                    step=step_obj,
+                    code="TAXON_REGISTRY_SYNC",
+                    status=ProgrammeQaStatus.PASS,
+                    message="Taxon backbone and voucher sync completed.",
+                    details_json={"log": detail_text},
+                )
+            except Exception as exc:  # noqa: BLE001
+                step_state = ProgrammeRunStatus.FAILED
+                detail_text = ingest_log.getvalue().strip()
+                errors.append(f"Taxon programme ingest failed: {exc}")
+                step_details["integration"] = {"source": "taxon_registry", "error": str(exc), "log": detail_text}
+                MonitoringProgrammeQAResult.objects.create(
+                    run=run,
+                    step=step_obj,
+                    code="TAXON_REGISTRY_SYNC",
+                    status=ProgrammeQaStatus.FAIL,
+                    message=f"Taxon registry sync failed: {exc}",
+                    details_json={"log": detail_text},
+                )
 
-        if step["type"] == ProgrammeStepType.COMPUTE and programme.programme_code == "NBMS-BIRDIE-INTEGRATION":
-            profiles = IndicatorMethodProfile.objects.filter(
-                indicator__code__startswith="BIRDIE-",
-                is_active=True,
-            ).order_by("indicator__code", "method_type", "id")[:20]
-            method_runs = []
-            for profile in profiles:
-                method_run = run_method_profile(profile=profile, user=actor, params={"programme_run": str(run.uuid)})
-                method_runs.append(
-                    {
-                        "profile_uuid": str(profile.uuid),
-                        "indicator_code": profile.indicator.code,
-                        "status": method_run.status,
-                    }
+    if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-PROG-IAS":
+        if run.dry_run:
+            step_details["integration"] = {"source": "ias_registry", "dry_run": True}
+        else:
+            ingest_log = StringIO()
+            try:
+                call_command("sync_griis_za", "--seed-demo", stdout=ingest_log, stderr=ingest_log)
+                detail_text = ingest_log.getvalue().strip()
+                step_details["integration"] = {"source": "ias_registry", "log": detail_text}
+                MonitoringProgrammeQAResult.objects.create(
+                    run=run,
+                    step=step_obj,
+                    code="IAS_REGISTRY_SYNC",
+                    status=ProgrammeQaStatus.PASS,
+                    message="IAS baseline sync completed.",
+                    details_json={"log": detail_text},
                 )
-            step_details["method_runs"] = method_runs
-
-        if step["type"] == ProgrammeStepType.COMPUTE and programme.programme_code == "NBMS-SPATIAL-BASELINES":
-            profiles = IndicatorMethodProfile.objects.filter(
-                method_type="spatial_overlay",
-                is_active=True,
-            ).order_by("indicator__code", "implementation_key", "id")[:20]
-            method_runs = []
-            for profile in profiles:
-                method_run = run_method_profile(
-                    profile=profile,
-                    user=actor,
-                    params={"programme_run": str(run.uuid), "year": timezone.now().year},
+            except Exception as exc:  # noqa: BLE001
+                step_state = ProgrammeRunStatus.FAILED
+                detail_text = ingest_log.getvalue().strip()
+                errors.append(f"IAS programme ingest failed: {exc}")
+                step_details["integration"] = {"source": "ias_registry", "error": str(exc), "log": detail_text}
+                MonitoringProgrammeQAResult.objects.create(
+                    run=run,
+                    step=step_obj,
+                    code="IAS_REGISTRY_SYNC",
+                    status=ProgrammeQaStatus.FAIL,
+                    message=f"IAS registry sync failed: {exc}",
+                    details_json={"log": detail_text},
                 )
-                method_runs.append(
-                    {
-                        "profile_uuid": str(profile.uuid),
-                        "indicator_code": profile.indicator.code,
-                        "status": method_run.status,
-                    }
+
+    if step["type"] == ProgrammeStepType.INGEST and programme.programme_code == "NBMS-PROG-PROTECTED-AREAS":
+        if run.dry_run:
+            step_details["integration"] = {"source": "protected_areas_registry", "dry_run": True}
+        else:
+            ingest_log = StringIO()
+            try:
+                call_command("sync_spatial_sources", "--source-code", "NE_PROTECTED_LANDS_ZA", stdout=ingest_log, stderr=ingest_log)
+                call_command("sync_spatial_sources", "--source-code", "NE_ADMIN1_ZA", stdout=ingest_log, stderr=ingest_log)
+                detail_text = ingest_log.getvalue().strip()
+                step_details["integration"] = {"source": "protected_areas_registry", "log": detail_text}
+                MonitoringProgrammeQAResult.objects.create(
+                    run=run,
+                    step=step_obj,
+                    code="PROTECTED_AREAS_SYNC",
+                    status=ProgrammeQaStatus.PASS,
+                    message="Protected areas sources synced.",
+                    details_json={"log": detail_text},
                 )
-                if method_run.status == ProgrammeRunStatus.FAILED:
-                    step_state = ProgrammeRunStatus.FAILED
-                    final_status = ProgrammeRunStatus.FAILED
-                    run_errors.append(
-                        f"Spatial overlay method failed for indicator {profile.indicator.code}."
-                    )
-                elif method_run.status == ProgrammeRunStatus.BLOCKED and step_state != ProgrammeRunStatus.FAILED:
-                    step_state = ProgrammeRunStatus.BLOCKED
-                    final_status = ProgrammeRunStatus.BLOCKED
-                    run_errors.append(
-                        f"Spatial overlay method blocked for indicator {profile.indicator.code}."
-                    )
-            if not method_runs:
+            except Exception as exc:  # noqa: BLE001
+                step_state = ProgrammeRunStatus.FAILED
+                detail_text = ingest_log.getvalue().strip()
+                errors.append(f"Protected areas ingest failed: {exc}")
+                step_details["integration"] = {
+                    "source": "protected_areas_registry",
+                    "error": str(exc),
+                    "log": detail_text,
+                }
                 MonitoringProgrammeQAResult.objects.create(
                     run=run,
                     step=step_obj,
-                    code="SPATIAL_OVERLAY_METHODS",
-                    status=ProgrammeQaStatus.WARN,
-                    message="No active SPATIAL_OVERLAY method profiles were found.",
-                    details_json={},
+                    code="PROTECTED_AREAS_SYNC",
+                    status=ProgrammeQaStatus.FAIL,
+                    message=f"Protected areas sync failed: {exc}",
+                    details_json={"log": detail_text},
                 )
-            step_details["method_runs"] = method_runs
-
-        if step["type"] == ProgrammeStepType.VALIDATE:
-            problems = []
-            if dataset_link_count < min_datasets:
-                problems.append(f"Requires at least {min_datasets} active dataset links.")
-            if indicator_link_count < min_indicators:
-                problems.append(f"Requires at least {min_indicators} active indicator links.")
-            if problems:
+
+    if step["type"] == ProgrammeStepType.COMPUTE and programme.programme_code == "NBMS-BIRDIE-INTEGRATION":
+        profiles = IndicatorMethodProfile.objects.filter(
+            indicator__code__startswith="BIRDIE-",
+            is_active=True,
+        ).order_by("indicator__code", "method_type", "id")[:20]
+        method_runs = []
+        for profile in profiles:
+            method_run = run_method_profile(profile=profile, user=actor, params={"programme_run": str(run.uuid)})
+            method_runs.append(
+                {
+                    "profile_uuid": str(profile.uuid),
+                    "indicator_code": profile.indicator.code,
+                    "status": method_run.status,
+                }
+            )
+        step_details["method_runs"] = method_runs
+
+    if step["type"] == ProgrammeStepType.COMPUTE and programme.programme_code == "NBMS-SPATIAL-BASELINES":
+        profiles = IndicatorMethodProfile.objects.filter(
+            method_type="spatial_overlay",
+            is_active=True,
+        ).order_by("indicator__code", "implementation_key", "id")[:20]
+        method_runs = []
+        for profile in profiles:
+            method_run = run_method_profile(
+                profile=profile,
+                user=actor,
+                params={"programme_run": str(run.uuid), "year": timezone.now().year},
+            )
+            method_runs.append(
+                {
+                    "profile_uuid": str(profile.uuid),
+                    "indicator_code": profile.indicator.code,
+                    "status": method_run.status,
+                }
+            )
+            if method_run.status == ProgrammeRunStatus.FAILED:
+                step_state = ProgrammeRunStatus.FAILED
+                errors.append(
+                    f"Spatial overlay method failed for indicator {profile.indicator.code}."
+                )
+            elif method_run.status == ProgrammeRunStatus.BLOCKED and step_state != ProgrammeRunStatus.FAILED:
                 step_state = ProgrammeRunStatus.BLOCKED
-                final_status = ProgrammeRunStatus.BLOCKED
-                problem_text = " ".join(problems)
-                run_errors.append(problem_text)
-                create_programme_alert(
-                    programme=programme,
-                    run=run,
-                    code="PROGRAMME_QA_THRESHOLD",
-                    severity=ProgrammeAlertSeverity.WARNING,
-                    message=problem_text,
-                    created_by=actor,
-                    details={
-                        "minimum_dataset_links": min_datasets,
-                        "minimum_indicator_links": min_indicators,
-                        "dataset_link_count": dataset_link_count,
-                        "indicator_link_count": indicator_link_count,
-                    },
+                errors.append(
+                    f"Spatial overlay method blocked for indicator {profile.indicator.code}."
                 )
-            step_details["checks"] = {
-                "minimum_dataset_links": min_datasets,
-                "minimum_indicator_links": min_indicators,
-            }
-            if programme.programme_code == "NBMS-SPATIAL-BASELINES":
-                spatial_qa = _run_spatial_layer_qa(run=run, step=step_obj)
-                step_details["spatial_qa"] = spatial_qa
-                if spatial_qa.get("blocking"):
-                    step_state = ProgrammeRunStatus.BLOCKED
-                    final_status = ProgrammeRunStatus.BLOCKED
-                    run_errors.append("Spatial validation found blocking geometry/feature issues.")
-
-        if step["type"] == ProgrammeStepType.PUBLISH and run.dry_run:
-            step_details["note"] = "Dry-run mode skipped publication side effects."
-        elif step["type"] == ProgrammeStepType.PUBLISH and programme.programme_code == "NBMS-SPATIAL-BASELINES":
-            publish_result = _publish_spatial_layers(run=run, step=step_obj)
-            step_details["publish"] = publish_result
-            if publish_result.get("status") == ProgrammeRunStatus.BLOCKED:
+        if not method_runs:
+            MonitoringProgrammeQAResult.objects.create(
+                run=run,
+                step=step_obj,
+                code="SPATIAL_OVERLAY_METHODS",
+                status=ProgrammeQaStatus.WARN,
+                message="No active SPATIAL_OVERLAY method profiles were found.",
+                details_json={},
+            )
+        step_details["method_runs"] = method_runs
+
+    if step["type"] == ProgrammeStepType.VALIDATE:
+        problems = []
+        if dataset_link_count < min_datasets:
+            problems.append(f"Requires at least {min_datasets} active dataset links.")
+        if indicator_link_count < min_indicators:
+            problems.append(f"Requires at least {min_indicators} active indicator links.")
+        if problems:
+            step_state = ProgrammeRunStatus.BLOCKED
+            problem_text = " ".join(problems)
+            errors.append(problem_text)
+            create_programme_alert(
+                programme=programme,
+                run=run,
+                code="PROGRAMME_QA_THRESHOLD",
+                severity=ProgrammeAlertSeverity.WARNING,
+                message=problem_text,
+                created_by=actor,
+                details={
+                    "minimum_dataset_links": min_datasets,
+                    "minimum_indicator_links": min_indicators,
+                    "dataset_link_count": dataset_link_count,
+                    "indicator_link_count": indicator_link_count,
+                },
+            )
+        step_details["checks"] = {
+            "minimum_dataset_links": min_datasets,
+            "minimum_indicator_links": min_indicators,
+        }
+        if programme.programme_code == "NBMS-SPATIAL-BASELINES":
+            spatial_qa = _run_spatial_layer_qa(run=run, step=step_obj)
+            step_details["spatial_qa"] = spatial_qa
+            if spatial_qa.get("blocking"):
                 step_state = ProgrammeRunStatus.BLOCKED
-                final_status = ProgrammeRunStatus.BLOCKED
-                run_errors.append(publish_result.get("detail") or "Spatial publication blocked.")
+                errors.append("Spatial validation found blocking geometry/feature issues.")
+
+    if step["type"] == ProgrammeStepType.PUBLISH and run.dry_run:
+        step_details["note"] = "Dry-run mode skipped publication side effects."
+    elif step["type"] == ProgrammeStepType.PUBLISH and programme.programme_code == "NBMS-SPATIAL-BASELINES":
+        publish_result = _publish_spatial_layers(run=run, step=step_obj)
+        step_details["publish"] = publish_result
+        if publish_result.get("status") == ProgrammeRunStatus.BLOCKED:
+            step_state = ProgrammeRunStatus.BLOCKED
+            errors.append(publish_result.get("detail") or "Spatial publication blocked.")
 
+    return step_state, step_details, errors
+
+
+def _run_step(*, run, programme, step, step_obj, actor, context, worker_thread=False):
+    started = time.monotonic()
+    try:
+        step_state, step_details, errors = _execute_step(
+            run=run,
+            programme=programme,
+            step=step,
+            step_obj=step_obj,
+            actor=actor,
+            context=context,
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Programme run %s step %s raised.", run.uuid, step["key"])
+        step_state = ProgrammeRunStatus.FAILED
+        step_details = {"dry_run": run.dry_run, "error": str(exc)}
+        errors = [f"Step {step['key']} failed: {exc}"]
+    try:
         step_obj.status = step_state
         step_obj.finished_at = timezone.now()
+        step_obj.duration_ms = int((time.monotonic() - started) * 1000)
         step_obj.details_json = step_details
-        if run_errors:
-            step_obj.log_excerpt = run_errors[-1]
-        step_obj.save(update_fields=["status", "finished_at", "details_json", "log_excerpt", "updated_at"])
+        if errors:
+            step_obj.log_excerpt = errors[-1]
+        step_obj.save(update_fields=["status", "finished_at", "duration_ms", "details_json", "log_excerpt", "updated_at"])
+        observe_background_job(job_type="programme_step", status=step_state)
+    finally:
+        if worker_thread:
+            connections.close_all()
+    return step_state, errors
+
+
+def _start_step(*, run, index, step):
+    return MonitoringProgrammeRunStep.objects.create(
+        run=run,
+        ordering=index,
+        step_key=step["key"],
+        step_type=step["type"],
+        depends_on_json=list(step["depends_on"]),
+        status=ProgrammeRunStatus.RUNNING,
+        started_at=timezone.now(),
+    )
+
+
+class _LeaseHeartbeat:
+    """Extend a run's lease from a background thread while its steps run on the calling thread."""
+
+    def __init__(self, run, lease_owner):
+        self.run = run
+        self.lease_owner = lease_owner
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._beat, name=f"programme-run-{run.pk}-heartbeat", daemon=True)
+
+    def _beat(self):
+        try:
+            while not self._stop.wait(_heartbeat_seconds()):
+                if not heartbeat_programme_run(self.run, lease_owner=self.lease_owner):
+                    self.lost = True
+                    return
+        finally:
+            connections.close_all()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join(timeout=_heartbeat_seconds())
+
+
+def _run_step_graph(*, run, programme, steps, actor, context, lease_owner):
+    """
+    Execute ``steps`` in dependency order, independent steps concurrently.
 
+    A step starts once every step it depends on has succeeded. After a step
+    is blocked or fails, or the run's lease is lost, no further steps start;
+    steps already running are allowed to finish. Returns
+    ``{ordering: (step_obj, status, errors)}`` for the steps that ran.
+    """
+
+    outcomes = {}
+    states = {}
+    started = set()
+    halted = False
+
+    def _ready():
+        return [
+            (index, step)
+            for index, step in enumerate(steps, start=1)
+            if step["key"] not in started
+            and all(states.get(dependency) == ProgrammeRunStatus.SUCCEEDED for dependency in step["depends_on"])
+        ]
+
+    def _record(index, step, step_obj, step_state, errors):
+        nonlocal halted
+        states[step["key"]] = step_state
+        outcomes[index] = (step_obj, step_state, errors)
+        if step_state in {ProgrammeRunStatus.BLOCKED, ProgrammeRunStatus.FAILED}:
+            halted = True
+        if not heartbeat_programme_run(run, lease_owner=lease_owner):
+            halted = True
+
+    if _run_mode() == RUN_MODE_INLINE:
+        with _LeaseHeartbeat(run, lease_owner) as lease:
+            while not halted:
+                ready = _ready()
+                if not ready:
+                    break
+                index, step = ready[0]
+                started.add(step["key"])
+                step_obj = _start_step(run=run, index=index, step=step)
+                step_state, errors = _run_step(
+                    run=run, programme=programme, step=step, step_obj=step_obj, actor=actor, context=context
+                )
+                _record(index, step, step_obj, step_state, errors)
+                if lease.lost:
+                    halted = True
+        return outcomes
+
+    workers = _step_workers()
+    running = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"programme-run-{run.pk}") as executor:
+        while True:
+            if not halted:
+                for index, step in _ready()[: max(0, workers - len(running))]:
+                    started.add(step["key"])
+                    step_obj = _start_step(run=run, index=index, step=step)
+                    future = executor.submit(
+                        _run_step,
+                        run=run,
+                        programme=programme,
+                        step=step,
+                        step_obj=step_obj,
+                        actor=actor,
+                        context=context,
+                        worker_thread=True,
+                    )
+                    running[future] = (index, step, step_obj)
+            if not running:
+                break
+            done, _pending = wait(running, timeout=_heartbeat_seconds(), return_when=FIRST_COMPLETED)
+            if not done and not heartbeat_programme_run(run, lease_owner=lease_owner):
+                halted = True
+            for future in done:
+                index, step, step_obj = running.pop(future)
+                step_state, errors = future.result()
+                _record(index, step, step_obj, step_state, errors)
+    return outcomes
+
+
+def execute_programme_run(*, run, actor=None, lease_owner=""):
+    """
+    Execute ``run`` under a lease held by ``lease_owner``.
+
+    Runs claimed by the scheduler pass the lease owner they were claimed
+    with; the run is only started while it is still queued under that
+    lease. Without one, the run is claimed for this process with a single
+    conditional update that succeeds only while no other process runs it or
+    holds an unexpired lease, and ``ProgrammeRunConflict`` is raised when
+    that claim loses. A run whose pipeline definition is invalid is failed
+    without executing any step. Re-running a finished run replaces its
+    earlier steps, QA results and artefact references.
+    """
+
+    if run.status == ProgrammeRunStatus.RUNNING:
+        return run
+
+    actor = actor if getattr(actor, "is_authenticated", False) else run.requested_by
+    programme = run.programme
+    now = timezone.now()
+    manual_claim = not lease_owner
+    claim = MonitoringProgrammeRun.objects.filter(pk=run.pk)
+    if not manual_claim:
+        claim = claim.filter(status=ProgrammeRunStatus.QUEUED, lease_owner=lease_owner)
+    else:
+        lease_owner = default_lease_owner()
+        claim = claim.exclude(status=ProgrammeRunStatus.RUNNING).filter(
+            Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now)
+        )
+    try:
+        steps = _pipeline_steps(programme, run.run_type)
+    except ValidationError as exc:
+        claim.update(
+            status=ProgrammeRunStatus.FAILED,
+            finished_at=now,
+            error_message="; ".join(exc.messages),
+            lease_owner="",
+            lease_expires_at=None,
+            updated_at=now,
+        )
+        run.refresh_from_db()
+        return run
+    with transaction.atomic():
+        claimed = claim.update(
+            status=ProgrammeRunStatus.RUNNING,
+            started_at=now,
+            finished_at=None,
+            error_message="",
+            lease_owner=lease_owner,
+            heartbeat_at=now,
+            lease_expires_at=now + timedelta(seconds=_lease_seconds()),
+            updated_at=now,
+        )
+        if claimed:
+            # A re-run replaces the earlier attempt's steps and the QA results and artefacts they produced.
+            run.qa_results.all().delete()
+            run.artefacts.all().delete()
+            run.steps.all().delete()
+    run.refresh_from_db()
+    if not claimed:
+        if manual_claim:
+            raise ProgrammeRunConflict(f"Programme run {run.uuid} is already claimed by another worker.")
+        return run
+    record_audit_event(
+        actor,
+        "programme_run_started",
+        run,
+        metadata={"programme_uuid": str(programme.uuid), "run_type": run.run_type, "lease_owner": lease_owner},
+    )
+    observe_background_job(job_type="programme_run", status=ProgrammeRunStatus.RUNNING)
+
+    rules = programme.data_quality_rules_json or {}
+    context = {
+        "min_datasets": _minimum_rule_int(rules, "minimum_dataset_links", 1),
+        "min_indicators": _minimum_rule_int(rules, "minimum_indicator_links", 1),
+        "dataset_link_count": programme.dataset_links.filter(is_active=True).count(),
+        "indicator_link_count": programme.indicator_links.filter(is_active=True).count(),
+    }
+
+    try:
+        outcomes = _run_step_graph(
+            run=run,
+            programme=programme,
+            steps=steps,
+            actor=actor,
+            context=context,
+            lease_owner=lease_owner,
+        )
+    except Exception as exc:  # noqa: BLE001
+        # Fail the run rather than leave it RUNNING until its lease expires.
+        logger.exception("Programme run %s could not run its steps.", run.uuid)
+        failed = timezone.now()
+        MonitoringProgrammeRun.objects.filter(pk=run.pk, lease_owner=lease_owner).update(
+            status=ProgrammeRunStatus.FAILED,
+            finished_at=failed,
+            error_message=str(exc),
+            lease_owner="",
+            lease_expires_at=None,
+            updated_at=failed,
+        )
+        observe_background_job(job_type="programme_run", status=ProgrammeRunStatus.FAILED)
+        run.refresh_from_db()
+        return run
+    if not MonitoringProgrammeRun.objects.filter(pk=run.pk, lease_owner=lease_owner).exists():
+        logger.warning("Programme run %s lost its lease to recovery; discarding results.", run.uuid)
+        run.refresh_from_db()
+        return run
+
+    final_status = ProgrammeRunStatus.SUCCEEDED
+    run_errors = []
+    step_summaries = []
+    for index in sorted(outcomes):
+        step_obj, step_state, errors = outcomes[index]
+        run_errors.extend(errors)
+        if step_state == ProgrammeRunStatus.FAILED:
+            final_status = ProgrammeRunStatus.FAILED
+        elif step_state == ProgrammeRunStatus.BLOCKED and final_status != ProgrammeRunStatus.FAILED:
+            final_status = ProgrammeRunStatus.BLOCKED
         step_summaries.append(
             {
                 "ordering": index,
                 "step_key": step_obj.step_key,
                 "step_type": step_obj.step_type,
+                "depends_on": step_obj.depends_on_json,
                 "status": step_obj.status,
+                "duration_ms": step_obj.duration_ms,
             }
         )
-        if step_state in {ProgrammeRunStatus.BLOCKED, ProgrammeRunStatus.FAILED}:
-            break
 
     if final_status == ProgrammeRunStatus.SUCCEEDED and run_errors:
         final_status = ProgrammeRunStatus.FAILED
@@ -737,6 +1103,9 @@ def execute_programme_run(*, run, actor=None):
     run.finished_at = finished
     run.log_excerpt = "\n".join(run_errors[:10]) if run_errors else "Programme run completed."
     run.error_message = "\n".join(run_errors) if run_errors else ""
+    run.lease_owner = ""
+    run.lease_expires_at = None
+    run.heartbeat_at = finished
     run.output_summary_json = {
         "step_count": len(step_summaries),
         "status_counts": {
@@ -763,6 +1132,9 @@ def execute_programme_run(*, run, actor=None):
             "finished_at",
             "log_excerpt",
             "error_message",
+            "lease_owner",
+            "lease_expires_at",
+            "heartbeat_at",
             "output_summary_json",
             "lineage_json",
             "updated_at",
@@ -796,23 +1168,32 @@ def execute_programme_run(*, run, actor=None):
     return run
 
 
-@transaction.atomic
 def process_due_programmes(*, actor=None, limit=20):
-    now = timezone.now()
-    queued_runs = []
-    programmes = (
-        MonitoringProgramme.objects.filter(is_active=True, scheduler_enabled=True)
-        .filter(Q(next_run_at__isnull=True) | Q(next_run_at__lte=now))
-        .order_by("next_run_at", "programme_code", "uuid")[: max(1, int(limit))]
+    """
+    Queue runs for due programmes and execute them on the run worker pool.
+
+    Programmes are picked with row-level locks, so concurrent invocations
+    never queue the same programme twice.
+    """
+
+    from nbms_app.services.programme_scheduler import (  # noqa: WPS433
+        claim_programme_runs,
+        execute_programme_runs,
+        queue_due_programme_runs,
+    )
+
+    queued_runs = queue_due_programme_runs(actor=actor, limit=limit)
+    if not queued_runs:
+        return []
+    lease_owner = default_lease_owner()
+    claimed = claim_programme_runs(
+        lease_owner=lease_owner,
+        limit=len(queued_runs),
+        run_ids=[run.pk for run in queued_runs],
+    )
+    execute_programme_runs(claimed, actor=actor, lease_owner=lease_owner)
+    return list(
+        MonitoringProgrammeRun.objects.filter(pk__in=[run.pk for run in queued_runs])
+        .select_related("programme")
+        .order_by("created_at", "id")
     )
-    for programme in programmes:
-        run = queue_programme_run(
-            programme=programme,
-            requested_by=actor,
-            run_type=ProgrammeRunType.FULL,
-            trigger=ProgrammeRunTrigger.SCHEDULED,
-            dry_run=False,
-            execute_now=True,
-        )
-        queued_runs.append(run)
-    return queued_runs
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from nbms_app.models import (
+    MonitoringProgramme,
+    MonitoringProgrammeRun,
+    MonitoringProgrammeRunStep,
+    ProgrammeAlertSeverity,
+    ProgrammeRunStatus,
+    ProgrammeRunTrigger,
+    ProgrammeRunType,
+)
+from nbms_app.services.audit import record_audit_event
+from nbms_app.services.indicator_method_sdk import refresh_stale_method_profiles
+from nbms_app.services.metrics import observe_background_job
+from nbms_app.services.programme_ops import (
+    RUN_MODE_INLINE,
+    RUN_MODE_THREADED,
+    create_programme_alert,
+    default_lease_owner,
+    execute_programme_run,
+    queue_programme_run,
+)
+
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_RUN_STATUSES = [ProgrammeRunStatus.QUEUED, ProgrammeRunStatus.RUNNING]
+
+
+def _run_mode():
+    return str(getattr(settings, "PROGRAMME_RUN_MODE", RUN_MODE_THREADED) or RUN_MODE_THREADED).lower()
+
+
+def _run_workers():
+    return max(1, int(getattr(settings, "PROGRAMME_RUN_WORKERS", 2) or 1))
+
+
+def _lease_seconds():
+    return max(1, int(getattr(settings, "PROGRAMME_RUN_LEASE_SECONDS", 300) or 300))
+
+
+def _poll_seconds():
+    return max(1, int(getattr(settings, "PROGRAMME_SCHEDULER_POLL_SECONDS", 30) or 30))
+
+
+def _method_auto_refresh():
+    return bool(getattr(settings, "INDICATOR_METHOD_AUTO_REFRESH", True))
+
+
+@transaction.atomic
+def queue_due_programme_runs(*, actor=None, limit=20):
+    """
+    Queue a scheduled run for each due programme without one already queued or running.
+
+    Due programmes are locked with ``FOR UPDATE SKIP LOCKED`` so a concurrent
+    scheduler skips the rows this one is queueing instead of duplicating them.
+    """
+
+    now = timezone.now()
+    active_runs = MonitoringProgrammeRun.objects.filter(programme=OuterRef("pk"), status__in=ACTIVE_RUN_STATUSES)
+    programmes = list(
+        MonitoringProgramme.objects.select_for_update(skip_locked=True)
+        .filter(is_active=True, scheduler_enabled=True)
+        .filter(Q(next_run_at__isnull=True) | Q(next_run_at__lte=now))
+        .exclude(Exists(active_runs))
+        .order_by("next_run_at", "programme_code", "uuid")[: max(1, int(limit))]
+    )
+    return [
+        queue_programme_run(
+            programme=programme,
+            requested_by=actor,
+            run_type=ProgrammeRunType.FULL,
+            trigger=ProgrammeRunTrigger.SCHEDULED,
+            dry_run=False,
+            execute_now=False,
+        )
+        for programme in programmes
+    ]
+
+
+@transaction.atomic
+def claim_programme_runs(*, lease_owner, limit, run_ids=None):
+    """
+    Lease up to ``limit`` queued runs to ``lease_owner``, oldest first.
+
+    Runs leased by another worker are skipped until that lease expires.
+    """
+
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    queryset = MonitoringProgrammeRun.objects.select_for_update(skip_locked=True).filter(
+        Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lte=now),
+        status=ProgrammeRunStatus.QUEUED,
+    )
+    if run_ids is not None:
+        queryset = queryset.filter(pk__in=run_ids)
+    run_ids = list(queryset.order_by("created_at", "id").values_list("pk", flat=True)[:limit])
+    if not run_ids:
+        return []
+    MonitoringProgrammeRun.objects.filter(pk__in=run_ids).update(
+        lease_owner=lease_owner,
+        lease_expires_at=now + timedelta(seconds=_lease_seconds()),
+        heartbeat_at=now,
+    )
+    return list(
+        MonitoringProgrammeRun.objects.filter(pk__in=run_ids)
+        .select_related("programme", "requested_by")
+        .order_by("created_at", "id")
+    )
+
+
+def recover_stuck_programme_runs(*, actor=None):
+    """
+    Fail running runs whose lease expired without a heartbeat.
+
+    The worker that held the lease is presumed lost. Scheduled programmes
+    are picked up again on the next tick because their ``next_run_at`` was
+    never advanced; an alert is raised for every recovered run.
+    """
+
+    now = timezone.now()
+    recovered = []
+    with transaction.atomic():
+        stuck_runs = list(
+            MonitoringProgrammeRun.objects.select_for_update(skip_locked=True)
+            .filter(status=ProgrammeRunStatus.RUNNING, lease_expires_at__lt=now)
+            .select_related("programme")
+            .order_by("lease_expires_at", "id")
+        )
+        for run in stuck_runs:
+            message = (
+                f"Run lease held by {run.lease_owner or 'unknown worker'} expired at "
+                f"{run.lease_expires_at.isoformat()} without a heartbeat."
+            )
+            MonitoringProgrammeRunStep.objects.filter(run=run, status=ProgrammeRunStatus.RUNNING).update(
+                status=ProgrammeRunStatus.FAILED,
+                finished_at=now,
+                log_excerpt=message,
+                updated_at=now,
+            )
+            previous_owner = run.lease_owner
+            run.status = ProgrammeRunStatus.FAILED
+            run.finished_at = now
+            run.error_message = message
+            run.log_excerpt = message
+            run.lease_owner = ""
+            run.lease_expires_at = None
+            run.save(
+                update_fields=[
+                    "status",
+                    "finished_at",
+                    "error_message",
+                    "log_excerpt",
+                    "lease_owner",
+                    "lease_expires_at",
+                    "updated_at",
+                ]
+            )
+            create_programme_alert(
+                programme=run.programme,
+                run=run,
+                code="PROGRAMME_RUN_STUCK",
+                severity=ProgrammeAlertSeverity.ERROR,
+                message=message,
+                created_by=actor,
+                details={
+                    "lease_owner": previous_owner,
+                    "heartbeat_at": run.heartbeat_at.isoformat() if run.heartbeat_at else None,
+                },
+            )
+            record_audit_event(
+                actor,
+                "programme_run_recovered",
+                run,
+                metadata={"programme_uuid": str(run.programme.uuid), "lease_owner": previous_owner},
+            )
+            observe_background_job(job_type="programme_run", status=ProgrammeRunStatus.FAILED)
+            recovered.append(run)
+    for run in recovered:
+        logger.warning("Recovered stuck programme run %s (%s).", run.uuid, run.programme.programme_code)
+    return recovered
+
+
+def _execute_in_worker(run_id, actor, lease_owner):
+    try:
+        run = MonitoringProgrammeRun.objects.select_related("programme", "requested_by").get(pk=run_id)
+        return execute_programme_run(run=run, actor=actor, lease_owner=lease_owner)
+    except Exception:  # noqa: BLE001
+        logger.exception("Programme run %s failed on scheduler worker.", run_id)
+        return None
+    finally:
+        connections.close_all()
+
+
+def _refresh_methods_in_worker(actor):
+    try:
+        return refresh_stale_method_profiles(user=actor)
+    except Exception:  # noqa: BLE001
+        logger.exception("Indicator method refresh failed on scheduler worker.")
+        return []
+    finally:
+        connections.close_all()
+
+
+def execute_programme_runs(runs, *, actor=None, lease_owner):
+    """Execute claimed ``runs`` on a bounded thread pool, or one after another in inline mode."""
+
+    if _run_mode() == RUN_MODE_INLINE or len(runs) <= 1:
+        return [execute_programme_run(run=run, actor=actor, lease_owner=lease_owner) for run in runs]
+    with ThreadPoolExecutor(max_workers=min(_run_workers(), len(runs)), thread_name_prefix="programme-run") as executor:
+        futures = [executor.submit(_execute_in_worker, run.pk, actor, lease_owner) for run in runs]
+        return [future.result() for future in futures]
+
+
+class ProgrammeRunScheduler:
+    """
+    Long-running scheduler: queue due programmes, claim runs and execute them.
+
+    Each tick recovers stuck runs, queues due programmes and claims as many
+    queued runs as there are free worker slots. Runs execute on a bounded
+    thread pool so one slow programme does not hold up the others; inline
+    mode executes claimed runs within the tick.
+
+    Each tick also re-runs indicator method profiles whose inputs changed,
+    with at most one refresh job in flight.
+    """
+
+    def __init__(self, *, actor=None, workers=None, lease_owner=None, queue_limit=20):
+        self.actor = actor
+        self.workers = max(1, int(workers or _run_workers()))
+        self.lease_owner = lease_owner or default_lease_owner()
+        self.queue_limit = queue_limit
+        self.inline = _run_mode() == RUN_MODE_INLINE
+        # One thread beyond the run slots is reserved for the method refresh job.
+        self._executor = None if self.inline else ThreadPoolExecutor(
+            max_workers=self.workers + 1,
+            thread_name_prefix="programme-run",
+        )
+        self._in_flight = set()
+        self._method_refresh = None
+
+    def tick(self):
+        self._in_flight = {future for future in self._in_flight if not future.done()}
+        recover_stuck_programme_runs(actor=self.actor)
+        queue_due_programme_runs(actor=self.actor, limit=self.queue_limit)
+        runs = claim_programme_runs(lease_owner=self.lease_owner, limit=self.workers - len(self._in_flight))
+        if self.inline:
+            execute_programme_runs(runs, actor=self.actor, lease_owner=self.lease_owner)
+        else:
+            for run in runs:
+                self._in_flight.add(self._executor.submit(_execute_in_worker, run.pk, self.actor, self.lease_owner))
+        self.refresh_methods()
+        return runs
+
+    def refresh_methods(self):
+        if not _method_auto_refresh():
+            return
+        if self.inline:
+            refresh_stale_method_profiles(user=self.actor)
+        elif self._method_refresh is None or self._method_refresh.done():
+            self._method_refresh = self._executor.submit(_refresh_methods_in_worker, self.actor)
+
+    def serve_forever(self, *, stop_event=None, poll_seconds=None):
+        stop_event = stop_event or threading.Event()
+        poll_seconds = poll_seconds or _poll_seconds()
+        while not stop_event.is_set():
+            try:
+                self.tick()
+            except Exception:  # noqa: BLE001
+                logger.exception("Programme scheduler tick failed.")
+            close_old_connections()
+            stop_event.wait(poll_seconds)
+
+    def shutdown(self, *, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        self._in_flight = set()
+        self._method_refresh = None
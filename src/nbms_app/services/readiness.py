@@ -155,13 +155,26 @@ def _consent_granted_uuids(instance, model):
     )
 
 
-def _indicator_reporting_capability_counts(instance, user):
+def _context_approved_ids(instance, model, context=None):
+    # An ``ExportBuildContext`` answers each model's lookup once per build.
+    if context is not None:
+        return context.approved_uuids(model)
+    return _approved_ids(instance, model)
+
+
+def _context_consent_granted_uuids(instance, model, context=None):
+    if context is not None:
+        return context.consent_granted_uuids(model)
+    return _consent_granted_uuids(instance, model)
+
+
+def _indicator_reporting_capability_counts(instance, user, context=None):
     queryset = filter_queryset_for_user(Indicator.objects.all(), user).filter(status=LifecycleStatus.PUBLISHED)
     if instance:
-        approved_ids = _approved_ids(instance, Indicator)
+        approved_ids = _context_approved_ids(instance, Indicator, context)
         queryset = queryset.filter(uuid__in=approved_ids)
     indicators = list(queryset)
-    consent_granted = _consent_granted_uuids(instance, Indicator)
+    consent_granted = _context_consent_granted_uuids(instance, Indicator, context)
     indicators = [
         indicator
         for indicator in indicators
@@ -174,25 +187,26 @@ def _indicator_reporting_capability_counts(instance, user):
     return {"total": len(indicators), "by_capability": dict(counts), "items": indicators}
 
 
-def _approval_counts(instance, model, user):
+def _approval_counts(instance, model, user, context=None):
     visible = _visible_queryset(model, user).filter(status=LifecycleStatus.PUBLISHED)
-    approved = visible.filter(uuid__in=_approved_ids(instance, model))
+    approved = visible.filter(uuid__in=_context_approved_ids(instance, model, context))
     total = visible.count()
     approved_count = approved.count()
     return {"total": total, "approved": approved_count, "pending": max(0, total - approved_count)}
 
 
-def _consent_missing(instance, model, user):
+def _consent_missing(instance, model, user, context=None):
     visible = _visible_queryset(model, user).filter(status=LifecycleStatus.PUBLISHED)
     approved_visible = visible.filter(
-        uuid__in=_approved_ids(instance, model),
+        uuid__in=_context_approved_ids(instance, model, context),
         sensitivity=SensitivityLevel.IPLC_SENSITIVE,
     )
-    missing = 0
-    for obj in approved_visible:
-        if not consent_is_granted(instance, obj):
-            missing += 1
-    return {"total": approved_visible.count(), "missing": missing}
+    objects = list(approved_visible)
+    if not objects:
+        return {"total": 0, "missing": 0}
+    granted = _context_consent_granted_uuids(instance, model, context)
+    missing = sum(1 for obj in objects if obj.uuid not in granted)
+    return {"total": len(objects), "missing": missing}
 
 
 def _section_state(instance, rules):
@@ -265,13 +279,23 @@ def _section_state(instance, rules):
     }
 
 
-def _progress_state(instance, user, section_state):
+def _progress_state(instance, user, section_state, context=None):
     required_codes = set(section_state.get("required_section_codes", []))
     require_section_iii = "section-iii" in required_codes
     require_section_iv = "section-iv" in required_codes
 
-    scoped_targets = scoped_national_targets(instance, user) if require_section_iii else NationalTarget.objects.none()
-    scoped_fw_targets = scoped_framework_targets(instance, user) if require_section_iv else FrameworkTarget.objects.none()
+    if context is not None:
+        scoped_targets = context.scoped_national_targets() if require_section_iii else NationalTarget.objects.none()
+        scoped_fw_targets = (
+            context.scoped_framework_targets() if require_section_iv else FrameworkTarget.objects.none()
+        )
+    else:
+        scoped_targets = (
+            scoped_national_targets(instance, user) if require_section_iii else NationalTarget.objects.none()
+        )
+        scoped_fw_targets = (
+            scoped_framework_targets(instance, user) if require_section_iv else FrameworkTarget.objects.none()
+        )
 
     section_iii_total = scoped_targets.count()
     section_iv_total = scoped_fw_targets.count()
@@ -389,11 +413,11 @@ def _score_consent(consent):
     return round(100 * (1 - (missing / total)))
 
 
-def _score_publication_quality(instance, user):
+def _score_publication_quality(instance, user, context=None):
     total = 0
     published = 0
     for model in (Indicator, NationalTarget, Evidence, Dataset):
-        approved_ids = _approved_ids(instance, model)
+        approved_ids = _context_approved_ids(instance, model, context)
         if not approved_ids:
             continue
         approved_qs = filter_queryset_for_user(model.objects.filter(uuid__in=approved_ids), user)
@@ -482,7 +506,7 @@ def _score_metadata(instance, user, rules):
     return round(100 * complete / totals)
 
 
-def _build_action_queue(instance, user, readiness):
+def _build_action_queue(instance, user, readiness, context=None):
     items = []
     approvals = readiness["details"]["approvals"]
     consent = readiness["details"]["consent"]
@@ -530,7 +554,7 @@ def _build_action_queue(instance, user, readiness):
 
     not_published_total = 0
     for model in (Indicator, NationalTarget, Evidence, Dataset):
-        approved_ids = _approved_ids(instance, model)
+        approved_ids = _context_approved_ids(instance, model, context)
         if not approved_ids:
             continue
         approved_qs = filter_queryset_for_user(model.objects.filter(uuid__in=approved_ids), user)
@@ -580,12 +604,23 @@ def _build_action_queue(instance, user, readiness):
     return items[:10]
 
 
-def get_instance_readiness(instance, user):
+def get_instance_readiness(instance, user, context=None):
+    """
+    Instance readiness for ``user``. ``context`` is an optional
+    ``ExportBuildContext`` whose scoped targets, approvals and consents are
+    reused; without one a context is built here so each lookup still runs
+    once across the checks.
+    """
+
+    if context is None:
+        from nbms_app.services.export_context import ExportBuildContext
+
+        context = ExportBuildContext(instance, user)
     blockers = []
     warnings = []
     rules = _load_validation_rules(instance)
     section_state = _section_state(instance, rules)
-    progress_state = _progress_state(instance, user, section_state)
+    progress_state = _progress_state(instance, user, section_state, context=context)
     missing_required = section_state["missing_required_sections"]
     incomplete_required = section_state["incomplete_required_sections"]
     if missing_required:
@@ -650,26 +685,26 @@ def get_instance_readiness(instance, user):
             )
 
     approvals = {
-        "indicators": _approval_counts(instance, Indicator, user),
-        "targets": _approval_counts(instance, NationalTarget, user),
-        "evidence": _approval_counts(instance, Evidence, user),
-        "datasets": _approval_counts(instance, Dataset, user),
+        "indicators": _approval_counts(instance, Indicator, user, context),
+        "targets": _approval_counts(instance, NationalTarget, user, context),
+        "evidence": _approval_counts(instance, Evidence, user, context),
+        "datasets": _approval_counts(instance, Dataset, user, context),
     }
     for key, counts in approvals.items():
         if counts["pending"]:
             warnings.append(_warning(f"{key}_pending", f"{counts['pending']} {key} pending approval."))
 
     consent = {
-        "indicators": _consent_missing(instance, Indicator, user),
-        "targets": _consent_missing(instance, NationalTarget, user),
-        "evidence": _consent_missing(instance, Evidence, user),
-        "datasets": _consent_missing(instance, Dataset, user),
+        "indicators": _consent_missing(instance, Indicator, user, context),
+        "targets": _consent_missing(instance, NationalTarget, user, context),
+        "evidence": _consent_missing(instance, Evidence, user, context),
+        "datasets": _consent_missing(instance, Dataset, user, context),
     }
     missing_consent = sum(item["missing"] for item in consent.values())
     if missing_consent:
         blockers.append(_blocker("consent_missing", "Missing consent for approved IPLC records.", count=missing_consent))
 
-    reporting_counts = _indicator_reporting_capability_counts(instance, user)
+    reporting_counts = _indicator_reporting_capability_counts(instance, user, context)
     require_reporting_metadata = bool(
         (rules or {}).get("require_indicator_reporting_metadata")
         or (rules or {}).get("indicator_reporting_metadata", {}).get("required")
@@ -764,7 +799,7 @@ def get_instance_readiness(instance, user):
         section_score = round((section_score + progress_score) / 2)
     approvals_score = _score_approvals(approvals)
     consent_score = _score_consent(consent)
-    publication_score = _score_publication_quality(instance, user)
+    publication_score = _score_publication_quality(instance, user, context)
     metadata_score = _score_metadata(instance, user, rules)
     weighted_score = round(
         (
@@ -782,7 +817,7 @@ def get_instance_readiness(instance, user):
         band = "amber"
     else:
         band = "red"
-    action_queue = _build_action_queue(instance, user, result)
+    action_queue = _build_action_queue(instance, user, result, context)
     result.update(
         {
             "readiness_score": weighted_score,
@@ -1334,10 +1369,9 @@ def _user_is_privileged(user):
 
 
 def _dataset_access_blocked(dataset, user):
+    # Callers skip privileged users, checked once per readiness run.
     if not user:
         return False
-    if _user_is_privileged(user):
-        return False
     if dataset.access_level == AccessLevel.RESTRICTED:
         return True
     if dataset.access_level == AccessLevel.INTERNAL:
@@ -1349,8 +1383,6 @@ def _dataset_access_blocked(dataset, user):
 def _programme_access_blocked(programme, user):
     if not user:
         return False
-    if _user_is_privileged(user):
-        return False
     access_level = programme.sensitivity_class.access_level_default if programme.sensitivity_class else None
     if access_level == AccessLevel.RESTRICTED:
         return True
@@ -1425,7 +1457,12 @@ def _compute_reporting_readiness(instance_ref, scope="all", user=None, mode="aut
     if indicator_ids:
         programme_links = (
             ProgrammeIndicatorLink.objects.filter(indicator_id__in=indicator_ids)
-            .select_related("programme", "programme__sensitivity_class", "programme__lead_org")
+            .select_related(
+                "programme",
+                "programme__sensitivity_class",
+                "programme__lead_org",
+                "programme__agreement",
+            )
             .prefetch_related("programme__partners")
         )
         for link in programme_links:
@@ -1451,6 +1488,7 @@ def _compute_reporting_readiness(instance_ref, scope="all", user=None, mode="aut
             "dataset",
             "dataset__custodian_org",
             "dataset__producer_org",
+            "dataset__agreement",
         )
         for link in programme_dataset_links:
             dataset_ids_by_programme[link.programme_id].add(link.dataset_id)
@@ -1459,7 +1497,12 @@ def _compute_reporting_readiness(instance_ref, scope="all", user=None, mode="aut
     if methodology_ids:
         methodology_dataset_links = MethodologyDatasetLink.objects.filter(
             methodology_id__in=methodology_ids
-        ).select_related("dataset", "dataset__custodian_org", "dataset__producer_org")
+        ).select_related(
+            "dataset",
+            "dataset__custodian_org",
+            "dataset__producer_org",
+            "dataset__agreement",
+        )
         for link in methodology_dataset_links:
             dataset_ids_by_methodology[link.methodology_id].add(link.dataset_id)
             dataset_map[link.dataset_id] = link.dataset
@@ -1467,7 +1510,12 @@ def _compute_reporting_readiness(instance_ref, scope="all", user=None, mode="aut
     if indicator_ids:
         dataset_indicator_links = DatasetCatalogIndicatorLink.objects.filter(
             indicator_id__in=indicator_ids
-        ).select_related("dataset", "dataset__custodian_org", "dataset__producer_org")
+        ).select_related(
+            "dataset",
+            "dataset__custodian_org",
+            "dataset__producer_org",
+            "dataset__agreement",
+        )
         for link in dataset_indicator_links:
             dataset_ids_by_indicator[link.indicator_id].add(link.dataset_id)
             dataset_map[link.dataset_id] = link.dataset
@@ -1529,6 +1577,7 @@ def _compute_reporting_readiness(instance_ref, scope="all", user=None, mode="aut
             .values_list("object_uuid", flat=True)
         )
 
+    user_privileged = _user_is_privileged(effective_user)
     for indicator in indicators:
         programmes = programmes_by_indicator.get(indicator.id, [])
         methodology_versions = methodology_versions_by_indicator.get(indicator.id, [])
@@ -1568,7 +1617,7 @@ def _compute_reporting_readiness(instance_ref, scope="all", user=None, mode="aut
         sensitivity_blocked = False
         policy_blocked = False
         policy_blockers = []
-        if mode == "authoring" and effective_user:
+        if mode == "authoring" and effective_user and not user_privileged:
             for dataset in datasets:
                 if _dataset_access_blocked(dataset, effective_user):
                     sensitivity_blocked = True
@@ -1697,6 +1746,11 @@ def compute_release_readiness_report(instance):
 
 def validate_release_readiness(instance):
     report, summary = compute_release_readiness_report(instance)
+    check_release_readiness(report, summary)
+    return report, summary
+
+
+def check_release_readiness(report, summary):
     overall_ready = summary.get("overall_ready")
     if overall_ready is None:
         raise ValidationError("Readiness computation failed or incomplete.")
@@ -1711,4 +1765,3 @@ def validate_release_readiness(instance):
             if blocking_count is not None
             else "Reporting readiness blockers: unknown"
         )
-    return report, summary
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import time
 from datetime import date
 from decimal import Decimal
 
@@ -19,18 +19,28 @@ from nbms_app.models import (
     IASGoldDimension,
     IASGoldSummary,
     LifecycleStatus,
+    RegistryMart,
+    RegistryMartRefresh,
     SEICATAssessment,
     SeicatCategory,
     SensitivityLevel,
-    SpatialFeature,
-    SpatialLayer,
+    SpatialOverlayCacheUnit,
     TaxonConcept,
     TaxonGoldSummary,
 )
+from nbms_app.services.input_versions import bump_input_versions_for, get_input_versions
+from nbms_app.services.spatial_overlay import (
+    PROTECTED_LAYER_CODES,
+    PROVINCE_LAYER_CODES,
+    active_layer,
+    get_overlay_cache,
+    overlay_inputs_hash,
+)
 from nbms_app.spatial_fields import GIS_ENABLED
 
 
 THREAT_CATEGORIES = {"CR", "EN", "VU"}
+ECOSYSTEM_LAYER_CODES = ["ZA_ECOSYSTEM_PROXY_NE"]
 
 
 def _pick_str(props: dict, keys):
@@ -56,59 +66,6 @@ def _coalesce_geom_sql(alias: str):
     )
 
 
-def _refresh_taxon_gold(snapshot: date):
-    TaxonGoldSummary.objects.filter(snapshot_date=snapshot).delete()
-    ias_counts = defaultdict(int)
-    for row in AlienTaxonProfile.objects.exclude(status=LifecycleStatus.ARCHIVED).values("taxon_id").annotate(total=Max("id")):
-        ias_counts[row["taxon_id"]] += 1
-
-    grouped = defaultdict(lambda: {"taxon_count": 0, "voucher_count": 0, "ias_profile_count": 0})
-    queryset = TaxonConcept.objects.exclude(status=LifecycleStatus.ARCHIVED).order_by("id")
-    for taxon in queryset:
-        key = (
-            taxon.organisation_id,
-            taxon.taxon_rank or "",
-            taxon.is_native,
-            bool(taxon.is_endemic),
-            bool(taxon.has_national_voucher_specimen),
-            bool(ias_counts.get(taxon.id)),
-        )
-        grouped[key]["taxon_count"] += 1
-        grouped[key]["voucher_count"] += int(taxon.voucher_specimen_count or 0)
-        grouped[key]["ias_profile_count"] += int(ias_counts.get(taxon.id, 0))
-
-    rows = []
-    for key, values in grouped.items():
-        (
-            organisation_id,
-            taxon_rank,
-            is_native,
-            is_endemic,
-            has_voucher,
-            is_ias,
-        ) = key
-        rows.append(
-            TaxonGoldSummary(
-                snapshot_date=snapshot,
-                organisation_id=organisation_id,
-                taxon_rank=taxon_rank,
-                is_native=is_native,
-                is_endemic=is_endemic,
-                has_voucher=has_voucher,
-                is_ias=is_ias,
-                taxon_count=values["taxon_count"],
-                voucher_count=values["voucher_count"],
-                ias_profile_count=values["ias_profile_count"],
-                status=LifecycleStatus.PUBLISHED,
-                sensitivity=SensitivityLevel.PUBLIC,
-                source_system="registry_marts",
-                source_ref="taxon_gold_v1",
-            )
-        )
-    TaxonGoldSummary.objects.bulk_create(rows, batch_size=500)
-    return len(rows)
-
-
 def _ecosystem_area_by_dimension(layer, property_keys):
     if not layer or not GIS_ENABLED:
         return {}
@@ -130,241 +87,492 @@ def _ecosystem_area_by_dimension(layer, property_keys):
         return {str(bucket): Decimal(str(area or 0)) for bucket, area in cursor.fetchall()}
 
 
-def _province_protected_rows():
-    admin = SpatialLayer.objects.filter(layer_code__in=["ZA_PROVINCES_NE", "ZA_PROVINCES"], is_active=True).order_by("id").first()
-    protected = SpatialLayer.objects.filter(
-        layer_code__in=["ZA_PROTECTED_AREAS_NE", "ZA_PROTECTED_AREAS"],
-        is_active=True,
-    ).order_by("id").first()
-    if not admin or not protected or not GIS_ENABLED:
-        return []
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _execute(query, params):
+    with connection.cursor() as cursor:
+        cursor.execute(query, params)
+        return max(cursor.rowcount, 0)
+
+
+def _fetchall(query, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(query, list(params))
+        return cursor.fetchall()
+
+
+def _layer_fingerprint(*layers):
+    keys = [("spatial_feature", layer.id) for layer in layers]
+    versions = get_input_versions(keys)
+    return ",".join(f"{layer.id}@{versions[key]}" for layer, key in zip(layers, keys))
+
+
+def _organisation_partition(alias):
+    return f"COALESCE({alias}.organisation_id, 0)::text"
+
+
+def _taxon_partition(alias):
+    return f"CONCAT(COALESCE({alias}.organisation_id, 0), '|', {alias}.taxon_rank)"
+
+
+def _partition_filter(partition_sql, keys):
+    """An ``AND`` clause restricting ``partition_sql`` to ``keys``; ``None`` keeps every partition."""
+
+    if keys is None:
+        return "", []
+    return f"AND {partition_sql} = ANY(%s)", [sorted(keys)]
+
+
+def _fingerprints(source_sql, params=()):
+    """
+    Hash the ``(partition_key, row_text)`` rows of ``source_sql`` per partition.
+
+    Row texts carry only the columns a mart reads, so a partition's hash
+    changes exactly when a refresh would write different rows for it.
+    """
+
     query = f"""
-        WITH admin AS (
-            SELECT
-                COALESCE(NULLIF(sf.province_code, ''), sf.feature_key, sf.feature_id, 'UNKNOWN') AS province_code,
-                COALESCE(NULLIF(sf.name, ''), sf.feature_key, sf.feature_id, 'Unknown') AS province_name,
-                {_coalesce_geom_sql("sf")} AS geom
-            FROM nbms_app_spatialfeature sf
-            WHERE sf.layer_id = %s
-        ),
-        protected AS (
-            SELECT ST_UnaryUnion(ST_Collect({_coalesce_geom_sql("sf")})) AS geom
-            FROM nbms_app_spatialfeature sf
-            WHERE sf.layer_id = %s
+        SELECT partition_key, md5(string_agg(row_text, ',' ORDER BY row_text))
+        FROM ({source_sql}) AS source (partition_key, row_text)
+        GROUP BY partition_key
+    """
+    return dict(_fetchall(query, params))
+
+
+# Trailing columns shared by every gold row, filled from _gold_params().
+GOLD_COLUMNS = "status, sensitivity, source_system, source_ref, created_at, updated_at"
+GOLD_VALUES = "%s, %s, %s, %s, NOW(), NOW()"
+
+
+def _gold_params(source_ref):
+    return [LifecycleStatus.PUBLISHED, SensitivityLevel.PUBLIC, "registry_marts", source_ref]
+
+
+def _taxon_fingerprints():
+    partition = _taxon_partition("t")
+    return _fingerprints(
+        f"""
+        SELECT {partition}, ROW(
+            'taxon', t.id, t.status, t.is_native, t.is_endemic,
+            t.has_national_voucher_specimen, t.voucher_specimen_count
+        )::text
+        FROM {_table(TaxonConcept)} t
+        UNION ALL
+        SELECT {partition}, ROW('profile', p.id, p.taxon_id, p.status)::text
+        FROM {_table(AlienTaxonProfile)} p
+        JOIN {_table(TaxonConcept)} t ON t.id = p.taxon_id
+        """
+    )
+
+
+def _insert_taxon_gold(snapshot: date, partitions=None):
+    clause, filter_params = _partition_filter(_taxon_partition("tc"), partitions)
+    query = f"""
+        INSERT INTO {_table(TaxonGoldSummary)} (
+            uuid, snapshot_date, organisation_id, taxon_rank, is_native, is_endemic, has_voucher, is_ias,
+            taxon_count, voucher_count, ias_profile_count, {GOLD_COLUMNS}
         )
         SELECT
-            a.province_code,
-            a.province_name,
-            ROUND((ST_Area(a.geom::geography) / 1000000.0)::numeric, 6) AS province_area_km2,
-            ROUND(
-                (CASE WHEN p.geom IS NULL THEN 0
-                      ELSE ST_Area(ST_Intersection(a.geom, p.geom)::geography) / 1000000.0
-                 END)::numeric,
-                6
-            ) AS protected_area_km2
-        FROM admin a
-        CROSS JOIN protected p
-        WHERE a.geom IS NOT NULL
-        ORDER BY a.province_code
+            gen_random_uuid(), %s, t.organisation_id, t.taxon_rank, t.is_native, t.is_endemic, t.has_voucher, t.is_ias,
+            COUNT(*), COALESCE(SUM(t.voucher_specimen_count), 0), COUNT(*) FILTER (WHERE t.is_ias), {GOLD_VALUES}
+        FROM (
+            SELECT
+                tc.organisation_id,
+                tc.taxon_rank,
+                tc.is_native,
+                tc.is_endemic,
+                tc.has_national_voucher_specimen AS has_voucher,
+                tc.voucher_specimen_count,
+                EXISTS (
+                    SELECT 1 FROM {_table(AlienTaxonProfile)} p WHERE p.taxon_id = tc.id AND p.status <> %s
+                ) AS is_ias
+            FROM {_table(TaxonConcept)} tc
+            WHERE tc.status <> %s {clause}
+        ) t
+        GROUP BY t.organisation_id, t.taxon_rank, t.is_native, t.is_endemic, t.has_voucher, t.is_ias
     """
-    with connection.cursor() as cursor:
-        cursor.execute(query, [admin.id, protected.id])
-        rows = []
-        for code, name, total_km2, protected_km2 in cursor.fetchall():
-            total = Decimal(str(total_km2 or 0))
-            protected_area = Decimal(str(protected_km2 or 0))
-            pct = Decimal("0")
-            if total > 0:
-                pct = (protected_area / total) * Decimal("100")
-            rows.append(
-                {
-                    "province_code": str(code or "UNKNOWN"),
-                    "province_name": str(name or "Unknown"),
-                    "total_area_km2": total.quantize(Decimal("0.001")),
-                    "protected_area_km2": protected_area.quantize(Decimal("0.001")),
-                    "protected_percent": pct.quantize(Decimal("0.001")),
-                }
+    return _execute(
+        query,
+        [
+            snapshot,
+            *_gold_params("taxon_gold_v1"),
+            LifecycleStatus.ARCHIVED,
+            LifecycleStatus.ARCHIVED,
+            *filter_params,
+        ],
+    )
+
+
+def _ecosystem_fingerprints():
+    partition = _organisation_partition("e")
+    fingerprints = _fingerprints(
+        f"""
+        SELECT {partition}, ROW('ecosystem', e.id, e.status, e.biome, e.bioregion)::text
+        FROM {_table(EcosystemType)} e
+        UNION ALL
+        SELECT {partition}, ROW('assessment', r.id, r.ecosystem_type_id, r.assessment_year, r.category)::text
+        FROM {_table(EcosystemRiskAssessment)} r
+        JOIN {_table(EcosystemType)} e ON e.id = r.ecosystem_type_id
+        """
+    )
+    if not GIS_ENABLED:
+        return fingerprints
+    # Biome and bioregion areas come from the ecosystem layer, so its
+    # features are part of every organisation partition.
+    eco_layer = active_layer(ECOSYSTEM_LAYER_CODES)
+    if eco_layer:
+        layer = _layer_fingerprint(eco_layer)
+        fingerprints = {key: f"{value}/{layer}" for key, value in fingerprints.items()}
+    admin = active_layer(PROVINCE_LAYER_CODES)
+    protected = active_layer(PROTECTED_LAYER_CODES)
+    if admin and protected:
+        fingerprints[EcosystemGoldDimension.PROVINCE.value] = overlay_inputs_hash(admin, protected)
+    return fingerprints
+
+
+def _ecosystem_area_params():
+    eco_layer = active_layer(ECOSYSTEM_LAYER_CODES)
+    dimensions, keys, areas = [], [], []
+    for dimension, property_keys in [
+        (EcosystemGoldDimension.BIOME, ["BIOME", "biome", "BIOME_NAME"]),
+        (EcosystemGoldDimension.BIOREGION, ["BIOREGION", "bioregion", "ECO_REGION"]),
+    ]:
+        for key, area in _ecosystem_area_by_dimension(eco_layer, property_keys).items():
+            dimensions.append(dimension.value)
+            keys.append(key)
+            areas.append(area)
+    return [dimensions, keys, areas]
+
+
+def _insert_ecosystem_gold(snapshot: date, partitions=None):
+    written = 0
+    organisation_partitions = partitions
+    if partitions is not None:
+        organisation_partitions = set(partitions) - {EcosystemGoldDimension.PROVINCE.value}
+    if organisation_partitions is None or organisation_partitions:
+        clause, filter_params = _partition_filter(_organisation_partition("e"), organisation_partitions)
+        query = f"""
+            WITH scoped AS (
+                SELECT
+                    e.id,
+                    e.organisation_id,
+                    COALESCE(NULLIF(e.biome, ''), 'Unknown') AS biome,
+                    COALESCE(NULLIF(e.bioregion, ''), 'Unknown') AS bioregion
+                FROM {_table(EcosystemType)} e
+                WHERE e.status <> %s {clause}
+            ),
+            latest AS (
+                SELECT DISTINCT ON (r.ecosystem_type_id) r.ecosystem_type_id, UPPER(r.category) AS category
+                FROM {_table(EcosystemRiskAssessment)} r
+                WHERE r.ecosystem_type_id IN (SELECT id FROM scoped)
+                ORDER BY r.ecosystem_type_id, r.assessment_year DESC, r.id DESC
+            ),
+            ecosystems AS (
+                SELECT s.*, COALESCE(l.category, '') AS threat_category
+                FROM scoped s
+                LEFT JOIN latest l ON l.ecosystem_type_id = s.id
+            ),
+            grouped AS (
+                SELECT organisation_id, %s AS dimension, biome AS dimension_key, COUNT(*) AS ecosystem_count,
+                       COUNT(*) FILTER (WHERE threat_category = ANY(%s)) AS threatened_count
+                FROM ecosystems GROUP BY organisation_id, biome
+                UNION ALL
+                SELECT organisation_id, %s, bioregion, COUNT(*), COUNT(*) FILTER (WHERE threat_category = ANY(%s))
+                FROM ecosystems GROUP BY organisation_id, bioregion
+                UNION ALL
+                SELECT organisation_id, %s, threat_category, COUNT(*), COUNT(*) FILTER (WHERE threat_category = ANY(%s))
+                FROM ecosystems WHERE threat_category <> '' GROUP BY organisation_id, threat_category
             )
-        return rows
-
-
-def _refresh_ecosystem_gold(snapshot: date):
-    EcosystemGoldSummary.objects.filter(snapshot_date=snapshot).delete()
-    ecosystems = list(EcosystemType.objects.exclude(status=LifecycleStatus.ARCHIVED).order_by("id"))
-    latest_assessments = {}
-    for row in EcosystemRiskAssessment.objects.order_by("ecosystem_type_id", "-assessment_year", "-id"):
-        if row.ecosystem_type_id not in latest_assessments:
-            latest_assessments[row.ecosystem_type_id] = row
-
-    eco_layer = SpatialLayer.objects.filter(layer_code__in=["ZA_ECOSYSTEM_PROXY_NE"], is_active=True).order_by("id").first()
-    biome_area = _ecosystem_area_by_dimension(eco_layer, ["BIOME", "biome", "BIOME_NAME"])
-    bioregion_area = _ecosystem_area_by_dimension(eco_layer, ["BIOREGION", "bioregion", "ECO_REGION"])
-
-    grouped = defaultdict(lambda: {"ecosystem_count": 0, "threatened_count": 0})
-    threat_grouped = defaultdict(int)
-    for ecosystem in ecosystems:
-        threat_category = ""
-        latest = latest_assessments.get(ecosystem.id)
-        if latest:
-            threat_category = (latest.category or "").upper()
-        for dim, value in [
-            (EcosystemGoldDimension.BIOME, ecosystem.biome or "Unknown"),
-            (EcosystemGoldDimension.BIOREGION, ecosystem.bioregion or "Unknown"),
-        ]:
-            key = (ecosystem.organisation_id, dim, str(value))
-            grouped[key]["ecosystem_count"] += 1
-            if threat_category in THREAT_CATEGORIES:
-                grouped[key]["threatened_count"] += 1
-        if threat_category:
-            threat_grouped[(ecosystem.organisation_id, threat_category)] += 1
-
-    rows = []
-    for key, counts in grouped.items():
-        org_id, dim, value = key
-        total_area = Decimal("0")
-        if dim == EcosystemGoldDimension.BIOME:
-            total_area = biome_area.get(value, Decimal("0"))
-        elif dim == EcosystemGoldDimension.BIOREGION:
-            total_area = bioregion_area.get(value, Decimal("0"))
-        rows.append(
-            EcosystemGoldSummary(
-                snapshot_date=snapshot,
-                organisation_id=org_id,
-                dimension=dim,
-                dimension_key=value,
-                dimension_label=value,
-                ecosystem_count=counts["ecosystem_count"],
-                threatened_count=counts["threatened_count"],
-                total_area_km2=total_area,
-                protected_area_km2=Decimal("0"),
-                protected_percent=Decimal("0"),
-                status=LifecycleStatus.PUBLISHED,
-                sensitivity=SensitivityLevel.PUBLIC,
-                source_system="registry_marts",
-                source_ref="ecosystem_gold_v1",
+            INSERT INTO {_table(EcosystemGoldSummary)} (
+                uuid, snapshot_date, organisation_id, dimension, dimension_key, dimension_label,
+                ecosystem_count, threatened_count, total_area_km2, protected_area_km2, protected_percent, {GOLD_COLUMNS}
             )
+            SELECT
+                gen_random_uuid(), %s, g.organisation_id, g.dimension, g.dimension_key, g.dimension_key,
+                g.ecosystem_count, g.threatened_count, COALESCE(area.area_km2, 0), 0, 0, {GOLD_VALUES}
+            FROM grouped g
+            LEFT JOIN UNNEST(%s::text[], %s::text[], %s::numeric[]) AS area (dimension, dimension_key, area_km2)
+                ON area.dimension = g.dimension AND area.dimension_key = g.dimension_key
+        """
+        threatened = sorted(THREAT_CATEGORIES)
+        written += _execute(
+            query,
+            [
+                LifecycleStatus.ARCHIVED,
+                *filter_params,
+                EcosystemGoldDimension.BIOME.value,
+                threatened,
+                EcosystemGoldDimension.BIOREGION.value,
+                threatened,
+                EcosystemGoldDimension.THREAT_CATEGORY.value,
+                threatened,
+                snapshot,
+                *_gold_params("ecosystem_gold_v1"),
+                *_ecosystem_area_params(),
+            ],
         )
+    if partitions is None or EcosystemGoldDimension.PROVINCE.value in partitions:
+        written += _insert_province_protected_rows(snapshot)
+    return written
 
-    for key, value in threat_grouped.items():
-        org_id, threat_category = key
-        rows.append(
-            EcosystemGoldSummary(
-                snapshot_date=snapshot,
-                organisation_id=org_id,
-                dimension=EcosystemGoldDimension.THREAT_CATEGORY,
-                dimension_key=threat_category,
-                dimension_label=threat_category,
-                ecosystem_count=value,
-                threatened_count=value if threat_category in THREAT_CATEGORIES else 0,
-                total_area_km2=Decimal("0"),
-                protected_area_km2=Decimal("0"),
-                protected_percent=Decimal("0"),
-                status=LifecycleStatus.PUBLISHED,
-                sensitivity=SensitivityLevel.PUBLIC,
-                source_system="registry_marts",
-                source_ref="ecosystem_gold_v1",
-            )
-        )
 
-    for row in _province_protected_rows():
-        rows.append(
-            EcosystemGoldSummary(
-                snapshot_date=snapshot,
-                dimension=EcosystemGoldDimension.PROVINCE,
-                dimension_key=row["province_code"],
-                dimension_label=row["province_name"],
-                ecosystem_count=0,
-                threatened_count=0,
-                total_area_km2=row["total_area_km2"],
-                protected_area_km2=row["protected_area_km2"],
-                protected_percent=row["protected_percent"],
-                status=LifecycleStatus.PUBLISHED,
-                sensitivity=SensitivityLevel.PUBLIC,
-                source_system="registry_marts",
-                source_ref="ecosystem_gold_v1",
-            )
+def _insert_province_protected_rows(snapshot: date):
+    admin = active_layer(PROVINCE_LAYER_CODES)
+    protected = active_layer(PROTECTED_LAYER_CODES)
+    if not admin or not protected or not GIS_ENABLED:
+        return 0
+    cache = get_overlay_cache(admin, protected)
+    query = f"""
+        INSERT INTO {_table(EcosystemGoldSummary)} (
+            uuid, snapshot_date, organisation_id, dimension, dimension_key, dimension_label,
+            ecosystem_count, threatened_count, total_area_km2, protected_area_km2, protected_percent, {GOLD_COLUMNS}
         )
+        SELECT
+            gen_random_uuid(), %s, NULL, %s, u.unit_code, u.unit_name, 0, 0,
+            ROUND(u.unit_area_km2, 3),
+            ROUND(u.overlay_area_km2, 3),
+            CASE WHEN u.unit_area_km2 > 0 THEN ROUND(u.overlay_area_km2 / u.unit_area_km2 * 100, 3) ELSE 0 END,
+            {GOLD_VALUES}
+        FROM {_table(SpatialOverlayCacheUnit)} u
+        WHERE u.cache_id = %s
+    """
+    return _execute(
+        query,
+        [
+            snapshot,
+            EcosystemGoldDimension.PROVINCE.value,
+            *_gold_params("ecosystem_gold_v1"),
+            cache.id,
+        ],
+    )
 
-    EcosystemGoldSummary.objects.bulk_create(rows, batch_size=500)
-    return len(rows)
-
-
-def _latest_category_map(model_cls, fk_field):
-    latest = {}
-    for row in model_cls.objects.order_by(fk_field, "-assessed_on", "-id"):
-        key = getattr(row, fk_field)
-        if key and key not in latest:
-            latest[key] = row.category
-    return latest
-
-
-def _refresh_ias_gold(snapshot: date):
-    IASGoldSummary.objects.filter(snapshot_date=snapshot).delete()
-    profiles = list(AlienTaxonProfile.objects.exclude(status=LifecycleStatus.ARCHIVED).order_by("id"))
-    latest_eicat = _latest_category_map(EICATAssessment, "profile_id")
-    latest_seicat = _latest_category_map(SEICATAssessment, "profile_id")
-
-    grouped = defaultdict(lambda: {"profile_count": 0, "invasive_count": 0})
-    for profile in profiles:
-        habitats = profile.habitat_types_json if isinstance(profile.habitat_types_json, list) else []
-        habitats = [str(item).strip() for item in habitats if str(item).strip()] or ["unknown"]
-        pathway = profile.pathway_code or "unknown"
-        eicat = latest_eicat.get(profile.id, EicatCategory.NE)
-        seicat = latest_seicat.get(profile.id, SeicatCategory.NE)
-
-        for habitat in habitats:
-            key = (
-                profile.organisation_id,
-                IASGoldDimension.HABITAT,
-                habitat.lower(),
-                habitat,
-                eicat,
-                seicat,
-            )
-            grouped[key]["profile_count"] += 1
-            grouped[key]["invasive_count"] += int(profile.is_invasive)
-
-        system_key = (
-            profile.organisation_id,
-            IASGoldDimension.SYSTEM,
-            pathway,
-            pathway.replace("_", " "),
-            eicat,
-            seicat,
+
+def _ias_fingerprints():
+    partition = _organisation_partition("p")
+    return _fingerprints(
+        f"""
+        SELECT {partition}, ROW('profile', p.id, p.status, p.habitat_types_json, p.pathway_code, p.is_invasive)::text
+        FROM {_table(AlienTaxonProfile)} p
+        UNION ALL
+        SELECT {partition}, ROW('eicat', a.id, a.profile_id, a.assessed_on, a.category)::text
+        FROM {_table(EICATAssessment)} a
+        JOIN {_table(AlienTaxonProfile)} p ON p.id = a.profile_id
+        UNION ALL
+        SELECT {partition}, ROW('seicat', a.id, a.profile_id, a.assessed_on, a.category)::text
+        FROM {_table(SEICATAssessment)} a
+        JOIN {_table(AlienTaxonProfile)} p ON p.id = a.profile_id
+        """
+    )
+
+
+def _insert_ias_gold(snapshot: date, partitions=None):
+    clause, filter_params = _partition_filter(_organisation_partition("p"), partitions)
+    query = f"""
+        WITH scoped AS (
+            SELECT p.id, p.organisation_id, p.habitat_types_json, p.pathway_code, p.is_invasive
+            FROM {_table(AlienTaxonProfile)} p
+            WHERE p.status <> %s {clause}
+        ),
+        eicat AS (
+            SELECT DISTINCT ON (a.profile_id) a.profile_id, a.category
+            FROM {_table(EICATAssessment)} a
+            WHERE a.profile_id IN (SELECT id FROM scoped)
+            ORDER BY a.profile_id, a.assessed_on DESC, a.id DESC
+        ),
+        seicat AS (
+            SELECT DISTINCT ON (a.profile_id) a.profile_id, a.category
+            FROM {_table(SEICATAssessment)} a
+            WHERE a.profile_id IN (SELECT id FROM scoped)
+            ORDER BY a.profile_id, a.assessed_on DESC, a.id DESC
+        ),
+        profiles AS (
+            SELECT
+                s.*,
+                COALESCE(ei.category, %s) AS eicat_category,
+                COALESCE(se.category, %s) AS seicat_category,
+                COALESCE(NULLIF(s.pathway_code, ''), 'unknown') AS pathway
+            FROM scoped s
+            LEFT JOIN eicat ei ON ei.profile_id = s.id
+            LEFT JOIN seicat se ON se.profile_id = s.id
+        ),
+        habitats AS (
+            SELECT p.id, BTRIM(h.value, E' \\t\\n\\r\\f\\v') AS habitat
+            FROM profiles p
+            CROSS JOIN LATERAL jsonb_array_elements_text(
+                CASE WHEN jsonb_typeof(p.habitat_types_json) = 'array' THEN p.habitat_types_json ELSE '[]'::jsonb END
+            ) AS h (value)
+        ),
+        dimensions AS (
+            SELECT
+                p.organisation_id,
+                %s AS dimension,
+                LOWER(COALESCE(h.habitat, 'unknown')) AS dimension_key,
+                COALESCE(h.habitat, 'unknown') AS dimension_label,
+                p.eicat_category,
+                p.seicat_category,
+                p.is_invasive
+            FROM profiles p
+            LEFT JOIN habitats h ON h.id = p.id AND h.habitat <> ''
+            UNION ALL
+            SELECT p.organisation_id, %s, p.pathway, REPLACE(p.pathway, '_', ' '), p.eicat_category, p.seicat_category, p.is_invasive
+            FROM profiles p
         )
-        grouped[system_key]["profile_count"] += 1
-        grouped[system_key]["invasive_count"] += int(profile.is_invasive)
-
-    rows = []
-    for key, values in grouped.items():
-        org_id, dim, dim_key, dim_label, eicat, seicat = key
-        rows.append(
-            IASGoldSummary(
-                snapshot_date=snapshot,
-                organisation_id=org_id,
-                dimension=dim,
-                dimension_key=dim_key,
-                dimension_label=dim_label,
-                eicat_category=eicat,
-                seicat_category=seicat,
-                profile_count=values["profile_count"],
-                invasive_count=values["invasive_count"],
-                status=LifecycleStatus.PUBLISHED,
-                sensitivity=SensitivityLevel.PUBLIC,
-                source_system="registry_marts",
-                source_ref="ias_gold_v1",
-            )
+        INSERT INTO {_table(IASGoldSummary)} (
+            uuid, snapshot_date, organisation_id, dimension, dimension_key, dimension_label,
+            eicat_category, seicat_category, profile_count, invasive_count, {GOLD_COLUMNS}
         )
-    IASGoldSummary.objects.bulk_create(rows, batch_size=500)
-    return len(rows)
+        SELECT
+            gen_random_uuid(), %s, organisation_id, dimension, dimension_key, dimension_label,
+            eicat_category, seicat_category, COUNT(*), COUNT(*) FILTER (WHERE is_invasive), {GOLD_VALUES}
+        FROM dimensions
+        GROUP BY organisation_id, dimension, dimension_key, dimension_label, eicat_category, seicat_category
+    """
+    return _execute(
+        query,
+        [
+            LifecycleStatus.ARCHIVED,
+            *filter_params,
+            EicatCategory.NE,
+            SeicatCategory.NE,
+            IASGoldDimension.HABITAT.value,
+            IASGoldDimension.SYSTEM.value,
+            snapshot,
+            *_gold_params("ias_gold_v1"),
+        ],
+    )
+
+
+class _Mart:
+    def __init__(self, name, model, source_ref, partition_sql, fingerprints, insert):
+        self.name = str(name)
+        self.model = model
+        self.source_ref = source_ref
+        # Partition key of an existing gold row, aliased ``g``.
+        self.partition_sql = partition_sql
+        self.fingerprints = fingerprints
+        self.insert = insert
+
+
+MARTS = [
+    _Mart(
+        RegistryMart.TAXON,
+        TaxonGoldSummary,
+        "taxon_gold_v1",
+        _taxon_partition("g"),
+        _taxon_fingerprints,
+        _insert_taxon_gold,
+    ),
+    _Mart(
+        RegistryMart.ECOSYSTEM,
+        EcosystemGoldSummary,
+        "ecosystem_gold_v1",
+        f"CASE WHEN g.dimension = '{EcosystemGoldDimension.PROVINCE.value}' "
+        f"THEN g.dimension ELSE {_organisation_partition('g')} END",
+        _ecosystem_fingerprints,
+        _insert_ecosystem_gold,
+    ),
+    _Mart(
+        RegistryMart.IAS,
+        IASGoldSummary,
+        "ias_gold_v1",
+        _organisation_partition("g"),
+        _ias_fingerprints,
+        _insert_ias_gold,
+    ),
+]
+
+
+def _copy_partitions(mart, source_snapshot: date, snapshot: date, *, exclude):
+    columns = [
+        field.column
+        for field in mart.model._meta.concrete_fields
+        if field.column not in {"id", "uuid", "snapshot_date", "created_at", "updated_at"}
+    ]
+    column_sql = ", ".join(connection.ops.quote_name(column) for column in columns)
+    table = _table(mart.model)
+    return _execute(
+        f"""
+        INSERT INTO {table} (uuid, snapshot_date, created_at, updated_at, {column_sql})
+        SELECT gen_random_uuid(), %s, NOW(), NOW(), {column_sql}
+        FROM {table} g
+        WHERE g.snapshot_date = %s AND NOT ({mart.partition_sql} = ANY(%s))
+        """,
+        [snapshot, source_snapshot, sorted(exclude)],
+    )
+
+
+def _refresh_mart(mart, snapshot: date):
+    """
+    Bring ``mart``'s rows for ``snapshot`` up to date and return its refresh entry.
+
+    Partitions (organisation, plus taxon rank for taxa) whose source rows are
+    unchanged since the last refresh are kept, or copied forward when the
+    snapshot date moved on; only changed partitions are recomputed.
+    """
+
+    started = time.monotonic()
+    current = {key: f"{mart.source_ref}:{value}" for key, value in mart.fingerprints().items()}
+    baseline = RegistryMartRefresh.objects.filter(mart=mart.name).order_by("-id").first()
+    table = _table(mart.model)
+    full_rebuild = baseline is None or not mart.model.objects.filter(snapshot_date=baseline.snapshot_date).exists()
+    rows_written = 0
+    if full_rebuild:
+        changed = None
+        _execute(f"DELETE FROM {table} WHERE snapshot_date = %s", [snapshot])
+    else:
+        previous = baseline.partition_fingerprints_json or {}
+        changed = {key for key in set(current) | set(previous) if current.get(key) != previous.get(key)}
+        if baseline.snapshot_date == snapshot:
+            if changed:
+                clause, filter_params = _partition_filter(mart.partition_sql, changed)
+                _execute(f"DELETE FROM {table} g WHERE g.snapshot_date = %s {clause}", [snapshot, *filter_params])
+        else:
+            _execute(f"DELETE FROM {table} WHERE snapshot_date = %s", [snapshot])
+            rows_written += _copy_partitions(mart, baseline.snapshot_date, snapshot, exclude=changed)
+    if changed is None or changed:
+        rows_written += mart.insert(snapshot, changed)
+    if full_rebuild or changed or baseline.snapshot_date != snapshot:
+        bump_input_versions_for(mart.model)
+    return RegistryMartRefresh(
+        mart=mart.name,
+        snapshot_date=snapshot,
+        partition_fingerprints_json=current,
+        partitions_refreshed=len(current) if changed is None else len(changed),
+        rows_written=rows_written,
+        full_rebuild=full_rebuild,
+        duration_ms=int((time.monotonic() - started) * 1000),
+    )
 
 
 @transaction.atomic
 def refresh_registry_gold_marts(*, snapshot_date: date | None = None):
+    """
+    Refresh the taxon, ecosystem and IAS gold marts for ``snapshot_date`` (today by default).
+
+    Each mart is written with set-based ``INSERT ... SELECT`` statements and
+    only its changed partitions are recomputed; the summary reports row
+    counts and per-mart timings.
+    """
+
     snapshot = snapshot_date or timezone.now().date()
-    return {
-        "snapshot_date": snapshot.isoformat(),
-        "taxon_rows": _refresh_taxon_gold(snapshot),
-        "ecosystem_rows": _refresh_ecosystem_gold(snapshot),
-        "ias_rows": _refresh_ias_gold(snapshot),
-    }
+    started = time.monotonic()
+    refreshes = [_refresh_mart(mart, snapshot) for mart in MARTS]
+    RegistryMartRefresh.objects.bulk_create(refreshes)
+    summary = {"snapshot_date": snapshot.isoformat(), "marts": {}}
+    for mart, refresh in zip(MARTS, refreshes):
+        rows = mart.model.objects.filter(snapshot_date=snapshot).count()
+        summary[f"{mart.name}_rows"] = rows
+        summary["marts"][mart.name] = {
+            "rows": rows,
+            "rows_written": refresh.rows_written,
+            "partitions": len(refresh.partition_fingerprints_json),
+            "partitions_refreshed": refresh.partitions_refreshed,
+            "full_rebuild": refresh.full_rebuild,
+            "duration_ms": refresh.duration_ms,
+        }
+    summary["duration_ms"] = int((time.monotonic() - started) * 1000)
+    return summary
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sys
+import threading
+from collections import Counter
+from importlib import metadata
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode, IncludeNode
+from django.utils import timezone
+
+from nbms_app.models import RenderCacheEntry
+from nbms_app.services.audit import suppress_audit_events
+from nbms_app.services.metrics import inc_counter
+
+
+RENDERER_PACKAGES = {
+    "pdf": "xhtml2pdf",
+    "docx": "python-docx",
+}
+# Project modules whose code shapes each renderer's output.
+RENDERER_MODULES = {
+    "pdf": ("nbms_app.services.pdf_rendering",),
+    "docx": ("nbms_app.services.docx_rendering",),
+}
+FILE_EXTENSIONS = {
+    "application/pdf": "pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document": "docx",
+}
+
+# Payload keys that change on every build without changing content.
+VOLATILE_PAYLOAD_KEYS = {"generated_at", "payload_hash"}
+
+_RESULT_COUNTS = Counter()
+_EVICT_STATE = {"stores": 0}
+_EVICT_LOCK = threading.Lock()
+
+
+def _canonical_json(value):
+    return json.dumps(value, sort_keys=True, ensure_ascii=True, separators=(",", ":"), default=str)
+
+
+def _strip_volatile(value):
+    if isinstance(value, dict):
+        return {key: _strip_volatile(item) for key, item in value.items() if key not in VOLATILE_PAYLOAD_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_strip_volatile(item) for item in value]
+    return value
+
+
+def _hash_text(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _template_sources(template_name: str, seen: set) -> list[str]:
+    """Sources of ``template_name`` and of every template it extends or includes by literal name."""
+
+    if not template_name or template_name in seen:
+        return []
+    seen.add(template_name)
+    try:
+        template = get_template(template_name)
+    except TemplateDoesNotExist:
+        return []
+    compiled = getattr(template, "template", None)
+    sources = [f"{template_name}\n{getattr(compiled, 'source', '') or ''}"]
+    if compiled is None:
+        return sources
+    for node in compiled.nodelist.get_nodes_by_type((ExtendsNode, IncludeNode)):
+        expression = node.parent_name if isinstance(node, ExtendsNode) else node.template
+        name = getattr(expression, "var", None)
+        if isinstance(name, str):
+            sources.extend(_template_sources(name, seen))
+    return sources
+
+
+def template_version(template_name: str) -> str:
+    """Hash of the template and the templates it extends or includes, so editing any of them invalidates its renders."""
+
+    if not template_name:
+        return ""
+    sources = _template_sources(template_name, set())
+    return _hash_text("\n".join(sources)) if sources else ""
+
+
+def _module_source_hash(module_names) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(set(module_names)):
+        module = sys.modules.get(name)
+        path = getattr(module, "__file__", None)
+        if not path:
+            continue
+        try:
+            with open(path, "rb") as handle:
+                digest.update(handle.read())
+        except OSError:
+            continue
+    return digest.hexdigest()[:12]
+
+
+def renderer_version(renderer: str, render=None) -> str:
+    """
+    Renderer package version plus a hash of the project code that drives it.
+
+    The project part covers the renderer's module and the module of the
+    ``render`` callable (the builder that lays out the document), so a code
+    change there invalidates renders even when no template is involved.
+    """
+
+    package = RENDERER_PACKAGES.get(renderer, renderer)
+    try:
+        version = metadata.version(package)
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    modules = list(RENDERER_MODULES.get(renderer, ()))
+    if render is not None and getattr(render, "__module__", None):
+        modules.append(render.__module__)
+    return f"{package}-{version}+{_module_source_hash(modules)}"
+
+
+def _cache_enabled() -> bool:
+    return bool(getattr(settings, "RENDER_CACHE_ENABLED", True))
+
+
+def _observe(kind: str, result: str) -> None:
+    _RESULT_COUNTS[result] += 1
+    inc_counter("render_cache_requests_total", {"kind": kind, "result": result})
+
+
+def _evict_due() -> bool:
+    """Check the cache size only every ``RENDER_CACHE_EVICT_EVERY`` stores rather than after each miss."""
+
+    interval = max(int(getattr(settings, "RENDER_CACHE_EVICT_EVERY", 20) or 1), 1)
+    with _EVICT_LOCK:
+        _EVICT_STATE["stores"] += 1
+        if _EVICT_STATE["stores"] < interval:
+            return False
+        _EVICT_STATE["stores"] = 0
+        return True
+
+
+def _evict() -> None:
+    max_bytes = int(getattr(settings, "RENDER_CACHE_MAX_BYTES", 0) or 0)
+    max_entries = int(getattr(settings, "RENDER_CACHE_MAX_ENTRIES", 0) or 0)
+    if not max_bytes and not max_entries:
+        return
+    entries = RenderCacheEntry.objects.all()
+    total_bytes = entries.aggregate(total=Sum("size_bytes"))["total"] or 0
+    total_entries = entries.count()
+    if (not max_bytes or total_bytes <= max_bytes) and (not max_entries or total_entries <= max_entries):
+        return
+    evicted = []
+    for entry in entries.order_by("last_accessed_at", "id").only("id", "storage_path", "size_bytes").iterator():
+        if (not max_bytes or total_bytes <= max_bytes) and (not max_entries or total_entries <= max_entries):
+            break
+        evicted.append(entry.id)
+        total_bytes -= entry.size_bytes
+        total_entries -= 1
+        if default_storage.exists(entry.storage_path):
+            default_storage.delete(entry.storage_path)
+    with suppress_audit_events():
+        RenderCacheEntry.objects.filter(id__in=evicted).delete()
+    _observe("all", "evicted")
+
+
+def _cache_key(*, kind: str, renderer: str, payload, template_name: str, render=None, fingerprint=None):
+    if fingerprint is not None:
+        keyed_by, source = "fingerprint", fingerprint
+    else:
+        keyed_by, source = "payload", _strip_volatile(payload)
+    payload_hash = _hash_text(_canonical_json(source))
+    template_hash = template_version(template_name)
+    renderer_tag = renderer_version(renderer, render)
+    cache_version = str(getattr(settings, "RENDER_CACHE_VERSION", "1"))
+    cache_key = _hash_text(
+        _canonical_json(
+            {
+                "kind": kind,
+                keyed_by: payload_hash,
+                "template": template_hash,
+                "renderer": renderer_tag,
+                "version": cache_version,
+            }
+        )
+    )
+    return {
+        "cache_key": cache_key,
+        "kind": kind,
+        "payload_hash": payload_hash,
+        "template_version": template_hash,
+        "renderer_version": renderer_tag,
+    }
+
+
+def _load_cached(key: dict):
+    """The cache entry for ``key`` and its bytes, or ``(None, None)`` on a miss."""
+
+    entry = RenderCacheEntry.objects.filter(cache_key=key["cache_key"]).first()
+    if not entry:
+        _observe(key["kind"], "miss")
+        return None, None
+    try:
+        with default_storage.open(entry.storage_path, "rb") as handle:
+            content = handle.read()
+    except (FileNotFoundError, OSError):
+        content = None
+    if content is not None and hashlib.sha256(content).hexdigest() == entry.content_hash:
+        RenderCacheEntry.objects.filter(id=entry.id).update(
+            hit_count=F("hit_count") + 1,
+            last_accessed_at=timezone.now(),
+        )
+        _observe(key["kind"], "hit")
+        return entry, content
+    with suppress_audit_events():
+        entry.delete()
+    _observe(key["kind"], "miss")
+    return None, None
+
+
+def _store_cached(key: dict, content: bytes, content_type: str, *, generated_at, metadata) -> None:
+    cache_key = key["cache_key"]
+    extension = FILE_EXTENSIONS.get(content_type, "bin")
+    storage_path = f"render_cache/{cache_key[:2]}/{cache_key}.{extension}"
+    if default_storage.exists(storage_path):
+        default_storage.delete(storage_path)
+    stored_path = default_storage.save(storage_path, ContentFile(content))
+    try:
+        with transaction.atomic(), suppress_audit_events():
+            RenderCacheEntry.objects.create(
+                **key,
+                storage_path=stored_path,
+                content_type=content_type,
+                content_hash=hashlib.sha256(content).hexdigest(),
+                size_bytes=len(content),
+                generated_at=generated_at,
+                metadata=metadata,
+            )
+    except IntegrityError:
+        # A concurrent request stored the same render first.
+        if stored_path != storage_path:
+            default_storage.delete(stored_path)
+        return
+    if _evict_due():
+        _evict()
+
+
+class PendingRender:
+    """
+    Callable returned by ``cached_render_async`` that waits for the rendered bytes.
+
+    ``generated_at`` is the timestamp the bytes were rendered with and
+    ``metadata`` what the caller recorded about the render; on a hit both
+    come from the cache entry, so they always describe the cached bytes.
+    """
+
+    def __init__(self, collect, *, generated_at, metadata=None):
+        self._collect = collect
+        self.generated_at = generated_at
+        self.metadata = metadata or {}
+
+    def __call__(self) -> bytes:
+        return self._collect()
+
+
+def cached_render(
+    *,
+    kind: str,
+    renderer: str,
+    render,
+    content_type: str,
+    payload=None,
+    fingerprint=None,
+    template_name: str = "",
+) -> bytes:
+    """
+    Return the rendered bytes for ``payload``, rendering only on a cache miss.
+
+    Entries are keyed by the payload hash (or by ``fingerprint``, see
+    ``cached_render_async``), the hash of the template and the templates it
+    extends or includes, and the renderer version (package version plus a
+    hash of the project rendering code), stored in the configured storage.
+    ``render`` is called with the generation timestamp to print. Every
+    ``RENDER_CACHE_EVICT_EVERY`` stores the least recently used entries are
+    evicted once ``RENDER_CACHE_MAX_BYTES`` or ``RENDER_CACHE_MAX_ENTRIES``
+    is exceeded.
+    """
+
+    return cached_render_async(
+        kind=kind,
+        renderer=renderer,
+        payload=payload,
+        fingerprint=fingerprint,
+        submit=render,
+        content_type=content_type,
+        template_name=template_name,
+    )()
+
+
+def cached_render_async(
+    *,
+    kind: str,
+    renderer: str,
+    submit,
+    content_type: str,
+    payload=None,
+    fingerprint=None,
+    template_name: str = "",
+    metadata=None,
+) -> PendingRender:
+    """
+    Start a cached render and return a ``PendingRender`` that yields its bytes.
+
+    A ``fingerprint`` (a cheap version stamp of everything the payload is
+    built from) keys the entry in place of ``payload``, so ``submit`` can
+    build the payload itself and a hit skips the build as well as the
+    render. On a miss ``submit`` is called straight away with the generation
+    timestamp; it may return the bytes or a zero-argument callable that waits
+    for them (e.g. ``start_pdf_render``), so the caller can do other work
+    before collecting the result. ``metadata``, a zero-argument callable
+    called after ``submit``, is stored with the entry. Cache reads and writes
+    stay on the calling thread.
+    """
+
+    if not _cache_enabled():
+        generated_at = timezone.now()
+        pending = submit(generated_at)
+        return PendingRender(
+            pending if callable(pending) else lambda: pending,
+            generated_at=generated_at,
+            metadata=metadata() if metadata else None,
+        )
+
+    key = _cache_key(
+        kind=kind,
+        renderer=renderer,
+        payload=payload,
+        template_name=template_name,
+        render=submit,
+        fingerprint=fingerprint,
+    )
+    entry, content = _load_cached(key)
+    if entry is not None:
+        return PendingRender(
+            lambda: content,
+            generated_at=entry.generated_at or entry.created_at,
+            metadata=entry.metadata,
+        )
+
+    generated_at = timezone.now()
+    pending = submit(generated_at)
+    render_metadata = metadata() if metadata else {}
+
+    def collect():
+        result = pending() if callable(pending) else pending
+        _store_cached(key, result, content_type, generated_at=generated_at, metadata=render_metadata)
+        return result
+
+    return PendingRender(collect, generated_at=generated_at, metadata=render_metadata)
+
+
+def render_cache_stats() -> dict:
+    totals = RenderCacheEntry.objects.aggregate(size_bytes=Sum("size_bytes"), hits=Sum("hit_count"))
+    return {
+        "entries": RenderCacheEntry.objects.count(),
+        "size_bytes": totals["size_bytes"] or 0,
+        "hits": totals["hits"] or 0,
+        "process_counts": {result: _RESULT_COUNTS[result] for result in ("hit", "miss", "evicted")},
+    }
@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-from io import BytesIO
-
-from django.core.exceptions import ValidationError
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -17,6 +14,8 @@ from nbms_app.models import (
     TaxonGoldSummary,
 )
 from nbms_app.services.authorization import filter_queryset_for_user
+from nbms_app.services.pdf_rendering import render_pdf_bytes
+from nbms_app.services.render_cache import cached_render
 from nbms_app.services.spatial_access import filter_spatial_layers_for_user
 
 
@@ -363,23 +362,26 @@ def build_report_product_payload(*, template: ReportProductTemplate, instance, u
     }
 
 
-def render_report_product_html(*, template: ReportProductTemplate, payload):
-    context = {"template": template, "payload": payload, "generated_at": timezone.now()}
-    return render_to_string("nbms_app/reporting/report_product_preview.html", context)
+REPORT_PRODUCT_HTML_TEMPLATE = "nbms_app/reporting/report_product_preview.html"
 
 
-def render_report_product_pdf_bytes(*, template: ReportProductTemplate, payload):
-    try:
-        from xhtml2pdf import pisa  # noqa: WPS433
-    except Exception as exc:  # noqa: BLE001
-        raise ValidationError(f"PDF renderer dependency missing: {exc}") from exc
+def render_report_product_html(*, template: ReportProductTemplate, payload, generated_at=None):
+    context = {"template": template, "payload": payload, "generated_at": generated_at or timezone.now()}
+    return render_to_string(REPORT_PRODUCT_HTML_TEMPLATE, context)
 
-    html = render_report_product_html(template=template, payload=payload)
-    output = BytesIO()
-    result = pisa.CreatePDF(src=html, dest=output, encoding="utf-8")
-    if result.err:
-        raise ValidationError("Failed to render report product PDF output.")
-    return output.getvalue()
+
+def render_report_product_pdf_bytes(*, template: ReportProductTemplate, payload):
+    return cached_render(
+        kind="report_product_pdf",
+        renderer="pdf",
+        template_name=REPORT_PRODUCT_HTML_TEMPLATE,
+        payload={"template": {"code": template.code, "updated_at": template.updated_at}, "payload": payload},
+        content_type="application/pdf",
+        render=lambda generated_at: render_pdf_bytes(
+            render_report_product_html(template=template, payload=payload, generated_at=generated_at),
+            error_message="Failed to render report product PDF output.",
+        ),
+    )
 
 
 def generate_report_product_run(*, template: ReportProductTemplate, instance, user):
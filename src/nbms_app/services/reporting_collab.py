@@ -2,13 +2,16 @@ import hashlib
 import json
 from copy import deepcopy
 
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Max
 from django.utils import timezone
 
 from nbms_app.models import (
     ReportSectionRevision,
     ReportSuggestedChange,
+    RevisionStorageKind,
     SuggestedChangeStatus,
 )
 from nbms_app.services.audit import record_audit_event
@@ -18,8 +21,12 @@ def canonical_json(value):
     return json.dumps(value or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
 
 
+def _hash_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
 def payload_hash(value):
-    return hashlib.sha256(canonical_json(value).encode("utf-8")).hexdigest()
+    return _hash_text(canonical_json(value))
 
 
 def compute_patch(before, after):
@@ -40,6 +47,136 @@ def apply_patch(content, patch):
     return content
 
 
+def compute_delta(before, after):
+    """Key-level delta from ``before`` to ``after``; unlike ``compute_patch`` it records removed keys."""
+
+    before = before or {}
+    after = after or {}
+    delta = {}
+    changed = {key: deepcopy(value) for key, value in after.items() if key not in before or before[key] != value}
+    removed = sorted(key for key in before if key not in after)
+    if changed:
+        delta["set"] = changed
+    if removed:
+        delta["unset"] = removed
+    return delta
+
+
+def apply_delta(content, delta):
+    content = dict(content or {})
+    for key in (delta or {}).get("unset") or []:
+        content.pop(key, None)
+    for key, value in ((delta or {}).get("set") or {}).items():
+        content[key] = value
+    return content
+
+
+def changed_keys(before, after):
+    delta = compute_delta(before, after)
+    return sorted(set(delta.get("set") or {}) | set(delta.get("unset") or []))
+
+
+def _checkpoint_interval():
+    return max(int(getattr(settings, "REPORT_REVISION_CHECKPOINT_INTERVAL", 20) or 1), 1)
+
+
+def revision_contents(section_response, versions):
+    """
+    Reconstruct the content of several revisions of ``section_response``.
+
+    Walks forward once from the nearest checkpoint at or below the lowest
+    requested version, applying deltas, and returns ``{version: content}``.
+    Contents rebuilt from deltas are checked against their stored ``content_hash``.
+    """
+
+    wanted = sorted({int(version) for version in versions})
+    if not wanted:
+        return {}
+    checkpoint = (
+        ReportSectionRevision.objects.filter(
+            section_response=section_response,
+            version__lte=wanted[0],
+            storage_kind=RevisionStorageKind.CHECKPOINT,
+        )
+        .order_by("-version")
+        .values_list("version", flat=True)
+        .first()
+    )
+    if checkpoint is None:
+        raise ValidationError("Revision history has no checkpoint for the requested version.")
+    rows = (
+        ReportSectionRevision.objects.filter(
+            section_response=section_response,
+            version__gte=checkpoint,
+            version__lte=wanted[-1],
+        )
+        .order_by("version")
+        .values_list("version", "storage_kind", "content_snapshot", "delta_json", "content_hash")
+    )
+    contents = {}
+    content = None
+    previous_version = None
+    for version, storage_kind, snapshot, delta, content_hash in rows.iterator():
+        if storage_kind == RevisionStorageKind.CHECKPOINT:
+            content = snapshot or {}
+        elif previous_version is None or version != previous_version + 1:
+            raise ValidationError(f"Revision history is incomplete before version {version}.")
+        else:
+            content = apply_delta(content, delta)
+        previous_version = version
+        if version in wanted:
+            if storage_kind == RevisionStorageKind.DELTA and payload_hash(content) != content_hash:
+                raise ValidationError(f"Revision {version} does not match its content hash.")
+            contents[version] = deepcopy(content)
+    return contents
+
+
+def revision_content(revision):
+    if revision.storage_kind == RevisionStorageKind.CHECKPOINT:
+        return deepcopy(revision.content_snapshot or {})
+    return revision_contents(revision.section_response, [revision.version])[revision.version]
+
+
+def _previous_content(section_response, version):
+    latest = section_response.revisions.order_by("-version").values_list("version", "content_hash").first()
+    if latest is None or latest[0] != version - 1:
+        return None
+    response_json = section_response.response_json or {}
+    if payload_hash(response_json) == latest[1]:
+        return response_json
+    return revision_contents(section_response, [latest[0]])[latest[0]]
+
+
+def _encode_revision(section_response, *, version, content, content_text):
+    """Storage fields for a new revision: a checkpoint, or a delta against the previous version."""
+
+    checkpoint = {
+        "storage_kind": RevisionStorageKind.CHECKPOINT,
+        "content_snapshot": content,
+        "delta_json": {},
+    }
+    last_checkpoint = section_response.revisions.filter(storage_kind=RevisionStorageKind.CHECKPOINT).aggregate(
+        latest=Max("version")
+    )["latest"]
+    if last_checkpoint is None or version - last_checkpoint >= _checkpoint_interval():
+        return checkpoint
+    previous = _previous_content(section_response, version)
+    if previous is None:
+        return checkpoint
+    delta = compute_delta(previous, content)
+    if len(canonical_json(delta)) >= len(content_text):
+        return checkpoint
+    # ``==`` treats e.g. 1 and True as equal; fall back to a checkpoint
+    # whenever the delta would not reproduce the exact content hash.
+    if payload_hash(apply_delta(previous, delta)) != _hash_text(content_text):
+        return checkpoint
+    return {
+        "storage_kind": RevisionStorageKind.DELTA,
+        "content_snapshot": {},
+        "delta_json": delta,
+    }
+
+
 @transaction.atomic
 def append_revision(*, section_response, content, author=None, note=""):
     if section_response.locked_for_editing:
@@ -47,7 +184,8 @@ def append_revision(*, section_response, content, author=None, note=""):
     content = content or {}
     parent_hash = section_response.current_content_hash or ""
     next_version = int(section_response.current_version or 0) + 1
-    content_digest = payload_hash(content)
+    content_text = canonical_json(content)
+    content_digest = _hash_text(content_text)
 
     existing = ReportSectionRevision.objects.filter(
         section_response=section_response,
@@ -60,10 +198,10 @@ def append_revision(*, section_response, content, author=None, note=""):
         section_response=section_response,
         version=next_version,
         author=author if getattr(author, "is_authenticated", False) else None,
-        content_snapshot=content,
         content_hash=content_digest,
         parent_hash=parent_hash,
         note=note or "",
+        **_encode_revision(section_response, version=next_version, content=content, content_text=content_text),
     )
     section_response.response_json = content
     section_response.current_version = next_version
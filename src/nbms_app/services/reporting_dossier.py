@@ -4,7 +4,8 @@ import hashlib
 import json
 import subprocess
 import sys
-from io import BytesIO
+import time
+from contextlib import contextmanager
 from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
 
 import django
@@ -24,14 +25,16 @@ from nbms_app.models import (
     SectionIIINationalTargetProgress,
 )
 from nbms_app.services.audit import record_audit_event
+from nbms_app.services.csv_streaming import HashingSpool
 from nbms_app.services.reporting_exports import (
     build_cbd_report_payload,
     render_cbd_docx_bytes,
-    render_cbd_pdf_bytes,
+    start_cbd_pdf_render,
     store_report_export_artifact,
 )
-from nbms_app.services.reporting_workflow import report_content_snapshot
-from nbms_app.services.reporting_narratives import normalize_context_filters, render_section_narrative
+from nbms_app.services.reporting_workflow import report_content_snapshot, resolve_cbd_pack
+from nbms_app.services.reporting_narratives import normalize_context_filters, render_section_narratives
+from nbms_app.services.section_charts import section_chart_data, visible_section_charts
 
 
 def _canonical_json(value):
@@ -120,6 +123,7 @@ def _revision_hash_chain(instance):
     rows = (
         ReportSectionRevision.objects.filter(section_response__reporting_instance=instance)
         .select_related("section_response__section", "author")
+        .defer("content_snapshot", "delta_json")
         .order_by("section_response__section__ordering", "section_response__section__code", "version", "id")
     )
     chain = []
@@ -173,31 +177,61 @@ def _workflow_audit_payload(instance):
     }
 
 
+class _StageTimer:
+    def __init__(self):
+        self._timings = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._timings[name] = round((time.perf_counter() - started) * 1000, 2)
+
+    def as_dict(self):
+        return dict(self._timings)
+
+
 def generate_reporting_dossier(*, instance, user, linked_action=None, context_filters=None):
-    payload = build_cbd_report_payload(instance=instance)
+    timings = _StageTimer()
+    with timings.stage("payload"):
+        payload = build_cbd_report_payload(instance=instance)
     context_filters = normalize_context_filters(context_filters)
     resolved_manifest = []
-    for section in payload.get("sections", []):
-        section_code = section.get("code")
-        if not section_code:
-            continue
-        rendered = render_section_narrative(
+    with timings.stage("narratives"):
+        sections = [section for section in payload.get("sections", []) if section.get("code")]
+        narratives = render_section_narratives(
             instance=instance,
-            section_code=section_code,
+            section_codes=[section["code"] for section in sections],
             context_filters=context_filters,
         )
-        section["rendered_narrative_html"] = rendered.get("rendered_html", "")
-        section["resolved_values_manifest"] = rendered.get("resolved_values_manifest", [])
-        resolved_manifest.extend(rendered.get("resolved_values_manifest", []))
+        for section in sections:
+            rendered = narratives[section["code"]]
+            section["rendered_narrative_html"] = rendered.get("rendered_html", "")
+            section["resolved_values_manifest"] = rendered.get("resolved_values_manifest", [])
+            resolved_manifest.extend(rendered.get("resolved_values_manifest", []))
+    with timings.stage("charts"):
+        charts = visible_section_charts(section_chart_data(instance=instance, pack=resolve_cbd_pack()), user, instance)
+        for section in payload.get("sections", []):
+            section["charts"] = charts.get(section.get("code"), [])
     payload["context_filters"] = context_filters
     payload["resolved_values_manifest"] = resolved_manifest
-    pdf_bytes = render_cbd_pdf_bytes(payload=payload)
-    docx_bytes = render_cbd_docx_bytes(payload=payload)
-    json_bytes = _canonical_json(payload).encode("utf-8")
-    evidence_manifest = _gather_evidence_manifest(instance)
-    audit_payload = _workflow_audit_payload(instance)
-    revision_chain = _revision_hash_chain(instance)
-    _snapshot_payload, report_hash, _pack = report_content_snapshot(instance)
+
+    # The PDF renders on the worker pool while the DOCX, JSON and the
+    # integrity inputs are built here.
+    with timings.stage("renders"):
+        collect_pdf = start_cbd_pdf_render(payload=payload)
+        with timings.stage("docx"):
+            docx_bytes = render_cbd_docx_bytes(payload=payload)
+        json_bytes = _canonical_json(payload).encode("utf-8")
+        with timings.stage("integrity_inputs"):
+            evidence_manifest = _gather_evidence_manifest(instance)
+            audit_payload = _workflow_audit_payload(instance)
+            revision_chain = _revision_hash_chain(instance)
+            _snapshot_payload, report_hash, _pack = report_content_snapshot(instance)
+        with timings.stage("pdf_wait"):
+            pdf_bytes = collect_pdf()
 
     integrity = {
         "report_content_hash": report_hash,
@@ -241,51 +275,58 @@ def generate_reporting_dossier(*, instance, user, linked_action=None, context_fi
         ),
     }
 
-    zip_buffer = BytesIO()
-    with ZipFile(zip_buffer, mode="w", compression=ZIP_DEFLATED) as zf:
-        _zip_write(zf, "submission.json", json_bytes)
-        _zip_write(zf, "report.pdf", pdf_bytes)
-        _zip_write(zf, "report.docx", docx_bytes)
-        _zip_write(zf, "evidence_manifest.json", _canonical_json(evidence_manifest).encode("utf-8"))
-        _zip_write(zf, "audit_log.json", _canonical_json(audit_payload).encode("utf-8"))
-        _zip_write(zf, "integrity.json", _canonical_json(integrity).encode("utf-8"))
-        _zip_write(zf, "visibility.json", _canonical_json(visibility).encode("utf-8"))
-        if resolved_manifest:
-            _zip_write(zf, "resolved_values_manifest.json", _canonical_json(resolved_manifest).encode("utf-8"))
-    zip_bytes = zip_buffer.getvalue()
-
-    pdf_artifact = store_report_export_artifact(
-        instance=instance,
-        generated_by=user,
-        format_name="pdf",
-        content_bytes=pdf_bytes,
-        linked_action=linked_action,
-        metadata={"source": "dossier"},
-    )
-    docx_artifact = store_report_export_artifact(
-        instance=instance,
-        generated_by=user,
-        format_name="docx",
-        content_bytes=docx_bytes,
-        linked_action=linked_action,
-        metadata={"source": "dossier"},
-    )
-    json_artifact = store_report_export_artifact(
-        instance=instance,
-        generated_by=user,
-        format_name="json",
-        content_bytes=json_bytes,
-        linked_action=linked_action,
-        metadata={"source": "dossier"},
-    )
-    dossier_export_artifact = store_report_export_artifact(
-        instance=instance,
-        generated_by=user,
-        format_name="dossier",
-        content_bytes=zip_bytes,
-        linked_action=linked_action,
-        metadata={"source": "dossier"},
-    )
+    with timings.stage("store_exports"):
+        pdf_artifact = store_report_export_artifact(
+            instance=instance,
+            generated_by=user,
+            format_name="pdf",
+            content_bytes=pdf_bytes,
+            linked_action=linked_action,
+            metadata={"source": "dossier"},
+        )
+        docx_artifact = store_report_export_artifact(
+            instance=instance,
+            generated_by=user,
+            format_name="docx",
+            content_bytes=docx_bytes,
+            linked_action=linked_action,
+            metadata={"source": "dossier"},
+        )
+        json_artifact = store_report_export_artifact(
+            instance=instance,
+            generated_by=user,
+            format_name="json",
+            content_bytes=json_bytes,
+            linked_action=linked_action,
+            metadata={"source": "dossier"},
+        )
+
+    spool = HashingSpool()
+    try:
+        with timings.stage("zip"):
+            # The ZIP is written straight into a hashing spool (memory, then
+            # disk beyond its threshold) rather than a BytesIO copy.
+            with ZipFile(spool, mode="w", compression=ZIP_DEFLATED) as zf:
+                _zip_write(zf, "submission.json", json_bytes)
+                _zip_write(zf, "report.pdf", pdf_bytes)
+                _zip_write(zf, "report.docx", docx_bytes)
+                _zip_write(zf, "evidence_manifest.json", _canonical_json(evidence_manifest).encode("utf-8"))
+                _zip_write(zf, "audit_log.json", _canonical_json(audit_payload).encode("utf-8"))
+                _zip_write(zf, "integrity.json", _canonical_json(integrity).encode("utf-8"))
+                _zip_write(zf, "visibility.json", _canonical_json(visibility).encode("utf-8"))
+                if resolved_manifest:
+                    _zip_write(zf, "resolved_values_manifest.json", _canonical_json(resolved_manifest).encode("utf-8"))
+        with timings.stage("store_dossier"):
+            dossier_export_artifact = store_report_export_artifact(
+                instance=instance,
+                generated_by=user,
+                format_name="dossier",
+                spool=spool,
+                linked_action=linked_action,
+                metadata={"source": "dossier"},
+            )
+    finally:
+        spool.close()
 
     dossier = ReportDossierArtifact.objects.create(
         reporting_instance=instance,
@@ -296,7 +337,9 @@ def generate_reporting_dossier(*, instance, user, linked_action=None, context_fi
             "docx_hash": docx_artifact.content_hash,
             "json_hash": json_artifact.content_hash,
             "dossier_hash": dossier_export_artifact.content_hash,
+            "dossier_size_bytes": spool.size,
             "resolved_values_count": len(resolved_manifest),
+            "stage_timings_ms": timings.as_dict(),
         },
         generated_by=user if getattr(user, "is_authenticated", False) else None,
         linked_action=linked_action,
@@ -1,20 +1,26 @@
 from __future__ import annotations
 
+import functools
 import hashlib
 import json
-from io import BytesIO
 
-from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+from django.db.models import Count, Max, Sum
 from django.template.loader import render_to_string
 from django.utils import timezone
 
 from nbms_app.models import (
     AnnexSectionResponse,
+    InputTableVersion,
+    Organisation,
     ReportExportArtifact,
+    ReportNarrativeBlock,
     ReportTemplatePackResponse,
 )
+from nbms_app.services.docx_rendering import DocxBuilder, render_section_fragments
+from nbms_app.services.pdf_rendering import start_pdf_render
+from nbms_app.services.render_cache import cached_render_async
 
 
 def _canonical_json(value):
@@ -93,72 +99,164 @@ def build_cbd_report_payload(*, instance):
     return payload
 
 
-def render_cbd_pdf_bytes(*, payload):
-    try:
-        from xhtml2pdf import pisa  # noqa: WPS433
-    except Exception as exc:  # noqa: BLE001
-        raise ValidationError(f"PDF renderer dependency missing: {exc}") from exc
+CBD_REPORT_PDF_TEMPLATE = "nbms_app/reporting/national_report_pdf.html"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 
+
+def cbd_report_fingerprint(instance, *, context_filters=None):
+    """
+    Cheap version stamp of everything a national report export is built from.
+
+    Pack response, annex, workflow and approval writes bump
+    ``workspace_version``, narrative blocks are stamped by their latest
+    update, and the indicator, spatial and consent values narrative tokens
+    resolve from by the input version counters, so renders can be looked up
+    without building ``build_cbd_report_payload``. ``context_filters`` is
+    ``None`` for the bare payload and the export context when narratives are
+    rendered into it.
+    """
+
+    from nbms_app.services.reporting_workflow import resolve_cbd_pack
+
+    pack = resolve_cbd_pack()
+    pack_sections = pack.sections.aggregate(updated_at=Max("updated_at"), count=Count("id"))
+    organisations = Organisation.objects.filter(
+        pk__in=[instance.focal_point_org_id, instance.publishing_authority_org_id]
+    ).aggregate(updated_at=Max("updated_at"))
+    narratives = ReportNarrativeBlock.objects.filter(reporting_instance=instance).aggregate(
+        updated_at=Max("updated_at"),
+        count=Count("id"),
+    )
+    inputs = InputTableVersion.objects.aggregate(updated_at=Max("updated_at"), versions=Sum("version"))
+    return {
+        "instance": [instance.pk, instance.workspace_version, instance.updated_at],
+        "cycle": instance.cycle.updated_at if instance.cycle_id else None,
+        "organisations": organisations["updated_at"],
+        "pack": [pack.pk, pack.version, pack.updated_at, pack_sections["updated_at"], pack_sections["count"]],
+        "narratives": [narratives["updated_at"], narratives["count"]],
+        "inputs": [inputs["updated_at"], inputs["versions"]],
+        "context_filters": context_filters,
+    }
+
+
+def _payload_builder(payload):
+    return functools.cache(payload) if callable(payload) else (lambda: payload)
+
+
+def render_cbd_pdf_bytes(*, payload, fingerprint=None):
+    return start_cbd_pdf_render(payload=payload, fingerprint=fingerprint)()
+
+
+def start_cbd_pdf_render(*, payload, fingerprint=None, metadata=None):
+    """
+    Start the national report PDF render; returns a ``PendingRender`` that waits for the bytes.
+
+    With a ``fingerprint`` (see ``cbd_report_fingerprint``) the render is
+    looked up before the payload is built, and ``payload`` may be a
+    zero-argument callable that is only called on a miss.
+    """
+
+    build = _payload_builder(payload)
+    return cached_render_async(
+        kind="cbd_report_pdf",
+        renderer="pdf",
+        template_name=CBD_REPORT_PDF_TEMPLATE,
+        payload=None if fingerprint is not None else build(),
+        fingerprint=fingerprint,
+        metadata=metadata,
+        content_type="application/pdf",
+        submit=lambda generated_at: _start_cbd_pdf_render(build(), generated_at),
+    )
+
+
+def _start_cbd_pdf_render(payload, generated_at):
     context = {
         "payload": payload,
         "instance": payload.get("reporting_instance", {}),
         "sections": payload.get("sections", []),
         "annex": payload.get("annex", []),
-        "generated_at": timezone.now(),
+        "generated_at": generated_at,
     }
-    html = render_to_string("nbms_app/reporting/national_report_pdf.html", context)
-    output = BytesIO()
-    result = pisa.CreatePDF(src=html, dest=output, encoding="utf-8")
-    if result.err:
-        raise ValidationError("Failed to render national report PDF.")
-    return output.getvalue()
+    html = render_to_string(CBD_REPORT_PDF_TEMPLATE, context)
+    return start_pdf_render(html, error_message="Failed to render national report PDF.")
 
 
-def render_cbd_docx_bytes(*, payload):
-    try:
-        from docx import Document  # noqa: WPS433
-    except Exception as exc:  # noqa: BLE001
-        raise ValidationError(f"DOCX renderer dependency missing: {exc}") from exc
+def render_cbd_docx_bytes(*, payload, fingerprint=None):
+    return start_cbd_docx_render(payload=payload, fingerprint=fingerprint)()
 
-    doc = Document()
-    report = payload.get("reporting_instance", {})
-    doc.add_heading(report.get("report_title") or "CBD National Report", level=0)
-    meta_line = f"{report.get('country_name', '')} | {report.get('cycle_code', '')} | {report.get('version_label', '')}"
-    doc.add_paragraph(meta_line)
-    doc.add_paragraph(f"Visibility: {'Public' if report.get('is_public') else 'Internal'}")
-
-    for section in payload.get("sections", []):
-        doc.add_heading(f"{section.get('code', '').upper()} - {section.get('title', '')}", level=1)
-        content = section.get("content") or {}
-        for key in sorted(content.keys()):
-            value = content.get(key)
-            doc.add_paragraph(f"{key}:", style="List Bullet")
-            if isinstance(value, list):
-                if value and isinstance(value[0], dict):
-                    for row in value:
-                        doc.add_paragraph(json.dumps(row, ensure_ascii=False), style="List Number")
-                else:
-                    doc.add_paragraph(", ".join(str(item) for item in value))
-            elif isinstance(value, dict):
-                for row_key in sorted(value.keys()):
-                    doc.add_paragraph(f"{row_key}: {value.get(row_key)}")
+
+def start_cbd_docx_render(*, payload, fingerprint=None, metadata=None):
+    """National report DOCX counterpart of ``start_cbd_pdf_render``; the DOCX renders on the calling thread."""
+
+    build = _payload_builder(payload)
+    return cached_render_async(
+        kind="cbd_report_docx",
+        renderer="docx",
+        payload=None if fingerprint is not None else build(),
+        fingerprint=fingerprint,
+        metadata=metadata,
+        content_type=DOCX_CONTENT_TYPE,
+        submit=lambda generated_at: _render_cbd_docx_bytes(build()),
+    )
+
+
+def _section_docx_blocks(section):
+    blocks = [("heading", f"{section.get('code', '').upper()} - {section.get('title', '')}", 1)]
+    content = section.get("content") or {}
+    for key in sorted(content.keys()):
+        value = content.get(key)
+        blocks.append(("paragraph", f"{key}:", "List Bullet"))
+        if isinstance(value, list):
+            if value and isinstance(value[0], dict):
+                for row in value:
+                    blocks.append(("paragraph", json.dumps(row, ensure_ascii=False), "List Number"))
             else:
-                doc.add_paragraph(str(value or ""))
+                blocks.append(("paragraph", ", ".join(str(item) for item in value), None))
+        elif isinstance(value, dict):
+            for row_key in sorted(value.keys()):
+                blocks.append(("paragraph", f"{row_key}: {value.get(row_key)}", None))
+        else:
+            blocks.append(("paragraph", str(value or ""), None))
+    return blocks
+
+
+def _annex_docx_blocks(annex_rows):
+    if not annex_rows:
+        return []
+    blocks = [("heading", "Annex", 1)]
+    for annex in annex_rows:
+        blocks.append(("heading", f"{annex.get('decision_topic_code')} - {annex.get('title')}", 2))
+        response_json = annex.get("response_json") or {}
+        for key in sorted(response_json.keys()):
+            blocks.append(("paragraph", f"{key}: {response_json.get(key)}", None))
+    return blocks
 
-    if payload.get("annex"):
-        doc.add_heading("Annex", level=1)
-        for annex in payload.get("annex", []):
-            doc.add_heading(f"{annex.get('decision_topic_code')} - {annex.get('title')}", level=2)
-            response_json = annex.get("response_json") or {}
-            for key in sorted(response_json.keys()):
-                doc.add_paragraph(f"{key}: {response_json.get(key)}")
 
-    out = BytesIO()
-    doc.save(out)
-    return out.getvalue()
+def _render_cbd_docx_bytes(payload):
+    builder = DocxBuilder()
+    report = payload.get("reporting_instance", {})
+    builder.heading(report.get("report_title") or "CBD National Report", level=0)
+    meta_line = f"{report.get('country_name', '')} | {report.get('cycle_code', '')} | {report.get('version_label', '')}"
+    builder.paragraph(meta_line)
+    builder.paragraph(f"Visibility: {'Public' if report.get('is_public') else 'Internal'}")
+
+    parts = [_section_docx_blocks(section) for section in payload.get("sections", [])]
+    parts.append(_annex_docx_blocks(payload.get("annex")))
+    for fragment in render_section_fragments(parts):
+        builder.append_fragment(fragment)
+    return builder.to_bytes()
 
 
-def store_report_export_artifact(*, instance, generated_by, format_name, content_bytes, linked_action=None, metadata=None):
+def store_report_export_artifact(
+    *,
+    instance,
+    generated_by,
+    format_name,
+    content_bytes=None,
+    spool=None,
+    linked_action=None,
+    metadata=None,
+):
     timestamp = timezone.now().strftime("%Y%m%dT%H%M%S")
     label = str(getattr(instance, "report_label", "") or getattr(instance, "version_label", "") or "report").strip().lower()
     label = "".join(ch for ch in label if ch.isalnum() or ch in {"-", "_"}) or "report"
@@ -174,8 +272,13 @@ def store_report_export_artifact(*, instance, generated_by, format_name, content
     storage_path = f"reports/{instance.uuid}/{timestamp}_{label}_{format_name}.{suffix}"
     if default_storage.exists(storage_path):
         default_storage.delete(storage_path)
-    default_storage.save(storage_path, ContentFile(content_bytes))
-    digest = _hash_bytes(content_bytes)
+    if spool is not None:
+        # Spooled content (e.g. a streamed dossier ZIP) was hashed while written.
+        default_storage.save(storage_path, spool.as_file(storage_path.rsplit("/", 1)[-1]))
+        digest = spool.sha256
+    else:
+        default_storage.save(storage_path, ContentFile(content_bytes))
+        digest = _hash_bytes(content_bytes)
     artifact = ReportExportArtifact.objects.create(
         reporting_instance=instance,
         format=format_name,
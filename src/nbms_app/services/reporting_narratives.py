@@ -3,12 +3,11 @@ from __future__ import annotations
 import hashlib
 import json
 import re
-from io import BytesIO
 from urllib import request as urllib_request
 
-from django.core.exceptions import ValidationError
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
+from django.db.models import OuterRef, Subquery
 from django.utils import timezone
 
 from nbms_app.models import (
@@ -19,12 +18,13 @@ from nbms_app.models import (
     ReportNarrativeBlock,
     ReportNarrativeBlockVersion,
     ReportTemplatePack,
-    ReportTemplatePackResponse,
     ReportingInstance,
     TaxonGoldSummary,
     EcosystemGoldSummary,
     IASGoldSummary,
 )
+from nbms_app.services.docx_rendering import DocxBuilder, extract_docx_text
+from nbms_app.services.section_charts import section_chart_data, visible_section_charts
 
 
 TOKEN_PATTERN = re.compile(r"\[\[nbms:(?P<token_type>[a-zA-Z0-9_]+)\s*(?P<args>[^\]]*)\]\]")
@@ -102,88 +102,175 @@ def persist_report_context(*, instance, user=None, session_key="", filters=None)
     return context
 
 
-def _indicator_value(code, year=None):
-    indicator = Indicator.objects.filter(code=code).first()
-    if not indicator:
-        return None
-    queryset = IndicatorDataPoint.objects.filter(series__indicator=indicator)
-    if year:
-        try:
-            queryset = queryset.filter(year=int(year))
-        except Exception:  # noqa: BLE001
-            pass
-    point = queryset.order_by("-year", "-id").first()
-    if not point:
-        return None
-    if point.value_numeric is not None:
-        return float(point.value_numeric)
-    return point.value_text
-
-
-def _registry_value(kind, metric):
-    model = {
-        "taxa": TaxonGoldSummary,
-        "ecosystems": EcosystemGoldSummary,
-        "ias": IASGoldSummary,
-    }.get((kind or "").strip().lower())
-    if not model:
-        return None
-    row = model.objects.order_by("-snapshot_date", "-id").first()
-    if not row:
-        return None
-    return getattr(row, metric, None)
+REGISTRY_GOLD_MODELS = {
+    "taxa": TaxonGoldSummary,
+    "ecosystems": EcosystemGoldSummary,
+    "ias": IASGoldSummary,
+}
 
 
-def _programme_value(code, metric):
-    programme = MonitoringProgramme.objects.filter(programme_code=code).first()
-    if not programme:
+def _year_filter(year):
+    if not year:
+        return None
+    try:
+        return int(year)
+    except Exception:  # noqa: BLE001
         return None
-    if metric == "last_run_at":
-        return programme.last_run_at.isoformat() if programme.last_run_at else ""
-    if metric == "title":
-        return programme.title
-    return getattr(programme, metric, None)
 
 
-def _resolve_token(token_type, args, context):
+def _token_request(token_type, args, context):
     if token_type == "indicator":
-        indicator_code = args.get("code") or context.get("indicator_code")
-        year = args.get("year")
-        value = _indicator_value(indicator_code, year=year)
         return {
-            "value": value if value is not None else "",
             "source": "indicator_data_point",
-            "params": {"code": indicator_code, "year": year},
+            "params": {"code": args.get("code") or context.get("indicator_code"), "year": args.get("year")},
         }
     if token_type == "registry":
         kind = args.get("kind")
-        metric = args.get("metric") or "profile_count"
-        value = _registry_value(kind, metric)
         return {
-            "value": value if value is not None else "",
             "source": f"registry_gold:{kind}",
-            "params": {"kind": kind, "metric": metric},
+            "params": {"kind": kind, "metric": args.get("metric") or "profile_count"},
         }
     if token_type == "programme":
-        programme_code = args.get("code") or context.get("programme_code")
-        metric = args.get("metric") or "title"
-        value = _programme_value(programme_code, metric)
         return {
-            "value": value if value is not None else "",
             "source": "monitoring_programme",
-            "params": {"code": programme_code, "metric": metric},
+            "params": {"code": args.get("code") or context.get("programme_code"), "metric": args.get("metric") or "title"},
         }
-    return {"value": "", "source": "unsupported", "params": args}
+    return {"source": "unsupported", "params": args}
+
+
+def collect_narrative_tokens(html):
+    """``(token_type, args)`` for every ``[[nbms:...]]`` token in ``html``."""
+
+    return [
+        (match.group("token_type").strip().lower(), _parse_args(match.group("args")))
+        for match in TOKEN_PATTERN.finditer(html or "")
+    ]
+
+
+class NarrativeValueCache:
+    """
+    Token values for one render, fetched in grouped queries.
+
+    ``prefetch`` loads every indicator, programme and registry value the
+    given tokens need (one query per distinct indicator year, one for all
+    programmes, one per registry kind); anything not prefetched is loaded on
+    first use. Values are kept for the life of the cache, so share one
+    instance across all sections of a render and drop it afterwards.
+    """
+
+    def __init__(self):
+        self._indicator_values = {}
+        self._programmes = {}
+        self._registry_rows = {}
+
+    def prefetch(self, tokens, context):
+        indicator_keys = set()
+        programme_codes = set()
+        registry_kinds = set()
+        for token_type, args in tokens:
+            params = _token_request(token_type, args, context)["params"]
+            if token_type == "indicator":
+                indicator_keys.add((params["code"], _year_filter(params["year"])))
+            elif token_type == "programme":
+                programme_codes.add(params["code"])
+            elif token_type == "registry":
+                registry_kinds.add((params["kind"] or "").strip().lower())
+        self._load_indicator_values(indicator_keys)
+        self._load_programmes(programme_codes)
+        for kind in registry_kinds:
+            self._registry_row(kind)
+
+    def _load_indicator_values(self, keys):
+        by_year = {}
+        for code, year in keys:
+            if (code, year) in self._indicator_values:
+                continue
+            self._indicator_values[(code, year)] = None
+            if code:
+                by_year.setdefault(year, set()).add(code)
+        for year, codes in by_year.items():
+            points = IndicatorDataPoint.objects.filter(series__indicator=OuterRef("pk"))
+            if year is not None:
+                points = points.filter(year=year)
+            points = points.order_by("-year", "-id")
+            rows = (
+                Indicator.objects.filter(code__in=codes)
+                .annotate(
+                    point_id=Subquery(points.values("id")[:1]),
+                    point_numeric=Subquery(points.values("value_numeric")[:1]),
+                    point_text=Subquery(points.values("value_text")[:1]),
+                )
+                .values_list("code", "point_id", "point_numeric", "point_text")
+            )
+            for code, point_id, value_numeric, value_text in rows:
+                if point_id is None:
+                    continue
+                self._indicator_values[(code, year)] = float(value_numeric) if value_numeric is not None else value_text
+
+    def _load_programmes(self, codes):
+        codes = {code for code in codes if code and code not in self._programmes}
+        if not codes:
+            return
+        for code in codes:
+            self._programmes[code] = None
+        for programme in MonitoringProgramme.objects.filter(programme_code__in=codes):
+            self._programmes[programme.programme_code] = programme
+
+    def _registry_row(self, kind):
+        if kind not in self._registry_rows:
+            model = REGISTRY_GOLD_MODELS.get(kind)
+            self._registry_rows[kind] = model.objects.order_by("-snapshot_date", "-id").first() if model else None
+        return self._registry_rows[kind]
+
+    def indicator_value(self, code, year=None):
+        key = (code, _year_filter(year))
+        self._load_indicator_values({key})
+        return self._indicator_values[key]
+
+    def registry_value(self, kind, metric):
+        row = self._registry_row((kind or "").strip().lower())
+        if not row:
+            return None
+        return getattr(row, metric, None)
+
+    def programme_value(self, code, metric):
+        self._load_programmes({code})
+        programme = self._programmes.get(code)
+        if not programme:
+            return None
+        if metric == "last_run_at":
+            return programme.last_run_at.isoformat() if programme.last_run_at else ""
+        if metric == "title":
+            return programme.title
+        return getattr(programme, metric, None)
+
+
+def _resolve_token(token_type, args, context, values):
+    resolved = _token_request(token_type, args, context)
+    params = resolved["params"]
+    value = None
+    if token_type == "indicator":
+        value = values.indicator_value(params["code"], year=params["year"])
+    elif token_type == "registry":
+        value = values.registry_value(params["kind"], params["metric"])
+    elif token_type == "programme":
+        value = values.programme_value(params["code"], params["metric"])
+    resolved["value"] = value if value is not None else ""
+    return resolved
 
 
-def resolve_narrative_tokens(*, html, context_filters=None):
+def resolve_narrative_tokens(*, html, context_filters=None, values=None):
     context = normalize_context_filters(context_filters)
+    context_hash = _hash_payload(context)
+    if values is None:
+        values = NarrativeValueCache()
+        values.prefetch(collect_narrative_tokens(html), context)
     manifest = []
 
     def _replacement(match):
         token_type = match.group("token_type").strip().lower()
         args = _parse_args(match.group("args"))
-        resolved = _resolve_token(token_type, args, context)
+        resolved = _resolve_token(token_type, args, context, values)
         token_text = match.group(0)
         value_text = _safe_text(resolved.get("value"))
         manifest.append(
@@ -193,7 +280,7 @@ def resolve_narrative_tokens(*, html, context_filters=None):
                 "params": resolved.get("params", {}),
                 "resolved_value": value_text,
                 "source": resolved.get("source"),
-                "context_hash": _hash_payload(context),
+                "context_hash": context_hash,
             }
         )
         return value_text
@@ -203,18 +290,12 @@ def resolve_narrative_tokens(*, html, context_filters=None):
         "rendered_html": rendered,
         "resolved_values_manifest": manifest,
         "context": context,
-        "context_hash": _hash_payload(context),
+        "context_hash": context_hash,
     }
 
 
 def _extract_docx_text(content_bytes):
-    try:
-        from docx import Document  # noqa: WPS433
-    except Exception:  # noqa: BLE001
-        return ""
-    document = Document(BytesIO(content_bytes))
-    lines = [paragraph.text.strip() for paragraph in document.paragraphs if paragraph.text.strip()]
-    return "\n".join(lines)
+    return extract_docx_text(content_bytes)
 
 
 def _text_to_html(text):
@@ -225,17 +306,11 @@ def _text_to_html(text):
 
 
 def _build_initial_docx_bytes(title, text=""):
-    try:
-        from docx import Document  # noqa: WPS433
-    except Exception as exc:  # noqa: BLE001
-        raise ValidationError(f"DOCX dependency missing: {exc}") from exc
-    document = Document()
-    document.add_heading(title, level=1)
+    builder = DocxBuilder()
+    builder.heading(title, level=1)
     if text:
-        document.add_paragraph(text)
-    output = BytesIO()
-    document.save(output)
-    return output.getvalue()
+        builder.paragraph(text)
+    return builder.to_bytes()
 
 
 def build_docx_bytes_from_text(*, title, text=""):
@@ -336,103 +411,59 @@ def section_narrative_html(*, instance, section_code):
     return "".join([row.html_snapshot for row in blocks if row.html_snapshot])
 
 
-def build_section_chart_specs(*, instance, section_code, context_filters=None):
+def build_section_chart_specs(*, instance, section_code, context_filters=None, user=None):
     context = normalize_context_filters(context_filters)
     pack = _resolve_pack()
     if not pack:
         return {"charts": [], "context": context, "context_hash": _hash_payload(context)}
-    section = pack.sections.filter(code=section_code, is_active=True).first()
-    if not section:
-        return {"charts": [], "context": context, "context_hash": _hash_payload(context)}
-    response = ReportTemplatePackResponse.objects.filter(
-        reporting_instance=instance,
-        section=section,
-    ).first()
-    payload = response.response_json or {} if response else {}
-    charts = []
-
-    if section_code == "section-iii":
-        rows = payload.get("target_progress_rows") or []
-        buckets = {}
-        for row in rows:
-            key = _safe_text(row.get("progress_level") or "unknown") or "unknown"
-            buckets[key] = buckets.get(key, 0) + 1
-        labels = sorted(buckets.keys())
-        charts.append(
-            {
-                "id": "section3-progress-levels",
-                "title": "Section III Progress Levels",
-                "spec": {
-                    "data": [{"type": "bar", "x": labels, "y": [buckets[label] for label in labels], "marker": {"color": "#2c7a5a"}}],
-                    "layout": {"margin": {"l": 40, "r": 20, "t": 40, "b": 40}, "height": 300},
-                    "config": {"displayModeBar": False, "responsive": True},
-                },
-            }
-        )
+    chart_data = section_chart_data(instance=instance, pack=pack, section_codes=[section_code])
+    charts = visible_section_charts(chart_data, user, instance).get(section_code, [])
+    return {"charts": charts, "context": context, "context_hash": _hash_payload(context)}
 
-    elif section_code == "section-iv":
-        rows = payload.get("target_progress_rows") or []
-        labels = []
-        values = []
-        for row in rows[:12]:
-            labels.append(_safe_text(row.get("framework_target_code") or row.get("target_code") or "target"))
-            values.append(1 if _safe_text(row.get("progress_level")).lower() in {"on_track", "achieved"} else 0)
-        charts.append(
-            {
-                "id": "section4-target-status",
-                "title": "Section IV Target Status (On-track=1)",
-                "spec": {
-                    "data": [{"type": "scatter", "mode": "lines+markers", "x": labels, "y": values, "line": {"color": "#15506c"}}],
-                    "layout": {"margin": {"l": 40, "r": 20, "t": 40, "b": 60}, "height": 320},
-                    "config": {"displayModeBar": False, "responsive": True},
-                },
-            }
-        )
 
-    elif section_code in {"section-i", "section-ii", "section-v"}:
-        filled = 0
-        total = 0
-        for key, value in payload.items():
-            if key.startswith("_"):
-                continue
-            total += 1
-            if isinstance(value, list):
-                filled += 1 if value else 0
-            elif isinstance(value, dict):
-                filled += 1 if value else 0
-            elif _safe_text(value):
-                filled += 1
-        charts.append(
-            {
-                "id": f"{section_code}-completion",
-                "title": "Structured Field Completion",
-                "spec": {
-                    "data": [
-                        {
-                            "type": "pie",
-                            "labels": ["Completed", "Missing"],
-                            "values": [filled, max(total - filled, 0)],
-                            "marker": {"colors": ["#1f7a4d", "#d8e8dd"]},
-                            "textinfo": "label+percent",
-                        }
-                    ],
-                    "layout": {"margin": {"l": 20, "r": 20, "t": 40, "b": 20}, "height": 280},
-                    "config": {"displayModeBar": False, "responsive": True},
-                },
-            }
-        )
+def render_section_narratives(*, instance, section_codes, context_filters=None):
+    """
+    Render the narratives of ``section_codes`` in two phases.
 
-    return {"charts": charts, "context": context, "context_hash": _hash_payload(context)}
+    All narrative blocks are read in one query and every token across the
+    sections is collected first, so token values are fetched in grouped
+    queries and shared by all sections. Returns ``{section_code: rendered}``
+    with the same shape as ``render_section_narrative``.
+    """
+
+    section_codes = list(section_codes)
+    raw_html = {code: "" for code in section_codes}
+    blocks = ReportNarrativeBlock.objects.filter(
+        reporting_instance=instance,
+        section_code__in=section_codes,
+    ).order_by("block_key")
+    for section_code, html_snapshot in blocks.values_list("section_code", "html_snapshot"):
+        if html_snapshot:
+            raw_html[section_code] += html_snapshot
+
+    context = normalize_context_filters(context_filters)
+    values = NarrativeValueCache()
+    values.prefetch(
+        [token for html in raw_html.values() for token in collect_narrative_tokens(html)],
+        context,
+    )
+    rendered = {}
+    for section_code in section_codes:
+        resolved = resolve_narrative_tokens(html=raw_html[section_code], context_filters=context, values=values)
+        rendered[section_code] = {
+            "section_code": section_code,
+            "raw_html": raw_html[section_code],
+            "rendered_html": resolved["rendered_html"],
+            "resolved_values_manifest": resolved["resolved_values_manifest"],
+            "context": resolved["context"],
+            "context_hash": resolved["context_hash"],
+        }
+    return rendered
 
 
 def render_section_narrative(*, instance, section_code, context_filters=None):
-    raw_html = section_narrative_html(instance=instance, section_code=section_code)
-    resolved = resolve_narrative_tokens(html=raw_html, context_filters=context_filters)
-    return {
-        "section_code": section_code,
-        "raw_html": raw_html,
-        "rendered_html": resolved["rendered_html"],
-        "resolved_values_manifest": resolved["resolved_values_manifest"],
-        "context": resolved["context"],
-        "context_hash": resolved["context_hash"],
-    }
+    return render_section_narratives(
+        instance=instance,
+        section_codes=[section_code],
+        context_filters=context_filters,
+    )[section_code]
@@ -33,13 +33,15 @@ from nbms_app.services.authorization import (
     is_system_admin,
     user_has_role,
 )
-from nbms_app.services.reporting_collab import payload_hash
+from nbms_app.services.reporting_collab import ensure_initial_revision, payload_hash
 from nbms_app.services.reporting_exports import (
     build_cbd_report_payload,
     render_cbd_docx_bytes,
     render_cbd_pdf_bytes,
     store_report_export_artifact,
 )
+from nbms_app.services.reporting_workspace import bump_workspace_version
+from nbms_app.services.snapshots import store_snapshot_payload
 from nbms_app.services.template_packs import build_default_response_payload, build_pack_validation
 
 
@@ -133,9 +135,8 @@ def ensure_workflow_definition():
     return definition
 
 
-def ensure_workflow_instance(instance):
-    definition = ensure_workflow_definition()
-    workflow = (
+def get_active_workflow(instance):
+    return (
         ReportWorkflowInstance.objects.filter(
             reporting_instance=instance,
             status=ReportWorkflowStatus.ACTIVE,
@@ -144,6 +145,11 @@ def ensure_workflow_instance(instance):
         .order_by("-created_at", "-id")
         .first()
     )
+
+
+def ensure_workflow_instance(instance):
+    definition = ensure_workflow_definition()
+    workflow = get_active_workflow(instance)
     if workflow:
         return workflow
     workflow = ReportWorkflowInstance.objects.create(
@@ -157,6 +163,38 @@ def ensure_workflow_instance(instance):
     return workflow
 
 
+def bootstrap_report_workspace(instance, *, user=None, initial_responses=None):
+    """
+    Create the section responses, their initial revisions, the workflow and
+    the section approval rows for a reporting instance.
+
+    Called when an instance is created so that reading the workspace never
+    has to write. ``initial_responses`` maps section codes to values merged
+    over the section's default payload.
+    """
+
+    pack = resolve_cbd_pack()
+    initial_responses = initial_responses or {}
+    author = user if getattr(user, "is_authenticated", False) else None
+    responses = ReportTemplatePackResponse.objects.filter(reporting_instance=instance, section__pack=pack)
+    existing = set(responses.values_list("section_id", flat=True))
+    for section in pack.sections.filter(is_active=True).order_by("ordering", "code"):
+        if section.id in existing:
+            continue
+        response_json = build_default_response_payload(section)
+        response_json.update(initial_responses.get(section.code) or {})
+        ReportTemplatePackResponse.objects.create(
+            reporting_instance=instance,
+            section=section,
+            response_json=response_json,
+            updated_by=author,
+        )
+    for response in responses.filter(revisions__isnull=True):
+        ensure_initial_revision(section_response=response, author=author)
+    workflow = ensure_workflow_instance(instance)
+    return pack, workflow
+
+
 def _ensure_section_approval_rows(workflow):
     pack = resolve_cbd_pack()
     for section in pack.sections.filter(is_active=True).order_by("ordering", "code"):
@@ -220,6 +258,7 @@ def _lock_sections(instance, user):
         locked_at=timezone.now(),
         locked_by=user if getattr(user, "is_authenticated", False) else None,
     )
+    bump_workspace_version(instance.pk)
 
 
 def _unlock_sections(instance):
@@ -228,6 +267,7 @@ def _unlock_sections(instance):
         locked_at=None,
         locked_by=None,
     )
+    bump_workspace_version(instance.pk)
 
 
 def _record_action(*, workflow, user, action_type, comment, payload_digest, payload_json):
@@ -334,7 +374,8 @@ def _create_immutable_snapshot_package(
         payload_hash=payload_hash_value,
         defaults={
             "snapshot_type": "CBD_NR_SIGNOFF_PACKAGE_V1",
-            "payload_json": payload,
+            "payload_json": None,
+            "payload_manifest_json": store_snapshot_payload(payload),
             "exporter_schema": payload.get("schema", "nbms.cbd_national_report.v1"),
             "exporter_version": payload.get("exporter_version", "1.0.0"),
             "report_family": instance.report_family,
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from nbms_app.models import ReportingInstance
+from nbms_app.services.reporting_exports import build_cbd_report_payload
+from nbms_app.services.template_packs import build_pack_validation
+
+
+def _cache_timeout():
+    return int(getattr(settings, "REPORT_WORKSPACE_CACHE_SECONDS", 300) or 0)
+
+
+def bump_workspace_version(reporting_instance_id):
+    """Invalidate cached workspace summaries for the instance without touching ``updated_at``."""
+
+    ReportingInstance.objects.filter(pk=reporting_instance_id).update(workspace_version=F("workspace_version") + 1)
+
+
+def _cache_key(kind, instance, *parts):
+    updated_at = instance.updated_at.timestamp() if instance.updated_at else 0
+    return ":".join(
+        str(part)
+        for part in ("reporting_workspace", kind, instance.pk, instance.workspace_version, updated_at, *parts)
+    )
+
+
+def _cached(key, build):
+    timeout = _cache_timeout()
+    if not timeout:
+        return build()
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout=timeout)
+    return value
+
+
+def cached_pack_validation(*, pack, instance, user):
+    """
+    ``build_pack_validation`` cached per instance workspace version, pack and user.
+
+    Section, workflow and approval writes bump ``workspace_version``; the
+    timeout bounds how long changes to linked indicators, programmes or
+    evidence take to show up.
+    """
+
+    key = _cache_key("validation", instance, pack.pk, pack.version, getattr(user, "pk", None) or "anon")
+    return _cached(key, lambda: build_pack_validation(pack=pack, instance=instance, user=user))
+
+
+def cached_report_payload(*, pack, instance):
+    """``build_cbd_report_payload`` cached per instance workspace version and pack."""
+
+    key = _cache_key("payload", instance, pack.pk, pack.version)
+    return _cached(key, lambda: build_cbd_report_payload(instance=instance))
@@ -17,15 +17,14 @@ from nbms_app.services.alignment import (
     filter_target_framework_links_for_user,
 )
 from nbms_app.services.authorization import filter_queryset_for_user, is_system_admin
-from nbms_app.services.consent import consent_is_granted, requires_consent
 from nbms_app.services.indicator_data import (
     binary_indicator_responses_for_user,
     indicator_data_points_for_user,
     indicator_data_series_for_user,
 )
+from nbms_app.services.export_context import ExportBuildContext
 from nbms_app.services.instance_approvals import approved_queryset
-from nbms_app.services.readiness import compute_reporting_readiness, get_instance_readiness
-from nbms_app.services.section_progress import scoped_framework_targets, scoped_national_targets
+from nbms_app.services.readiness import compute_reporting_readiness
 
 
 class _StrictUserProxy:
@@ -68,31 +67,26 @@ def _allowed_binary_queryset(instance, user):
     )
 
 
-def _allowed_evidence(instance, user):
+def _allowed_evidence(instance, user, context):
     evidence_qs = _abac_queryset(approved_queryset(instance, Evidence), user)
-    allowed = []
-    for item in evidence_qs:
-        if not requires_consent(item) or consent_is_granted(instance, item):
-            allowed.append(item)
-    return allowed
+    return [item for item in evidence_qs if context.consent_cleared(item)]
 
 
-def _allowed_dataset_releases(instance, user):
+def _allowed_dataset_releases(instance, user, context):
     dataset_qs = _abac_queryset(approved_queryset(instance, Dataset), user)
     releases = DatasetRelease.objects.filter(dataset__in=dataset_qs).select_related("dataset")
-    allowed = []
-    for release in releases:
-        if not requires_consent(release) or consent_is_granted(instance, release):
-            allowed.append(release)
-    return allowed
+    return [release for release in releases if context.consent_cleared(release)]
 
 
-def build_instance_review_summary(instance, user):
+def build_instance_review_summary(instance, user, context=None):
     strict_user = _strict_user(user)
-    readiness = get_instance_readiness(instance, strict_user)
+    if context is None:
+        context = ExportBuildContext(instance, strict_user)
+    readiness = context.instance_readiness()
     catalog_readiness = compute_reporting_readiness(instance.uuid, scope="selected", user=strict_user)
 
-    scoped_targets = scoped_national_targets(instance, strict_user)
+    scoped_targets = context.scoped_national_targets()
+    scoped_target_count = len(context.national_target_ids())
     section_iii_entries = SectionIIINationalTargetProgress.objects.filter(
         reporting_instance=instance,
         national_target__in=scoped_targets,
@@ -102,7 +96,8 @@ def build_instance_review_summary(instance, user):
         scoped_targets.exclude(id__in=section_iii_target_ids).order_by("code")
     )
 
-    scoped_framework = scoped_framework_targets(instance, strict_user)
+    scoped_framework = context.scoped_framework_targets()
+    scoped_framework_count = len(context.framework_target_ids())
     section_iv_entries = SectionIVFrameworkTargetProgress.objects.filter(
         reporting_instance=instance,
         framework_target__in=scoped_framework,
@@ -162,14 +157,14 @@ def build_instance_review_summary(instance, user):
 
     coverage = {
         "section_iii": {
-            "total": scoped_targets.count(),
+            "total": scoped_target_count,
             "completed": len(section_iii_target_ids),
-            "missing": max(0, scoped_targets.count() - len(section_iii_target_ids)),
+            "missing": max(0, scoped_target_count - len(section_iii_target_ids)),
         },
         "section_iv": {
-            "total": scoped_framework.count(),
+            "total": scoped_framework_count,
             "completed": len(section_iv_target_ids),
-            "missing": max(0, scoped_framework.count() - len(section_iv_target_ids)),
+            "missing": max(0, scoped_framework_count - len(section_iv_target_ids)),
         },
     }
 
@@ -181,7 +176,7 @@ def build_instance_review_summary(instance, user):
 
     mapping_coverage = {
         "targets_mapped": mapped_targets_count,
-        "targets_total": scoped_targets.count(),
+        "targets_total": scoped_target_count,
         "indicators_mapped": mapped_indicators_count,
         "indicators_total": len(indicator_ids),
     }
@@ -206,10 +201,12 @@ def _sort_series_key(series):
     return (framework_code, indicator_code)
 
 
-def build_review_pack_context(instance, user):
+def build_review_pack_context(instance, user, context=None):
     strict_user = _strict_user(user)
-    scoped_targets = scoped_national_targets(instance, strict_user)
-    scoped_framework = scoped_framework_targets(instance, strict_user)
+    if context is None:
+        context = ExportBuildContext(instance, strict_user)
+    scoped_targets = context.scoped_national_targets()
+    scoped_framework = context.scoped_framework_targets()
 
     section_iii_entries = (
         SectionIIINationalTargetProgress.objects.filter(
@@ -221,7 +218,7 @@ def build_review_pack_context(instance, user):
             "indicator_data_series",
             "binary_indicator_responses__question__framework_indicator",
             "evidence_items",
-            "dataset_releases",
+            "dataset_releases__dataset",
         )
         .order_by("national_target__code")
     )
@@ -236,7 +233,7 @@ def build_review_pack_context(instance, user):
             "indicator_data_series",
             "binary_indicator_responses__question__framework_indicator",
             "evidence_items",
-            "dataset_releases",
+            "dataset_releases__dataset",
         )
         .order_by("framework_target__code")
     )
@@ -247,10 +244,10 @@ def build_review_pack_context(instance, user):
     allowed_binary = _allowed_binary_queryset(instance, strict_user)
     allowed_binary_ids = set(allowed_binary.values_list("id", flat=True))
 
-    allowed_evidence = _allowed_evidence(instance, strict_user)
+    allowed_evidence = _allowed_evidence(instance, strict_user, context)
     allowed_evidence_ids = {item.id for item in allowed_evidence}
 
-    allowed_releases = _allowed_dataset_releases(instance, strict_user)
+    allowed_releases = _allowed_dataset_releases(instance, strict_user, context)
     allowed_release_ids = {item.id for item in allowed_releases}
 
     points_qs = indicator_data_points_for_user(strict_user, instance).filter(series__in=allowed_series)
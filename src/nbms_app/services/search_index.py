@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import Case, Count, F, FloatField, OuterRef, Q, Subquery, Value, When, Window
+
+from nbms_app.models import (
+    AlienTaxonProfile,
+    Dataset,
+    EcosystemType,
+    Indicator,
+    NationalTarget,
+    SearchDocument,
+    SearchEntityType,
+    TaxonConcept,
+)
+
+
+SEARCH_CONFIG = "simple"
+
+# Text feeding each entity's document: weight -> columns of the record (``s``)
+# or of a joined table. Codes and names rank above joined context, which ranks
+# above free-text descriptions.
+SEARCH_SOURCES = {
+    SearchEntityType.INDICATOR: {
+        "model": Indicator,
+        "joins": [(NationalTarget, "t", "t.id = s.national_target_id")],
+        "weights": {
+            "A": ["s.code", "s.title"],
+            "B": ["t.code", "t.title"],
+            "C": ["s.computation_notes"],
+        },
+    },
+    SearchEntityType.NATIONAL_TARGET: {
+        "model": NationalTarget,
+        "joins": [],
+        "weights": {"A": ["s.code", "s.title"], "C": ["s.description"]},
+    },
+    SearchEntityType.DATASET: {
+        "model": Dataset,
+        "joins": [],
+        "weights": {"A": ["s.dataset_code", "s.title"], "C": ["s.description"]},
+    },
+    SearchEntityType.TAXON: {
+        "model": TaxonConcept,
+        "joins": [],
+        "weights": {
+            "A": ["s.taxon_code", "s.scientific_name", "s.canonical_name"],
+            "B": ["s.family", "s.genus"],
+        },
+    },
+    SearchEntityType.ECOSYSTEM_TYPE: {
+        "model": EcosystemType,
+        "joins": [],
+        "weights": {
+            "A": ["s.ecosystem_code", "s.name"],
+            "B": ["s.biome", "s.bioregion"],
+            "C": ["s.description"],
+        },
+    },
+    SearchEntityType.ALIEN_TAXON_PROFILE: {
+        "model": AlienTaxonProfile,
+        "joins": [(TaxonConcept, "t", "t.id = s.taxon_id")],
+        "weights": {"A": ["t.taxon_code", "t.scientific_name", "t.canonical_name"]},
+    },
+}
+
+ENTITY_TYPE_BY_MODEL = {source["model"]: entity_type for entity_type, source in SEARCH_SOURCES.items()}
+
+# Documents carrying a joined record's text: joined model -> (entity type, foreign key to the joined record).
+DEPENDENT_DOCUMENTS = {
+    NationalTarget: (SearchEntityType.INDICATOR, "national_target_id"),
+    TaxonConcept: (SearchEntityType.ALIEN_TAXON_PROFILE, "taxon_id"),
+}
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def refresh_search_documents(entity_type, object_ids=None):
+    """
+    Rebuild the search documents of ``object_ids`` (every record when ``None``) of ``entity_type`` in one upsert.
+
+    The document's ``search_text`` joins every source column, lower-cased and
+    code first, for substring and prefix matching; ``search_vector`` weights
+    the same columns for ranking.
+    """
+
+    source = SEARCH_SOURCES[entity_type]
+    params = [SEARCH_CONFIG] * len(source["weights"])
+    where = ""
+    if object_ids is not None:
+        object_ids = sorted({int(pk) for pk in object_ids if pk is not None})
+        if not object_ids:
+            return 0
+        where = "WHERE s.id = ANY(%s)"
+        params.append(object_ids)
+    columns = [column for weight in sorted(source["weights"]) for column in source["weights"][weight]]
+    vector = " || ".join(
+        f"setweight(to_tsvector(%s::regconfig, concat_ws(' ', {', '.join(source['weights'][weight])})), '{weight}')"
+        for weight in sorted(source["weights"])
+    )
+    joins = " ".join(f"LEFT JOIN {_table(model)} {alias} ON {condition}" for model, alias, condition in source["joins"])
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {_table(SearchDocument)} (entity_type, object_id, search_text, search_vector, created_at, updated_at)
+            SELECT %s, s.id, lower(concat_ws(E'\\n', {', '.join(columns)})), {vector}, NOW(), NOW()
+            FROM {_table(source["model"])} s
+            {joins}
+            {where}
+            ON CONFLICT (entity_type, object_id) DO UPDATE SET
+                search_text = EXCLUDED.search_text,
+                search_vector = EXCLUDED.search_vector,
+                updated_at = EXCLUDED.updated_at
+            """,
+            [entity_type.value, *params],
+        )
+        return cursor.rowcount
+
+
+def refresh_search_documents_for(model, object_ids):
+    """Refresh the documents of ``model``'s ``object_ids`` and of the documents that carry their text."""
+
+    written = refresh_search_documents(ENTITY_TYPE_BY_MODEL[model], object_ids)
+    if model in DEPENDENT_DOCUMENTS:
+        entity_type, foreign_key = DEPENDENT_DOCUMENTS[model]
+        dependent_model = SEARCH_SOURCES[entity_type]["model"]
+        dependent_ids = dependent_model.objects.filter(**{f"{foreign_key}__in": list(object_ids)}).values_list("pk", flat=True)
+        written += refresh_search_documents(entity_type, list(dependent_ids))
+    return written
+
+
+def refresh_all_search_documents():
+    """Rebuild every entity type's search documents; returns rows written per entity type."""
+
+    return {entity_type.value: refresh_search_documents(entity_type) for entity_type in SEARCH_SOURCES}
+
+
+def delete_search_documents(entity_type, object_ids):
+    object_ids = sorted({int(pk) for pk in object_ids if pk is not None})
+    if not object_ids:
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {_table(SearchDocument)} WHERE entity_type = %s AND object_id = ANY(%s)",
+            [entity_type.value, object_ids],
+        )
+        return cursor.rowcount
+
+
+def _prefix_query(search):
+    terms = re.findall(r"[^\W_]+", search.lower())
+    if not terms:
+        return None
+    return SearchQuery(" & ".join(f"{term}:*" for term in terms), config=SEARCH_CONFIG, search_type="raw")
+
+
+def search_queryset(queryset, search):
+    """
+    Narrow ``queryset`` to records whose search document matches ``search`` and annotate ``search_rank``.
+
+    A record matches when every word of ``search`` prefixes a word of its
+    document, or when ``search`` occurs anywhere in its text (the substring
+    match the trigram index serves). Records whose text starts with
+    ``search`` rank first, then by weighted full-text rank. Access filtering
+    stays with the caller's ``queryset``.
+    """
+
+    entity_type = ENTITY_TYPE_BY_MODEL[queryset.model]
+    term = search.strip().lower()
+    query = _prefix_query(term)
+    match = Q(search_text__contains=term)
+    rank = Case(When(search_text__startswith=term, then=Value(1.0)), default=Value(0.0), output_field=FloatField())
+    if query is not None:
+        match |= Q(search_vector=query)
+        rank = rank + SearchRank(F("search_vector"), query)
+    documents = SearchDocument.objects.filter(entity_type=entity_type)
+    ranked = documents.filter(object_id=OuterRef("pk")).annotate(rank=rank).values("rank")[:1]
+    return queryset.filter(pk__in=documents.filter(match).values("object_id")).annotate(
+        search_rank=Subquery(ranked, output_field=FloatField())
+    )
+
+
+def search_page(queryset, limit):
+    """The first ``limit`` rows of ``queryset`` and its total row count, fetched in one query."""
+
+    rows = list(queryset.annotate(search_total=Window(Count("pk")))[:limit])
+    return rows, (rows[0].search_total if rows else 0)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from django.db.models import Avg
+
+from nbms_app.models import (
+    Indicator,
+    IndicatorDataPoint,
+    ReportSectionChartData,
+    ReportTemplatePackResponse,
+)
+from nbms_app.services.authorization import filter_queryset_for_user
+from nbms_app.services.indicator_data import filter_indicator_data_points_for_user
+from nbms_app.services.reporting_collab import payload_hash
+
+
+INDICATOR_CHART_LIMIT = 12
+CHART_DATA_FIELDS = ["content_hash", "charts_json", "linked_indicator_codes", "updated_at"]
+
+
+def _safe_text(value):
+    if value is None:
+        return ""
+    return str(value).strip()
+
+
+def _progress_level_chart(rows):
+    buckets = {}
+    for row in rows:
+        key = _safe_text(row.get("progress_level") or "unknown") or "unknown"
+        buckets[key] = buckets.get(key, 0) + 1
+    labels = sorted(buckets.keys())
+    return {
+        "id": "section3-progress-levels",
+        "title": "Section III Progress Levels",
+        "spec": {
+            "data": [{"type": "bar", "x": labels, "y": [buckets[label] for label in labels], "marker": {"color": "#2c7a5a"}}],
+            "layout": {"margin": {"l": 40, "r": 20, "t": 40, "b": 40}, "height": 300},
+            "config": {"displayModeBar": False, "responsive": True},
+        },
+    }
+
+
+def _target_status_chart(rows):
+    labels = []
+    values = []
+    for row in rows[:12]:
+        labels.append(_safe_text(row.get("framework_target_code") or row.get("target_code") or "target"))
+        values.append(1 if _safe_text(row.get("progress_level")).lower() in {"on_track", "achieved"} else 0)
+    return {
+        "id": "section4-target-status",
+        "title": "Section IV Target Status (On-track=1)",
+        "spec": {
+            "data": [{"type": "scatter", "mode": "lines+markers", "x": labels, "y": values, "line": {"color": "#15506c"}}],
+            "layout": {"margin": {"l": 40, "r": 20, "t": 40, "b": 60}, "height": 320},
+            "config": {"displayModeBar": False, "responsive": True},
+        },
+    }
+
+
+def _completion_chart(section_code, payload):
+    filled = 0
+    total = 0
+    for key, value in payload.items():
+        if key.startswith("_"):
+            continue
+        total += 1
+        if isinstance(value, (list, dict)):
+            filled += 1 if value else 0
+        elif _safe_text(value):
+            filled += 1
+    return {
+        "id": f"{section_code}-completion",
+        "title": "Structured Field Completion",
+        "spec": {
+            "data": [
+                {
+                    "type": "pie",
+                    "labels": ["Completed", "Missing"],
+                    "values": [filled, max(total - filled, 0)],
+                    "marker": {"colors": ["#1f7a4d", "#d8e8dd"]},
+                    "textinfo": "label+percent",
+                }
+            ],
+            "layout": {"margin": {"l": 20, "r": 20, "t": 40, "b": 20}, "height": 280},
+            "config": {"displayModeBar": False, "responsive": True},
+        },
+    }
+
+
+def build_section_charts(section_code, payload):
+    """Charts computed from a section's response payload alone."""
+
+    payload = payload or {}
+    if section_code == "section-iii":
+        return [_progress_level_chart(payload.get("target_progress_rows") or [])]
+    if section_code == "section-iv":
+        return [_target_status_chart(payload.get("target_progress_rows") or [])]
+    return [_completion_chart(section_code, payload)]
+
+
+def _codes_from(value):
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    if isinstance(value, dict):
+        code = value.get("indicator_code") or value.get("code")
+        return [str(code).strip()] if code else []
+    if isinstance(value, list):
+        return [code for item in value for code in _codes_from(item)]
+    return []
+
+
+def linked_indicator_codes(payload):
+    """Indicator codes referenced by ``*indicator_codes`` fields and ``indicator_links`` table cells."""
+
+    codes = set()
+    for key, value in (payload or {}).items():
+        if key.endswith("indicator_codes"):
+            codes.update(_codes_from(value))
+        elif isinstance(value, list):
+            for row in value:
+                if not isinstance(row, dict):
+                    continue
+                for row_key in ("linked_indicator_codes", "indicator_links", "indicator_codes"):
+                    codes.update(_codes_from(row.get(row_key)))
+    return sorted(codes)[:INDICATOR_CHART_LIMIT]
+
+
+def _indicator_series(codes, user, instance):
+    """
+    Yearly means per data series of ``codes``, over the points ``user`` may see for ``instance``.
+
+    Each series becomes its own trace so values in different units are never
+    averaged together.
+    """
+
+    charts = {}
+    if not codes:
+        return charts
+    points = filter_indicator_data_points_for_user(
+        IndicatorDataPoint.objects.filter(series__indicator__code__in=codes, value_numeric__isnull=False),
+        user,
+        instance,
+    )
+    rows = (
+        points.values(
+            "series_id",
+            "series__title",
+            "series__unit",
+            "series__indicator__code",
+            "series__indicator__title",
+            "year",
+        )
+        .annotate(value=Avg("value_numeric"))
+        .order_by("series__indicator__code", "series__title", "series_id", "year")
+    )
+    for row in rows:
+        chart = charts.setdefault(
+            row["series__indicator__code"],
+            {"title": row["series__indicator__title"], "series": {}},
+        )
+        name = row["series__title"] or row["series__indicator__code"]
+        if row["series__unit"]:
+            name = f"{name} ({row['series__unit']})"
+        trace = chart["series"].setdefault(row["series_id"], {"name": name, "x": [], "y": []})
+        trace["x"].append(row["year"])
+        trace["y"].append(float(row["value"]))
+    return charts
+
+
+def _indicator_chart(section_code, code, entry):
+    return {
+        "id": f"{section_code}-indicator-{code}",
+        "title": f"{code}: {entry['title']} (mean of reported values per series)",
+        "indicator_code": code,
+        "spec": {
+            "data": [
+                {"type": "scatter", "mode": "lines+markers", "name": trace["name"], "x": trace["x"], "y": trace["y"]}
+                for trace in entry["series"].values()
+            ],
+            "layout": {"margin": {"l": 40, "r": 20, "t": 40, "b": 40}, "height": 300},
+            "config": {"displayModeBar": False, "responsive": True},
+        },
+    }
+
+
+def _chart_row(instance_id, section_code, payload):
+    return ReportSectionChartData(
+        reporting_instance_id=instance_id,
+        section_code=section_code,
+        content_hash=payload_hash(payload or {}),
+        charts_json=build_section_charts(section_code, payload),
+        linked_indicator_codes=linked_indicator_codes(payload),
+    )
+
+
+def refresh_section_chart_row(response):
+    """
+    Store the chart data of one section response; called when the response is saved.
+
+    The row is rebuilt only when the hash of the response payload changed
+    since it was stored. Indicator data is not stored: it is read per user by
+    ``visible_section_charts``.
+    """
+
+    row = _chart_row(response.reporting_instance_id, response.section.code, response.response_json)
+    stored = ReportSectionChartData.objects.filter(
+        reporting_instance_id=row.reporting_instance_id,
+        section_code=row.section_code,
+        content_hash=row.content_hash,
+    )
+    if stored.exists():
+        return False
+    ReportSectionChartData.objects.bulk_create(
+        [row],
+        update_conflicts=True,
+        unique_fields=["reporting_instance", "section_code"],
+        update_fields=CHART_DATA_FIELDS,
+    )
+    return True
+
+
+def section_chart_data(*, instance, pack, section_codes=None):
+    """
+    Read-only ``{section_code: ReportSectionChartData}`` for the active sections of ``pack``.
+
+    A section whose stored row is missing or older than its payload (for
+    example after a queryset update that skipped the save signal) is built in
+    memory for this read and not written.
+    """
+
+    sections = pack.sections.filter(is_active=True)
+    if section_codes is not None:
+        sections = sections.filter(code__in=section_codes)
+    codes = list(sections.order_by("ordering", "code").values_list("code", flat=True))
+    payloads = dict(
+        ReportTemplatePackResponse.objects.filter(
+            reporting_instance=instance,
+            section__pack=pack,
+            section__code__in=codes,
+        ).values_list("section__code", "response_json")
+    )
+    stored = {
+        row.section_code: row
+        for row in ReportSectionChartData.objects.filter(reporting_instance=instance, section_code__in=codes)
+    }
+    chart_data = {}
+    for code in codes:
+        row = stored.get(code)
+        if row is None or row.content_hash != payload_hash(payloads.get(code) or {}):
+            row = _chart_row(instance.id, code, payloads.get(code))
+        chart_data[code] = row
+    return chart_data
+
+
+def visible_section_charts(chart_data, user, instance):
+    """
+    ``{section_code: charts}``: each section's charts plus charts of its linked indicators.
+
+    Indicator charts are built at read time from the data points ``user``
+    may see for ``instance`` (series ABAC, IPLC consent and dataset-release
+    visibility), in one query for every section of ``chart_data``.
+    """
+
+    codes = sorted({code for row in chart_data.values() for code in (row.linked_indicator_codes or [])})
+    if codes:
+        codes = list(
+            filter_queryset_for_user(
+                Indicator.objects.filter(code__in=codes),
+                user,
+                perm="nbms_app.view_indicator",
+            ).values_list("code", flat=True)
+        )
+    series = _indicator_series(codes, user, instance)
+    return {
+        section_code: list(row.charts_json or [])
+        + [
+            _indicator_chart(section_code, code, series[code])
+            for code in (row.linked_indicator_codes or [])
+            if code in series
+        ]
+        for section_code, row in chart_data.items()
+    }
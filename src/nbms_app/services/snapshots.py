@@ -1,15 +1,23 @@
 import hashlib
 import json
+from collections import Counter, defaultdict
+from datetime import timedelta
 
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.utils import timezone
 
 from nbms_app.exports.ort_nr7_v2 import build_ort_nr7_v2_payload
-from nbms_app.models import ReportingSnapshot
+from nbms_app.models import ReportingSnapshot, ReportingSnapshotBlob
+from nbms_app.services.audit import suppress_audit_events
 from nbms_app.services.authorization import is_system_admin
-from nbms_app.services.readiness import compute_release_readiness_report
+from nbms_app.services.export_context import ExportBuildContext
 
 
 SNAPSHOT_TYPE_NR7_V2 = "NR7_V2_EXPORT"
+SNAPSHOT_MANIFEST_FORMAT = "chunked-v1"
+# Unreferenced chunks younger than this may belong to a snapshot still being stored.
+SNAPSHOT_BLOB_GRACE_PERIOD = timedelta(hours=1)
 
 
 class _StrictUserProxy:
@@ -53,8 +61,9 @@ def _hash_payload(payload):
 
 def create_reporting_snapshot(*, instance, user, note=None):
     export_user = _strict_user(user)
-    payload = build_ort_nr7_v2_payload(instance=instance, user=export_user)
-    readiness_report, summary = compute_release_readiness_report(instance)
+    context = ExportBuildContext(instance, export_user)
+    payload = build_ort_nr7_v2_payload(instance=instance, user=export_user, context=context)
+    readiness_report, summary = context.release_readiness()
     payload_hash = _hash_payload(payload)
 
     existing = ReportingSnapshot.objects.filter(
@@ -67,7 +76,8 @@ def create_reporting_snapshot(*, instance, user, note=None):
     return ReportingSnapshot.objects.create(
         reporting_instance=instance,
         snapshot_type=SNAPSHOT_TYPE_NR7_V2,
-        payload_json=payload,
+        payload_json=None,
+        payload_manifest_json=store_snapshot_payload(payload),
         payload_hash=payload_hash,
         exporter_schema=payload.get("schema", ""),
         exporter_version=payload.get("exporter_version", ""),
@@ -83,9 +93,31 @@ def _stable_json(value):
     return json.dumps(value or {}, sort_keys=True, ensure_ascii=True, separators=(",", ":"))
 
 
+def _identity_key(identity):
+    return "" if identity is None else str(identity)
+
+
+def _keyed_items(items, key):
+    """
+    Map ``items`` by ``key`` without letting colliding rows overwrite each other.
+
+    The second and later rows sharing an identity (a missing identity counts
+    as ``""``) are keyed ``identity#2``, ``identity#3``, ... in payload order,
+    so their changes still show up in the diff.
+    """
+
+    keyed = {}
+    seen = Counter()
+    for item in items or []:
+        identity = _identity_key(key(item))
+        seen[identity] += 1
+        keyed[identity if seen[identity] == 1 else f"{identity}#{seen[identity]}"] = item
+    return keyed
+
+
 def _diff_sections(a_sections, b_sections):
-    a_map = {section.get("code"): section for section in a_sections or []}
-    b_map = {section.get("code"): section for section in b_sections or []}
+    a_map = _keyed_items(a_sections, lambda section: section.get("code"))
+    b_map = _keyed_items(b_sections, lambda section: section.get("code"))
 
     added = sorted([code for code in b_map if code not in a_map])
     removed = sorted([code for code in a_map if code not in b_map])
@@ -105,8 +137,8 @@ def _progress_key(entry, kind):
 
 
 def _diff_progress_entries(a_entries, b_entries, kind):
-    a_map = {(_progress_key(entry, kind)): entry for entry in a_entries or []}
-    b_map = {(_progress_key(entry, kind)): entry for entry in b_entries or []}
+    a_map = _keyed_items(a_entries, lambda entry: _progress_key(entry, kind))
+    b_map = _keyed_items(b_entries, lambda entry: _progress_key(entry, kind))
 
     added = sorted([key for key in b_map if key not in a_map])
     removed = sorted([key for key in a_map if key not in b_map])
@@ -141,8 +173,8 @@ def _series_identity(series):
 
 
 def _diff_indicator_series(a_series, b_series):
-    a_map = {item.get("uuid"): item for item in a_series or []}
-    b_map = {item.get("uuid"): item for item in b_series or []}
+    a_map = _keyed_items(a_series, lambda item: item.get("uuid"))
+    b_map = _keyed_items(b_series, lambda item: item.get("uuid"))
 
     added = sorted([_series_identity(b_map[key]) for key in b_map if key not in a_map])
     removed = sorted([_series_identity(a_map[key]) for key in a_map if key not in b_map])
@@ -205,8 +237,8 @@ def _binary_key(item):
 
 
 def _diff_binary_responses(a_items, b_items):
-    a_map = {(_binary_key(item)): item for item in a_items or []}
-    b_map = {(_binary_key(item)): item for item in b_items or []}
+    a_map = _keyed_items(a_items, _binary_key)
+    b_map = _keyed_items(b_items, _binary_key)
 
     added = sorted([key for key in b_map if key not in a_map])
     removed = sorted([key for key in a_map if key not in b_map])
@@ -224,6 +256,189 @@ def _diff_binary_responses(a_items, b_items):
     return {"added": added, "removed": removed, "modified": modified}
 
 
+# Payload lists stored as one blob per item, with the identity each diff helper keys items by.
+CHUNKED_PAYLOAD_KEYS = {
+    "sections": lambda item: item.get("code"),
+    "section_iii_progress": lambda item: _progress_key(item, "iii"),
+    "section_iv_progress": lambda item: _progress_key(item, "iv"),
+    "indicator_data_series": lambda item: item.get("uuid"),
+    "binary_indicator_data": _binary_key,
+}
+
+
+def _blob_entry(kind, value):
+    text = _canonical_json(value)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest(), (kind, value, len(text))
+
+
+def store_snapshot_payload(payload):
+    """
+    Split ``payload`` into content-addressed blobs and return its manifest.
+
+    Each item of the ``CHUNKED_PAYLOAD_KEYS`` lists becomes its own blob and
+    the remaining keys form a root blob, so sections and series that did not
+    change between snapshots are stored once and shared.
+    """
+
+    blobs = {}
+    chunks = {}
+    root = dict(payload)
+    for key, identity in CHUNKED_PAYLOAD_KEYS.items():
+        items = root.get(key)
+        if not isinstance(items, list):
+            continue
+        del root[key]
+        refs = []
+        for item in items:
+            digest, entry = _blob_entry(key, item)
+            blobs.setdefault(digest, entry)
+            refs.append([identity(item) if isinstance(item, dict) else None, digest])
+        chunks[key] = refs
+    root_hash, root_entry = _blob_entry("root", root)
+    blobs.setdefault(root_hash, root_entry)
+
+    # Finding the chunks that are already stored also touches them, so
+    # ``prune_snapshot_blobs`` does not delete a chunk this snapshot reuses.
+    table = connection.ops.quote_name(ReportingSnapshotBlob._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET updated_at = NOW() WHERE content_hash = ANY(%s) RETURNING content_hash",
+            [list(blobs)],
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+    ReportingSnapshotBlob.objects.bulk_create(
+        [
+            ReportingSnapshotBlob(content_hash=digest, kind=kind, content_json=value, size_bytes=size)
+            for digest, (kind, value, size) in blobs.items()
+            if digest not in existing
+        ],
+        batch_size=500,
+        ignore_conflicts=True,
+    )
+    return {
+        "format": SNAPSHOT_MANIFEST_FORMAT,
+        "root": root_hash,
+        "keys": list(payload.keys()),
+        "chunks": chunks,
+    }
+
+
+def _load_blobs(hashes):
+    hashes = set(hashes)
+    blobs = dict(
+        ReportingSnapshotBlob.objects.filter(content_hash__in=list(hashes)).values_list("content_hash", "content_json")
+    )
+    if hashes - set(blobs):
+        raise ValidationError("Snapshot payload references missing stored chunks.")
+    return blobs
+
+
+def _assemble_payload(manifest, blobs, identities=None):
+    content = dict(blobs[manifest["root"]])
+    for key, refs in (manifest.get("chunks") or {}).items():
+        wanted = None if identities is None else identities.get(key, set())
+        content[key] = [
+            blobs[digest] for identity, digest in refs if wanted is None or _identity_key(identity) in wanted
+        ]
+    order = {key: index for index, key in enumerate(manifest.get("keys") or [])}
+    return dict(sorted(content.items(), key=lambda item: order.get(item[0], len(order))))
+
+
+def snapshot_payload(snapshot):
+    manifest = snapshot.payload_manifest_json or {}
+    if not manifest.get("root"):
+        return snapshot.payload_json or {}
+    hashes = [manifest["root"]]
+    for refs in (manifest.get("chunks") or {}).values():
+        hashes.extend(digest for _identity, digest in refs)
+    return _assemble_payload(manifest, _load_blobs(hashes))
+
+
+def snapshot_chunk_counts(snapshot):
+    manifest = snapshot.payload_manifest_json or {}
+    if manifest.get("root"):
+        chunks = manifest.get("chunks") or {}
+        return {key: len(chunks.get(key) or []) for key in CHUNKED_PAYLOAD_KEYS}
+    payload = snapshot.payload_json or {}
+    return {key: len(payload.get(key) or []) for key in CHUNKED_PAYLOAD_KEYS}
+
+
+def _digests_by_identity(refs):
+    digests = defaultdict(list)
+    for identity, digest in refs:
+        digests[_identity_key(identity)].append(digest)
+    return digests
+
+
+def prune_snapshot_blobs(*, older_than=None):
+    """
+    Delete stored chunks that no snapshot manifest references; returns how many were deleted.
+
+    Chunks written or reused within ``SNAPSHOT_BLOB_GRACE_PERIOD`` (or after
+    ``older_than``) are kept, since a snapshot being created stores its
+    chunks before its manifest.
+    """
+
+    if older_than is None:
+        older_than = timezone.now() - SNAPSHOT_BLOB_GRACE_PERIOD
+    referenced = set()
+    manifests = ReportingSnapshot.objects.values_list("payload_manifest_json", flat=True)
+    for manifest in manifests.iterator():
+        if not (manifest or {}).get("root"):
+            continue
+        referenced.add(manifest["root"])
+        for refs in (manifest.get("chunks") or {}).values():
+            referenced.update(digest for _identity, digest in refs)
+
+    candidates = ReportingSnapshotBlob.objects.filter(updated_at__lt=older_than).values_list("id", "content_hash")
+    unreferenced = [blob_id for blob_id, digest in candidates.iterator() if digest not in referenced]
+    with suppress_audit_events():
+        deleted, _counts = ReportingSnapshotBlob.objects.filter(id__in=unreferenced).delete()
+    return deleted
+
+
+def diff_snapshot_records(snapshot_a, snapshot_b):
+    """
+    Diff two stored snapshots, loading only the chunks whose hashes differ.
+
+    Identities whose rows have the same hashes in the same order in both
+    snapshots cannot produce a change, so they are left out of the payloads
+    handed to ``diff_snapshots``; every row of any other identity, including
+    colliding and missing identities, is loaded. Snapshots stored before
+    chunking fall back to a full payload diff.
+    """
+
+    manifest_a = snapshot_a.payload_manifest_json or {}
+    manifest_b = snapshot_b.payload_manifest_json or {}
+    if not (manifest_a.get("root") and manifest_b.get("root")):
+        return diff_snapshots(snapshot_payload(snapshot_a), snapshot_payload(snapshot_b))
+
+    identities = {}
+    hashes = {manifest_a["root"], manifest_b["root"]}
+    chunks_a = manifest_a.get("chunks") or {}
+    chunks_b = manifest_b.get("chunks") or {}
+    for key in set(chunks_a) | set(chunks_b):
+        refs_a = chunks_a.get(key) or []
+        refs_b = chunks_b.get(key) or []
+        digests_a = _digests_by_identity(refs_a)
+        digests_b = _digests_by_identity(refs_b)
+        changed = {
+            identity
+            for identity in set(digests_a) | set(digests_b)
+            if digests_a.get(identity) != digests_b.get(identity)
+        }
+        identities[key] = changed
+        hashes.update(
+            digest for identity, digest in [*refs_a, *refs_b] if _identity_key(identity) in changed
+        )
+
+    blobs = _load_blobs(hashes)
+    return diff_snapshots(
+        _assemble_payload(manifest_a, blobs, identities),
+        _assemble_payload(manifest_b, blobs, identities),
+    )
+
+
 def diff_snapshots(a_payload, b_payload):
     if not a_payload or not b_payload:
         raise ValidationError("Both snapshots are required for diffing.")
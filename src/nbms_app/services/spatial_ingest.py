@@ -10,8 +10,15 @@ from django.conf import settings
 from django.db import connection
 from django.utils import timezone
 
-from nbms_app.models import SpatialIngestionRun, SpatialIngestionStatus, SpatialLayer, SpatialLayerSourceType
+from nbms_app.models import (
+    SpatialFeature,
+    SpatialIngestionRun,
+    SpatialIngestionStatus,
+    SpatialLayer,
+    SpatialLayerSourceType,
+)
 from nbms_app.services.audit import record_audit_event
+from nbms_app.services.input_versions import bump_input_versions_for
 from nbms_app.spatial_fields import GIS_ENABLED
 
 
@@ -295,6 +302,7 @@ def ingest_spatial_file(
             cursor.execute(insert_sql, [layer.id, geom_col, geom_col, *filter_params])
             inserted = cursor.rowcount
             cursor.execute(f"DROP TABLE IF EXISTS {tmp_table}")
+        bump_input_versions_for(SpatialFeature, scope_ids=[layer.id])
 
         run.status = SpatialIngestionStatus.SUCCEEDED
         run.rows_ingested = max(0, inserted)
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from nbms_app.models import SpatialFeature, SpatialLayer, SpatialOverlayCache, SpatialOverlayCacheUnit
+from nbms_app.services.input_versions import get_input_versions
+from nbms_app.spatial_fields import GIS_ENABLED
+
+
+logger = logging.getLogger(__name__)
+
+PROVINCE_LAYER_CODES = ["ZA_PROVINCES_NE", "ZA_PROVINCES"]
+PROTECTED_LAYER_CODES = ["ZA_PROTECTED_AREAS_NE", "ZA_PROTECTED_AREAS"]
+
+
+def active_layer(layer_codes):
+    return SpatialLayer.objects.filter(layer_code__in=layer_codes, is_active=True).order_by("id").first()
+
+
+def _subdivide_vertices():
+    return max(8, int(getattr(settings, "SPATIAL_OVERLAY_SUBDIVIDE_VERTICES", 256) or 256))
+
+
+def _feature_geom_sql(alias):
+    return (
+        f"COALESCE({alias}.geom, "
+        f"CASE WHEN {alias}.geometry_json ? 'type' "
+        f"THEN ST_SetSRID(ST_GeomFromGeoJSON({alias}.geometry_json::text), 4326) END)"
+    )
+
+
+def overlay_inputs_hash(admin_layer, overlay_layer):
+    """
+    Key of the overlay between two layers' current contents.
+
+    Changes when either layer is re-ingested (a new ``latest_ingestion_run``)
+    or its features are otherwise rewritten (its ``spatial_feature`` input
+    version), and between PostGIS and property-based computation.
+    """
+
+    versions = get_input_versions([("spatial_feature", admin_layer.id), ("spatial_feature", overlay_layer.id)])
+    payload = {
+        "mode": "postgis" if GIS_ENABLED else "properties",
+        "admin": [admin_layer.id, admin_layer.latest_ingestion_run_id, versions[("spatial_feature", admin_layer.id)]],
+        "overlay": [
+            overlay_layer.id,
+            overlay_layer.latest_ingestion_run_id,
+            versions[("spatial_feature", overlay_layer.id)],
+        ],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _compute_postgis(cache):  # pragma: no cover - requires PostGIS
+    cache_table = connection.ops.quote_name(SpatialOverlayCache._meta.db_table)
+    unit_table = connection.ops.quote_name(SpatialOverlayCacheUnit._meta.db_table)
+    feature_table = connection.ops.quote_name(SpatialFeature._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {cache_table} c
+            SET overlay_geom = u.geom,
+                overlay_area_km2 = ROUND(COALESCE(ST_Area(u.geom::geography) / 1000000.0, 0)::numeric, 6)
+            FROM (
+                SELECT ST_UnaryUnion(ST_Collect({_feature_geom_sql("sf")})) AS geom
+                FROM {feature_table} sf
+                WHERE sf.layer_id = %s
+            ) u
+            WHERE c.id = %s
+            """,
+            [cache.overlay_layer_id, cache.id],
+        )
+        # Intersect each unit with small pieces of the dissolved overlay; the
+        # pieces do not overlap, so their intersection areas add up exactly.
+        cursor.execute(
+            f"""
+            INSERT INTO {unit_table} (
+                cache_id, unit_code, unit_name, unit_area_km2, overlay_area_km2, created_at, updated_at
+            )
+            WITH units AS (
+                SELECT
+                    COALESCE(NULLIF(sf.province_code, ''), sf.feature_key, sf.feature_id, 'UNKNOWN') AS unit_code,
+                    COALESCE(NULLIF(sf.name, ''), sf.feature_key, sf.feature_id, 'Unknown') AS unit_name,
+                    {_feature_geom_sql("sf")} AS geom
+                FROM {feature_table} sf
+                WHERE sf.layer_id = %s
+            ),
+            pieces AS (
+                SELECT ST_Subdivide(ST_CollectionExtract(c.overlay_geom, 3), %s) AS geom
+                FROM {cache_table} c
+                WHERE c.id = %s AND c.overlay_geom IS NOT NULL
+            )
+            SELECT
+                %s,
+                u.unit_code,
+                u.unit_name,
+                ROUND((ST_Area(u.geom::geography) / 1000000.0)::numeric, 6),
+                ROUND(
+                    COALESCE(
+                        (
+                            SELECT SUM(ST_Area(ST_Intersection(u.geom, p.geom)::geography))
+                            FROM pieces p
+                            WHERE ST_Intersects(u.geom, p.geom)
+                        ),
+                        0
+                    )::numeric / 1000000.0,
+                    6
+                ),
+                NOW(),
+                NOW()
+            FROM units u
+            WHERE u.geom IS NOT NULL
+            """,
+            [cache.admin_layer_id, _subdivide_vertices(), cache.id, cache.id],
+        )
+
+
+def _property_area_km2(props):
+    if props.get("area_km2") is not None:
+        return float(props["area_km2"])
+    if props.get("area_ha") is not None:
+        return float(props["area_ha"]) / 100.0
+    return None
+
+
+def _compute_from_properties(cache):
+    """Without PostGIS, sum the area properties recorded on overlay features per province code."""
+
+    overlay_by_unit = {}
+    for item in SpatialFeature.objects.filter(layer_id=cache.overlay_layer_id).order_by("province_code", "feature_key"):
+        area_km2 = _property_area_km2(item.properties or item.properties_json or {})
+        if area_km2 is None:
+            continue
+        key = item.province_code or "UNKNOWN"
+        overlay_by_unit[key] = overlay_by_unit.get(key, 0.0) + area_km2
+    units = []
+    for item in SpatialFeature.objects.filter(layer_id=cache.admin_layer_id).order_by("province_code", "feature_key"):
+        props = item.properties or item.properties_json or {}
+        key = item.province_code or "UNKNOWN"
+        units.append(
+            SpatialOverlayCacheUnit(
+                cache=cache,
+                unit_code=key,
+                unit_name=item.name or key,
+                unit_area_km2=Decimal(str(round(float(props.get("area_km2") or 0.0), 6))),
+                overlay_area_km2=Decimal(str(round(overlay_by_unit.get(key, 0.0), 6))),
+            )
+        )
+    SpatialOverlayCacheUnit.objects.bulk_create(units, batch_size=500)
+    SpatialOverlayCache.objects.filter(pk=cache.pk).update(
+        overlay_area_km2=Decimal(str(round(sum(overlay_by_unit.values()), 6)))
+    )
+
+
+def get_overlay_cache(admin_layer, overlay_layer):
+    """
+    The overlay of ``overlay_layer`` on the units of ``admin_layer``, recomputed only when stale.
+
+    The dissolved overlay geometry and per-unit intersection areas are shared
+    by every caller (indicator methods, registry marts); a caller finding the
+    entry stale recomputes it under a row lock so concurrent callers wait for
+    and reuse that result.
+    """
+
+    inputs_hash = overlay_inputs_hash(admin_layer, overlay_layer)
+    caches = SpatialOverlayCache.objects.defer("overlay_geom")
+    cache = caches.filter(admin_layer=admin_layer, overlay_layer=overlay_layer).first()
+    if cache is not None and cache.inputs_hash == inputs_hash:
+        return cache
+    with transaction.atomic():
+        SpatialOverlayCache.objects.bulk_create(
+            [SpatialOverlayCache(admin_layer=admin_layer, overlay_layer=overlay_layer)],
+            ignore_conflicts=True,
+        )
+        cache = caches.select_for_update().get(admin_layer=admin_layer, overlay_layer=overlay_layer)
+        if cache.inputs_hash == inputs_hash:
+            return cache
+        started = time.monotonic()
+        unit_table = connection.ops.quote_name(SpatialOverlayCacheUnit._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {unit_table} WHERE cache_id = %s", [cache.id])
+        if GIS_ENABLED:
+            _compute_postgis(cache)
+        else:
+            _compute_from_properties(cache)
+        duration_ms = int((time.monotonic() - started) * 1000)
+        SpatialOverlayCache.objects.filter(pk=cache.pk).update(
+            admin_ingestion_run_id=admin_layer.latest_ingestion_run_id,
+            overlay_ingestion_run_id=overlay_layer.latest_ingestion_run_id,
+            inputs_hash=inputs_hash,
+            computed_at=timezone.now(),
+            duration_ms=duration_ms,
+            updated_at=timezone.now(),
+        )
+        logger.info(
+            "Recomputed spatial overlay %s x %s in %sms.",
+            admin_layer.layer_code,
+            overlay_layer.layer_code,
+            duration_ms,
+        )
+    cache.refresh_from_db()
+    return cache
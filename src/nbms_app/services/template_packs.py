@@ -1,8 +1,5 @@
 from __future__ import annotations
 
-from io import BytesIO
-
-from django.core.exceptions import ValidationError
 from django.template.loader import render_to_string
 from django.utils import timezone
 
@@ -16,6 +13,8 @@ from nbms_app.models import (
 )
 from nbms_app.services.authorization import filter_queryset_for_user
 from nbms_app.services.catalog_access import filter_monitoring_programmes_for_user
+from nbms_app.services.pdf_rendering import render_pdf_bytes
+from nbms_app.services.render_cache import cached_render
 
 
 def _normalise_multivalue(value):
@@ -293,12 +292,10 @@ def build_pack_validation(*, pack: ReportTemplatePack, instance, user):
     }
 
 
-def render_pack_pdf_bytes(*, pack: ReportTemplatePack, instance, user):
-    try:
-        from xhtml2pdf import pisa  # noqa: WPS433
-    except Exception as exc:  # noqa: BLE001
-        raise ValidationError(f"PDF renderer dependency missing: {exc}") from exc
+TEMPLATE_PACK_PDF_TEMPLATE = "nbms_app/reporting/template_pack_pdf.html"
+
 
+def render_pack_pdf_bytes(*, pack: ReportTemplatePack, instance, user):
     validation = build_pack_validation(pack=pack, instance=instance, user=user)
     sections = pack.sections.filter(is_active=True).order_by("ordering", "code")
     responses = {
@@ -356,11 +353,20 @@ def render_pack_pdf_bytes(*, pack: ReportTemplatePack, instance, user):
         "instance": instance,
         "sections": rendered_sections,
         "validation": validation,
-        "generated_at": timezone.now(),
     }
-    html = render_to_string("nbms_app/reporting/template_pack_pdf.html", context)
-    output = BytesIO()
-    result = pisa.CreatePDF(src=html, dest=output, encoding="utf-8")
-    if result.err:
-        raise ValidationError("Failed to render template pack PDF output.")
-    return output.getvalue()
+    return cached_render(
+        kind="template_pack_pdf",
+        renderer="pdf",
+        template_name=TEMPLATE_PACK_PDF_TEMPLATE,
+        payload={
+            "pack": {"code": pack.code, "updated_at": pack.updated_at},
+            "instance": {"uuid": str(instance.uuid), "updated_at": instance.updated_at},
+            "sections": rendered_sections,
+            "validation": validation,
+        },
+        content_type="application/pdf",
+        render=lambda generated_at: render_pdf_bytes(
+            render_to_string(TEMPLATE_PACK_PDF_TEMPLATE, {**context, "generated_at": generated_at}),
+            error_message="Failed to render template pack PDF output.",
+        ),
+    )
@@ -1,10 +1,41 @@
 from django.contrib.auth.models import Group
-from django.db.models.signals import post_save
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 from guardian.shortcuts import assign_perm
 
-from nbms_app.models import Dataset, DatasetRelease, Evidence, Indicator, NationalTarget
+from nbms_app.models import (
+    AlienTaxonProfile,
+    AnnexSectionResponse,
+    BinaryIndicatorResponse,
+    ConsentRecord,
+    Dataset,
+    DatasetRelease,
+    EcosystemType,
+    Evidence,
+    Indicator,
+    IndicatorDataPoint,
+    IndicatorFrameworkIndicatorLink,
+    IndicatorInputRequirement,
+    IndicatorMethodProfile,
+    InstanceExportApproval,
+    NationalTarget,
+    NationalTargetFrameworkTargetLink,
+    ReportTemplatePackResponse,
+    ReportWorkflowAction,
+    ReportWorkflowInstance,
+    ReportWorkflowSectionApproval,
+    SectionIIINationalTargetProgress,
+    SectionIVFrameworkTargetProgress,
+    SpatialFeature,
+    TaxonConcept,
+)
 from nbms_app.services.authorization import ROLE_DATA_STEWARD, ROLE_SECRETARIAT
+from nbms_app.services.indicator_explorer import refresh_explorer_index_for_series, refresh_indicator_explorer_index
+from nbms_app.services.input_versions import bump_input_versions_for
+from nbms_app.services.reporting_workspace import bump_workspace_version
+from nbms_app.services.search_index import ENTITY_TYPE_BY_MODEL, delete_search_documents, refresh_search_documents_for
+from nbms_app.services.section_charts import refresh_section_chart_row
 
 
 def _assign_perms_to_groups(obj, perm_base):
@@ -58,3 +89,159 @@ def grant_datasetrelease_perms(sender, instance, created, **kwargs):
         return
     _assign_perms_to_creator(instance, "datasetrelease")
     _assign_perms_to_groups(instance, "datasetrelease")
+
+
+@receiver(post_save, sender=ReportTemplatePackResponse)
+@receiver(post_delete, sender=ReportTemplatePackResponse)
+@receiver(post_save, sender=AnnexSectionResponse)
+@receiver(post_delete, sender=AnnexSectionResponse)
+@receiver(post_save, sender=ReportWorkflowInstance)
+@receiver(post_delete, sender=ReportWorkflowInstance)
+@receiver(post_save, sender=InstanceExportApproval)
+@receiver(post_delete, sender=InstanceExportApproval)
+@receiver(post_save, sender=SectionIIINationalTargetProgress)
+@receiver(post_delete, sender=SectionIIINationalTargetProgress)
+@receiver(post_save, sender=SectionIVFrameworkTargetProgress)
+@receiver(post_delete, sender=SectionIVFrameworkTargetProgress)
+def invalidate_workspace_for_instance(sender, instance, **kwargs):
+    bump_workspace_version(instance.reporting_instance_id)
+
+
+@receiver(post_save, sender=ReportTemplatePackResponse)
+def store_section_chart_data(sender, instance, **kwargs):
+    refresh_section_chart_row(instance)
+
+
+@receiver(post_save, sender=ReportWorkflowSectionApproval)
+@receiver(post_delete, sender=ReportWorkflowSectionApproval)
+@receiver(post_save, sender=ReportWorkflowAction)
+@receiver(post_delete, sender=ReportWorkflowAction)
+def invalidate_workspace_for_workflow(sender, instance, **kwargs):
+    workflow = ReportWorkflowInstance.objects.filter(pk=instance.workflow_instance_id)
+    bump_workspace_version(workflow.values("reporting_instance_id")[:1])
+
+
+@receiver(post_save, sender=IndicatorDataPoint)
+@receiver(post_delete, sender=IndicatorDataPoint)
+@receiver(post_save, sender=BinaryIndicatorResponse)
+@receiver(post_delete, sender=BinaryIndicatorResponse)
+@receiver(post_save, sender=SpatialFeature)
+@receiver(post_delete, sender=SpatialFeature)
+@receiver(post_save, sender=NationalTargetFrameworkTargetLink)
+@receiver(post_delete, sender=NationalTargetFrameworkTargetLink)
+@receiver(post_save, sender=IndicatorFrameworkIndicatorLink)
+@receiver(post_delete, sender=IndicatorFrameworkIndicatorLink)
+@receiver(post_save, sender=ConsentRecord)
+@receiver(post_delete, sender=ConsentRecord)
+def bump_input_table_versions(sender, instance, **kwargs):
+    bump_input_versions_for(sender, [instance])
+
+
+@receiver(post_save, sender=Indicator)
+def refresh_explorer_index_for_indicator(sender, instance, **kwargs):
+    refresh_indicator_explorer_index([instance.pk])
+
+
+@receiver(post_save, sender=IndicatorMethodProfile)
+@receiver(post_delete, sender=IndicatorMethodProfile)
+@receiver(post_save, sender=IndicatorFrameworkIndicatorLink)
+@receiver(post_delete, sender=IndicatorFrameworkIndicatorLink)
+@receiver(post_delete, sender=IndicatorInputRequirement)
+def refresh_explorer_index_for_related(sender, instance, **kwargs):
+    # Deletes may be part of the indicator's own cascade; only update existing rows then.
+    refresh_indicator_explorer_index([instance.indicator_id], create=kwargs["signal"] is post_save)
+
+
+@receiver(pre_save, sender=IndicatorDataPoint)
+def remember_spatial_point(sender, instance, **kwargs):
+    # The series a saved point was spatial in, so clearing its layer or unit (or moving it) refreshes that series too.
+    instance._spatial_series_before = None
+    if instance.pk and not kwargs.get("raw"):
+        instance._spatial_series_before = (
+            IndicatorDataPoint.objects.filter(pk=instance.pk)
+            .filter(Q(spatial_layer__isnull=False) | Q(spatial_unit__isnull=False))
+            .values_list("series_id", flat=True)
+            .first()
+        )
+
+
+@receiver(post_save, sender=IndicatorDataPoint)
+@receiver(post_delete, sender=IndicatorDataPoint)
+def refresh_explorer_index_for_spatial_point(sender, instance, **kwargs):
+    series_ids = {getattr(instance, "_spatial_series_before", None)}
+    if instance.spatial_layer_id or instance.spatial_unit_id:
+        series_ids.add(instance.series_id)
+    refresh_explorer_index_for_series(series_ids, create=kwargs["signal"] is post_save)
+
+
+@receiver(m2m_changed, sender=IndicatorInputRequirement.required_map_layers.through)
+def refresh_explorer_index_for_map_layers(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+    if not reverse:
+        refresh_indicator_explorer_index([instance.indicator_id])
+    elif pk_set:
+        requirements = IndicatorInputRequirement.objects.filter(pk__in=pk_set)
+        refresh_indicator_explorer_index(list(requirements.values_list("indicator_id", flat=True)))
+
+
+@receiver(post_save, sender=Indicator)
+@receiver(post_save, sender=NationalTarget)
+@receiver(post_save, sender=Dataset)
+@receiver(post_save, sender=TaxonConcept)
+@receiver(post_save, sender=EcosystemType)
+@receiver(post_save, sender=AlienTaxonProfile)
+def refresh_search_document(sender, instance, **kwargs):
+    refresh_search_documents_for(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Indicator)
+@receiver(post_delete, sender=NationalTarget)
+@receiver(post_delete, sender=Dataset)
+@receiver(post_delete, sender=TaxonConcept)
+@receiver(post_delete, sender=EcosystemType)
+@receiver(post_delete, sender=AlienTaxonProfile)
+def delete_search_document(sender, instance, **kwargs):
+    delete_search_documents(ENTITY_TYPE_BY_MODEL[sender], [instance.pk])
+
+
+_WORKSPACE_MODELS = (
+    ReportTemplatePackResponse,
+    AnnexSectionResponse,
+    ReportWorkflowInstance,
+    InstanceExportApproval,
+    SectionIIINationalTargetProgress,
+    SectionIVFrameworkTargetProgress,
+)
+
+
+def refresh_derived_rows(model, instances):
+    """
+    Do for bulk-written ``instances`` of ``model`` what the post_save receivers above do for one saved row.
+
+    ``bulk_create``, ``bulk_update`` and ``QuerySet.update`` send no
+    post_save, so bulk writers call this once per batch instead; it keeps
+    the version counters, explorer index, search documents and workspace
+    versions in step with the receivers.
+    """
+
+    instances = [obj for obj in instances if obj.pk is not None]
+    if not instances:
+        return
+    bump_input_versions_for(model, instances)
+    if model is Indicator:
+        refresh_indicator_explorer_index([obj.pk for obj in instances])
+    elif model in (IndicatorMethodProfile, IndicatorFrameworkIndicatorLink):
+        refresh_indicator_explorer_index([obj.indicator_id for obj in instances])
+    elif model is IndicatorDataPoint:
+        refresh_explorer_index_for_series(
+            {obj.series_id for obj in instances if obj.spatial_layer_id or obj.spatial_unit_id}
+        )
+    if model in ENTITY_TYPE_BY_MODEL:
+        refresh_search_documents_for(model, [obj.pk for obj in instances])
+    if model in _WORKSPACE_MODELS:
+        for reporting_instance_id in {obj.reporting_instance_id for obj in instances}:
+            bump_workspace_version(reporting_instance_id)
+    if model is ReportTemplatePackResponse:
+        for obj in instances:
+            refresh_section_chart_row(obj)
@@ -2,7 +2,7 @@ from django.apps import apps
 from django.db.models.signals import post_delete, post_save
 
 from nbms_app.models import AuditEvent
-from nbms_app.services.audit import audit_is_suppressed, record_event
+from nbms_app.services.audit import audit_is_suppressed, build_event, record_event
 from nbms_app.services.request_context import get_current_request
 
 
@@ -33,6 +33,25 @@ def _audit_save(sender, instance, created, **kwargs):
     record_event(actor, action, obj=instance, metadata=_base_metadata(instance), request=request)
 
 
+def audit_bulk_save(model, instances, created):
+    """Record the post_save audit events for rows written with bulk_create/bulk_update."""
+    if audit_is_suppressed() or not _should_audit_model(model):
+        return
+    request = get_current_request()
+    action = f"{'create' if created else 'update'}_{model.__name__.lower()}"
+    events = [
+        build_event(
+            _resolve_actor(instance, request),
+            action,
+            obj=instance,
+            metadata=_base_metadata(instance),
+            request=request,
+        )
+        for instance in instances
+    ]
+    AuditEvent.objects.bulk_create(events, batch_size=500)
+
+
 def _audit_delete(sender, instance, **kwargs):
     if audit_is_suppressed():
         return
@@ -26,7 +26,8 @@ from nbms_app.models import (
     SensitivityLevel,
     User,
 )
-from nbms_app.services.alignment_coverage import compute_alignment_coverage
+from nbms_app.services.alignment_bulk import bulk_archive_target_links
+from nbms_app.services.alignment_coverage import cached_alignment_coverage, compute_alignment_coverage
 from nbms_app.services.authorization import ROLE_DATA_STEWARD
 
 
@@ -445,3 +446,42 @@ def test_alignment_coverage_framework_breakdown():
     assert by_framework[0]["targets"]["distinct_framework_targets_used"] == 1
     assert by_framework[0]["indicators"]["mapped_links"] == 1
     assert by_framework[0]["indicators"]["distinct_framework_indicators_used"] == 1
+
+
+def test_cached_alignment_coverage_invalidated_by_link_changes(settings):
+    settings.ALIGNMENT_COVERAGE_CACHE_SECONDS = 300
+    org = Organisation.objects.create(name="Org A")
+    user = User.objects.create_user(username="user", password="pass1234", organisation=org)
+    instance = _create_instance()
+    target = NationalTarget.objects.create(
+        code="NT-CACHE",
+        title="Target",
+        organisation=org,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+    _approve(instance, target)
+    instance.refresh_from_db()
+    fw = Framework.objects.create(code="GBF", title="GBF", status=LifecycleStatus.PUBLISHED)
+    fw_target = FrameworkTarget.objects.create(
+        framework=fw,
+        code="T1",
+        title="Target 1",
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+
+    def mapped():
+        coverage = cached_alignment_coverage(user=user, instance=instance, scope="selected", include_details=False)
+        return coverage["summary"]["national_targets"]["mapped"]
+
+    assert mapped() == 0
+    link = NationalTargetFrameworkTargetLink.objects.create(national_target=target, framework_target=fw_target)
+    assert mapped() == 1
+
+    # Writes that bypass signals are served from the cache until the link version moves.
+    NationalTargetFrameworkTargetLink.objects.filter(pk=link.pk).update(is_active=False)
+    assert mapped() == 1
+    NationalTargetFrameworkTargetLink.objects.filter(pk=link.pk).update(is_active=True)
+    assert bulk_archive_target_links(user=user, links=[link]) == 1
+    assert mapped() == 0
@@ -4,7 +4,17 @@ import pytest
 from django.core.management import call_command
 from django.urls import reverse
 
-from nbms_app.models import IntegrationDataAsset, Organisation, ReportingCycle, ReportingInstance, User
+from nbms_app.integrations.birdie import ingest_birdie_snapshot
+from nbms_app.models import (
+    BirdieModelOutput,
+    BirdieSpecies,
+    IndicatorDataPoint,
+    IntegrationDataAsset,
+    Organisation,
+    ReportingCycle,
+    ReportingInstance,
+    User,
+)
 
 
 pytestmark = pytest.mark.django_db
@@ -54,3 +64,26 @@ def test_birdie_seed_and_dashboard_api(client):
 def test_birdie_dashboard_requires_auth(client):
     response = client.get(reverse("api_birdie_dashboard"))
     assert response.status_code in {401, 403}
+
+
+def test_birdie_ingest_skips_unchanged_records_on_rerun():
+    first = ingest_birdie_snapshot()
+    assert first["changes"]["species"] == {"inserted": 4, "updated": 0, "skipped": 0}
+    assert first["totals"]["updated"] == 0
+    output_count = BirdieModelOutput.objects.count()
+    point_count = IndicatorDataPoint.objects.filter(series__indicator__code__startswith="BIRDIE-").count()
+    assert point_count > 0
+
+    second = ingest_birdie_snapshot()
+    assert second["totals"]["inserted"] == 0
+    assert second["totals"]["updated"] == 0
+    assert second["totals"]["skipped"] == first["totals"]["inserted"]
+    assert BirdieModelOutput.objects.count() == output_count
+
+    species = BirdieSpecies.objects.get(species_code="ANAHER")
+    species.common_name = "Edited"
+    species.save()
+    third = ingest_birdie_snapshot()
+    assert third["changes"]["species"] == {"inserted": 0, "updated": 1, "skipped": 3}
+    species.refresh_from_db()
+    assert species.common_name == "Grey Heron"
@@ -26,6 +26,7 @@ from nbms_app.models import (
     SpatialLayerSourceType,
     User,
 )
+from nbms_app.services.download_records import stream_download_record_from_payload
 
 
 pytestmark = pytest.mark.django_db
@@ -110,6 +111,59 @@ def test_download_record_create_list_detail_and_file(client):
     assert "attachment" in file_response["Content-Disposition"]
 
 
+def test_indicator_series_csv_streams_and_records_download(client):
+    org = Organisation.objects.create(name="Stream Org", org_code="ST-ORG")
+    user = User.objects.create_user(username="stream_user", password="pass1234", organisation=org, is_staff=True)
+    indicator = _seed_indicator_series(org=org)
+    series = IndicatorDataSeries.objects.get(indicator=indicator)
+    IndicatorDataPoint.objects.bulk_create(
+        [IndicatorDataPoint(series=series, year=2000 + offset, value_numeric=Decimal(offset)) for offset in range(20)]
+    )
+
+    client.force_login(user)
+    response = client.get(
+        reverse("api_indicator_series_csv", args=[indicator.uuid]),
+        {"year_from": 2010, "year_to": 2024},
+    )
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"].startswith("text/csv")
+    content = b"".join(response.streaming_content)
+    lines = content.decode("utf-8").splitlines()
+    assert lines[0].startswith("indicator_uuid,indicator_code,")
+    assert len(lines) == 1 + 10 + 1
+    assert lines[-1].endswith('"{""province_code"": ""WC""}"')
+
+    record = DownloadRecord.objects.get(uuid=response["X-Download-Record"])
+    assert record.status == "ready"
+    assert record.file_size_bytes == len(content)
+    file_response = client.get(reverse("api_download_record_file", args=[record.uuid]))
+    assert b"".join(file_response.streaming_content) == content
+
+
+def test_indicator_series_csv_anonymous_and_abandoned_streams(client):
+    org = Organisation.objects.create(name="Abandon Org", org_code="AB-ORG")
+    user = User.objects.create_user(username="abandon_user", password="pass1234", organisation=org, is_staff=True)
+    indicator = _seed_indicator_series(org=org)
+    url = reverse("api_indicator_series_csv", args=[indicator.uuid])
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert "X-Download-Record" not in response
+    assert b"".join(response.streaming_content).startswith(b"indicator_uuid,")
+    assert not DownloadRecord.objects.exists()
+
+    stream = stream_download_record_from_payload(
+        user=user,
+        payload={"record_type": "indicator_series", "object_uuid": str(indicator.uuid)},
+    )
+    next(stream["chunks"])
+    stream["chunks"].close()
+    record = DownloadRecord.objects.get(pk=stream["record"].pk)
+    assert record.status == "failed"
+    assert record.error_message
+
+
 def test_download_record_visibility_when_access_is_revoked(client):
     org_a = Organisation.objects.create(name="Org A", org_code="ORG-A")
     org_b = Organisation.objects.create(name="Org B", org_code="ORG-B")
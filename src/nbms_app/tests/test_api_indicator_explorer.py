@@ -1,8 +1,10 @@
+import importlib
 from datetime import date
 from decimal import Decimal
 
 import pytest
 from django.contrib.auth.models import Group
+from django.db import connection
 from django.urls import reverse
 
 from nbms_app.models import (
@@ -17,8 +19,11 @@ from nbms_app.models import (
     IndicatorDataSeries,
     IndicatorDatasetLink,
     IndicatorEvidenceLink,
+    IndicatorExplorerIndex,
     IndicatorFrameworkIndicatorLink,
     IndicatorInputRequirement,
+    IndicatorMethodProfile,
+    IndicatorMethodType,
     IndicatorRegistryCoverageRequirement,
     LifecycleStatus,
     MonitoringProgramme,
@@ -28,6 +33,7 @@ from nbms_app.models import (
     ProgrammeTemplate,
     ProgrammeTemplateDomain,
     ReportProductTemplate,
+    SearchDocument,
     SensitivityLevel,
     SpatialFeature,
     SpatialLayer,
@@ -37,6 +43,7 @@ from nbms_app.models import (
     User,
 )
 from nbms_app.services.authorization import ROLE_SECRETARIAT
+from nbms_app.signals import refresh_derived_rows
 
 
 pytestmark = pytest.mark.django_db
@@ -200,6 +207,123 @@ def test_indicator_list_supports_q_and_summary_payload(client):
     assert any(row["code"] == "IND-PUB" for row in payload["results"])
 
 
+def test_indicator_list_summary_follows_explorer_index_writes(client):
+    stack = _seed_indicator_stack()
+    indicator = stack["public"]
+    index = IndicatorExplorerIndex.objects.get(indicator=indicator)
+    assert (index.readiness_band, index.readiness_score, index.has_spatial) == ("red", 35, True)
+    assert index.framework_codes == ["GBF"]
+    assert index.next_expected_update == date(2024, 12, 31)
+
+    profile = IndicatorMethodProfile.objects.create(
+        indicator=indicator,
+        method_type=IndicatorMethodType.CSV_IMPORT,
+        implementation_key="csv_import_aggregation",
+        readiness_state="ready",
+    )
+    payload = client.get(reverse("api_indicator_list"), {"readiness_band": "green"}).json()
+    assert [row["code"] for row in payload["results"]] == ["IND-PUB"]
+    assert payload["count"] == 1
+    assert payload["summary"]["readiness_bands"] == {"red": 0, "amber": 0, "green": 1}
+    assert payload["facets"]["method_readiness"] == [{"readiness_state": "ready", "total": 1}]
+    assert payload["facets"]["frameworks"] == [{"framework_indicator__framework__code": "GBF", "total": 1}]
+    blockers = {row["code"]: row["count"] for row in payload["summary"]["blockers"]}
+    assert blockers == {"missing_approved_method": 0, "no_recent_release": 1, "missing_spatial_output": 0}
+
+    profile.delete()
+    IndicatorFrameworkIndicatorLink.objects.filter(indicator=indicator).delete()
+    index.refresh_from_db()
+    assert (index.readiness_band, index.framework_codes, index.method_readiness_states) == ("red", [], [])
+
+    indicator_id = indicator.pk
+    indicator.delete()
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    assert not IndicatorExplorerIndex.objects.filter(indicator_id=indicator_id).exists()
+
+
+def test_explorer_index_follows_cleared_spatial_points_and_missing_rows(client):
+    stack = _seed_indicator_stack()
+    indicator = stack["public"]
+    Indicator.objects.filter(pk=indicator.pk).update(coverage_geography="")
+    layer = SpatialLayer.objects.create(
+        layer_code="ZA_PROVINCES_NE",
+        title="Provinces",
+        name="Provinces",
+        slug="za-provinces-ne",
+        source_type=SpatialLayerSourceType.NBMS_TABLE,
+        sensitivity=SensitivityLevel.PUBLIC,
+        is_public=True,
+        is_active=True,
+    )
+    point = IndicatorDataPoint.objects.filter(series__indicator=indicator).first()
+    point.spatial_layer = layer
+    point.save()
+    index = IndicatorExplorerIndex.objects.get(indicator=indicator)
+    assert index.has_spatial
+
+    point.spatial_layer = None
+    point.save()
+    index.refresh_from_db()
+    assert not index.has_spatial
+
+    index.delete()
+    payload = client.get(reverse("api_indicator_list"), {"readiness_band": "red"}).json()
+    assert [row["code"] for row in payload["results"]] == ["IND-PUB"]
+    assert payload["count"] == 1
+    assert payload["summary"]["readiness_bands"] == {"red": 1, "amber": 0, "green": 0}
+    blockers = {row["code"]: row["count"] for row in payload["summary"]["blockers"]}
+    assert blockers["missing_spatial_output"] == 1
+
+
+def test_bulk_writes_refresh_what_the_save_receivers_would(client):
+    stack = _seed_indicator_stack()
+    indicator = stack["public"]
+    Indicator.objects.filter(pk=indicator.pk).update(coverage_geography="")
+    refresh_derived_rows(Indicator, [indicator])
+    assert not IndicatorExplorerIndex.objects.get(indicator=indicator).has_spatial
+
+    layer = SpatialLayer.objects.create(
+        layer_code="ZA_PROVINCES_NE",
+        title="Provinces",
+        name="Provinces",
+        slug="za-provinces-ne",
+        source_type=SpatialLayerSourceType.NBMS_TABLE,
+        sensitivity=SensitivityLevel.PUBLIC,
+        is_public=True,
+        is_active=True,
+    )
+    points = list(IndicatorDataPoint.objects.filter(series__indicator=indicator))
+    for point in points:
+        point.spatial_layer = layer
+    IndicatorDataPoint.objects.bulk_update(points, ["spatial_layer"])
+    refresh_derived_rows(IndicatorDataPoint, points)
+    assert IndicatorExplorerIndex.objects.get(indicator=indicator).has_spatial
+
+    target = indicator.national_target
+    target.title = "Wetland Target A"
+    NationalTarget.objects.bulk_update([target], ["title"])
+    refresh_derived_rows(NationalTarget, [target])
+    payload = client.get(reverse("api_discovery_search"), {"search": "wetland"}).json()
+    assert [row["code"] for row in payload["targets"]] == ["T-A"]
+    assert [row["code"] for row in payload["indicators"]] == ["IND-PUB"]
+
+
+def test_explorer_index_migration_backfills_existing_indicators(client):
+    _seed_indicator_stack()
+    fields = ["indicator_id", "method_readiness_state", "readiness_score", "readiness_band", "has_spatial"]
+    fields += ["next_expected_update", "framework_codes", "method_readiness_states"]
+    expected = list(IndicatorExplorerIndex.objects.order_by("indicator_id").values(*fields))
+    IndicatorExplorerIndex.objects.all().delete()
+
+    migration = importlib.import_module("nbms_app.migrations.0060_indicator_explorer_index")
+    with connection.cursor() as cursor:
+        cursor.execute(migration.BACKFILL_EXPLORER_INDEX_SQL)
+    assert list(IndicatorExplorerIndex.objects.order_by("indicator_id").values(*fields)) == expected
+    payload = client.get(reverse("api_indicator_list"), {"next_expected_update_to": "2024-12-31"}).json()
+    assert [row["code"] for row in payload["results"]] == ["IND-PUB"]
+
+
 def test_indicator_list_filters_by_geography_type_and_code(client):
     stack = _seed_indicator_stack()
     series = IndicatorDataSeries.objects.get(indicator=stack["public"])
@@ -241,6 +365,25 @@ def test_discovery_search_returns_indicator_target_and_dataset(client):
     assert stack["dataset_public"].dataset_code in dataset_codes
 
 
+def test_search_document_migration_backfills_existing_records(client):
+    stack = _seed_indicator_stack()
+    documents = SearchDocument.objects.order_by("entity_type", "object_id").values_list(
+        "entity_type", "object_id", "search_text"
+    )
+    expected = list(documents)
+    SearchDocument.objects.all().delete()
+    assert client.get(reverse("api_discovery_search"), {"search": "forest"}).json()["counts"]["indicators"] == 0
+
+    migration = importlib.import_module("nbms_app.migrations.0061_search_document")
+    with connection.schema_editor() as schema_editor:
+        migration._backfill_search_documents(None, schema_editor)
+    assert list(documents.all()) == expected
+    payload = client.get(reverse("api_discovery_search"), {"search": "forest"}).json()
+    assert stack["public"].code in {row["code"] for row in payload["indicators"]}
+    assert "T-A" in {row["code"] for row in payload["targets"]}
+    assert stack["dataset_public"].dataset_code in {row["code"] for row in payload["datasets"]}
+
+
 def test_discovery_search_hides_restricted_records_for_anonymous(client):
     _seed_indicator_stack()
     response = client.get(reverse("api_discovery_search"), {"search": "hidden"})
@@ -252,6 +395,33 @@ def test_discovery_search_hides_restricted_records_for_anonymous(client):
     assert payload["datasets"] == []
 
 
+def test_discovery_search_ranks_and_follows_renamed_targets(client):
+    stack = _seed_indicator_stack()
+    response = client.get(reverse("api_discovery_search"), {"search": "ind forest"})
+    assert [row["code"] for row in response.json()["indicators"]] == ["IND-PUB"]
+
+    NationalTarget.objects.filter(code="T-A").update(title="Wetland Target A")
+    target = NationalTarget.objects.get(code="T-A")
+    target.save()
+    payload = client.get(reverse("api_discovery_search"), {"search": "wetland"}).json()
+    assert payload["counts"]["indicators"] == 1
+    assert payload["indicators"][0]["code"] == stack["public"].code
+    assert [row["code"] for row in payload["targets"]] == ["T-A"]
+
+    Indicator.objects.create(
+        code="IND-PUB-2",
+        title="Cover indicator",
+        computation_notes="Derived from forest plots.",
+        national_target=target,
+        organisation=stack["public"].organisation,
+        indicator_type=NationalIndicatorType.OTHER,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+    payload = client.get(reverse("api_indicator_list"), {"q": "forest", "sort": "relevance"}).json()
+    assert [row["code"] for row in payload["results"]] == ["IND-PUB", "IND-PUB-2"]
+
+
 def test_indicator_series_summary_returns_grouped_values(client):
     stack = _seed_indicator_stack()
     response = client.get(
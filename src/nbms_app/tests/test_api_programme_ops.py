@@ -164,6 +164,52 @@ def test_programme_run_rerun_endpoint_executes_again(client):
     assert run.status in {ProgrammeRunStatus.SUCCEEDED, ProgrammeRunStatus.BLOCKED}
 
 
+def _rerun_completed_run(client, code):
+    org = Organisation.objects.create(name=f"{code} Org", org_code=code)
+    programme = _make_programme(code=code, lead_org=org)
+    User.objects.create_user(username=f"{code.lower()}-runner", password="pass12345", organisation=org)
+    assert client.login(username=f"{code.lower()}-runner", password="pass12345")
+
+    create_response = client.post(
+        reverse("api_programme_run_create", args=[programme.uuid]),
+        data=json.dumps({"run_type": "full", "execute_now": True}),
+        content_type="application/json",
+    )
+    assert create_response.status_code == 201
+    run = MonitoringProgrammeRun.objects.get(uuid=create_response.json()["uuid"])
+    assert run.status == ProgrammeRunStatus.SUCCEEDED
+    first_step_ids = set(run.steps.values_list("id", flat=True))
+
+    rerun_response = client.post(
+        reverse("api_programme_run_detail", args=[run.uuid]),
+        data=json.dumps({}),
+        content_type="application/json",
+    )
+    assert rerun_response.status_code == 200
+    run.refresh_from_db()
+    assert run.status == ProgrammeRunStatus.SUCCEEDED
+    assert run.lease_owner == ""
+    steps = list(run.steps.values_list("id", "ordering", "step_key", "status"))
+    assert [step[1:] for step in steps] == [
+        (1, "ingest", ProgrammeRunStatus.SUCCEEDED),
+        (2, "validate", ProgrammeRunStatus.SUCCEEDED),
+    ]
+    assert not first_step_ids & {step[0] for step in steps}
+    assert [step["step_key"] for step in rerun_response.json()["steps"]] == ["ingest", "validate"]
+    assert run.output_summary_json["artefact_count"] == run.artefacts.count() == 1
+
+
+def test_programme_run_rerun_replaces_the_steps_of_a_completed_run(client):
+    _rerun_completed_run(client, "PROG-RERUN-DONE")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_programme_run_rerun_executes_steps_on_worker_threads(client, settings):
+    settings.PROGRAMME_RUN_MODE = "threaded"
+    settings.PROGRAMME_STEP_WORKERS = 2
+    _rerun_completed_run(client, "PROG-RERUN-THREADS")
+
+
 def test_programme_run_report_endpoint_returns_json_attachment(client):
     org = Organisation.objects.create(name="Report Org", org_code="RPT")
     programme = _make_programme(
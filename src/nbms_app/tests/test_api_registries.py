@@ -174,6 +174,40 @@ def test_registry_ias_filters_and_detail(client):
     assert payload["checklist_records"][0]["source_identifier"] == "GRIIS-ZA-001"
 
 
+def test_registry_taxa_and_ias_search_rank_prefix_matches(client):
+    org = Organisation.objects.create(name="Org Search", org_code="ORG-SRCH")
+    user = User.objects.create_user(username="search-user", password="pass1234", organisation=org, is_staff=True)
+    common = {
+        "organisation": org,
+        "status": LifecycleStatus.PUBLISHED,
+        "sensitivity": SensitivityLevel.PUBLIC,
+        "qa_status": QaStatus.PUBLISHED,
+    }
+    wattle = TaxonConcept.objects.create(taxon_code="TAX-W", scientific_name="Acacia mearnsii", genus="Acacia", **common)
+    TaxonConcept.objects.create(taxon_code="TAX-V", scientific_name="Vachellia karroo", family="Fabaceae acacia-like", **common)
+    TaxonConcept.objects.create(
+        taxon_code="TAX-H",
+        scientific_name="Acacia hidden",
+        organisation=org,
+        status=LifecycleStatus.DRAFT,
+        sensitivity=SensitivityLevel.RESTRICTED,
+    )
+    AlienTaxonProfile.objects.create(taxon=wattle, country_code="ZA", **common)
+
+    _auth_client(client, user)
+    payload = client.get(reverse("api_registry_taxa"), {"search": "acac"}).json()
+    assert payload["count"] == 2
+    assert [row["taxon_code"] for row in payload["results"]] == ["TAX-W", "TAX-V"]
+
+    wattle.scientific_name = "Racosperma mearnsii"
+    wattle.save()
+    results = client.get(reverse("api_registry_ias"), {"search": "racosperma mea"}).json()["results"]
+    assert [row["taxon_code"] for row in results] == ["TAX-W"]
+
+    wattle.delete()
+    assert client.get(reverse("api_registry_ias"), {"search": "racosperma"}).json()["count"] == 0
+
+
 def test_programme_templates_endpoint_exposes_linked_programmes(client):
     org = Organisation.objects.create(name="Org Templates", org_code="ORG-TEMP")
     user = User.objects.create_user(username="template-user", password="pass1234", organisation=org, is_staff=True)
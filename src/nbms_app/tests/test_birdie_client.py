@@ -0,0 +1,147 @@
+import json
+import threading
+import time
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from nbms_app.integrations.birdie.client import BirdieClient, BirdieRequestError
+
+
+PAGES = {
+    "abundance_trends": [
+        [{"site_code": "S1", "species_code": "A", "year": 2021, "value": 0.5}],
+        [{"site_code": "S1", "species_code": "B", "year": 2021, "value": 0.7}],
+        [{"site_code": "S2", "species_code": "A", "year": 2022, "value": 0.9}],
+    ],
+}
+PLAIN = {"species": [{"species_code": "A"}, {"species_code": "B"}]}
+
+
+class _StandInBirdie(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, payload, *, etag):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        endpoint = parsed.path.strip("/")
+        page = int(parse_qs(parsed.query).get("page", ["1"])[0])
+        self.server.requests.append((endpoint, page, self.headers.get("If-None-Match")))
+        if endpoint == "flaky" and self.server.failures_left > 0:
+            self.server.failures_left -= 1
+            self.send_response(503)
+            self.end_headers()
+            return
+        etag = f'"{endpoint}-{page}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        if endpoint == "offsite":
+            self._send_json({"results": [{"ok": True}], "next": "https://elsewhere.example/offsite?page=2"}, etag=etag)
+        elif endpoint in PAGES:
+            pages = PAGES[endpoint]
+            payload = {"results": pages[page - 1], "next": None}
+            if page < len(pages):
+                payload["next"] = f"/{endpoint}?page={page + 1}&page_size=1"
+            self._send_json(payload, etag=etag)
+        elif endpoint in PLAIN or endpoint == "flaky":
+            self._send_json(PLAIN.get(endpoint, [{"ok": True}]), etag=etag)
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+
+@pytest.fixture
+def birdie_server(settings, tmp_path):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInBirdie)
+    server.requests = []
+    server.failures_left = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    settings.BIRDIE_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+    settings.BIRDIE_USE_FIXTURE = False
+    settings.BIRDIE_BACKOFF_SECONDS = 0
+    settings.BIRDIE_PAGE_SIZE = 1
+    settings.BIRDIE_CACHE_DIR = str(tmp_path / "birdie-cache")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _fetch(endpoints):
+    with BirdieClient().stream_many(endpoints) as streams:
+        return {endpoint: [row for page in streams[endpoint] for row in page] for endpoint in endpoints}
+
+
+def test_birdie_client_pages_concurrently_and_revalidates_from_disk(birdie_server):
+    snapshot = _fetch(["species", "abundance_trends"])
+    assert snapshot["species"] == PLAIN["species"]
+    assert [row["species_code"] for row in snapshot["abundance_trends"]] == ["A", "B", "A"]
+    assert all(etag is None for _endpoint, _page, etag in birdie_server.requests)
+
+    birdie_server.requests.clear()
+    again = _fetch(["species", "abundance_trends"])
+    assert again == snapshot
+    assert sorted(birdie_server.requests) == [
+        ("abundance_trends", 1, '"abundance_trends-1"'),
+        ("abundance_trends", 2, '"abundance_trends-2"'),
+        ("abundance_trends", 3, '"abundance_trends-3"'),
+        ("species", 1, '"species-1"'),
+    ]
+
+
+def test_birdie_client_streams_later_endpoints_before_earlier_ones_are_read(birdie_server):
+    with BirdieClient().stream_many(["species", "abundance_trends"]) as streams:
+        deadline = time.monotonic() + 5
+        while len(birdie_server.requests) < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert {endpoint for endpoint, _page, _etag in birdie_server.requests} == {"species", "abundance_trends"}
+        assert next(streams["species"]) == PLAIN["species"]
+
+
+def test_birdie_client_refetches_when_the_cached_body_is_corrupt(birdie_server, settings):
+    assert _fetch(["species"]) == {"species": PLAIN["species"]}
+    for body in Path(settings.BIRDIE_CACHE_DIR).glob("*.json"):
+        if not body.name.endswith(".meta.json"):
+            body.write_text('{"trunc', encoding="utf-8")
+
+    birdie_server.requests.clear()
+    assert _fetch(["species"]) == {"species": PLAIN["species"]}
+    assert birdie_server.requests == [("species", 1, '"species-1"'), ("species", 1, None)]
+    assert _fetch(["species"]) == {"species": PLAIN["species"]}
+
+
+def test_birdie_client_only_follows_next_links_to_its_own_host(birdie_server):
+    with pytest.raises(BirdieRequestError, match="elsewhere.example"):
+        _fetch(["offsite"])
+    assert [endpoint for endpoint, _page, _etag in birdie_server.requests] == ["offsite"]
+
+
+def test_birdie_client_retries_with_backoff(birdie_server):
+    birdie_server.failures_left = 2
+    assert _fetch(["flaky"]) == {"flaky": [{"ok": True}]}
+    assert len(birdie_server.requests) == 3
+
+    birdie_server.failures_left = 5
+    birdie_server.requests.clear()
+    with pytest.raises(BirdieRequestError):
+        BirdieClient()._request_json("flaky")
+    assert len(birdie_server.requests) == 3
+
+
+def test_birdie_client_falls_back_to_fixture(birdie_server, settings):
+    settings.BIRDIE_USE_FIXTURE = True
+    rows = BirdieClient()._request_json("wcv_scores")
+    assert rows == BirdieClient().fixture_payload()["wcv_scores"]
@@ -0,0 +1,88 @@
+from io import BytesIO
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+
+from nbms_app.services import pdf_rendering
+from nbms_app.services.docx_rendering import (
+    DocxBuilder,
+    extract_docx_text,
+    iter_docx_paragraph_text,
+    render_section_fragments,
+)
+from nbms_app.services.pdf_rendering import PdfRenderPool
+from nbms_app.services.reporting_exports import _render_cbd_docx_bytes
+
+
+SECTIONS = [
+    [("heading", f"SECTION-{index} - Title", 1), ("paragraph", "summary:", "List Bullet"), ("paragraph", "text", None)]
+    for index in range(3)
+]
+
+
+def _paragraphs(content):
+    return [(paragraph.text, paragraph.style.name) for paragraph in Document(BytesIO(content)).paragraphs]
+
+
+def _assemble(fragments):
+    builder = DocxBuilder()
+    for fragment in fragments:
+        builder.append_fragment(fragment)
+    return builder.to_bytes()
+
+
+def test_streamed_text_matches_python_docx_paragraphs():
+    document = Document()
+    document.add_heading("Report", level=0)
+    paragraph = document.add_paragraph("a\tb")
+    run = paragraph.add_run("c")
+    run.add_break()
+    run.add_text("d")
+    run.add_break(WD_BREAK.PAGE)
+    document.add_table(rows=1, cols=1).cell(0, 0).text = "table cell"
+    document.add_paragraph("  trailing  ")
+    document.add_paragraph("")
+    output = BytesIO()
+    document.save(output)
+    content = output.getvalue()
+
+    assert list(iter_docx_paragraph_text(content)) == [item.text for item in Document(BytesIO(content)).paragraphs]
+    assert extract_docx_text(content) == "Report\na\tbc\nd\ntrailing"
+
+
+def test_pooled_section_fragments_match_inline(settings, monkeypatch):
+    inline = _assemble(render_section_fragments(SECTIONS))
+
+    settings.DOCX_RENDER_MODE = "process"
+    settings.DOCX_PARALLEL_MIN_BLOCKS = 1
+    pool = PdfRenderPool(workers=1, queue_size=2, max_tasks_per_child=0, memory_limit_mb=0)
+    monkeypatch.setattr(pdf_rendering, "_POOL", pool)
+    try:
+        pooled = _assemble(render_section_fragments(SECTIONS))
+    finally:
+        pool.reset()
+
+    assert _paragraphs(pooled) == _paragraphs(inline)
+    assert _paragraphs(inline)[0] == ("SECTION-0 - Title", "Heading 1")
+
+
+def test_cbd_docx_keeps_heading_and_list_styles():
+    payload = {
+        "reporting_instance": {"report_title": "National Report", "country_name": "ZA", "cycle_code": "NR7"},
+        "sections": [{"code": "section-i", "title": "Overview", "content": {"rows": [{"a": 1}], "summary": "Text"}}],
+        "annex": [{"decision_topic_code": "D-1", "title": "Decision", "response_json": {"status": "done"}}],
+    }
+
+    assert _paragraphs(_render_cbd_docx_bytes(payload)) == [
+        ("National Report", "Title"),
+        ("ZA | NR7 | ", "Normal"),
+        ("Visibility: Internal", "Normal"),
+        ("SECTION-I - Overview", "Heading 1"),
+        ("rows:", "List Bullet"),
+        ('{"a": 1}', "List Number"),
+        ("summary:", "List Bullet"),
+        ("Text", "Normal"),
+        ("Annex", "Heading 1"),
+        ("D-1 - Decision", "Heading 2"),
+        ("status: done", "Normal"),
+    ]
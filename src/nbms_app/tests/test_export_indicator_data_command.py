@@ -0,0 +1,90 @@
+import csv
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from nbms_app.models import (
+    Framework,
+    FrameworkIndicator,
+    Indicator,
+    IndicatorDataPoint,
+    IndicatorDataSeries,
+    NationalTarget,
+    Organisation,
+)
+from nbms_app.management.commands import export_indicator_data
+from nbms_app.management.commands.export_indicator_data import FIELDNAMES
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_export_indicator_data_writes_all_series(tmp_path):
+    org = Organisation.objects.create(name="Org A")
+    target = NationalTarget.objects.create(code="NT-1", title="Target", organisation=org)
+    indicator = Indicator.objects.create(code="IND-1", title="Indicator", national_target=target, organisation=org)
+    framework = Framework.objects.create(code="GBF", title="GBF")
+    framework_indicator = FrameworkIndicator.objects.create(framework=framework, code="A.1", title="Headline")
+    national = IndicatorDataSeries.objects.create(indicator=indicator, title="National", unit="ha")
+    headline = IndicatorDataSeries.objects.create(
+        framework_indicator=framework_indicator,
+        title="Headline",
+        disaggregation_schema={"sex": ["F", "M"]},
+    )
+    IndicatorDataPoint.objects.create(series=national, year=2021, value_numeric=Decimal("1.50"))
+    IndicatorDataPoint.objects.create(series=national, year=2020, value_text="n/a")
+    IndicatorDataPoint.objects.create(series=headline, year=2020, value_numeric=Decimal("3"), disaggregation={"sex": "F"})
+
+    out_path = tmp_path / "export" / "points.csv"
+    call_command("export_indicator_data", "--out", str(out_path))
+
+    with out_path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        assert reader.fieldnames == FIELDNAMES
+        rows = list(reader)
+
+    assert [(row["series_title"], row["year"]) for row in rows] == [
+        ("National", "2020"),
+        ("National", "2021"),
+        ("Headline", "2020"),
+    ]
+    assert rows[0]["indicator_code"] == "IND-1"
+    assert rows[0]["value_text"] == "n/a"
+    assert rows[0]["disaggregation_json"] == "{}"
+    assert Decimal(rows[1]["value_numeric"]) == Decimal("1.5")
+    assert rows[2]["framework_code"] == "GBF"
+    assert rows[2]["framework_indicator_code"] == "A.1"
+    assert rows[2]["disaggregation_schema_json"] == '{"sex": ["F", "M"]}'
+    assert rows[2]["disaggregation_json"] == '{"sex": "F"}'
+
+
+def test_export_indicator_data_skips_series_deleted_mid_export(tmp_path, monkeypatch):
+    org = Organisation.objects.create(name="Org A")
+    target = NationalTarget.objects.create(code="NT-1", title="Target", organisation=org)
+    indicator = Indicator.objects.create(code="IND-1", title="Indicator", national_target=target, organisation=org)
+    other = Indicator.objects.create(code="IND-2", title="Other", national_target=target, organisation=org)
+    kept = IndicatorDataSeries.objects.create(indicator=indicator, title="Kept")
+    dropped = IndicatorDataSeries.objects.create(indicator=other, title="Dropped")
+    IndicatorDataPoint.objects.create(series=kept, year=2020, value_numeric=Decimal("1"))
+    IndicatorDataPoint.objects.create(series=dropped, year=2020, value_numeric=Decimal("2"))
+
+    original = export_indicator_data._series_columns
+
+    def columns_without_dropped(series_ids):
+        columns = original(series_ids)
+        columns.pop(dropped.id)
+        return columns
+
+    monkeypatch.setattr(export_indicator_data, "_series_columns", columns_without_dropped)
+    out_path = tmp_path / "points.csv"
+    stdout = StringIO()
+    call_command("export_indicator_data", "--out", str(out_path), stdout=stdout)
+
+    with out_path.open(newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+
+    assert [row["series_title"] for row in rows] == ["Kept"]
+    assert "Skipped 1 point(s)" in stdout.getvalue()
+    assert "Exported 1 indicator data point(s)." in stdout.getvalue()
@@ -0,0 +1,131 @@
+import csv
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from nbms_app.models import (
+    Framework,
+    FrameworkIndicator,
+    Indicator,
+    IndicatorDataPoint,
+    IndicatorDataSeries,
+    LifecycleStatus,
+    NationalTarget,
+    Organisation,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+HEADERS = [
+    "framework_code",
+    "framework_indicator_code",
+    "indicator_uuid",
+    "indicator_code",
+    "series_title",
+    "unit",
+    "value_type",
+    "status",
+    "year",
+    "value_numeric",
+    "value_text",
+    "disaggregation_json",
+    "source_url",
+    "footnote",
+]
+
+
+def _write_csv(path, rows):
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=HEADERS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+
+
+def _seed_identities():
+    org = Organisation.objects.create(name="Org A")
+    target = NationalTarget.objects.create(code="NT-1", title="Target", organisation=org)
+    indicator = Indicator.objects.create(
+        code="IND-1",
+        title="Indicator",
+        national_target=target,
+        organisation=org,
+        status=LifecycleStatus.PUBLISHED,
+    )
+    framework = Framework.objects.create(code="GBF", title="GBF")
+    framework_indicator = FrameworkIndicator.objects.create(framework=framework, code="A.1", title="Headline")
+    return indicator, framework_indicator
+
+
+def test_import_indicator_data_chunked_upsert(tmp_path):
+    indicator, framework_indicator = _seed_identities()
+    rows = [
+        {"indicator_code": "IND-1", "series_title": "Series", "year": str(year), "value_numeric": str(year)}
+        for year in range(2000, 2010)
+    ]
+    rows.append(
+        {
+            "framework_code": "GBF",
+            "framework_indicator_code": "A.1",
+            "year": "2020",
+            "value_numeric": "1.5",
+            "disaggregation_json": '{"province": "WC", "sex": "F"}',
+        }
+    )
+    path = tmp_path / "data.csv"
+    _write_csv(path, rows)
+
+    call_command("import_indicator_data", "--in", str(path), "--chunk-size", "3")
+
+    series = IndicatorDataSeries.objects.get(indicator=indicator)
+    assert series.title == "Series"
+    assert IndicatorDataPoint.objects.filter(series=series).count() == 10
+    assert IndicatorDataSeries.objects.filter(framework_indicator=framework_indicator).count() == 1
+
+    rows = [
+        {"indicator_code": "IND-1", "status": "published", "year": "2001", "value_numeric": "99"},
+        {
+            "framework_code": "GBF",
+            "framework_indicator_code": "A.1",
+            "year": "2020",
+            "value_numeric": "2.5",
+            "disaggregation_json": '{"sex": "F", "province": "WC"}',
+        },
+        {"indicator_code": "IND-1", "year": "2030", "value_text": "pending"},
+    ]
+    _write_csv(path, rows)
+    call_command("import_indicator_data", "--in", str(path), "--chunk-size", "2")
+
+    series.refresh_from_db()
+    assert series.status == LifecycleStatus.PUBLISHED
+    assert IndicatorDataPoint.objects.filter(series=series).count() == 11
+    assert IndicatorDataPoint.objects.get(series=series, year=2001).value_numeric == Decimal("99")
+    framework_point = IndicatorDataPoint.objects.get(series__framework_indicator=framework_indicator)
+    assert framework_point.value_numeric == Decimal("2.5")
+
+
+def test_import_indicator_data_reports_row_errors_without_aborting(tmp_path):
+    indicator, _framework_indicator = _seed_identities()
+    rows = [
+        {"indicator_code": "IND-1", "year": "2020", "value_numeric": "1"},
+        {"indicator_code": "MISSING", "year": "2020", "value_numeric": "1"},
+        {"indicator_code": "IND-1", "year": "", "value_numeric": "1"},
+        {"indicator_code": "IND-1", "year": "2021", "value_numeric": "abc"},
+        {"indicator_code": "IND-1", "year": "2022", "value_numeric": "3"},
+    ]
+    path = tmp_path / "data.csv"
+    _write_csv(path, rows)
+
+    with pytest.raises(CommandError) as excinfo:
+        call_command("import_indicator_data", "--in", str(path), "--chunk-size", "2")
+
+    message = str(excinfo.value)
+    assert "Row 3: indicator code not found: MISSING" in message
+    assert "Row 4: year is required" in message
+    assert "Row 5: invalid decimal in value_numeric" in message
+    years = sorted(IndicatorDataPoint.objects.filter(series__indicator=indicator).values_list("year", flat=True))
+    assert years == [2020, 2022]
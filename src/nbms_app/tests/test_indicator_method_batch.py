@@ -0,0 +1,164 @@
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from nbms_app.indicator_methods.base import BaseIndicatorMethod, MethodResult
+from nbms_app.indicator_methods.registry import METHOD_REGISTRY
+from nbms_app.models import (
+    Indicator,
+    IndicatorDataPoint,
+    IndicatorDataSeries,
+    IndicatorMethodProfile,
+    IndicatorMethodResourceClass,
+    IndicatorMethodRun,
+    IndicatorMethodType,
+    IndicatorValueType,
+    LifecycleStatus,
+    NationalIndicatorType,
+    NationalTarget,
+    Organisation,
+    SensitivityLevel,
+)
+from nbms_app.services.indicator_method_batch import (
+    STATUS_CACHED,
+    STATUS_SKIPPED,
+    profile_resource_class,
+    run_indicator_methods,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+class _SeriesWriterMethod(BaseIndicatorMethod):
+    key = "test_series_writer"
+    resource_class = "postgis"
+    writes_indicator_data = True
+
+    def run(self, context):
+        series = context.indicator.data_series.first()
+        IndicatorDataPoint.objects.create(series=series, year=2030, value_numeric=99)
+        return MethodResult(status="succeeded", output={"method": self.key})
+
+
+class _FailingWriterMethod(_SeriesWriterMethod):
+    key = "test_failing_writer"
+
+    def run(self, context):
+        return MethodResult(status="failed", output={}, error_message="Writer broke.")
+
+
+@pytest.fixture
+def writer_methods(monkeypatch):
+    monkeypatch.setitem(METHOD_REGISTRY, _SeriesWriterMethod.key, _SeriesWriterMethod())
+    monkeypatch.setitem(METHOD_REGISTRY, _FailingWriterMethod.key, _FailingWriterMethod())
+
+
+def _seed_indicator(code):
+    org, _ = Organisation.objects.get_or_create(org_code="BATCH-ORG", defaults={"name": "Batch Org"})
+    target, _ = NationalTarget.objects.get_or_create(
+        code="T-BATCH",
+        defaults={
+            "title": "Target Batch",
+            "organisation": org,
+            "status": LifecycleStatus.PUBLISHED,
+            "sensitivity": SensitivityLevel.PUBLIC,
+        },
+    )
+    indicator = Indicator.objects.create(
+        code=code,
+        title=f"Indicator {code}",
+        national_target=target,
+        indicator_type=NationalIndicatorType.OTHER,
+        organisation=org,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+    series = IndicatorDataSeries.objects.create(
+        indicator=indicator,
+        title="Series",
+        unit="index",
+        value_type=IndicatorValueType.NUMERIC,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+        organisation=org,
+    )
+    IndicatorDataPoint.objects.create(series=series, year=2021, value_numeric=10)
+    reader = IndicatorMethodProfile.objects.create(
+        indicator=indicator,
+        method_type=IndicatorMethodType.CSV_IMPORT,
+        implementation_key="csv_import_aggregation",
+        is_active=True,
+    )
+    return indicator, reader
+
+
+def _writer(indicator, key=_SeriesWriterMethod.key):
+    return IndicatorMethodProfile.objects.create(
+        indicator=indicator,
+        method_type=IndicatorMethodType.SCRIPTED_PYTHON,
+        implementation_key=key,
+        is_active=True,
+    )
+
+
+def test_writers_run_before_readers_and_cache_hits_are_skipped(writer_methods):
+    indicator, reader = _seed_indicator("IND-BATCH-1")
+    writer = _writer(indicator)
+
+    report = run_indicator_methods()
+
+    entries = {entry["profile_uuid"]: entry for entry in report["profiles"]}
+    assert entries[str(reader.uuid)]["depends_on"] == [str(writer.uuid)]
+    assert entries[str(writer.uuid)]["resource_class"] == IndicatorMethodResourceClass.POSTGIS
+    assert report["counts"] == {"succeeded": 2}
+    writer_run = IndicatorMethodRun.objects.get(profile=writer)
+    reader_run = IndicatorMethodRun.objects.get(profile=reader)
+    assert reader_run.started_at >= writer_run.finished_at
+    assert [row["year"] for row in reader_run.output_json["aggregated_by_year"]] == [2021, 2030]
+
+    report = run_indicator_methods(profiles=IndicatorMethodProfile.objects.filter(pk=reader.pk))
+
+    assert report["counts"] == {STATUS_CACHED: 1}
+    assert report["profiles"][0]["run_uuid"] == str(reader_run.uuid)
+    assert IndicatorMethodRun.objects.filter(profile=reader).count() == 1
+
+
+def test_failed_writer_skips_dependent_readers(writer_methods):
+    indicator, reader = _seed_indicator("IND-BATCH-2")
+    _writer(indicator, key=_FailingWriterMethod.key)
+    _other_indicator, other_reader = _seed_indicator("IND-BATCH-3")
+
+    report = run_indicator_methods()
+
+    statuses = {entry["profile_uuid"]: entry["status"] for entry in report["profiles"]}
+    assert statuses[str(reader.uuid)] == STATUS_SKIPPED
+    assert statuses[str(other_reader.uuid)] == "succeeded"
+    assert not IndicatorMethodRun.objects.filter(profile=reader).exists()
+
+
+def test_profile_resource_class_overrides_the_method_default(writer_methods):
+    indicator, reader = _seed_indicator("IND-BATCH-4")
+    writer = _writer(indicator)
+
+    assert profile_resource_class(reader) == IndicatorMethodResourceClass.LIGHT
+    assert profile_resource_class(writer) == IndicatorMethodResourceClass.POSTGIS
+    writer.resource_class = IndicatorMethodResourceClass.LIGHT
+    assert profile_resource_class(writer) == IndicatorMethodResourceClass.LIGHT
+
+
+def test_run_indicator_methods_command_writes_report(tmp_path, writer_methods):
+    indicator, _reader = _seed_indicator("IND-BATCH-5")
+    report_path = tmp_path / "methods.json"
+
+    call_command("run_indicator_methods", "--indicator", indicator.code, "--output", str(report_path))
+
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["counts"] == {"succeeded": 1}
+    assert report["profiles"][0]["duration_ms"] is not None
+
+    _writer(indicator, key=_FailingWriterMethod.key)
+    with pytest.raises(CommandError):
+        call_command("run_indicator_methods", "--indicator", indicator.code, "--force")
@@ -0,0 +1,123 @@
+import pytest
+from django.core.cache import cache
+
+from nbms_app.models import (
+    Indicator,
+    IndicatorDataPoint,
+    IndicatorDataSeries,
+    IndicatorMethodProfile,
+    IndicatorMethodResult,
+    IndicatorMethodType,
+    IndicatorValueType,
+    InputTableVersion,
+    LifecycleStatus,
+    NationalIndicatorType,
+    NationalTarget,
+    Organisation,
+    SensitivityLevel,
+)
+from nbms_app.services.indicator_method_sdk import (
+    input_versions_hash,
+    refresh_stale_method_profiles,
+    run_method_profile,
+)
+from nbms_app.services.input_versions import bump_input_versions_for, get_input_versions
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _seed_profile():
+    org = Organisation.objects.create(name="Method Results Org", org_code="MRES-ORG")
+    target = NationalTarget.objects.create(
+        code="T-MRES",
+        title="Target Method Results",
+        organisation=org,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+    indicator = Indicator.objects.create(
+        code="IND-MRES-1",
+        title="Indicator Method Results",
+        national_target=target,
+        indicator_type=NationalIndicatorType.OTHER,
+        organisation=org,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+    series = IndicatorDataSeries.objects.create(
+        indicator=indicator,
+        title="Series",
+        unit="index",
+        value_type=IndicatorValueType.NUMERIC,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+        organisation=org,
+    )
+    IndicatorDataPoint.objects.create(series=series, year=2021, value_numeric=10)
+    profile = IndicatorMethodProfile.objects.create(
+        indicator=indicator,
+        method_type=IndicatorMethodType.CSV_IMPORT,
+        implementation_key="csv_import_aggregation",
+        is_active=True,
+    )
+    return series, profile
+
+
+def test_data_point_writes_bump_the_series_version():
+    series, _profile = _seed_profile()
+    key = ("indicator_data_point", series.id)
+    before = get_input_versions([key])[key]
+
+    point = IndicatorDataPoint.objects.create(series=series, year=2022, value_numeric=20)
+    point.delete()
+    bump_input_versions_for(IndicatorDataPoint, scope_ids=[series.id])
+
+    assert get_input_versions([key])[key] == before + 3
+    assert InputTableVersion.objects.filter(table_name="indicator_data_point", scope_id=series.id).count() == 1
+
+
+def test_stored_result_is_reused_after_cache_clear_until_inputs_change():
+    series, profile = _seed_profile()
+
+    first = run_method_profile(profile=profile, params={"window": 1})
+    cache.clear()
+    second = run_method_profile(profile=profile, params={"window": 1})
+
+    assert first.output_json.get("cache_hit") is None
+    assert second.output_json["cache_hit"] is True
+    assert second.input_hash == first.input_hash
+    assert IndicatorMethodResult.objects.get(profile=profile).run_id == first.pk
+
+    IndicatorDataPoint.objects.create(series=series, year=2022, value_numeric=20)
+    third = run_method_profile(profile=profile, params={"window": 1})
+
+    assert third.input_hash != first.input_hash
+    assert third.output_json.get("cache_hit") is None
+    assert IndicatorMethodResult.objects.filter(profile=profile).count() == 2
+
+
+def test_stale_profiles_are_refreshed_when_inputs_change(settings):
+    settings.INDICATOR_METHOD_RESULTS_PER_PROFILE = 1
+    series, profile = _seed_profile()
+    idle = IndicatorMethodProfile.objects.create(
+        indicator=profile.indicator,
+        method_type=IndicatorMethodType.API_CONNECTOR,
+        implementation_key="birdie_api_connector",
+        is_active=True,
+    )
+
+    run_method_profile(profile=profile)
+    assert refresh_stale_method_profiles() == []
+
+    IndicatorDataPoint.objects.filter(series=series).update(value_numeric=15)
+    bump_input_versions_for(IndicatorDataPoint, scope_ids=[series.id])
+    runs = refresh_stale_method_profiles()
+
+    profile.refresh_from_db()
+    assert [run.profile_id for run in runs] == [profile.pk]
+    assert profile.input_versions_hash == input_versions_hash(profile)
+    idle.refresh_from_db()
+    assert idle.input_versions_hash == "" and idle.last_run_at is None
+    assert IndicatorMethodResult.objects.filter(profile=profile).count() == 1
+
@@ -16,10 +16,15 @@ from nbms_app.models import (
     Organisation,
     SeicatCategory,
     SensitivityLevel,
+    SpatialFeature,
+    SpatialIngestionRun,
+    SpatialLayer,
     TaxonGoldSummary,
     EcosystemGoldSummary,
+    disaggregation_hash,
 )
 from nbms_app.services.indicator_method_sdk import run_method_profile
+from nbms_app.services.spatial_overlay import get_overlay_cache
 
 
 pytestmark = pytest.mark.django_db
@@ -131,3 +136,78 @@ def test_taxon_registry_method_generates_series_point():
     point = IndicatorDataPoint.objects.filter(series__indicator=indicator, year=2026).first()
     assert point is not None
     assert float(point.value_numeric) >= 0
+
+
+def test_registry_method_rerun_updates_point_in_place():
+    indicator = _seed_indicator("IND-ECO-RERUN")
+    summary = EcosystemGoldSummary.objects.create(
+        snapshot_date=date(2026, 1, 31),
+        dimension="province",
+        dimension_key="WC",
+        dimension_label="Western Cape",
+        ecosystem_count=4,
+        threatened_count=1,
+        total_area_km2=Decimal("100.000"),
+        protected_area_km2=Decimal("10.000"),
+        protected_percent=Decimal("10.000"),
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+    profile = IndicatorMethodProfile.objects.create(
+        indicator=indicator,
+        method_type=IndicatorMethodType.SCRIPTED_PYTHON,
+        implementation_key="ecosystem_registry_summary",
+        is_active=True,
+    )
+    run_method_profile(profile=profile, user=None, params={"year": 2026}, use_cache=False)
+    summary.protected_area_km2 = Decimal("20.000")
+    summary.save()
+    run_method_profile(profile=profile, user=None, params={"year": 2026}, use_cache=False)
+
+    point = IndicatorDataPoint.objects.get(series__indicator=indicator, year=2026)
+    assert float(point.value_numeric) == 20.0
+    assert point.disaggregation_hash == disaggregation_hash(point.disaggregation)
+
+
+def test_spatial_overlay_method_upserts_province_points_in_bulk(django_assert_max_num_queries):
+    indicator = _seed_indicator("IND-OVERLAY-METHOD")
+    admin = SpatialLayer.objects.create(layer_code="ZA_PROVINCES", name="Provinces", slug="za-provinces")
+    overlay = SpatialLayer.objects.create(layer_code="ZA_PROTECTED_AREAS", name="Protected", slug="za-protected")
+    provinces = [f"P{index:02d}" for index in range(12)]
+    for code in provinces:
+        SpatialFeature.objects.create(
+            layer=admin,
+            feature_key=code,
+            name=f"Province {code}",
+            province_code=code,
+            properties={"area_km2": 100},
+        )
+        SpatialFeature.objects.create(
+            layer=overlay,
+            feature_key=f"pa-{code}",
+            province_code=code,
+            properties={"area_km2": 25},
+        )
+    profile = IndicatorMethodProfile.objects.create(
+        indicator=indicator,
+        method_type=IndicatorMethodType.SPATIAL_OVERLAY,
+        implementation_key="spatial_overlay_area_by_province",
+        is_active=True,
+    )
+
+    run = run_method_profile(profile=profile, user=None, params={"year": 2026}, use_cache=False)
+    assert run.status == "succeeded"
+    SpatialFeature.objects.filter(layer=overlay, province_code="P00").update(properties={"area_km2": 50})
+    overlay.latest_ingestion_run = SpatialIngestionRun.objects.create(run_id="overlay-reingest", layer=overlay)
+    overlay.save(update_fields=["latest_ingestion_run"])
+    # The re-ingest invalidates the shared overlay cache; rebuild it here so
+    # the budget covers only the method's own reads and point upserts.
+    get_overlay_cache(admin, overlay)
+    with django_assert_max_num_queries(30):
+        run_method_profile(profile=profile, user=None, params={"year": 2026}, use_cache=False)
+
+    points = IndicatorDataPoint.objects.filter(series__indicator=indicator, year=2026)
+    assert points.count() == len(provinces)
+    changed = points.get(disaggregation__province_code="P00").value_numeric
+    unchanged = points.get(disaggregation__province_code="P01").value_numeric
+    assert changed == unchanged * 2
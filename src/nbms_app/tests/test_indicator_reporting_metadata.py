@@ -1,4 +1,5 @@
 import csv
+from datetime import date
 
 import pytest
 from django.core.exceptions import ValidationError
@@ -6,6 +7,7 @@ from django.core.management import call_command
 
 from nbms_app.models import (
     Indicator,
+    IndicatorExplorerIndex,
     IndicatorReportingCapability,
     IndicatorUpdateFrequency,
     LifecycleStatus,
@@ -14,6 +16,8 @@ from nbms_app.models import (
     Organisation,
     ReportingCycle,
     ReportingInstance,
+    SearchDocument,
+    SearchEntityType,
     SensitivityLevel,
 )
 from nbms_app.services.readiness import get_instance_readiness
@@ -123,8 +127,12 @@ def test_indicator_import_export_roundtrip(tmp_path):
     assert row["indicator_code"] == "IND-1"
     assert row["reporting_capability"] == "yes"
 
+    assert (indicator.explorer_index.has_spatial, indicator.explorer_index.next_expected_update) == (False, None)
     row["reporting_capability"] = "no"
     row["reporting_no_reason_codes"] = "no_data"
+    row["spatial_coverage"] = "National"
+    row["last_updated_on"] = "2024-01-01"
+    row["indicator_title"] = "Wetland extent"
 
     import_path = tmp_path / "indicator_import.csv"
     with import_path.open("w", encoding="utf-8", newline="") as handle:
@@ -142,6 +150,11 @@ def test_indicator_import_export_roundtrip(tmp_path):
     indicator.refresh_from_db()
     assert indicator.reporting_capability == IndicatorReportingCapability.NO
     assert indicator.reporting_no_reason_codes == ["no_data"]
+    explorer_index = IndicatorExplorerIndex.objects.get(indicator=indicator)
+    assert (explorer_index.has_spatial, explorer_index.readiness_score) == (True, 35)
+    assert explorer_index.next_expected_update == date(2024, 12, 31)
+    document = SearchDocument.objects.get(entity_type=SearchEntityType.INDICATOR, object_id=indicator.pk)
+    assert "wetland extent" in document.search_text
 
 
 def test_readiness_includes_reporting_capability_counts():
@@ -0,0 +1,73 @@
+import os
+import time
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from nbms_app.services import pdf_rendering
+from nbms_app.services.pdf_rendering import PdfRenderError, PdfRenderPool, render_pdf_bytes
+
+
+HTML = "<html><body><h1>Render check</h1><p>Body</p></body></html>"
+
+
+@pytest.fixture
+def process_pool(settings, monkeypatch):
+    settings.PDF_RENDER_MODE = "process"
+    pool = PdfRenderPool(workers=1, queue_size=1, max_tasks_per_child=2, memory_limit_mb=0)
+    monkeypatch.setattr(pdf_rendering, "_POOL", pool)
+    yield pool
+    pool.reset()
+
+
+def test_render_pdf_bytes_uses_worker_pool_and_recycles_workers(process_pool):
+    outputs = [render_pdf_bytes(HTML) for _ in range(3)]
+    assert all(output.startswith(b"%PDF") for output in outputs)
+
+    future = process_pool.submit(HTML)
+    assert future.result(timeout=60).startswith(b"%PDF")
+
+
+def test_render_pool_rejects_work_beyond_queue_bound(process_pool):
+    first = process_pool.submit(HTML)
+    second = process_pool.submit(HTML)
+    with pytest.raises(PdfRenderError, match="busy"):
+        process_pool.submit(HTML)
+    assert first.result(timeout=60).startswith(b"%PDF")
+    assert second.result(timeout=60).startswith(b"%PDF")
+
+
+def test_render_timeout_surfaces_validation_error(process_pool, settings):
+    settings.PDF_RENDER_TIMEOUT_SECONDS = 0.001
+    with pytest.raises(ValidationError, match="timed out"):
+        render_pdf_bytes(HTML, error_message="Failed to render test PDF.")
+    settings.PDF_RENDER_TIMEOUT_SECONDS = 60
+    assert render_pdf_bytes(HTML).startswith(b"%PDF")
+
+
+def test_render_timeout_recycles_only_the_stuck_worker(settings):
+    settings.PDF_RENDER_MODE = "process"
+    pool = PdfRenderPool(workers=2, queue_size=0, max_tasks_per_child=0, memory_limit_mb=0)
+    try:
+        stuck = pool.submit_call(time.sleep, 30)
+        healthy = pool.submit(HTML)
+        with pytest.raises(PdfRenderError, match="timed out"):
+            pool.wait(stuck, timeout=0.5)
+        assert pool.wait(healthy, timeout=60).startswith(b"%PDF")
+        assert pool.render(HTML, timeout=60).startswith(b"%PDF")
+    finally:
+        pool.reset()
+
+
+def test_crashed_worker_is_replaced_without_touching_the_others(settings):
+    settings.PDF_RENDER_MODE = "process"
+    pool = PdfRenderPool(workers=2, queue_size=0, max_tasks_per_child=0, memory_limit_mb=0)
+    try:
+        crashed = pool.submit_call(os._exit, 1)
+        healthy = pool.submit(HTML)
+        with pytest.raises(PdfRenderError, match="exited unexpectedly"):
+            pool.wait(crashed, timeout=60)
+        assert pool.wait(healthy, timeout=60).startswith(b"%PDF")
+        assert [pool.render(HTML, timeout=60)[:4] for _ in range(2)] == [b"%PDF", b"%PDF"]
+    finally:
+        pool.reset()
@@ -82,3 +82,23 @@ def test_run_programme_command_executes_selected_programme():
 def test_run_programme_command_errors_on_unknown_programme():
     with pytest.raises(CommandError):
         call_command("run_programme", "--programme-code", "MISSING-PROGRAMME")
+
+
+def test_run_programme_scheduler_once_executes_due_programmes():
+    org = Organisation.objects.create(name="Daemon Org", org_code="DMN-ORG")
+    programme = MonitoringProgramme.objects.create(
+        programme_code="PROG-SCHED-DAEMON",
+        title="Daemon Programme",
+        lead_org=org,
+        refresh_cadence=ProgrammeRefreshCadence.DAILY,
+        scheduler_enabled=True,
+        next_run_at=timezone.now() - timedelta(hours=2),
+        pipeline_definition_json={"steps": [{"key": "validate", "type": "validate"}]},
+        data_quality_rules_json={"minimum_dataset_links": 0, "minimum_indicator_links": 0},
+    )
+
+    call_command("run_programme_scheduler", "--once")
+
+    run = MonitoringProgrammeRun.objects.get(programme=programme)
+    assert run.status == "succeeded"
+    assert run.trigger == "scheduled"
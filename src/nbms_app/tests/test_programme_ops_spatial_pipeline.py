@@ -1,6 +1,18 @@
+from unittest.mock import patch
+
 import pytest
 
-from nbms_app.models import MonitoringProgramme, ProgrammeRunStatus
+from nbms_app.models import (
+    MonitoringProgramme,
+    ProgrammeRunStatus,
+    SensitivityLevel,
+    SpatialFeature,
+    SpatialLayer,
+    SpatialLayerSourceType,
+    SpatialSource,
+    SpatialSourceFormat,
+)
+from nbms_app.services import programme_ops
 from nbms_app.services.programme_ops import queue_programme_run
 
 
@@ -43,3 +55,64 @@ def test_spatial_baselines_programme_records_qa_and_artefacts(monkeypatch):
     assert run.qa_results.count() >= 1
     assert run.artefacts.filter(label="run-report-json").exists()
     assert run.qa_results.first().status == "pass"
+
+
+def _square(x, y):
+    return {"type": "Polygon", "coordinates": [[[x, y], [x + 1, y], [x + 1, y + 1], [x, y + 1], [x, y]]]}
+
+
+def test_spatial_layer_qa_reuses_metrics_for_unchanged_layers():
+    source = SpatialSource.objects.create(
+        code="QA_SOURCE",
+        title="QA source",
+        source_url="https://example.org/file.geojson",
+        source_format=SpatialSourceFormat.GEOJSON,
+        source_type=SpatialLayerSourceType.UPLOADED_FILE,
+        layer_code="QA_LAYER_A",
+        layer_title="QA Layer A",
+        sensitivity=SensitivityLevel.PUBLIC,
+        enabled_by_default=True,
+    )
+    layers = {}
+    for code in ("QA_LAYER_A", "QA_LAYER_B"):
+        layers[code] = SpatialLayer.objects.create(
+            layer_code=code,
+            name=code,
+            slug=code.lower().replace("_", "-"),
+            spatial_source=source,
+        )
+    SpatialFeature.objects.create(layer=layers["QA_LAYER_A"], feature_key="a-1", geometry_json=_square(18, -34))
+    SpatialFeature.objects.create(layer=layers["QA_LAYER_B"], feature_key="b-1", geometry_json=_square(20, -34))
+    programme = MonitoringProgramme.objects.create(
+        programme_code="NBMS-SPATIAL-BASELINES",
+        title="Spatial Baselines Programme",
+        scheduler_enabled=False,
+        pipeline_definition_json={"steps": [{"key": "validate_layers", "type": "validate"}]},
+        data_quality_rules_json={"minimum_dataset_links": 0, "minimum_indicator_links": 0},
+    )
+
+    def _run_qa():
+        with patch(
+            "nbms_app.services.programme_ops._spatial_layer_qa_metrics",
+            wraps=programme_ops._spatial_layer_qa_metrics,
+        ) as spy:
+            run = queue_programme_run(programme=programme, run_type="full", execute_now=True)
+        return run, sorted(spy.call_args.args[0])
+
+    run, checked = _run_qa()
+    assert checked == sorted(layer.id for layer in layers.values())
+    assert run.status == ProgrammeRunStatus.SUCCEEDED
+    assert run.qa_results.filter(code__startswith="SPATIAL_LAYER_QA_LAYER_", status="pass").count() == 2
+
+    _run, checked = _run_qa()
+    assert checked == []
+
+    SpatialFeature.objects.create(layer=layers["QA_LAYER_B"], feature_key="b-2", geometry_json=_square(21, -34))
+    run, checked = _run_qa()
+    assert checked == [layers["QA_LAYER_B"].id]
+    spatial_qa = run.steps.get().details_json["spatial_qa"]
+    assert spatial_qa["layers_revalidated"] == 1
+    assert [(row["layer_code"], row["feature_count"], row["qa_cached"]) for row in spatial_qa["rows"]] == [
+        ("QA_LAYER_A", 1, True),
+        ("QA_LAYER_B", 2, False),
+    ]
@@ -0,0 +1,217 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from nbms_app.models import (
+    MonitoringProgramme,
+    MonitoringProgrammeAlert,
+    MonitoringProgrammeRun,
+    Organisation,
+    ProgrammeRefreshCadence,
+    ProgrammeRunStatus,
+)
+from nbms_app.services import programme_ops
+from nbms_app.services.programme_ops import ProgrammeRunConflict, execute_programme_run, queue_programme_run
+from nbms_app.services.programme_scheduler import (
+    ProgrammeRunScheduler,
+    claim_programme_runs,
+    queue_due_programme_runs,
+    recover_stuck_programme_runs,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+DAG_STEPS = [
+    {"key": "check_datasets", "type": "validate", "depends_on": []},
+    {"key": "check_layers", "type": "validate", "depends_on": []},
+    {"key": "publish", "type": "publish", "depends_on": ["check_datasets", "check_layers"]},
+]
+
+
+def _programme(code, *, steps, minimum_links=0, **extra):
+    org, _ = Organisation.objects.get_or_create(org_code="SCHED-ORG", defaults={"name": "Scheduler Org"})
+    return MonitoringProgramme.objects.create(
+        programme_code=code,
+        title=f"Programme {code}",
+        lead_org=org,
+        pipeline_definition_json={"steps": steps},
+        data_quality_rules_json={"minimum_dataset_links": minimum_links, "minimum_indicator_links": 0},
+        **extra,
+    )
+
+
+def test_steps_follow_declared_dependencies_and_record_timing():
+    programme = _programme("PROG-DAG", steps=DAG_STEPS)
+
+    run = queue_programme_run(programme=programme, execute_now=True)
+    run.refresh_from_db()
+
+    steps = list(run.steps.order_by("ordering"))
+    assert run.status == ProgrammeRunStatus.SUCCEEDED
+    assert [step.depends_on_json for step in steps] == [[], [], ["check_datasets", "check_layers"]]
+    assert all(step.duration_ms is not None for step in steps)
+    assert steps[2].started_at >= max(steps[0].finished_at, steps[1].finished_at)
+    assert run.lease_owner == "" and run.lease_expires_at is None
+    assert run.lineage_json["steps"][2]["depends_on"] == ["check_datasets", "check_layers"]
+
+
+def test_blocked_step_stops_dependent_steps():
+    programme = _programme("PROG-DAG-BLOCKED", steps=DAG_STEPS, minimum_links=1)
+
+    run = queue_programme_run(programme=programme, execute_now=True)
+    run.refresh_from_db()
+
+    assert run.status == ProgrammeRunStatus.BLOCKED
+    assert list(run.steps.values_list("step_key", "status")) == [("check_datasets", ProgrammeRunStatus.BLOCKED)]
+
+
+def test_independent_steps_run_concurrently_in_threaded_mode(settings, monkeypatch):
+    settings.PROGRAMME_RUN_MODE = "threaded"
+    settings.PROGRAMME_STEP_WORKERS = 2
+    programme = _programme("PROG-DAG-THREADS", steps=DAG_STEPS)
+    barrier = threading.Barrier(2, timeout=10)
+    executed = []
+
+    def fake_run_step(*, step, step_obj, worker_thread=False, **kwargs):
+        if step["key"] != "publish":
+            barrier.wait()
+        executed.append((step["key"], worker_thread))
+        step_obj.status = ProgrammeRunStatus.SUCCEEDED
+        return ProgrammeRunStatus.SUCCEEDED, []
+
+    monkeypatch.setattr(programme_ops, "_run_step", fake_run_step)
+    run = queue_programme_run(programme=programme, execute_now=True)
+
+    assert run.status == ProgrammeRunStatus.SUCCEEDED
+    assert sorted(executed[:2]) == [("check_datasets", True), ("check_layers", True)]
+    assert executed[2] == ("publish", True)
+
+
+def test_due_programmes_are_queued_once_and_claimed_by_one_worker():
+    programme = _programme(
+        "PROG-LEASE",
+        steps=[{"key": "validate", "type": "validate"}],
+        refresh_cadence=ProgrammeRefreshCadence.DAILY,
+        scheduler_enabled=True,
+        next_run_at=timezone.now() - timedelta(hours=1),
+    )
+
+    queued = queue_due_programme_runs()
+    assert [run.programme_id for run in queued] == [programme.pk]
+    assert queue_due_programme_runs() == []
+
+    claimed = claim_programme_runs(lease_owner="worker-a", limit=5)
+    assert [run.pk for run in claimed] == [queued[0].pk]
+    assert claim_programme_runs(lease_owner="worker-b", limit=5) == []
+
+    untouched = execute_programme_run(run=claimed[0], lease_owner="worker-b")
+    assert untouched.status == ProgrammeRunStatus.QUEUED
+
+    run = execute_programme_run(run=claimed[0], lease_owner="worker-a")
+    run.refresh_from_db()
+    assert run.status == ProgrammeRunStatus.SUCCEEDED
+    programme.refresh_from_db()
+    assert programme.next_run_at > timezone.now()
+
+
+def test_stuck_runs_are_recovered_and_programme_requeued():
+    programme = _programme(
+        "PROG-STUCK",
+        steps=[{"key": "validate", "type": "validate"}],
+        refresh_cadence=ProgrammeRefreshCadence.DAILY,
+        scheduler_enabled=True,
+        next_run_at=timezone.now() - timedelta(hours=1),
+    )
+    stuck = MonitoringProgrammeRun.objects.create(
+        programme=programme,
+        status=ProgrammeRunStatus.RUNNING,
+        started_at=timezone.now() - timedelta(hours=1),
+        lease_owner="lost-host:123",
+        lease_expires_at=timezone.now() - timedelta(minutes=5),
+    )
+    stuck.steps.create(ordering=1, step_key="validate", step_type="validate", status=ProgrammeRunStatus.RUNNING)
+
+    assert [run.pk for run in recover_stuck_programme_runs()] == [stuck.pk]
+    stuck.refresh_from_db()
+    assert stuck.status == ProgrammeRunStatus.FAILED
+    assert stuck.steps.get().status == ProgrammeRunStatus.FAILED
+    assert MonitoringProgrammeAlert.objects.filter(run=stuck, code="PROGRAMME_RUN_STUCK").exists()
+
+    claimed = ProgrammeRunScheduler(lease_owner="worker-a").tick()
+    assert len(claimed) == 1
+    claimed[0].refresh_from_db()
+    assert claimed[0].status == ProgrammeRunStatus.SUCCEEDED
+
+
+def test_manual_execution_claims_the_run_once():
+    programme = _programme("PROG-CLAIM", steps=[{"key": "validate", "type": "validate"}])
+    run = queue_programme_run(programme=programme, execute_now=False)
+    stale = MonitoringProgrammeRun.objects.get(pk=run.pk)
+    MonitoringProgrammeRun.objects.filter(pk=run.pk).update(
+        lease_owner="other-host:1",
+        lease_expires_at=timezone.now() + timedelta(minutes=5),
+    )
+
+    with pytest.raises(ProgrammeRunConflict):
+        execute_programme_run(run=stale)
+    assert not stale.steps.exists()
+
+    MonitoringProgrammeRun.objects.filter(pk=run.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+    run = execute_programme_run(run=stale)
+    assert run.status == ProgrammeRunStatus.SUCCEEDED
+
+
+def test_duplicate_step_keys_fail_the_run_before_any_step():
+    programme = _programme(
+        "PROG-DUP",
+        steps=[{"key": "check", "type": "validate"}, {"key": "check", "type": "publish"}],
+    )
+
+    run = queue_programme_run(programme=programme, execute_now=True)
+    run.refresh_from_db()
+
+    assert run.status == ProgrammeRunStatus.FAILED
+    assert "Duplicate pipeline step keys: check." in run.error_message
+    assert not run.steps.exists()
+
+
+def test_step_bookkeeping_errors_fail_the_run_and_release_its_lease(monkeypatch):
+    programme = _programme("PROG-BROKEN", steps=[{"key": "validate", "type": "validate"}])
+
+    def broken_start_step(**kwargs):
+        raise RuntimeError("step table unavailable")
+
+    monkeypatch.setattr(programme_ops, "_start_step", broken_start_step)
+    run = queue_programme_run(programme=programme, execute_now=True)
+    run.refresh_from_db()
+
+    assert run.status == ProgrammeRunStatus.FAILED
+    assert run.error_message == "step table unavailable"
+    assert run.lease_owner == "" and run.lease_expires_at is None
+
+
+def test_inline_steps_keep_the_lease_alive_while_they_run(settings, monkeypatch):
+    settings.PROGRAMME_RUN_HEARTBEAT_SECONDS = 1
+    programme = _programme("PROG-SLOW", steps=[{"key": "validate", "type": "validate"}])
+    beats = []
+    original_execute_step = programme_ops._execute_step
+
+    def slow_step(**kwargs):
+        threading.Event().wait(2.5)
+        return original_execute_step(**kwargs)
+
+    monkeypatch.setattr(programme_ops, "_execute_step", slow_step)
+    monkeypatch.setattr(
+        programme_ops,
+        "heartbeat_programme_run",
+        lambda run, *, lease_owner: beats.append(threading.current_thread().name) or True,
+    )
+
+    run = queue_programme_run(programme=programme, execute_now=True)
+    run.refresh_from_db()
+
+    assert run.status == ProgrammeRunStatus.SUCCEEDED
+    assert len([name for name in beats if name.endswith("-heartbeat")]) >= 2
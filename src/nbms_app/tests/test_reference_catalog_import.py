@@ -3,8 +3,10 @@ import csv
 import pytest
 from django.core.management import call_command
 from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from nbms_app.models import Framework, Organisation
+from nbms_app.models import AuditEvent, Framework, Organisation
 
 
 pytestmark = pytest.mark.django_db
@@ -224,6 +226,70 @@ def test_reference_catalog_import_reports_row_errors(tmp_path, capsys):
     assert "Organisation" in captured.err
 
 
+def test_reference_catalog_import_orders_parents_before_children(tmp_path):
+    path = tmp_path / "orgs.csv"
+    _write_csv(
+        path,
+        ORG_HEADERS,
+        [
+            _row(ORG_HEADERS, org_code="CHILD", org_name="Child", parent_org_code="PARENT"),
+            _row(ORG_HEADERS, org_code="PARENT", org_name="Parent"),
+        ],
+    )
+    call_command("reference_catalog_import", entity="organisation", file=str(path))
+    assert Organisation.objects.filter(org_code="PARENT").exists()
+    assert not Organisation.objects.filter(org_code="CHILD").exists()
+
+    _write_csv(
+        path,
+        ORG_HEADERS,
+        [
+            _row(ORG_HEADERS, org_code="PARENT", org_name="Parent Updated"),
+            _row(ORG_HEADERS, org_code="CHILD", org_name="Child", parent_org_code="PARENT"),
+            _row(ORG_HEADERS, org_code="GRANDCHILD", org_name="Grandchild", parent_org_code="CHILD"),
+        ],
+    )
+    call_command("reference_catalog_import", entity="organisation", file=str(path))
+    grandchild = Organisation.objects.get(org_code="GRANDCHILD")
+    assert grandchild.parent_org.org_code == "CHILD"
+    assert grandchild.parent_org.parent_org.name == "Parent Updated"
+    assert AuditEvent.objects.filter(action="create_organisation").count() == 3
+    assert AuditEvent.objects.filter(action="update_organisation").count() == 1
+
+
+def test_reference_catalog_import_dry_run_writes_nothing(tmp_path, capsys):
+    path = tmp_path / "orgs.csv"
+    _write_csv(path, ORG_HEADERS, [_row(ORG_HEADERS, org_code="ORG-1", org_name="Org One")])
+    call_command("reference_catalog_import", entity="organisation", file=str(path), dry_run=True)
+    captured = capsys.readouterr()
+    assert "Created: 1" in captured.out
+    assert "rows/s" in captured.out
+    assert not Organisation.objects.filter(org_code="ORG-1").exists()
+
+
+def test_reference_catalog_import_query_count_is_independent_of_row_count(tmp_path):
+    Organisation.objects.create(name="Org A", org_code="ORG-A")
+    path = tmp_path / "framework.csv"
+
+    def _import(count):
+        rows = [
+            _row(
+                FRAMEWORK_HEADERS,
+                framework_code=f"FW-{count}-{index}",
+                title=f"Framework {index}",
+                organisation_code="ORG-A",
+            )
+            for index in range(count)
+        ]
+        _write_csv(path, FRAMEWORK_HEADERS, rows)
+        with CaptureQueriesContext(connection) as queries:
+            call_command("reference_catalog_import", entity="framework", file=str(path))
+        return len(queries)
+
+    assert _import(2) == _import(40)
+    assert Framework.objects.count() == 42
+
+
 def test_reference_catalog_export_template_includes_example(tmp_path):
     path = tmp_path / "framework_template.csv"
     call_command(
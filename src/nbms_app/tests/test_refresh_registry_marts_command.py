@@ -1,20 +1,32 @@
+from datetime import date
+from io import StringIO
+
 from django.core.management import call_command
 
 import pytest
 
 from nbms_app.models import (
     AlienTaxonProfile,
+    EICATAssessment,
+    EcosystemGoldDimension,
     EcosystemRiskAssessment,
     EcosystemType,
+    EicatCategory,
+    IASGoldDimension,
     IucnRleCategory,
     LifecycleStatus,
+    Organisation,
     QaStatus,
+    RegistryMart,
+    RegistryMartRefresh,
+    SeicatCategory,
     SensitivityLevel,
     TaxonConcept,
     TaxonGoldSummary,
     EcosystemGoldSummary,
     IASGoldSummary,
 )
+from nbms_app.services.registry_marts import refresh_registry_gold_marts
 
 
 pytestmark = pytest.mark.django_db
@@ -63,3 +75,127 @@ def test_refresh_registry_marts_command_generates_summary_rows():
     assert TaxonGoldSummary.objects.exists()
     assert EcosystemGoldSummary.objects.exists()
     assert IASGoldSummary.objects.exists()
+
+
+def _taxon(code, organisation, **extra):
+    fields = {
+        "taxon_rank": "species",
+        "status": LifecycleStatus.PUBLISHED,
+        "sensitivity": SensitivityLevel.PUBLIC,
+        "qa_status": QaStatus.PUBLISHED,
+        **extra,
+    }
+    return TaxonConcept.objects.create(
+        taxon_code=code,
+        scientific_name=f"Species {code}",
+        organisation=organisation,
+        **fields,
+    )
+
+
+def test_gold_marts_group_sources_in_sql():
+    org = Organisation.objects.create(name="Mart Org", org_code="MART-ORG")
+    first = _taxon("TAX-SQL-1", org, is_native=False, voucher_specimen_count=3)
+    _taxon("TAX-SQL-2", org, is_native=False, voucher_specimen_count=4)
+    _taxon("TAX-SQL-3", org, is_native=False, status=LifecycleStatus.ARCHIVED)
+    profile = AlienTaxonProfile.objects.create(
+        taxon=first,
+        country_code="ZA",
+        is_invasive=True,
+        pathway_code="escape",
+        habitat_types_json=["Riparian", " ", "Grassland"],
+        organisation=org,
+        status=LifecycleStatus.PUBLISHED,
+    )
+    EICATAssessment.objects.create(profile=profile, category=EicatCategory.MO, assessed_on=date(2020, 1, 1))
+    EICATAssessment.objects.create(profile=profile, category=EicatCategory.MR, assessed_on=date(2024, 1, 1))
+    ecosystem = EcosystemType.objects.create(ecosystem_code="ECO-SQL-1", name="Eco", organisation=org)
+    EcosystemRiskAssessment.objects.create(ecosystem_type=ecosystem, assessment_year=2018, category=IucnRleCategory.LC)
+    EcosystemRiskAssessment.objects.create(ecosystem_type=ecosystem, assessment_year=2024, category=IucnRleCategory.CR)
+
+    summary = refresh_registry_gold_marts(snapshot_date=date(2026, 1, 1))
+
+    assert summary["taxon_rows"] == 2
+    taxon_rows = {
+        row.is_ias: (row.taxon_count, row.voucher_count, row.ias_profile_count)
+        for row in TaxonGoldSummary.objects.filter(organisation=org)
+    }
+    assert taxon_rows == {True: (1, 3, 1), False: (1, 4, 0)}
+    ecosystem_rows = {
+        (row.dimension, row.dimension_key): (row.ecosystem_count, row.threatened_count)
+        for row in EcosystemGoldSummary.objects.all()
+    }
+    assert ecosystem_rows == {
+        (EcosystemGoldDimension.BIOME, "Unknown"): (1, 1),
+        (EcosystemGoldDimension.BIOREGION, "Unknown"): (1, 1),
+        (EcosystemGoldDimension.THREAT_CATEGORY, "CR"): (1, 1),
+    }
+    ias_rows = {
+        (row.dimension, row.dimension_key, row.dimension_label, row.eicat_category, row.seicat_category): row.invasive_count
+        for row in IASGoldSummary.objects.all()
+    }
+    assert ias_rows == {
+        (IASGoldDimension.HABITAT, "riparian", "Riparian", EicatCategory.MR, SeicatCategory.NE): 1,
+        (IASGoldDimension.HABITAT, "grassland", "Grassland", EicatCategory.MR, SeicatCategory.NE): 1,
+        (IASGoldDimension.SYSTEM, "escape", "escape", EicatCategory.MR, SeicatCategory.NE): 1,
+    }
+
+
+def test_refresh_recomputes_only_changed_partitions():
+    changed_org = Organisation.objects.create(name="Changed Org", org_code="MART-CHANGED")
+    stable_org = Organisation.objects.create(name="Stable Org", org_code="MART-STABLE")
+    changed_taxon = _taxon("TAX-INC-1", changed_org)
+    _taxon("TAX-INC-2", stable_org)
+    snapshot = date(2026, 1, 1)
+
+    first = refresh_registry_gold_marts(snapshot_date=snapshot)
+    assert first["marts"]["taxon"]["full_rebuild"] is True
+    stable_uuid = TaxonGoldSummary.objects.get(organisation=stable_org).uuid
+
+    unchanged = refresh_registry_gold_marts(snapshot_date=snapshot)
+    assert unchanged["marts"]["taxon"]["partitions_refreshed"] == 0
+    assert unchanged["marts"]["taxon"]["rows_written"] == 0
+
+    changed_taxon.voucher_specimen_count = 5
+    changed_taxon.save()
+    incremental = refresh_registry_gold_marts(snapshot_date=snapshot)
+
+    assert incremental["marts"]["taxon"]["full_rebuild"] is False
+    assert incremental["marts"]["taxon"]["partitions_refreshed"] == 1
+    assert TaxonGoldSummary.objects.get(organisation=changed_org).voucher_count == 5
+    assert TaxonGoldSummary.objects.get(organisation=stable_org).uuid == stable_uuid
+
+    next_day = refresh_registry_gold_marts(snapshot_date=date(2026, 1, 2))
+    assert next_day["marts"]["taxon"]["partitions_refreshed"] == 0
+    assert next_day["taxon_rows"] == 2
+    assert TaxonGoldSummary.objects.get(snapshot_date=date(2026, 1, 2), organisation=changed_org).voucher_count == 5
+    assert RegistryMartRefresh.objects.filter(mart=RegistryMart.TAXON).count() == 4
+
+
+def test_refresh_recomputes_partition_when_a_profile_moves_to_another_taxon():
+    org = Organisation.objects.create(name="Move Org", org_code="MART-MOVE")
+    first = _taxon("TAX-MOVE-1", org, is_native=False, voucher_specimen_count=3)
+    second = _taxon("TAX-MOVE-2", org, is_native=False, voucher_specimen_count=4)
+    profile = AlienTaxonProfile.objects.create(taxon=first, country_code="ZA", organisation=org)
+    snapshot = date(2026, 1, 1)
+    refresh_registry_gold_marts(snapshot_date=snapshot)
+
+    AlienTaxonProfile.objects.filter(pk=profile.pk).update(taxon=second)
+    refreshed = refresh_registry_gold_marts(snapshot_date=snapshot)
+
+    assert refreshed["marts"]["taxon"]["partitions_refreshed"] == 1
+    assert {
+        row.is_ias: row.voucher_count for row in TaxonGoldSummary.objects.filter(organisation=org)
+    } == {True: 4, False: 3}
+
+
+def test_refresh_registry_marts_command_reports_mart_timings():
+    _taxon("TAX-CMD-1", None)
+    out = StringIO()
+
+    call_command("refresh_registry_marts", stdout=out)
+
+    output = out.getvalue()
+    assert "taxon: rows=1" in output
+    assert "ecosystem: rows=0" in output
+    assert "(full rebuild," in output
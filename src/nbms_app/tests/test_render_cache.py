@@ -0,0 +1,205 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from nbms_app import api_spa
+from nbms_app.models import (
+    AnnexSectionResponse,
+    Organisation,
+    RenderCacheEntry,
+    ReportExportArtifact,
+    ReportingCycle,
+    ReportingInstance,
+    User,
+)
+from nbms_app.services import render_cache
+from nbms_app.services.render_cache import (
+    cached_render,
+    cached_render_async,
+    render_cache_stats,
+    renderer_version,
+    template_version,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _render_counter():
+    calls = []
+
+    def render(label):
+        def _render(generated_at):
+            calls.append(label)
+            return f"%PDF-{label}".encode("utf-8")
+
+        return _render
+
+    return calls, render
+
+
+def test_cached_render_hits_on_same_payload_and_misses_on_change():
+    calls, render = _render_counter()
+    kwargs = {"kind": "test_pdf", "renderer": "pdf", "content_type": "application/pdf"}
+
+    first = cached_render(payload={"a": 1, "b": [1, 2]}, render=render("one"), **kwargs)
+    second = cached_render(payload={"b": [1, 2], "a": 1}, render=render("two"), **kwargs)
+    third = cached_render(payload={"a": 2, "b": [1, 2]}, render=render("three"), **kwargs)
+
+    assert first == second == b"%PDF-one"
+    assert third == b"%PDF-three"
+    assert calls == ["one", "three"]
+    entry = RenderCacheEntry.objects.get(content_hash__isnull=False, size_bytes=len(first), hit_count=1)
+    assert entry.kind == "test_pdf"
+    assert entry.renderer_version.startswith("xhtml2pdf-")
+    assert render_cache_stats()["entries"] == 2
+
+
+def test_cached_render_evicts_least_recently_used(settings):
+    settings.RENDER_CACHE_MAX_ENTRIES = 2
+    settings.RENDER_CACHE_EVICT_EVERY = 1
+    calls, render = _render_counter()
+    kwargs = {"kind": "test_pdf", "renderer": "pdf", "content_type": "application/pdf"}
+
+    cached_render(payload={"n": 1}, render=render("1"), **kwargs)
+    cached_render(payload={"n": 2}, render=render("2"), **kwargs)
+    cached_render(payload={"n": 1}, render=render("1-again"), **kwargs)
+    cached_render(payload={"n": 3}, render=render("3"), **kwargs)
+    cached_render(payload={"n": 1}, render=render("1-third"), **kwargs)
+    cached_render(payload={"n": 2}, render=render("2-again"), **kwargs)
+
+    assert calls == ["1", "2", "3", "2-again"]
+    assert RenderCacheEntry.objects.count() == 2
+
+
+def test_fingerprint_keyed_render_skips_the_payload_build_and_keeps_its_timestamp():
+    builds = []
+
+    def submit(generated_at):
+        builds.append(generated_at)
+        return f"%PDF-{generated_at.isoformat()}".encode("utf-8")
+
+    kwargs = {
+        "kind": "test_pdf",
+        "renderer": "pdf",
+        "content_type": "application/pdf",
+        "submit": submit,
+        "metadata": lambda: {"builds": len(builds)},
+    }
+
+    first = cached_render_async(fingerprint={"instance": [1, 3]}, **kwargs)
+    first_bytes = first()
+    second = cached_render_async(fingerprint={"instance": [1, 3]}, **kwargs)
+    third = cached_render_async(fingerprint={"instance": [1, 4]}, **kwargs)
+
+    assert len(builds) == 2
+    assert second() == first_bytes == f"%PDF-{first.generated_at.isoformat()}".encode("utf-8")
+    assert second.generated_at == first.generated_at
+    assert second.metadata == first.metadata == {"builds": 1}
+    assert third.generated_at == builds[1]
+    assert RenderCacheEntry.objects.get(hit_count=1).generated_at == first.generated_at
+
+
+def test_eviction_counter_is_shared_safely_between_threads(settings):
+    settings.RENDER_CACHE_EVICT_EVERY = 7
+    render_cache._EVICT_STATE["stores"] = 0
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        due = list(pool.map(lambda _: render_cache._evict_due(), range(700)))
+
+    assert due.count(True) == 100
+    assert render_cache._EVICT_STATE["stores"] == 0
+
+
+def test_cache_key_covers_extended_templates_and_project_renderer_code(settings):
+    settings.TEMPLATES = [
+        {
+            "BACKEND": "django.template.backends.django.DjangoTemplates",
+            "OPTIONS": {
+                "loaders": [
+                    (
+                        "django.template.loaders.locmem.Loader",
+                        {
+                            "report.html": '{% extends "base.html" %}{% block body %}{% include "part.html" %}{% endblock %}',
+                            "base.html": "<html>{% block body %}{% endblock %}</html>",
+                            "part.html": "<p>part</p>",
+                        },
+                    )
+                ]
+            },
+        }
+    ]
+    before = template_version("report.html")
+    settings.TEMPLATES[0]["OPTIONS"]["loaders"][0][1]["part.html"] = "<p>changed part</p>"
+    settings.TEMPLATES = list(settings.TEMPLATES)
+    assert template_version("report.html") != before
+
+    def render(generated_at):
+        return b""
+
+    assert renderer_version("docx", render) != renderer_version("docx")
+    assert renderer_version("docx").startswith("python-docx-")
+
+
+def test_repeated_workspace_pdf_export_is_served_from_cache(client, monkeypatch):
+    call_command("seed_mea_template_packs")
+    org = Organisation.objects.create(name="Cache Org", org_code="CACHE-ORG")
+    user = User.objects.create_user(username="cache_user", password="pass1234", organisation=org, is_staff=True)
+    cycle = ReportingCycle.objects.create(
+        code="CACHE-CYCLE",
+        title="Cache Cycle",
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 12, 31),
+        due_date=date(2026, 1, 31),
+    )
+    instance = ReportingInstance.objects.create(
+        cycle=cycle,
+        report_label="NR7",
+        version_label="v1",
+        focal_point_org=org,
+        publishing_authority_org=org,
+        created_by=user,
+        status="submitted",
+    )
+
+    builds = []
+    build_payload = api_spa.build_cbd_report_payload
+
+    def counting_build(**kwargs):
+        builds.append(kwargs["instance"].pk)
+        return build_payload(**kwargs)
+
+    monkeypatch.setattr(api_spa, "build_cbd_report_payload", counting_build)
+    url = reverse("api_reporting_workspace_export_pdf", args=[instance.uuid])
+
+    client.force_login(user)
+    first = client.get(url)
+    second = client.get(url)
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert builds == [instance.pk]
+
+    entry = RenderCacheEntry.objects.get(kind="cbd_report_pdf")
+    assert entry.hit_count == 1
+    generated = {
+        artifact.metadata_json["generated_at"]
+        for artifact in ReportExportArtifact.objects.filter(reporting_instance=instance, format="pdf")
+    }
+    assert generated == {entry.generated_at.isoformat()}
+
+    AnnexSectionResponse.objects.create(
+        reporting_instance=instance,
+        decision_topic_code="TOPIC-1",
+        title="Annex topic",
+        response_json={"answer": "yes"},
+    )
+    third = client.get(url)
+    assert third.status_code == 200
+    assert builds == [instance.pk, instance.pk]
+    assert RenderCacheEntry.objects.filter(kind="cbd_report_pdf").count() == 2
+
+    health = client.get(reverse("api_system_health"))
+    assert health.json()["render_cache"]["entries"] == 2
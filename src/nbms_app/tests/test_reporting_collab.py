@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from datetime import date
+from importlib import import_module
+
+import pytest
+from django.apps import apps
+from django.core.management import call_command
+from django.urls import reverse
+
+from nbms_app.models import (
+    Organisation,
+    ReportingCycle,
+    ReportingInstance,
+    ReportSectionRevision,
+    ReportTemplatePackResponse,
+    ReportTemplatePackSection,
+    RevisionStorageKind,
+    User,
+)
+from nbms_app.services.reporting_collab import (
+    append_revision,
+    ensure_initial_revision,
+    payload_hash,
+    revision_content,
+    revision_contents,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _mk_section_response():
+    call_command("seed_mea_template_packs")
+    org = Organisation.objects.create(name="SANBI", org_code="SANBI")
+    cycle = ReportingCycle.objects.create(
+        code="NR7",
+        title="Seventh National Report",
+        start_date=date(2024, 1, 1),
+        end_date=date(2026, 12, 31),
+        due_date=date(2027, 3, 1),
+    )
+    instance = ReportingInstance.objects.create(
+        cycle=cycle,
+        version_label="v1",
+        focal_point_org=org,
+        publishing_authority_org=org,
+    )
+    section = ReportTemplatePackSection.objects.get(pack__code="cbd_national_report_v1", code="section-i")
+    response = ReportTemplatePackResponse.objects.create(
+        reporting_instance=instance,
+        section=section,
+        response_json={"country_name": "South Africa", "summary": "x" * 200},
+    )
+    ensure_initial_revision(section_response=response)
+    return instance, response
+
+
+def _draft(step):
+    content = {"country_name": "South Africa", "summary": "x" * 200, "step": step}
+    if step % 3 == 0:
+        content["contact_phone"] = f"+27-{step}"
+    return content
+
+
+def test_revisions_store_checkpoints_and_deltas(settings):
+    settings.REPORT_REVISION_CHECKPOINT_INTERVAL = 4
+    _instance, response = _mk_section_response()
+    drafts = {1: dict(response.response_json)}
+    for step in range(2, 11):
+        append_revision(section_response=response, content=_draft(step))
+        drafts[step] = _draft(step)
+
+    rows = {row.version: row for row in ReportSectionRevision.objects.filter(section_response=response)}
+    kinds = {version: row.storage_kind for version, row in rows.items()}
+    assert [version for version, kind in sorted(kinds.items()) if kind == RevisionStorageKind.CHECKPOINT] == [1, 5, 9]
+    assert rows[4].content_snapshot == {}
+    assert rows[4].delta_json == {"set": {"step": 4}, "unset": ["contact_phone"]}
+
+    contents = revision_contents(response, range(1, 11))
+    assert contents == drafts
+    assert revision_content(rows[7]) == drafts[7]
+    for version, row in rows.items():
+        assert payload_hash(contents[version]) == row.content_hash
+        assert row.parent_hash == (rows[version - 1].content_hash if version > 1 else "")
+
+
+def test_section_history_diff_reads_delta_revisions(client, settings):
+    settings.REPORT_REVISION_CHECKPOINT_INTERVAL = 10
+    instance, response = _mk_section_response()
+    for step in range(2, 5):
+        append_revision(section_response=response, content=_draft(step))
+    admin = User.objects.create_superuser(username="admin", password="pass1234", email="admin@example.org")
+    client.force_login(admin)
+
+    history = client.get(
+        reverse("api_reporting_workspace_section_history", args=[instance.uuid, "section-i"]),
+        {"from": 2, "to": 4},
+    )
+
+    assert history.status_code == 200
+    payload = history.json()
+    assert [row["version"] for row in payload["revisions"]] == [4, 3, 2, 1]
+    assert payload["diff"] == {"from_version": 2, "to_version": 4, "changed_keys": ["step"]}
+
+
+def test_section_history_diff_rejects_unknown_and_pruned_versions(client, settings):
+    settings.REPORT_REVISION_CHECKPOINT_INTERVAL = 10
+    instance, response = _mk_section_response()
+    for step in range(2, 5):
+        append_revision(section_response=response, content=_draft(step))
+    admin = User.objects.create_superuser(username="admin", password="pass1234", email="admin@example.org")
+    client.force_login(admin)
+    url = reverse("api_reporting_workspace_section_history", args=[instance.uuid, "section-i"])
+
+    assert client.get(url, {"from": 2, "to": 9}).status_code == 404
+
+    ReportSectionRevision.objects.filter(section_response=response, version=3).delete()
+    pruned = client.get(url, {"from": 2, "to": 4})
+    assert pruned.status_code == 400
+    assert pruned.json() == {"detail": "Revision history is incomplete before version 4."}
+
+
+def test_compaction_migration_rewrites_full_history_as_deltas(settings):
+    settings.REPORT_REVISION_CHECKPOINT_INTERVAL = 3
+    _instance, response = _mk_section_response()
+    previous_hash = response.current_content_hash
+    for step in range(2, 8):
+        content = _draft(step)
+        digest = payload_hash(content)
+        ReportSectionRevision.objects.create(
+            section_response=response,
+            version=step,
+            content_snapshot=content,
+            content_hash=digest,
+            parent_hash=previous_hash,
+        )
+        previous_hash = digest
+    migration = import_module("nbms_app.migrations.0050_reportsectionrevision_delta_storage")
+    before = revision_contents(response, range(1, 8))
+
+    migration._compact_revisions(apps, None)
+
+    kinds = dict(ReportSectionRevision.objects.filter(section_response=response).values_list("version", "storage_kind"))
+    assert [version for version, kind in sorted(kinds.items()) if kind == RevisionStorageKind.CHECKPOINT] == [1, 4, 7]
+    assert revision_contents(response, range(1, 8)) == before
+
+    migration._expand_revisions(apps, None)
+
+    assert set(
+        ReportSectionRevision.objects.filter(section_response=response).values_list("storage_kind", flat=True)
+    ) == {RevisionStorageKind.CHECKPOINT}
+    assert revision_contents(response, range(1, 8)) == before
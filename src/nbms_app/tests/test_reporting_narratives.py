@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from nbms_app.models import (
+    Indicator,
+    IndicatorDataPoint,
+    IndicatorDataSeries,
+    LifecycleStatus,
+    MonitoringProgramme,
+    NationalIndicatorType,
+    NationalTarget,
+    Organisation,
+    ReportingCycle,
+    ReportingInstance,
+    ReportNarrativeBlock,
+    SensitivityLevel,
+)
+from nbms_app.services.reporting_narratives import (
+    render_section_narrative,
+    render_section_narratives,
+    resolve_narrative_tokens,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _seed(indicator_count):
+    org = Organisation.objects.create(name="SANBI", org_code="SANBI")
+    cycle = ReportingCycle.objects.create(
+        code="NR7",
+        title="Seventh National Report",
+        start_date=date(2024, 1, 1),
+        end_date=date(2026, 12, 31),
+        due_date=date(2027, 3, 1),
+    )
+    instance = ReportingInstance.objects.create(cycle=cycle, version_label="v1", focal_point_org=org)
+    target = NationalTarget.objects.create(
+        code="NT-1",
+        title="Target 1",
+        organisation=org,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+    for index in range(indicator_count):
+        indicator = Indicator.objects.create(
+            code=f"IND-{index}",
+            title=f"Indicator {index}",
+            national_target=target,
+            organisation=org,
+            indicator_type=NationalIndicatorType.OTHER,
+            status=LifecycleStatus.PUBLISHED,
+            sensitivity=SensitivityLevel.PUBLIC,
+        )
+        series = IndicatorDataSeries.objects.create(
+            indicator=indicator,
+            title=f"Series {index}",
+            organisation=org,
+            status=LifecycleStatus.PUBLISHED,
+            sensitivity=SensitivityLevel.PUBLIC,
+        )
+        IndicatorDataPoint.objects.create(series=series, year=2021, value_numeric=Decimal(index))
+        IndicatorDataPoint.objects.create(series=series, year=2022, value_text=f"latest {index}")
+    MonitoringProgramme.objects.create(programme_code="PROG-1", title="Coastal Monitoring", lead_org=org)
+    return instance
+
+
+def _narrative(indicator_count, section):
+    tokens = []
+    for index in range(indicator_count):
+        tokens.append(f"[[nbms:indicator code=IND-{index}]]")
+        tokens.append(f"[[nbms:indicator code=IND-{index} year=2021]]")
+    tokens.append("[[nbms:programme code=PROG-1]]")
+    tokens.append("[[nbms:indicator code=IND-MISSING]]")
+    tokens.append("[[nbms:registry kind=taxa]]")
+    return f"<p>{section}: " + " ".join(tokens) + "</p>"
+
+
+def _add_blocks(instance, indicator_count):
+    for section_code in ("section-i", "section-iii"):
+        ReportNarrativeBlock.objects.create(
+            reporting_instance=instance,
+            section_code=section_code,
+            block_key="main",
+            title="Narrative",
+            html_snapshot=_narrative(indicator_count, section_code),
+        )
+
+
+def test_batched_render_matches_single_section_manifest():
+    instance = _seed(2)
+    _add_blocks(instance, 2)
+    context = {"indicator_code": "IND-1"}
+
+    rendered = render_section_narratives(
+        instance=instance,
+        section_codes=["section-i", "section-iii", "section-v"],
+        context_filters=context,
+    )
+
+    assert rendered["section-i"]["rendered_html"] == (
+        "<p>section-i: latest 0 0.0 latest 1 1.0 Coastal Monitoring  </p>"
+    )
+    assert rendered["section-v"]["rendered_html"] == ""
+    manifest = rendered["section-iii"]["resolved_values_manifest"]
+    assert manifest[1] == {
+        "token": "[[nbms:indicator code=IND-0 year=2021]]",
+        "token_type": "indicator",
+        "params": {"code": "IND-0", "year": "2021"},
+        "resolved_value": "0.0",
+        "source": "indicator_data_point",
+        "context_hash": rendered["section-iii"]["context_hash"],
+    }
+    assert manifest[-1]["source"] == "registry_gold:taxa"
+    for section_code in ("section-i", "section-iii"):
+        assert render_section_narrative(
+            instance=instance,
+            section_code=section_code,
+            context_filters=context,
+        ) == rendered[section_code]
+
+    inline = resolve_narrative_tokens(html="[[nbms:indicator year=2021]]", context_filters=context)
+    assert inline["rendered_html"] == "1.0"
+
+
+def test_render_queries_do_not_grow_with_token_count():
+    instance = _seed(12)
+    _add_blocks(instance, 1)
+    with CaptureQueriesContext(connection) as small:
+        render_section_narratives(instance=instance, section_codes=["section-i", "section-iii"])
+
+    for block in ReportNarrativeBlock.objects.filter(reporting_instance=instance):
+        block.html_snapshot = _narrative(12, block.section_code)
+        block.save(update_fields=["html_snapshot"])
+    with CaptureQueriesContext(connection) as large:
+        render_section_narratives(instance=instance, section_codes=["section-i", "section-iii"])
+
+    assert len(large) == len(small)
@@ -1,30 +1,53 @@
-from datetime import date, datetime, timezone as py_timezone
+from datetime import date, datetime, timedelta, timezone as py_timezone
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
 from django.contrib.auth.models import Group
 from django.core.exceptions import ValidationError
 from django.core.management import call_command
+from django.db import connection
 from django.urls import reverse
+from django.utils import timezone
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 
 from nbms_app.models import (
+    DataAgreement,
+    DatasetCatalog,
+    DatasetCatalogIndicatorLink,
+    Evidence,
     Indicator,
     LifecycleStatus,
+    MonitoringProgramme,
     NationalTarget,
     Organisation,
+    ProgrammeDatasetLink,
+    ProgrammeIndicatorLink,
     ProgressStatus,
     ReportSectionResponse,
     ReportSectionTemplate,
     ReportingCycle,
     ReportingInstance,
+    ReportingSnapshotBlob,
     SectionIIINationalTargetProgress,
+    SensitivityClass,
     SensitivityLevel,
     User,
 )
 from nbms_app.services.authorization import ROLE_DATA_STEWARD
+from nbms_app.services.export_context import ExportBuildContext
 from nbms_app.services.instance_approvals import approve_for_instance
-from nbms_app.services.snapshots import create_reporting_snapshot
+from nbms_app.services.readiness import compute_reporting_readiness
+from nbms_app.exports.ort_nr7_v2 import build_ort_nr7_v2_payload
+from nbms_app.services.snapshots import (
+    create_reporting_snapshot,
+    diff_snapshot_records,
+    diff_snapshots,
+    prune_snapshot_blobs,
+    snapshot_payload,
+    store_snapshot_payload,
+)
 
 
 pytestmark = pytest.mark.django_db
@@ -253,3 +276,187 @@ def test_snapshot_diff_detects_controlled_change(client):
     assert response.status_code == 200
     content = response.content.decode("utf-8")
     assert "NT-1" in content
+
+
+@override_settings(EXPORT_REQUIRE_SECTIONS=True)
+def test_snapshot_payload_chunks_are_shared_and_diffed_by_hash():
+    instance, user, progress = _setup_exportable_instance()
+    time_a = datetime(2026, 1, 22, 12, 0, 0, tzinfo=py_timezone.utc)
+    time_b = datetime(2026, 1, 22, 13, 0, 0, tzinfo=py_timezone.utc)
+
+    with patch("nbms_app.exports.ort_nr7_v2.timezone.now", return_value=time_a):
+        snapshot_a = create_reporting_snapshot(instance=instance, user=user)
+        payload_a = build_ort_nr7_v2_payload(instance=instance, user=user)
+    blob_count = ReportingSnapshotBlob.objects.count()
+
+    progress.summary = "Updated summary"
+    progress.save(update_fields=["summary"])
+
+    with patch("nbms_app.exports.ort_nr7_v2.timezone.now", return_value=time_b):
+        snapshot_b = create_reporting_snapshot(instance=instance, user=user)
+        payload_b = build_ort_nr7_v2_payload(instance=instance, user=user)
+
+    assert snapshot_a.payload_json is None
+    assert snapshot_payload(snapshot_a) == payload_a
+    assert list(snapshot_payload(snapshot_b)) == list(payload_b)
+    # Only the new root and the changed Section III entry are stored again.
+    assert ReportingSnapshotBlob.objects.count() == blob_count + 2
+    sections_a = snapshot_a.payload_manifest_json["chunks"]["sections"]
+    assert sections_a == snapshot_b.payload_manifest_json["chunks"]["sections"]
+
+    diff = diff_snapshot_records(snapshot_a, snapshot_b)
+    assert diff == diff_snapshots(payload_a, payload_b)
+    assert diff["section_iii_progress"]["modified"] == [{"key": "NT-1", "changed_fields": ["summary"]}]
+    assert diff["sections"] == {"added": [], "removed": [], "modified": []}
+
+
+def _chunked_snapshot(payload):
+    return SimpleNamespace(payload_manifest_json=store_snapshot_payload(payload))
+
+
+def test_snapshot_diff_keeps_rows_with_duplicate_or_missing_identities():
+    def progress(code, summary):
+        return {"national_target": {"code": code}, "progress_status": "in_progress", "summary": summary}
+
+    payload_a = {
+        "schema": "test",
+        "sections": [{"code": None, "content": {"a": 1}}, {"code": None, "content": {"b": 1}}],
+        "section_iii_progress": [progress("NT-1", "first"), progress("NT-1", "second"), progress("NT-2", "same")],
+    }
+    payload_b = {
+        "schema": "test",
+        "sections": [{"code": None, "content": {"a": 1}}, {"code": None, "content": {"b": 2}}],
+        "section_iii_progress": [progress("NT-1", "first"), progress("NT-1", "changed"), progress("NT-2", "same")],
+    }
+
+    diff = diff_snapshot_records(_chunked_snapshot(payload_a), _chunked_snapshot(payload_b))
+
+    assert diff == diff_snapshots(payload_a, payload_b)
+    assert diff["sections"]["modified"] == ["#2"]
+    assert diff["section_iii_progress"]["modified"] == [{"key": "NT-1#2", "changed_fields": ["summary"]}]
+
+
+@override_settings(EXPORT_REQUIRE_SECTIONS=True)
+def test_prune_snapshot_blobs_deletes_only_old_unreferenced_chunks():
+    instance, user, _progress = _setup_exportable_instance()
+    snapshot = create_reporting_snapshot(instance=instance, user=user)
+    store_snapshot_payload({"schema": "orphan", "sections": [{"code": "orphan", "content": {}}]})
+    referenced_count = ReportingSnapshotBlob.objects.count() - 2
+
+    assert prune_snapshot_blobs() == 0
+    assert prune_snapshot_blobs(older_than=timezone.now() + timedelta(seconds=1)) == 2
+    assert ReportingSnapshotBlob.objects.count() == referenced_count
+    assert snapshot_payload(snapshot)
+
+    call_command("prune_snapshot_blobs", "--grace-minutes", "0")
+    assert ReportingSnapshotBlob.objects.count() == referenced_count
+
+
+def _add_scoped_targets(instance, user, indexes):
+    for index in indexes:
+        target = NationalTarget.objects.create(
+            code=f"NT-X{index}",
+            title=f"Extra target {index}",
+            organisation=user.organisation,
+            created_by=user,
+            status=LifecycleStatus.PUBLISHED,
+            sensitivity=SensitivityLevel.INTERNAL,
+        )
+        evidence = Evidence.objects.create(
+            title=f"Evidence {index}",
+            organisation=user.organisation,
+            created_by=user,
+            status=LifecycleStatus.PUBLISHED,
+            sensitivity=SensitivityLevel.INTERNAL,
+        )
+        approve_for_instance(instance, target, user)
+        approve_for_instance(instance, evidence, user)
+        progress = SectionIIINationalTargetProgress.objects.create(
+            reporting_instance=instance,
+            national_target=target,
+            progress_status=ProgressStatus.IN_PROGRESS,
+            summary=f"Summary {index}",
+        )
+        progress.evidence_items.add(evidence)
+
+
+@override_settings(EXPORT_REQUIRE_SECTIONS=True)
+def test_snapshot_queries_do_not_grow_with_progress_entries():
+    instance, user, _progress = _setup_exportable_instance()
+    _add_scoped_targets(instance, user, range(1))
+    with CaptureQueriesContext(connection) as small:
+        create_reporting_snapshot(instance=instance, user=user)
+
+    _add_scoped_targets(instance, user, range(1, 6))
+    with patch(
+        "nbms_app.services.readiness.compute_reporting_readiness",
+        wraps=compute_reporting_readiness,
+    ) as readiness_spy, CaptureQueriesContext(connection) as large:
+        create_reporting_snapshot(instance=instance, user=user)
+
+    assert readiness_spy.call_count == 1
+    assert len(large) <= len(small)
+
+
+def _add_linked_indicators(instance, user, indexes):
+    target = NationalTarget.objects.get(code="NT-1")
+    for index in indexes:
+        agreement = DataAgreement.objects.create(agreement_code=f"AG-{index}", title=f"Agreement {index}")
+        programme = MonitoringProgramme.objects.create(
+            programme_code=f"PRG-{index}",
+            title=f"Programme {index}",
+            lead_org=user.organisation,
+            agreement=agreement,
+            sensitivity_class=SensitivityClass.objects.create(
+                sensitivity_code=f"SC-{index}",
+                sensitivity_name=f"Class {index}",
+                access_level_default="internal",
+            ),
+        )
+        dataset = DatasetCatalog.objects.create(
+            dataset_code=f"DS-{index}",
+            title=f"Dataset {index}",
+            custodian_org=user.organisation,
+            access_level="internal",
+            agreement=agreement,
+        )
+        indicator = Indicator.objects.create(
+            code=f"IND-L{index}",
+            title=f"Linked indicator {index}",
+            national_target=target,
+            organisation=user.organisation,
+            created_by=user,
+            status=LifecycleStatus.PUBLISHED,
+            sensitivity=SensitivityLevel.INTERNAL,
+        )
+        approve_for_instance(instance, indicator, user)
+        ProgrammeDatasetLink.objects.create(programme=programme, dataset=dataset)
+        ProgrammeIndicatorLink.objects.create(programme=programme, indicator=indicator)
+        DatasetCatalogIndicatorLink.objects.create(dataset=dataset, indicator=indicator)
+    _add_scoped_targets(instance, user, indexes)
+
+
+def _readiness_query_counts(instance, user):
+    counts = {}
+    with CaptureQueriesContext(connection) as queries:
+        ExportBuildContext(instance, user).instance_readiness()
+    counts["instance"] = len(queries)
+    with CaptureQueriesContext(connection) as queries:
+        compute_reporting_readiness(instance.uuid, scope="selected", user=user)
+    counts["authoring"] = len(queries)
+    with CaptureQueriesContext(connection) as queries:
+        ExportBuildContext(instance, user).release_readiness()
+    counts["release"] = len(queries)
+    return counts
+
+
+@override_settings(EXPORT_REQUIRE_SECTIONS=True)
+def test_readiness_queries_do_not_grow_with_targets_and_indicators():
+    instance, user, _progress = _setup_exportable_instance()
+    _add_linked_indicators(instance, user, range(1, 2))
+    small = _readiness_query_counts(instance, user)
+
+    _add_linked_indicators(instance, user, range(2, 8))
+    large = _readiness_query_counts(instance, user)
+
+    assert all(large[key] <= small[key] for key in small), (small, large)
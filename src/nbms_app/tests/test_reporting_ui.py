@@ -1,9 +1,10 @@
 from datetime import date
 
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 
-from nbms_app.models import Organisation, ReportingCycle, ReportingInstance, User
+from nbms_app.models import Organisation, ReportingCycle, ReportingInstance, ReportTemplatePackResponse, User
 
 
 class ReportingUiTests(TestCase):
@@ -40,3 +41,23 @@ class ReportingUiTests(TestCase):
         self.assertEqual(resp.status_code, 200)
         resp = self.client.get(reverse("nbms_app:reporting_instance_detail", args=[self.instance.uuid]))
         self.assertEqual(resp.status_code, 200)
+
+    def _create_instance(self):
+        self.client.force_login(self.staff)
+        return self.client.post(
+            reverse("nbms_app:reporting_instance_create"),
+            {"cycle": self.cycle.pk, "version_label": "v2", "status": "draft", "notes": ""},
+        )
+
+    def test_instance_create_bootstraps_its_workspace(self):
+        call_command("seed_mea_template_packs")
+        resp = self._create_instance()
+        instance = ReportingInstance.objects.get(version_label="v2")
+        self.assertRedirects(resp, reverse("nbms_app:reporting_instance_detail", args=[instance.uuid]))
+        self.assertTrue(ReportTemplatePackResponse.objects.filter(reporting_instance=instance).exists())
+
+    def test_instance_create_reports_bootstrap_errors_and_keeps_nothing(self):
+        resp = self._create_instance()
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "CBD National Report template pack is not seeded.")
+        self.assertFalse(ReportingInstance.objects.filter(version_label="v2").exists())
@@ -4,12 +4,15 @@ from datetime import date
 import json
 import hashlib
 import io
+from unittest.mock import patch
 from zipfile import ZipFile
 
 import pytest
 from django.contrib.auth.models import Group
 from django.core.management import call_command
 from django.core.files.storage import default_storage
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from nbms_app.models import (
@@ -18,6 +21,8 @@ from nbms_app.models import (
     Organisation,
     ReportingCycle,
     ReportingInstance,
+    ReportTemplatePackResponse,
+    ReportWorkflowInstance,
     SectionIIINationalTargetProgress,
     User,
 )
@@ -28,6 +33,7 @@ from nbms_app.services.authorization import (
     ROLE_SYSTEM_ADMIN,
     ROLE_TECHNICAL_COMMITTEE,
 )
+from nbms_app.services.template_packs import build_pack_validation
 
 
 pytestmark = pytest.mark.django_db
@@ -238,6 +244,9 @@ def test_workspace_collaboration_workflow_exports_and_dossier(client):
     with default_storage.open(dossier_payload["storage_path"], mode="rb") as fh:
         payload = fh.read()
     assert hashlib.sha256(payload).hexdigest() == dossier_payload["content_hash"]
+    manifest = dossier_payload["manifest_json"]
+    assert manifest["dossier_size_bytes"] == len(payload)
+    assert {"payload", "renders", "pdf_wait", "zip", "store_dossier"} <= set(manifest["stage_timings_ms"])
     with ZipFile(io.BytesIO(payload), "r") as zf:
         names = sorted(zf.namelist())
         assert names == [
@@ -272,3 +281,63 @@ def test_internal_report_blocks_unauthorized_dossier_access(client):
     client.force_login(outsider)
     blocked = client.get(reverse("api_reporting_workspace_latest_dossier", args=[instance.uuid]))
     assert blocked.status_code == 403
+
+
+def test_workspace_summary_is_read_only_and_caches_validation(client):
+    call_command("bootstrap_roles")
+    call_command("seed_mea_template_packs")
+    org = Organisation.objects.create(name="SANBI", org_code="SANBI")
+    author = _mk_user(org, "author", [ROLE_SECTION_LEAD])
+    client.force_login(author)
+
+    created = client.post(
+        reverse("api_reporting_instances"),
+        {"report_label": "NR7", "country_name": "South Africa"},
+        content_type="application/json",
+    )
+    assert created.status_code == 201
+    instance = ReportingInstance.objects.get(uuid=created.json()["instance"]["uuid"])
+    assert ReportTemplatePackResponse.objects.filter(reporting_instance=instance).count() == 6
+    assert not ReportTemplatePackResponse.objects.filter(reporting_instance=instance, revisions__isnull=True).exists()
+    assert ReportWorkflowInstance.objects.filter(reporting_instance=instance).count() == 1
+
+    summary_url = reverse("api_reporting_workspace_summary", args=[instance.uuid])
+    with patch(
+        "nbms_app.services.reporting_workspace.build_pack_validation",
+        wraps=build_pack_validation,
+    ) as validation_spy, CaptureQueriesContext(connection) as queries:
+        first = client.get(summary_url)
+        second = client.get(summary_url)
+    assert first.status_code == second.status_code == 200
+    assert first.json()["validation"] == second.json()["validation"]
+    assert all(row["latest_revision_uuid"] for row in first.json()["sections"])
+    assert validation_spy.call_count == 1
+    writes = [
+        query["sql"]
+        for query in queries.captured_queries
+        if query["sql"].startswith(("INSERT", "UPDATE", "DELETE")) and "django_session" not in query["sql"]
+    ]
+    assert writes == []
+
+    _seed_section_content(client, instance)
+    with patch(
+        "nbms_app.services.reporting_workspace.build_pack_validation",
+        wraps=build_pack_validation,
+    ) as validation_spy:
+        refreshed = client.get(summary_url)
+    assert validation_spy.call_count == 1
+    sections = {row["section_code"]: row for row in refreshed.json()["sections"]}
+    assert sections["section-i"]["current_version"] == 2
+    preview_sections = {row["code"]: row for row in refreshed.json()["preview_payload"]["sections"]}
+    assert preview_sections["section-i"]["content"]["contact_name"] == "Demo Contact"
+
+    carried = client.post(reverse("api_reporting_workspace_create_nr8_from_nr7", args=[instance.uuid]))
+    assert carried.status_code == 201
+    nr8 = ReportingInstance.objects.get(uuid=carried.json()["new_instance_uuid"])
+    assert ReportWorkflowInstance.objects.filter(reporting_instance=nr8).count() == 1
+    nr8_rows = {row.section.code: row for row in ReportTemplatePackResponse.objects.filter(reporting_instance=nr8)}
+    assert len(nr8_rows) == 6
+    assert all(row.current_version == 1 and row.revisions.count() == 1 for row in nr8_rows.values())
+    assert nr8_rows["section-i"].response_json["contact_name"] == "Demo Contact"
+    assert nr8_rows["section-i"].response_json["report_label"] == "NR8"
+    assert nr8_rows["section-i"].response_json["_carry_forward_needs_review"] is True
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from nbms_app.models import (
+    Indicator,
+    IndicatorDataPoint,
+    IndicatorDataSeries,
+    LifecycleStatus,
+    NationalIndicatorType,
+    NationalTarget,
+    Organisation,
+    ReportingCycle,
+    ReportingInstance,
+    ReportSectionChartData,
+    ReportTemplatePackResponse,
+    SensitivityLevel,
+    User,
+)
+from nbms_app.services.reporting_narratives import build_section_chart_specs
+from nbms_app.services.reporting_workflow import bootstrap_report_workspace, resolve_cbd_pack
+from nbms_app.services.section_charts import build_section_charts, section_chart_data, visible_section_charts
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _seed():
+    call_command("seed_mea_template_packs")
+    org = Organisation.objects.create(name="SANBI", org_code="SANBI")
+    cycle = ReportingCycle.objects.create(
+        code="NR7",
+        title="Seventh National Report",
+        start_date=date(2024, 1, 1),
+        end_date=date(2026, 12, 31),
+        due_date=date(2027, 3, 1),
+    )
+    instance = ReportingInstance.objects.create(cycle=cycle, version_label="v1", focal_point_org=org)
+    bootstrap_report_workspace(instance)
+    target = NationalTarget.objects.create(
+        code="NT-1",
+        title="Target 1",
+        organisation=org,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+    series = {}
+    for code, sensitivity in (("IND-PUB", SensitivityLevel.PUBLIC), ("IND-RES", SensitivityLevel.RESTRICTED)):
+        indicator = Indicator.objects.create(
+            code=code,
+            title=f"Indicator {code}",
+            national_target=target,
+            organisation=org,
+            indicator_type=NationalIndicatorType.OTHER,
+            status=LifecycleStatus.PUBLISHED,
+            sensitivity=sensitivity,
+        )
+        series[code] = IndicatorDataSeries.objects.create(
+            indicator=indicator,
+            title=f"Series {code}",
+            organisation=org,
+            status=LifecycleStatus.PUBLISHED,
+            sensitivity=sensitivity,
+        )
+        IndicatorDataPoint.objects.create(series=series[code], year=2021, value_numeric=Decimal("10"))
+        IndicatorDataPoint.objects.create(series=series[code], year=2022, value_numeric=Decimal("14"))
+    response = ReportTemplatePackResponse.objects.get(reporting_instance=instance, section__code="section-ii")
+    response.response_json = {**response.response_json, "linkages_indicator_codes": ["IND-PUB", "IND-RES"]}
+    response.save(update_fields=["response_json"])
+    return instance, series
+
+
+def test_chart_data_covers_every_section_and_filters_indicator_charts():
+    instance, series = _seed()
+    admin = User.objects.create_superuser(username="admin", password="pass1234", email="admin@example.org")
+    public_indicator = series["IND-PUB"].indicator
+    mixed = Indicator.objects.create(
+        code="IND-MIX",
+        title="Indicator IND-MIX",
+        national_target=public_indicator.national_target,
+        organisation=public_indicator.organisation,
+        indicator_type=NationalIndicatorType.OTHER,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.PUBLIC,
+    )
+    restricted = IndicatorDataSeries.objects.create(
+        indicator=mixed,
+        title="Restricted hectares",
+        unit="ha",
+        organisation=public_indicator.organisation,
+        status=LifecycleStatus.PUBLISHED,
+        sensitivity=SensitivityLevel.RESTRICTED,
+    )
+    IndicatorDataPoint.objects.create(series=restricted, year=2021, value_numeric=Decimal("5000"))
+    response = ReportTemplatePackResponse.objects.get(reporting_instance=instance, section__code="section-ii")
+    response.response_json = {**response.response_json, "linkages_indicator_codes": ["IND-PUB", "IND-RES", "IND-MIX"]}
+    response.save(update_fields=["response_json"])
+    assert ReportSectionChartData.objects.filter(reporting_instance=instance).count() == 6
+
+    with CaptureQueriesContext(connection) as queries:
+        admin_charts = build_section_chart_specs(instance=instance, section_code="section-ii", user=admin)["charts"]
+        public_charts = build_section_chart_specs(instance=instance, section_code="section-ii")["charts"]
+
+    assert not [query["sql"] for query in queries.captured_queries if "reportsectionchartdata" in query["sql"] and not query["sql"].startswith("SELECT")]
+    assert [chart["id"] for chart in admin_charts] == [
+        "section-ii-completion",
+        "section-ii-indicator-IND-MIX",
+        "section-ii-indicator-IND-PUB",
+        "section-ii-indicator-IND-RES",
+    ]
+    assert [chart["id"] for chart in public_charts] == ["section-ii-completion", "section-ii-indicator-IND-PUB"]
+    assert admin_charts[1]["spec"]["data"][0]["name"] == "Restricted hectares (ha)"
+    assert admin_charts[1]["spec"]["data"][0]["y"] == [5000.0]
+    assert public_charts[1]["spec"]["data"][0]["name"] == "Series IND-PUB"
+    assert public_charts[1]["spec"]["data"][0]["x"] == [2021, 2022]
+    assert public_charts[1]["spec"]["data"][0]["y"] == [10.0, 14.0]
+
+
+def test_chart_data_is_stored_on_save_and_indicator_data_read_live():
+    instance, series = _seed()
+    pack = resolve_cbd_pack()
+
+    response = ReportTemplatePackResponse.objects.get(reporting_instance=instance, section__code="section-iii")
+    with patch("nbms_app.services.section_charts.build_section_charts", wraps=build_section_charts) as spy:
+        response.save(update_fields=["updated_at"])
+    assert spy.call_count == 1
+    assert ReportSectionChartData.objects.get(reporting_instance=instance, section_code="section-iii").charts_json[0][
+        "spec"
+    ]["data"][0]["y"] == []
+
+    response.response_json = {"target_progress_rows": [{"progress_level": "on_track"}, {"progress_level": "on_track"}]}
+    response.save(update_fields=["response_json"])
+    IndicatorDataPoint.objects.create(series=series["IND-PUB"], year=2023, value_numeric=Decimal("20"))
+    admin = User.objects.create_superuser(username="admin", password="pass1234", email="admin@example.org")
+    chart_data = section_chart_data(instance=instance, pack=pack)
+    charts = visible_section_charts(chart_data, admin, instance)
+
+    assert chart_data["section-iii"].charts_json[0]["spec"]["data"][0]["y"] == [2]
+    assert chart_data["section-ii"].linked_indicator_codes == ["IND-PUB", "IND-RES"]
+    assert charts["section-ii"][1]["indicator_code"] == "IND-PUB"
+    assert charts["section-ii"][1]["spec"]["data"][0]["x"] == [2021, 2022, 2023]
+
+    ReportTemplatePackResponse.objects.filter(pk=response.pk).update(
+        response_json={"target_progress_rows": [{"progress_level": "achieved"}]}
+    )
+    stale_read = section_chart_data(instance=instance, pack=pack, section_codes=["section-iii"])
+    assert stale_read["section-iii"].charts_json[0]["spec"]["data"][0]["x"] == ["achieved"]
+    assert ReportSectionChartData.objects.get(reporting_instance=instance, section_code="section-iii").charts_json[0][
+        "spec"
+    ]["data"][0]["x"] == ["on_track"]
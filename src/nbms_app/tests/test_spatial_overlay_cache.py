@@ -0,0 +1,59 @@
+from decimal import Decimal
+
+import pytest
+
+from nbms_app.models import SpatialFeature, SpatialIngestionRun, SpatialLayer, SpatialOverlayCache
+from nbms_app.services.spatial_overlay import get_overlay_cache
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _layers():
+    admin = SpatialLayer.objects.create(layer_code="ZA_PROVINCES", name="Provinces", slug="za-provinces")
+    overlay = SpatialLayer.objects.create(layer_code="ZA_PROTECTED_AREAS", name="Protected", slug="za-protected")
+    for code in ["GP", "WC"]:
+        SpatialFeature.objects.create(layer=admin, feature_key=code, name=code, province_code=code, properties={"area_km2": 200})
+        SpatialFeature.objects.create(
+            layer=overlay,
+            feature_key=f"pa-{code}",
+            province_code=code,
+            properties={"area_km2": 20},
+        )
+    return admin, overlay
+
+
+def test_overlay_cache_is_reused_until_a_layer_is_reingested(django_assert_max_num_queries):
+    admin, overlay = _layers()
+
+    cache = get_overlay_cache(admin, overlay)
+    assert list(cache.units.values_list("unit_code", "overlay_area_km2")) == [("GP", Decimal("20")), ("WC", Decimal("20"))]
+    assert cache.overlay_area_km2 == Decimal("40")
+    computed_at = cache.computed_at
+
+    SpatialFeature.objects.filter(layer=overlay, province_code="GP").update(properties={"area_km2": 80})
+    with django_assert_max_num_queries(2):
+        cached = get_overlay_cache(admin, overlay)
+    assert cached.computed_at == computed_at
+    assert cached.units.get(unit_code="GP").overlay_area_km2 == Decimal("20")
+
+    overlay.latest_ingestion_run = SpatialIngestionRun.objects.create(run_id="pa-reingest", layer=overlay)
+    overlay.save(update_fields=["latest_ingestion_run"])
+    refreshed = get_overlay_cache(admin, overlay)
+
+    assert refreshed.pk == cache.pk
+    assert refreshed.overlay_ingestion_run_id == overlay.latest_ingestion_run_id
+    assert refreshed.units.get(unit_code="GP").overlay_area_km2 == Decimal("80")
+    assert refreshed.units.count() == 2
+    assert SpatialOverlayCache.objects.count() == 1
+
+
+def test_feature_edits_invalidate_the_overlay_cache():
+    admin, overlay = _layers()
+    get_overlay_cache(admin, overlay)
+
+    feature = SpatialFeature.objects.get(layer=overlay, province_code="WC")
+    feature.properties = {"area_km2": 50}
+    feature.save()
+
+    assert get_overlay_cache(admin, overlay).units.get(unit_code="WC").overlay_area_km2 == Decimal("50")
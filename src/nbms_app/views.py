@@ -159,7 +159,8 @@ from nbms_app.services.readiness import (
     get_target_readiness,
 )
 from nbms_app.services.notifications import create_notification
-from nbms_app.services.alignment_coverage import compute_alignment_coverage
+from nbms_app.services.alignment_coverage import cached_alignment_coverage
+from nbms_app.services.reporting_workflow import bootstrap_report_workspace
 from nbms_app.services.review import build_instance_review_summary, build_review_pack_context
 from nbms_app.services.review_decisions import (
     create_review_decision,
@@ -171,7 +172,9 @@ from nbms_app.services.section_progress import scoped_framework_targets, scoped_
 from nbms_app.services.snapshots import (
     create_reporting_snapshot,
     diff_snapshot_readiness,
-    diff_snapshots,
+    diff_snapshot_records,
+    snapshot_chunk_counts,
+    snapshot_payload,
 )
 from nbms_app.services.workflows import approve, reject
 
@@ -2528,9 +2531,16 @@ def reporting_instance_create(request):
         initial["cycle"] = cycle
     form = ReportingInstanceForm(request.POST or None, initial=initial)
     if request.method == "POST" and form.is_valid():
-        instance = form.save()
-        messages.success(request, "Reporting instance created.")
-        return redirect("nbms_app:reporting_instance_detail", instance_uuid=instance.uuid)
+        try:
+            with transaction.atomic():
+                instance = form.save()
+                bootstrap_report_workspace(instance, user=request.user)
+        except ValidationError as exc:
+            # Without its workspace the instance cannot be edited, so it is not kept.
+            form.add_error(None, exc)
+        else:
+            messages.success(request, "Reporting instance created.")
+            return redirect("nbms_app:reporting_instance_detail", instance_uuid=instance.uuid)
     return render(request, "nbms_app/reporting/instance_form.html", {"form": form, "mode": "create"})
 
 
@@ -2538,7 +2548,7 @@ def reporting_instance_create(request):
 def reporting_instance_detail(request, instance_uuid):
     instance = get_object_or_404(ReportingInstance.objects.select_related("cycle", "frozen_by"), uuid=instance_uuid)
     readiness = get_instance_readiness(instance, request.user)
-    alignment_coverage = compute_alignment_coverage(
+    alignment_coverage = cached_alignment_coverage(
         user=request.user,
         instance=instance,
         scope="selected",
@@ -2903,7 +2913,7 @@ def reporting_instance_review(request, instance_uuid):
     instance = get_object_or_404(ReportingInstance.objects.select_related("cycle"), uuid=instance_uuid)
     _require_section_progress_access(instance, request.user)
     summary = build_instance_review_summary(instance, request.user)
-    alignment_coverage = compute_alignment_coverage(
+    alignment_coverage = cached_alignment_coverage(
         user=request.user,
         instance=instance,
         scope="selected",
@@ -2941,7 +2951,7 @@ def reporting_instance_review(request, instance_uuid):
 def reporting_instance_alignment_coverage(request, instance_uuid):
     instance = get_object_or_404(ReportingInstance.objects.select_related("cycle"), uuid=instance_uuid)
     _require_section_progress_access(instance, request.user)
-    coverage = compute_alignment_coverage(
+    coverage = cached_alignment_coverage(
         user=request.user,
         instance=instance,
         scope="selected",
@@ -2988,13 +2998,14 @@ def reporting_instance_review_pack_v2(request, instance_uuid):
     return render(request, "nbms_app/reporting/review_pack_v2.html", context)
 
 
-def _snapshot_counts(payload):
+def _snapshot_counts(snapshot):
+    counts = snapshot_chunk_counts(snapshot)
     return {
-        "sections": len(payload.get("sections") or []),
-        "section_iii": len(payload.get("section_iii_progress") or []),
-        "section_iv": len(payload.get("section_iv_progress") or []),
-        "indicator_series": len(payload.get("indicator_data_series") or []),
-        "binary_responses": len(payload.get("binary_indicator_data") or []),
+        "sections": counts["sections"],
+        "section_iii": counts["section_iii_progress"],
+        "section_iv": counts["section_iv_progress"],
+        "indicator_series": counts["indicator_data_series"],
+        "binary_responses": counts["binary_indicator_data"],
     }
 
 
@@ -3048,7 +3059,7 @@ def reporting_instance_snapshot_detail(request, instance_uuid, snapshot_uuid):
     context = {
         "instance": instance,
         "snapshot": snapshot,
-        "counts": _snapshot_counts(snapshot.payload_json or {}),
+        "counts": _snapshot_counts(snapshot),
     }
     return render(request, "nbms_app/reporting/snapshot_detail.html", context)
 
@@ -3068,7 +3079,7 @@ def reporting_instance_snapshot_download(request, instance_uuid, snapshot_uuid):
         snapshot,
         metadata={"instance_uuid": str(instance.uuid)},
     )
-    response = JsonResponse(snapshot.payload_json, json_dumps_params={"indent": 2})
+    response = JsonResponse(snapshot_payload(snapshot), json_dumps_params={"indent": 2})
     response["Content-Disposition"] = f'attachment; filename="snapshot-{snapshot.uuid}.json"'
     return response
 
@@ -3096,7 +3107,7 @@ def reporting_instance_snapshot_diff(request, instance_uuid):
     diff = None
     readiness_diff = None
     if snapshot_a and snapshot_b:
-        diff = diff_snapshots(snapshot_a.payload_json, snapshot_b.payload_json)
+        diff = diff_snapshot_records(snapshot_a, snapshot_b)
         readiness_diff = diff_snapshot_readiness(snapshot_a, snapshot_b)
         record_audit_event(
             request.user,